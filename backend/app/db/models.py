@@ -17,6 +17,7 @@ from sqlalchemy import (
     ForeignKey,
     Index,
     Integer,
+    LargeBinary,
     String,
     Text,
     UniqueConstraint,
@@ -1189,6 +1190,47 @@ class LlmDailySpendModel(Base):
     spend_usd: Mapped[float] = mapped_column(Float, default=0.0)
 
 
+class LlmResponseCacheModel(Base):
+    """Cached LLM responses for opt-in deterministic task types.
+
+    ``key`` hashes (provider, model, task_type, normalized messages,
+    temperature, json_mode). ``scope_hash`` hashes everything except the
+    final user message; the similarity lookup only compares ``embedding``
+    (of that final message) among rows sharing a scope.
+    """
+    __tablename__ = "llm_response_cache"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    scope_hash: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+    provider: Mapped[str] = mapped_column(String(50), nullable=False)
+    model: Mapped[str] = mapped_column(String(200), nullable=False)
+    task_type: Mapped[Optional[str]] = mapped_column(String(50), index=True)
+    response: Mapped[str] = mapped_column(Text, nullable=False)
+    cost_usd: Mapped[float] = mapped_column(Float, default=0.0)
+    embedding = mapped_column(Vector(1024), nullable=True)
+    hits: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    last_hit_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+
+
+class EmbeddingCacheModel(Base):
+    """Content-addressed embedding vectors shared by every embed caller.
+
+    ``key`` is sha256 over (model, dimension, text); ``vector`` holds the
+    embedding as little-endian float16 bytes.
+    """
+    __tablename__ = "embedding_cache"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    model: Mapped[str] = mapped_column(String(200), nullable=False)
+    dimension: Mapped[int] = mapped_column(Integer, nullable=False)
+    vector: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    hits: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    last_hit_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+
+
 # ---------------------------------------------------------------------------
 # Sprint 2: Gateway Agent Configs
 # ---------------------------------------------------------------------------
@@ -1302,6 +1344,31 @@ class VisualWorkflowExecutionModel(Base):
     completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
 
 
+class WorkflowExecutionRecordModel(Base):
+    """One row per YAML workflow engine execution (``workflow_engine``).
+
+    Summary columns are indexed for history / dashboard queries; ``state``
+    is the full execution state, stripped of step outputs once compacted.
+    """
+    __tablename__ = "workflow_executions"
+    __table_args__ = (
+        Index("idx_workflow_executions_workflow_started", "workflow_id", "started_at"),
+        Index("idx_workflow_executions_status_started", "status", "started_at"),
+    )
+
+    execution_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    workflow_id: Mapped[str] = mapped_column(String(200), nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False)
+    trigger_type: Mapped[Optional[str]] = mapped_column(String(50))
+    error: Mapped[Optional[str]] = mapped_column(Text)
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    duration_ms: Mapped[Optional[float]] = mapped_column(Float)
+    step_status: Mapped[dict] = mapped_column(JSONB, default=dict)
+    state: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    compacted: Mapped[bool] = mapped_column(Boolean, default=False)
+
+
 # ---------------------------------------------------------------------------
 # Sprint 4: Outcome Tracking (Business KPIs)
 # ---------------------------------------------------------------------------
@@ -1379,6 +1446,27 @@ class MeetingTranscriptSegmentModel(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
 
+class MeetingTranscriptChunkModel(Base):
+    """One embedded window of consecutive transcript segments.
+
+    Written in bulk by ``MeetingVectorService.embed_segments``; the HNSW
+    index on ``embedding`` is created by migration 053.
+    """
+    __tablename__ = "meeting_transcript_chunks"
+
+    id: Mapped[str] = mapped_column(String(96), primary_key=True)
+    meeting_id: Mapped[str] = mapped_column(String(64), ForeignKey("meetings.id", ondelete="CASCADE"), nullable=False, index=True)
+    chunk_idx: Mapped[int] = mapped_column(Integer, nullable=False)
+    start_time: Mapped[float] = mapped_column(Float, nullable=False)
+    end_time: Mapped[float] = mapped_column(Float, nullable=False)
+    speakers: Mapped[Optional[list]] = mapped_column(ARRAY(Text), default=[])
+    text: Mapped[str] = mapped_column(Text, nullable=False)
+    segment_ids: Mapped[Optional[list]] = mapped_column(ARRAY(Integer), default=[])
+    embedding = mapped_column(Vector(768), nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
 class MeetingSummaryModel(Base):
     __tablename__ = "meeting_summaries"
 
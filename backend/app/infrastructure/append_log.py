@@ -0,0 +1,203 @@
+"""
+Append-only, segmented JSONL log.
+
+``JsonStorage`` persists a whole document per write: read the file, mutate,
+re-serialise (indented) and atomically replace it. For event-style data
+that makes every append O(file size) and serialises all writers behind a
+lock. ``SegmentedAppendLog`` is the alternative for append-mostly records:
+
+  - ``append`` writes one compact JSON line to the active segment and
+    flushes it to the OS: O(1), synchronous, no lock (the event loop is the
+    only writer).
+  - The active segment rotates to a new file past ``segment_max_bytes``;
+    segments are ``<name>.<000001>.jsonl`` in ``directory``.
+  - ``fsync`` is batched: a background task syncs at most once per
+    ``fsync_interval_s`` when something was written, and ``close()`` syncs
+    before returning.
+  - ``compact()`` (run by the same background task every
+    ``compact_interval_s``) drops the oldest sealed segments beyond
+    ``max_segments``.
+  - ``read_tail(n)`` reads segments newest-first and returns the last ``n``
+    records in order, skipping torn lines from a crash mid-write.
+
+Callers keep whatever in-memory index they need over the tail (see
+``ActivityLogService``).
+"""
+
+import asyncio
+import json
+import os
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+class SegmentedAppendLog:
+    """JSONL records across size-rotated segment files."""
+
+    def __init__(
+        self,
+        directory: Path,
+        name: str,
+        *,
+        segment_max_bytes: int = 1_000_000,
+        max_segments: int = 8,
+        fsync_interval_s: float = 1.0,
+        compact_interval_s: float = 600.0,
+    ):
+        self.directory = directory
+        self.name = name
+        self._segment_max_bytes = segment_max_bytes
+        self._max_segments = max(1, max_segments)
+        self._fsync_interval_s = fsync_interval_s
+        self._compact_interval_s = compact_interval_s
+        self._fh: Optional[IO[str]] = None
+        self._active_id = 0
+        self._active_size = 0
+        self._dirty = False
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Segments
+    # ------------------------------------------------------------------
+
+    def _segment_path(self, seg_id: int) -> Path:
+        return self.directory / f"{self.name}.{seg_id:06d}.jsonl"
+
+    def segment_ids(self) -> List[int]:
+        ids = []
+        for path in self.directory.glob(f"{self.name}.*.jsonl"):
+            stem = path.name[len(self.name) + 1:-len(".jsonl")]
+            if stem.isdigit():
+                ids.append(int(stem))
+        return sorted(ids)
+
+    def _open_active(self) -> IO[str]:
+        if self._fh is None:
+            ids = self.segment_ids()
+            self._active_id = ids[-1] if ids else 1
+            path = self._segment_path(self._active_id)
+            self._fh = open(path, "a", encoding="utf-8")
+            self._active_size = path.stat().st_size
+        return self._fh
+
+    def _rotate(self) -> None:
+        self._sync_now()
+        self._fh.close()
+        self._active_id += 1
+        self._fh = open(self._segment_path(self._active_id), "a", encoding="utf-8")
+        self._active_size = 0
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Append one record. O(1); durable to the OS now, to disk within a tick."""
+        line = json.dumps(record, default=str, ensure_ascii=False, separators=(",", ":")) + "\n"
+        fh = self._open_active()
+        if self._active_size and self._active_size + len(line) > self._segment_max_bytes:
+            self._rotate()
+            fh = self._fh
+        fh.write(line)
+        fh.flush()
+        self._active_size += len(line.encode("utf-8"))
+        self._dirty = True
+        self._ensure_background()
+
+    def _sync_now(self) -> None:
+        if self._fh is not None and self._dirty:
+            self._dirty = False
+            os.fsync(self._fh.fileno())
+
+    def _ensure_background(self) -> None:
+        if self._closed or (self._task is not None and not self._task.done()):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._task = loop.create_task(self._run(), name=f"append_log:{self.name}")
+
+    async def _run(self) -> None:
+        since_compact = 0.0
+        while not self._closed:
+            await asyncio.sleep(self._fsync_interval_s)
+            try:
+                if self._dirty and self._fh is not None:
+                    self._dirty = False
+                    await asyncio.to_thread(os.fsync, self._fh.fileno())
+                since_compact += self._fsync_interval_s
+                if since_compact >= self._compact_interval_s:
+                    since_compact = 0.0
+                    await asyncio.to_thread(self.compact)
+            except Exception as e:  # noqa: BLE001 — keep syncing on later ticks
+                logger.warning("append_log_background_failed", log=self.name, error=str(e))
+
+    def compact(self) -> int:
+        """Delete the oldest sealed segments beyond ``max_segments``."""
+        ids = self.segment_ids()
+        removable = [i for i in ids[:-self._max_segments] if i != self._active_id]
+        for seg_id in removable:
+            try:
+                self._segment_path(seg_id).unlink()
+            except FileNotFoundError:
+                pass
+        if removable:
+            logger.info("append_log_compacted", log=self.name, removed_segments=len(removable))
+        return len(removable)
+
+    async def close(self) -> None:
+        self._closed = True
+        task, self._task = self._task, None
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        if self._fh is not None:
+            self._sync_now()
+            self._fh.close()
+            self._fh = None
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def read_tail(self, n: int) -> List[Dict[str, Any]]:
+        """Last ``n`` records in append order (blocking; run in a thread)."""
+        if self._fh is not None:
+            self._fh.flush()
+        chunks: List[List[Dict[str, Any]]] = []
+        remaining = n
+        for seg_id in reversed(self.segment_ids()):
+            if remaining <= 0:
+                break
+            records = self._read_segment(self._segment_path(seg_id))
+            if len(records) > remaining:
+                records = records[-remaining:]
+            chunks.append(records)
+            remaining -= len(records)
+        return [r for chunk in reversed(chunks) for r in chunk]
+
+    def _read_segment(self, path: Path) -> List[Dict[str, Any]]:
+        records = []
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        logger.warning("append_log_torn_line", log=self.name, path=str(path))
+        except FileNotFoundError:
+            pass
+        return records
@@ -61,6 +61,22 @@ class Settings(BaseSettings):
     vault_path: str = "/vault"
     vault_agent_research_subdir: str = "00_Meta/_agent/research"
     vault_daily_subdir: str = "20_Calendar/Daily"
+    # Vault indexer pipeline: chunks per embed_batch call, batches in flight,
+    # and worker threads for read/hash/chunk.
+    vault_index_embed_batch_size: int = 32
+    vault_index_embed_concurrency: int = 4
+    vault_index_chunk_workers: int = 4
+    # Filesystem watcher (needs `watchdog`): quiet period before a batch of
+    # edits is indexed, and how often the cron tick still does a full scan.
+    vault_watch_enabled: bool = True
+    vault_watch_debounce_s: float = 2.0
+    vault_watch_reconcile_minutes: int = 60
+    # Vault retrieval caches: query embeddings (LRU + TTL) and full search
+    # results (short TTL, cleared on every index write).
+    vault_query_embed_cache_size: int = 512
+    vault_query_embed_cache_ttl_s: float = 3600.0
+    vault_search_cache_size: int = 256
+    vault_search_cache_ttl_s: float = 60.0
 
     # Autonomous research loop
     autonomous_research_enabled: bool = True
@@ -94,6 +110,13 @@ class Settings(BaseSettings):
     google_client_secret: Optional[str] = None
     google_redirect_uri: str = "http://localhost:18792/api/google/auth/callback"
     frontend_url: str = "http://localhost:5173"
+    # Gmail sync: message bodies are fetched through batch requests of
+    # gmail_batch_size (API max 100); gmail_sync_concurrency accounts sync at
+    # once. gmail_api_endpoint overrides https://gmail.googleapis.com, e.g.
+    # to run the sync against a local fake Gmail server.
+    gmail_batch_size: int = 50
+    gmail_sync_concurrency: int = 4
+    gmail_api_endpoint: Optional[str] = None
 
     # Email Automation
     email_automation_enabled: bool = True
@@ -107,6 +130,34 @@ class Settings(BaseSettings):
     # dimension for older 768-dim pgvector tables.
     embedding_model: str = "qwen3-embed"
     embedding_dimension: int = 768
+    # Embedding cache: sha256(model, dimension, text) -> float16 vector, kept
+    # in an in-process LRU and the embedding_cache table. Single embed()
+    # calls arriving within embed_coalesce_window_ms go out as one batch
+    # (0 disables coalescing).
+    embedding_cache_enabled: bool = True
+    embedding_cache_memory_entries: int = 4096
+    embedding_cache_max_entries: int = 200_000
+    embed_coalesce_window_ms: float = 5.0
+    embed_coalesce_max_batch: int = 32
+    # Episodic memory bulk ingestion: LLM extractions in flight, and the
+    # cosine similarity above which two extracted facts count as duplicates.
+    episodic_extract_concurrency: int = 4
+    episodic_dedupe_similarity: float = 0.95
+    # YAML workflow execution history (workflow_executions table). Rows past
+    # the compaction age keep their summary columns and step statuses but
+    # drop step outputs; rows past the retention age are deleted.
+    workflow_history_compact_after_days: int = 14
+    workflow_history_retention_days: int = 180
+    # Orchestrator intent routing: embedding nearest-exemplar router between
+    # the keyword tier and the LLM classifier. A route is taken when its
+    # top-k exemplar similarity clears min_similarity and beats the next
+    # route by min_margin.
+    intent_router_enabled: bool = True
+    intent_router_min_similarity: float = 0.6
+    intent_router_min_margin: float = 0.04
+    intent_router_exemplars_per_route: int = 200
+    intent_router_history_days: int = 90
+    intent_router_refresh_s: float = 3600.0
 
     # Reachy Mini voice surface
     reachy_api_url: str = "http://host.docker.internal:8000"
@@ -136,6 +187,11 @@ class Settings(BaseSettings):
     # backend falls back to its in-process audio capture (only works if the backend
     # itself is running on the host with pyaudiowpatch/sounddevice installed).
     host_agent_url: Optional[str] = None
+    # Meeting transcript vectors: chunks per embed_batch call, and the HNSW
+    # candidate list size for cross-meeting search (higher = better recall,
+    # slower; pgvector's default is 40).
+    meeting_embed_batch_size: int = 32
+    meeting_vector_ef_search: int = 64
 
     # AIContentTools Integration
     ai_content_tools_url: str = "http://host.docker.internal:8085"
@@ -244,6 +300,18 @@ class Settings(BaseSettings):
     # LLM Cost Control
     llm_daily_budget_usd: float = 5.0
 
+    # LLM concurrency: per-provider AIMD limits (see llm_concurrency.py).
+    # Upper bound for any provider's adaptive limit, and slots background
+    # (scheduler) calls may never take from interactive turns.
+    llm_concurrency_max_per_provider: int = 16
+    llm_concurrency_interactive_reserve: int = 1
+
+    # LLM response cache (opt-in per task via ModelAssignment.cache_ttl_s)
+    llm_response_cache_enabled: bool = True
+    llm_response_cache_max_entries: int = 50_000
+    llm_response_cache_memory_entries: int = 1024
+    llm_response_cache_similarity: float = 0.97
+
     # Character Content Autopilot
     character_autopilot_enabled: bool = True
     character_minimax_daily_cap_usd: float = 3.50
@@ -268,15 +336,28 @@ class Settings(BaseSettings):
     # Rubric gate threshold for the W3 fail-retry loop on carousel generation.
     carousel_rubric_threshold: float = 6.5
     carousel_rubric_max_retries: int = 2
+    # Slide render worker processes (0 = render in one background thread).
+    carousel_render_workers: int = 4
 
     # Meeting Intelligence (DailyMemory)
     whisper_model_size: str = "large-v3"
     whisper_device: str = "cuda"
     whisper_compute_type: str = "float16"
     whisper_language: str = "en"
+    # Word timestamps for meeting transcripts, used to split segments at
+    # speaker changes during diarization alignment.
+    whisper_word_timestamps: bool = True
     hf_token: Optional[str] = None  # HuggingFace token for pyannote diarization
     diarization_model: str = "pyannote/speaker-diarization-3.1"
     max_speakers: int = 10
+    # Meeting worker processes (each holds its own warm whisper/pyannote
+    # models, so size to GPU memory); also the number of recordings processed
+    # at once. 0 = run the model stages in one background thread.
+    meeting_processing_workers: int = 1
+    meeting_processing_prewarm: bool = True
+    # Long-transcript summaries: section LLM calls in flight during the map
+    # stage. Finished sections are cached under <workspace>/cache/meeting_sections.
+    meeting_summary_concurrency: int = 4
     recordings_dir: str = "../workspace/recordings"
     audio_source: str = "mixed"  # system|mic|mixed
     sample_rate: int = 16000
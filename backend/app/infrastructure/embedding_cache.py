@@ -0,0 +1,298 @@
+"""
+Content-addressed embedding cache and request coalescing for the embed client.
+
+The same text is embedded over and over — vault queries, episodic memory
+search, knowledge lookups, meeting search, and reindex / backfill jobs
+re-embedding unchanged chunks — and every call was a fresh round trip to
+the embedder. ``OllamaClient.embed`` / ``embed_batch`` consult this cache
+first, so every caller shares it without code changes.
+
+Key: sha256 over (model, dimension, text), text used verbatim. Vectors are
+stored as float16 (half the bytes of float32; cosine similarity moves by
+well under 1e-3).
+
+Lookup order:
+  1. in-process LRU (``TTLCache``) — no I/O
+  2. ``embedding_cache`` table — one UPDATE … RETURNING per batch of keys
+     (also bumps the hit counter used for LRU pruning)
+
+New vectors go into memory immediately and are persisted in the
+background. The table is bounded to ``embedding_cache_max_entries``: every
+few hundred writes the least recently used rows beyond it are dropped. A
+cache failure is always a miss — it never fails the embed call.
+
+``EmbedCoalescer`` merges concurrent single-text ``embed()`` misses into
+micro-batched ``embed_batch`` requests.
+"""
+
+import asyncio
+import hashlib
+import json
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set
+
+import numpy as np
+import structlog
+
+from app.infrastructure.ttl_cache import TTLCache
+
+logger = structlog.get_logger(__name__)
+
+_PRUNE_EVERY = 500
+
+
+def embedding_cache_key(model: str, dimension: int, text: str) -> str:
+    payload = json.dumps([model, int(dimension), text], ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _pack(vec: Sequence[float]) -> np.ndarray:
+    return np.asarray(vec, dtype=np.float16)
+
+
+def _unpack(arr: np.ndarray) -> List[float]:
+    return arr.astype(np.float32).tolist()
+
+
+class EmbeddingCache:
+    """Two-tier (memory + Postgres) cache of embedding vectors."""
+
+    def __init__(
+        self,
+        *,
+        memory_entries: int = 4096,
+        max_entries: int = 200_000,
+        enabled: bool = True,
+        persist: bool = True,
+    ):
+        self.enabled = enabled
+        self._persist = persist
+        self._max_entries = max_entries
+        self._memory: TTLCache[np.ndarray] = TTLCache(
+            "embeddings", max_entries=memory_entries, ttl_s=float("inf")
+        )
+        self._pending: Set[asyncio.Task] = set()
+        self._writes_since_prune = 0
+        self._stats = {
+            "memory_hits": 0,
+            "db_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "errors": 0,
+        }
+
+    key = staticmethod(embedding_cache_key)
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    async def get_many(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        """Cached vectors for whichever of ``keys`` are known."""
+        if not self.enabled:
+            return {}
+        found: Dict[str, List[float]] = {}
+        missing: List[str] = []
+        for key in dict.fromkeys(keys):
+            arr = self._memory.get(key)
+            if arr is not None:
+                found[key] = _unpack(arr)
+            else:
+                missing.append(key)
+        self._stats["memory_hits"] += len(found)
+
+        if missing and self._persist:
+            try:
+                rows = await self._db_get(missing)
+            except Exception as e:  # noqa: BLE001 — cache failures are misses
+                self._stats["errors"] += 1
+                logger.debug("embedding_cache_lookup_failed", error=str(e))
+                rows = {}
+            for key, blob in rows.items():
+                arr = np.frombuffer(blob, dtype="<f2")
+                self._memory.set(key, arr)
+                found[key] = _unpack(arr)
+            self._stats["db_hits"] += len(rows)
+            missing = [k for k in missing if k not in rows]
+        self._stats["misses"] += len(missing)
+        return found
+
+    async def _db_get(self, keys: List[str]) -> Dict[str, bytes]:
+        from sqlalchemy import text
+        from app.infrastructure.database import get_session
+
+        async with get_session() as session:
+            rows = (await session.execute(
+                text(
+                    "UPDATE embedding_cache SET hits = hits + 1, last_hit_at = now() "
+                    "WHERE key = ANY(:keys) RETURNING key, vector"
+                ),
+                {"keys": keys},
+            )).all()
+        return {row[0]: bytes(row[1]) for row in rows}
+
+    # ------------------------------------------------------------------
+    # Store
+    # ------------------------------------------------------------------
+
+    def put_many(self, model: str, dimension: int, vectors: Dict[str, Sequence[float]]) -> None:
+        """Cache ``vectors`` now in memory, persist them in the background."""
+        if not self.enabled or not vectors:
+            return
+        packed = {key: _pack(vec) for key, vec in vectors.items()}
+        for key, arr in packed.items():
+            self._memory.set(key, arr)
+        if not self._persist:
+            return
+        try:
+            task = asyncio.get_running_loop().create_task(self._store(model, dimension, packed))
+        except RuntimeError:
+            return
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _store(self, model: str, dimension: int, packed: Dict[str, np.ndarray]) -> None:
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        from app.db.models import EmbeddingCacheModel
+        from app.infrastructure.database import get_session
+
+        try:
+            rows = [
+                {
+                    "key": key,
+                    "model": model[:200],
+                    "dimension": int(dimension),
+                    "vector": arr.astype("<f2").tobytes(),
+                    "hits": 0,
+                }
+                for key, arr in packed.items()
+            ]
+            stmt = pg_insert(EmbeddingCacheModel).values(rows).on_conflict_do_nothing(
+                index_elements=["key"]
+            )
+            async with get_session() as session:
+                await session.execute(stmt)
+            self._stats["stores"] += len(rows)
+            self._writes_since_prune += len(rows)
+            if self._writes_since_prune >= _PRUNE_EVERY:
+                self._writes_since_prune = 0
+                await self.prune()
+        except Exception as e:  # noqa: BLE001
+            self._stats["errors"] += 1
+            logger.debug("embedding_cache_store_failed", error=str(e))
+
+    async def prune(self) -> int:
+        """Drop the least recently used rows beyond ``max_entries``."""
+        from sqlalchemy import text
+        from app.infrastructure.database import get_session
+
+        async with get_session() as session:
+            result = await session.execute(
+                text(
+                    "DELETE FROM embedding_cache WHERE key IN ("
+                    "  SELECT key FROM embedding_cache"
+                    "   ORDER BY coalesce(last_hit_at, created_at) DESC"
+                    "   OFFSET :max_entries)"
+                ),
+                {"max_entries": self._max_entries},
+            )
+        removed = result.rowcount or 0
+        if removed:
+            logger.info("embedding_cache_pruned", removed=removed)
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self._stats["memory_hits"] + self._stats["db_hits"]
+        total = hits + self._stats["misses"]
+        return {
+            **self._stats,
+            "enabled": self.enabled,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+            "memory": self._memory.stats(),
+            "pending_writes": len(self._pending),
+            "max_entries": self._max_entries,
+        }
+
+
+class EmbedCoalescer:
+    """Merges concurrent single-text embeds into micro-batched calls.
+
+    ``submit`` waits at most ``window_s`` for other callers (or until
+    ``max_batch`` distinct texts are queued), then one ``embed_batch`` call
+    serves them all. Identical texts waiting together share one slot.
+    """
+
+    def __init__(
+        self,
+        embed_batch: Callable[[List[str]], Awaitable[List[List[float]]]],
+        *,
+        window_s: float,
+        max_batch: int,
+    ):
+        self._embed_batch = embed_batch
+        self._window_s = window_s
+        self._max_batch = max(1, max_batch)
+        self._queued: Dict[str, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._inflight: Set[asyncio.Task] = set()
+        self._stats = {"requests": 0, "batches": 0, "texts": 0}
+
+    async def submit(self, text: str) -> List[float]:
+        self._stats["requests"] += 1
+        fut = self._queued.get(text)
+        if fut is None:
+            loop = asyncio.get_running_loop()
+            fut = loop.create_future()
+            self._queued[text] = fut
+            if len(self._queued) >= self._max_batch:
+                self._flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self._window_s, self._flush)
+        # A cancelled caller must not cancel the batch other callers share.
+        return list(await asyncio.shield(fut))
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._queued = self._queued, {}
+        if not batch:
+            return
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _run(self, batch: Dict[str, asyncio.Future]) -> None:
+        texts = list(batch)
+        self._stats["batches"] += 1
+        self._stats["texts"] += len(texts)
+        try:
+            vecs = await self._embed_batch(texts)
+        except Exception as e:  # noqa: BLE001 — surfaced to every waiter
+            for fut in batch.values():
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        for text, vec in zip(texts, vecs):
+            if not batch[text].done():
+                batch[text].set_result(vec)
+
+    def stats(self) -> Dict[str, Any]:
+        batches = self._stats["batches"]
+        return {
+            **self._stats,
+            "avg_batch_size": round(self._stats["texts"] / batches, 2) if batches else 0.0,
+        }
+
+
+@lru_cache()
+def get_embedding_cache() -> EmbeddingCache:
+    """Get the singleton embedding cache."""
+    from app.infrastructure.config import get_settings
+
+    settings = get_settings()
+    return EmbeddingCache(
+        memory_entries=settings.embedding_cache_memory_entries,
+        max_entries=settings.embedding_cache_max_entries,
+        enabled=settings.embedding_cache_enabled,
+    )
@@ -0,0 +1,340 @@
+"""
+Per-provider adaptive concurrency limits for LLM calls.
+
+Replaces the single process-wide ``asyncio.Semaphore(4)`` that used to wrap
+every ``UnifiedLLMClient`` call. One global gate meant a slow remote
+fallback or a burst of scheduler jobs held slots that cheap local calls and
+interactive Reachy/chat turns were waiting on.
+
+Each provider gets its own ``AdaptiveLimiter``:
+  - The limit is sized with AIMD: +1 slot per ``limit`` successful,
+    uncongested calls; ×``decrease`` on a 429/503/timeout or when recent
+    latency jumps well above its long-run baseline (at most once per
+    ``cooldown_s`` so one burst of failures doesn't collapse it to the floor).
+  - Two priority lanes. Interactive waiters are always served first, and
+    background work (scheduler jobs) may never occupy the last
+    ``reserved_interactive`` slots.
+  - Queue depth, in-flight count, current limit and wait times are exposed
+    via ``stats()`` (GET /api/llm/concurrency) and wait times go to the
+    metrics service as ``llm_queue_wait_ms``.
+
+Priority is ambient: ``llm_priority(LlmPriority.BACKGROUND)`` marks the
+current task (the scheduler wraps every job in it); everything else is
+interactive by default.
+
+Usage:
+    limiter = get_llm_limiters().get("vllm")
+    async with limiter.slot():
+        result = await provider.chat(...)
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import Enum
+from functools import lru_cache
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, Optional
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class LlmPriority(str, Enum):
+    INTERACTIVE = "interactive"
+    BACKGROUND = "background"
+
+
+_PRIORITY: ContextVar[LlmPriority] = ContextVar("llm_priority", default=LlmPriority.INTERACTIVE)
+
+
+def current_priority() -> LlmPriority:
+    return _PRIORITY.get()
+
+
+@contextmanager
+def llm_priority(priority: LlmPriority) -> Iterator[None]:
+    """Run the enclosed LLM calls (including spawned tasks) in ``priority``'s lane."""
+    token = _PRIORITY.set(priority)
+    try:
+        yield
+    finally:
+        _PRIORITY.reset(token)
+
+
+@dataclass(frozen=True)
+class LimiterConfig:
+    initial: int = 4
+    min_limit: int = 1
+    max_limit: int = 16
+    reserved_interactive: int = 1
+    decrease: float = 0.7
+    latency_tolerance: float = 2.0
+    cooldown_s: float = 2.0
+
+
+# Starting points only — AIMD moves each limit within [min_limit, max_limit].
+_PROVIDER_DEFAULTS: Dict[str, LimiterConfig] = {
+    "vllm": LimiterConfig(initial=4, max_limit=16),
+    "ollama": LimiterConfig(initial=2, max_limit=8),
+    "bifrost": LimiterConfig(initial=6, max_limit=32),
+    "kimi": LimiterConfig(initial=3, max_limit=12),
+}
+
+
+def is_overload_error(exc: BaseException) -> bool:
+    """True for errors that mean "back off" (rate limit, overload, timeout)."""
+    if isinstance(exc, asyncio.TimeoutError):
+        return True
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None)
+    if status in (429, 503):
+        return True
+    text = str(exc)
+    return (
+        "429" in text
+        or "Too Many Requests" in text
+        or "rate limit" in text.lower()
+        or "ReadTimeout" in type(exc).__name__
+    )
+
+
+class AdaptiveLimiter:
+    """AIMD-sized concurrency limit with an interactive and a background lane."""
+
+    # EWMA weights for the latency gradient: "recent" vs "baseline".
+    _SHORT_ALPHA = 0.3
+    _LONG_ALPHA = 0.02
+    _MIN_LATENCY_SAMPLES = 10
+
+    def __init__(self, name: str, config: LimiterConfig = LimiterConfig()):
+        self.name = name
+        self._cfg = config
+        self._limit = float(min(max(config.initial, config.min_limit), config.max_limit))
+        self._in_flight: Dict[LlmPriority, int] = {p: 0 for p in LlmPriority}
+        self._waiters: Dict[LlmPriority, Deque[asyncio.Future]] = {p: deque() for p in LlmPriority}
+        self._lat_short: Optional[float] = None
+        self._lat_long: Optional[float] = None
+        self._lat_samples = 0
+        self._last_decrease = 0.0
+        self._stats = {
+            "acquired": 0,
+            "queued": 0,
+            "overloads": 0,
+            "latency_backoffs": 0,
+            "decreases": 0,
+            "wait_ms_total": 0.0,
+            "wait_ms_max": 0.0,
+        }
+
+    # ------------------------------------------------------------------
+    # Slot accounting
+    # ------------------------------------------------------------------
+
+    @property
+    def limit(self) -> int:
+        return max(self._cfg.min_limit, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        return sum(self._in_flight.values())
+
+    def _can_grant(self, priority: LlmPriority) -> bool:
+        if self.in_flight >= self.limit:
+            return False
+        if priority is LlmPriority.BACKGROUND:
+            # Background may never take the slots held back for interactive
+            # turns, but always gets at least one slot of its own.
+            cap = max(1, self.limit - self._cfg.reserved_interactive)
+            return self._in_flight[LlmPriority.BACKGROUND] < cap
+        return True
+
+    def _dispatch(self) -> None:
+        """Hand free slots to waiters, interactive first."""
+        for priority in (LlmPriority.INTERACTIVE, LlmPriority.BACKGROUND):
+            queue = self._waiters[priority]
+            while queue and self._can_grant(priority):
+                fut = queue.popleft()
+                if fut.done():
+                    continue
+                self._in_flight[priority] += 1
+                fut.set_result(None)
+
+    async def acquire(self, priority: Optional[LlmPriority] = None) -> LlmPriority:
+        priority = priority or current_priority()
+        t0 = time.monotonic()
+        if not self._waiters[priority] and self._can_grant(priority) and (
+            priority is LlmPriority.INTERACTIVE or not self._waiters[LlmPriority.INTERACTIVE]
+        ):
+            self._in_flight[priority] += 1
+        else:
+            self._stats["queued"] += 1
+            fut = asyncio.get_running_loop().create_future()
+            self._waiters[priority].append(fut)
+            try:
+                await fut
+            except asyncio.CancelledError:
+                if fut.done() and not fut.cancelled():
+                    # Slot was granted just as we were cancelled; pass it on.
+                    self._release_slot(priority)
+                else:
+                    try:
+                        self._waiters[priority].remove(fut)
+                    except ValueError:
+                        pass
+                raise
+        wait_ms = (time.monotonic() - t0) * 1000
+        self._stats["acquired"] += 1
+        self._stats["wait_ms_total"] += wait_ms
+        self._stats["wait_ms_max"] = max(self._stats["wait_ms_max"], wait_ms)
+        _record_wait(self.name, priority, wait_ms)
+        return priority
+
+    def _release_slot(self, priority: LlmPriority) -> None:
+        self._in_flight[priority] = max(0, self._in_flight[priority] - 1)
+        self._dispatch()
+
+    def release(
+        self,
+        priority: LlmPriority,
+        *,
+        latency_ms: Optional[float] = None,
+        overloaded: bool = False,
+    ) -> None:
+        """Return a slot and feed the call's outcome into the AIMD controller."""
+        if overloaded:
+            self._stats["overloads"] += 1
+            self._decrease("overload")
+        elif latency_ms is not None:
+            self._observe_latency(latency_ms)
+        self._release_slot(priority)
+
+    @asynccontextmanager
+    async def slot(self, priority: Optional[LlmPriority] = None) -> AsyncIterator[None]:
+        lane = await self.acquire(priority)
+        t0 = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            self.release(lane, overloaded=is_overload_error(e))
+            raise
+        else:
+            self.release(lane, latency_ms=(time.monotonic() - t0) * 1000)
+
+    # ------------------------------------------------------------------
+    # AIMD
+    # ------------------------------------------------------------------
+
+    def _observe_latency(self, latency_ms: float) -> None:
+        self._lat_samples += 1
+        if self._lat_short is None:
+            self._lat_short = self._lat_long = latency_ms
+        else:
+            self._lat_short += self._SHORT_ALPHA * (latency_ms - self._lat_short)
+            self._lat_long += self._LONG_ALPHA * (latency_ms - self._lat_long)
+        if (
+            self._lat_samples >= self._MIN_LATENCY_SAMPLES
+            and self._lat_short > self._lat_long * self._cfg.latency_tolerance
+        ):
+            self._stats["latency_backoffs"] += 1
+            self._decrease("latency")
+            return
+        # Additive increase: roughly +1 slot per window of `limit` good calls,
+        # and only while the limit is actually being used.
+        if self.in_flight >= self.limit - 1:
+            self._limit = min(float(self._cfg.max_limit), self._limit + 1.0 / self._limit)
+            self._dispatch()
+
+    def _decrease(self, reason: str) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < self._cfg.cooldown_s:
+            return
+        self._last_decrease = now
+        before = self.limit
+        self._limit = max(float(self._cfg.min_limit), self._limit * self._cfg.decrease)
+        self._stats["decreases"] += 1
+        if self.limit != before:
+            logger.info(
+                "llm_concurrency_decreased",
+                provider=self.name,
+                reason=reason,
+                limit=self.limit,
+                previous=before,
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        acquired = self._stats["acquired"]
+        return {
+            "limit": self.limit,
+            "limit_raw": round(self._limit, 2),
+            "max_limit": self._cfg.max_limit,
+            "reserved_interactive": self._cfg.reserved_interactive,
+            "in_flight": {p.value: n for p, n in self._in_flight.items()},
+            "queue_depth": {p.value: len(q) for p, q in self._waiters.items()},
+            "latency_ms_recent": round(self._lat_short, 1) if self._lat_short else None,
+            "latency_ms_baseline": round(self._lat_long, 1) if self._lat_long else None,
+            "acquired": acquired,
+            "queued": self._stats["queued"],
+            "overloads": self._stats["overloads"],
+            "latency_backoffs": self._stats["latency_backoffs"],
+            "decreases": self._stats["decreases"],
+            "wait_ms_avg": round(self._stats["wait_ms_total"] / acquired, 1) if acquired else 0.0,
+            "wait_ms_max": round(self._stats["wait_ms_max"], 1),
+        }
+
+
+def _record_wait(provider: str, priority: LlmPriority, wait_ms: float) -> None:
+    try:
+        from app.services.metrics_service import get_metrics_service
+        get_metrics_service().record(
+            "llm_queue_wait_ms", wait_ms, {"provider": provider, "priority": priority.value}
+        )
+    except Exception:
+        pass
+
+
+class LlmLimiterRegistry:
+    """Lazily creates one ``AdaptiveLimiter`` per provider name."""
+
+    def __init__(self, *, max_limit: int = 16, reserved_interactive: int = 1):
+        self._max_limit = max_limit
+        self._reserved_interactive = reserved_interactive
+        self._limiters: Dict[str, AdaptiveLimiter] = {}
+
+    def _config_for(self, provider: str) -> LimiterConfig:
+        base = _PROVIDER_DEFAULTS.get(provider, LimiterConfig())
+        max_limit = max(base.min_limit, min(base.max_limit, self._max_limit))
+        return LimiterConfig(
+            initial=min(base.initial, max_limit),
+            min_limit=base.min_limit,
+            max_limit=max_limit,
+            reserved_interactive=self._reserved_interactive,
+            decrease=base.decrease,
+            latency_tolerance=base.latency_tolerance,
+            cooldown_s=base.cooldown_s,
+        )
+
+    def get(self, provider: str) -> AdaptiveLimiter:
+        limiter = self._limiters.get(provider)
+        if limiter is None:
+            limiter = AdaptiveLimiter(provider, self._config_for(provider))
+            self._limiters[provider] = limiter
+        return limiter
+
+    def stats(self) -> Dict[str, Any]:
+        return {name: limiter.stats() for name, limiter in sorted(self._limiters.items())}
+
+
+@lru_cache()
+def get_llm_limiters() -> LlmLimiterRegistry:
+    """Get the singleton limiter registry."""
+    from app.infrastructure.config import get_settings
+
+    settings = get_settings()
+    return LlmLimiterRegistry(
+        max_limit=settings.llm_concurrency_max_per_provider,
+        reserved_interactive=settings.llm_concurrency_interactive_reserve,
+    )
@@ -0,0 +1,357 @@
+"""
+Opt-in response cache for deterministic LLM task types.
+
+Scheduler jobs re-send identical classification / extraction / JSON
+structuring prompts at low temperature and paid full latency and cost for
+each one. Task types opt in through their router assignment
+(``ModelAssignment.cache_ttl_s``, editable via PUT /api/llm/task/{type});
+only calls at ``temperature <= 0.3`` are eligible.
+
+Lookup order:
+  1. in-process LRU (``TTLCache``) — exact key, no I/O
+  2. ``llm_response_cache`` table — exact key (one UPDATE … RETURNING that
+     also bumps the hit counter)
+  3. if the task sets ``cache_semantic``: nearest cached row by embedding of
+     the final user message, restricted to the same scope (provider, model,
+     task, temperature, json_mode and every earlier message), accepted when
+     cosine similarity >= ``llm_response_cache_similarity``
+
+The key is a sha256 over (provider, model, task_type, normalized messages,
+temperature, json_mode, max_tokens, thinking/reasoning options);
+normalization collapses whitespace only. Writes
+happen in the background after the response is returned. The table is
+bounded to ``llm_response_cache_max_entries``: every few hundred writes the
+expired rows go first, then the least recently used.
+
+Hits and the spend they avoided are reported to ``LlmRouter``
+(``record_cache_lookup`` / ``cache_report``). A cache failure is always a
+miss — it never fails the LLM call.
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import structlog
+
+from app.infrastructure.ttl_cache import TTLCache
+
+logger = structlog.get_logger(__name__)
+
+MAX_CACHEABLE_TEMPERATURE = 0.3
+_EMBED_DIM = 1024
+_PRUNE_EVERY = 200
+_WS_RE = re.compile(r"\s+")
+
+
+@dataclass(frozen=True)
+class CacheKey:
+    key: str
+    scope_hash: str
+    provider: str
+    model: str
+    task_type: Optional[str]
+    probe_text: str  # final user message, embedded for similarity lookups
+
+
+def normalize_messages(messages: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+    return [
+        (str(m.get("role", "")), _WS_RE.sub(" ", str(m.get("content", ""))).strip())
+        for m in messages
+    ]
+
+
+def _sha(payload: Any) -> str:
+    return hashlib.sha256(
+        json.dumps(
+            payload, ensure_ascii=False, separators=(",", ":"), sort_keys=True, default=str,
+        ).encode("utf-8")
+    ).hexdigest()
+
+
+def make_cache_key(
+    provider: str,
+    model: str,
+    task_type: Optional[str],
+    messages: List[Dict[str, Any]],
+    temperature: float,
+    json_mode: bool,
+    *,
+    max_tokens: Optional[int] = None,
+    thinking_mode: bool = False,
+    reasoning: Any = None,
+) -> CacheKey:
+    """Exact key and similarity scope of one chat request.
+
+    Everything that shapes the response is part of both: a reply cut short
+    by a small ``max_tokens`` must not answer a call that allows more.
+    """
+    norm = normalize_messages(messages)
+    last_user = max((i for i, (role, _) in enumerate(norm) if role == "user"), default=None)
+    probe = norm[last_user][1] if last_user is not None else ""
+    scope_msgs = [m for i, m in enumerate(norm) if i != last_user]
+    base = [
+        provider, model, task_type or "", round(float(temperature), 2), bool(json_mode),
+        max_tokens, bool(thinking_mode), reasoning,
+    ]
+    return CacheKey(
+        key=_sha([*base, norm]),
+        scope_hash=_sha([*base, scope_msgs]),
+        provider=provider,
+        model=model,
+        task_type=task_type,
+        probe_text=probe,
+    )
+
+
+class LlmResponseCache:
+    """Two-tier (memory + Postgres) response cache with optional similarity lookup."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 50_000,
+        memory_entries: int = 1024,
+        similarity_threshold: float = 0.97,
+        enabled: bool = True,
+    ):
+        self.enabled = enabled
+        self._max_entries = max_entries
+        self._similarity = similarity_threshold
+        # Values carry their own monotonic deadline (TTLs differ per task).
+        self._memory: TTLCache[Tuple[float, str]] = TTLCache(
+            "llm_response", max_entries=memory_entries, ttl_s=float("inf")
+        )
+        self._pending: Set[asyncio.Task] = set()
+        self._writes_since_prune = 0
+        self._stats = {
+            "memory_hits": 0,
+            "db_hits": 0,
+            "semantic_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "errors": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    async def lookup(self, ck: CacheKey, *, semantic: bool = False) -> Optional[str]:
+        if not self.enabled:
+            return None
+        entry = self._memory.get(ck.key)
+        if entry is not None:
+            deadline, response = entry
+            if time.monotonic() < deadline:
+                self._stats["memory_hits"] += 1
+                return response
+            self._memory.pop(ck.key)
+
+        try:
+            row = await self._db_exact(ck.key)
+            if row is not None:
+                self._stats["db_hits"] += 1
+                self._remember(ck.key, row[0], row[1])
+                return row[0]
+            if semantic and ck.probe_text:
+                response = await self._db_similar(ck)
+                if response is not None:
+                    self._stats["semantic_hits"] += 1
+                    return response
+        except Exception as e:  # noqa: BLE001 — cache failures are misses
+            self._stats["errors"] += 1
+            logger.debug("llm_response_cache_lookup_failed", error=str(e))
+        self._stats["misses"] += 1
+        return None
+
+    def _remember(self, key: str, response: str, expires_at: datetime) -> None:
+        remaining = (expires_at - datetime.now(timezone.utc)).total_seconds()
+        if remaining > 0:
+            self._memory.set(key, (time.monotonic() + remaining, response))
+
+    async def _db_exact(self, key: str) -> Optional[Tuple[str, datetime]]:
+        from sqlalchemy import text
+        from app.infrastructure.database import get_session
+
+        async with get_session() as session:
+            row = (await session.execute(
+                text(
+                    "UPDATE llm_response_cache SET hits = hits + 1, last_hit_at = now() "
+                    "WHERE key = :key AND expires_at > now() "
+                    "RETURNING response, expires_at"
+                ),
+                {"key": key},
+            )).first()
+        return (row[0], row[1]) if row else None
+
+    async def _db_similar(self, ck: CacheKey) -> Optional[str]:
+        from sqlalchemy import text
+        from app.infrastructure.database import get_session
+
+        embedding = await self._embed(ck.probe_text)
+        if embedding is None:
+            return None
+        async with get_session() as session:
+            row = (await session.execute(
+                text(
+                    "WITH best AS ("
+                    "  SELECT key, 1 - (embedding <=> CAST(:emb AS vector)) AS sim"
+                    "    FROM llm_response_cache"
+                    "   WHERE scope_hash = :scope AND expires_at > now()"
+                    "     AND embedding IS NOT NULL"
+                    "   ORDER BY embedding <=> CAST(:emb AS vector)"
+                    "   LIMIT 1"
+                    ") "
+                    "UPDATE llm_response_cache c SET hits = c.hits + 1, last_hit_at = now() "
+                    "  FROM best WHERE c.key = best.key AND best.sim >= :threshold "
+                    "RETURNING c.response"
+                ),
+                {
+                    "emb": "[" + ",".join(str(float(x)) for x in embedding) + "]",
+                    "scope": ck.scope_hash,
+                    "threshold": self._similarity,
+                },
+            )).first()
+        return row[0] if row else None
+
+    async def _embed(self, text: str) -> Optional[List[float]]:
+        from app.infrastructure.ollama_client import get_llm_client
+
+        vec = await get_llm_client().embed_safe(text[:4000])
+        if not vec:
+            return None
+        # Fit the client's embedding_dimension to the vector(1024) column;
+        # zero padding leaves cosine similarity unchanged.
+        if len(vec) > _EMBED_DIM:
+            return vec[:_EMBED_DIM]
+        return vec + [0.0] * (_EMBED_DIM - len(vec))
+
+    # ------------------------------------------------------------------
+    # Store
+    # ------------------------------------------------------------------
+
+    def store_later(
+        self,
+        ck: CacheKey,
+        response: str,
+        *,
+        ttl_s: int,
+        cost_usd: float = 0.0,
+        semantic: bool = False,
+    ) -> None:
+        """Cache ``response`` now in memory, persist it in the background."""
+        if not self.enabled or not response or ttl_s <= 0:
+            return
+        self._memory.set(ck.key, (time.monotonic() + ttl_s, response))
+        try:
+            task = asyncio.get_running_loop().create_task(
+                self._store(ck, response, ttl_s=ttl_s, cost_usd=cost_usd, semantic=semantic)
+            )
+        except RuntimeError:
+            return
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _store(
+        self, ck: CacheKey, response: str, *, ttl_s: int, cost_usd: float, semantic: bool
+    ) -> None:
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        from app.db.models import LlmResponseCacheModel
+        from app.infrastructure.database import get_session
+
+        try:
+            embedding = await self._embed(ck.probe_text) if semantic and ck.probe_text else None
+            expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl_s)
+            values = {
+                "key": ck.key,
+                "scope_hash": ck.scope_hash,
+                "provider": ck.provider,
+                "model": ck.model[:200],
+                "task_type": ck.task_type,
+                "response": response,
+                "cost_usd": cost_usd,
+                "embedding": embedding,
+                "hits": 0,
+                "expires_at": expires_at,
+            }
+            stmt = pg_insert(LlmResponseCacheModel).values(values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["key"],
+                set_={
+                    "response": stmt.excluded.response,
+                    "embedding": stmt.excluded.embedding,
+                    "expires_at": stmt.excluded.expires_at,
+                },
+            )
+            async with get_session() as session:
+                await session.execute(stmt)
+            self._stats["stores"] += 1
+            self._writes_since_prune += 1
+            if self._writes_since_prune >= _PRUNE_EVERY:
+                self._writes_since_prune = 0
+                await self.prune()
+        except Exception as e:  # noqa: BLE001
+            self._stats["errors"] += 1
+            logger.debug("llm_response_cache_store_failed", error=str(e))
+
+    async def prune(self) -> int:
+        """Drop expired rows, then the least recently used beyond ``max_entries``."""
+        from sqlalchemy import text
+        from app.infrastructure.database import get_session
+
+        async with get_session() as session:
+            expired = await session.execute(
+                text("DELETE FROM llm_response_cache WHERE expires_at <= now()")
+            )
+            overflow = await session.execute(
+                text(
+                    "DELETE FROM llm_response_cache WHERE key IN ("
+                    "  SELECT key FROM llm_response_cache"
+                    "   ORDER BY coalesce(last_hit_at, created_at) DESC"
+                    "   OFFSET :max_entries)"
+                ),
+                {"max_entries": self._max_entries},
+            )
+        removed = (expired.rowcount or 0) + (overflow.rowcount or 0)
+        if removed:
+            logger.info("llm_response_cache_pruned", removed=removed)
+        return removed
+
+    async def clear(self) -> None:
+        from sqlalchemy import text
+        from app.infrastructure.database import get_session
+
+        self._memory.clear()
+        async with get_session() as session:
+            await session.execute(text("DELETE FROM llm_response_cache"))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "enabled": self.enabled,
+            "memory": self._memory.stats(),
+            "pending_writes": len(self._pending),
+            "max_entries": self._max_entries,
+            "similarity_threshold": self._similarity,
+        }
+
+
+@lru_cache()
+def get_llm_response_cache() -> LlmResponseCache:
+    """Get the singleton response cache."""
+    from app.infrastructure.config import get_settings
+
+    settings = get_settings()
+    return LlmResponseCache(
+        max_entries=settings.llm_response_cache_max_entries,
+        memory_entries=settings.llm_response_cache_memory_entries,
+        similarity_threshold=settings.llm_response_cache_similarity,
+        enabled=settings.llm_response_cache_enabled,
+    )
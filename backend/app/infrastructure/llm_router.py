@@ -21,7 +21,7 @@ import asyncio
 import os
 from datetime import date
 from functools import lru_cache
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import structlog
 
@@ -78,6 +78,7 @@ class LlmRouter:
         self._config = LlmRouterConfig()
         self._initialized = False
         self._budget_lock = asyncio.Lock()
+        self._cache_stats: Dict[str, Dict[str, float]] = {}
 
     async def initialize(self):
         """Load persisted config from storage."""
@@ -214,17 +215,97 @@ class LlmRouter:
         """Add to daily spend counter and persist (thread-safe).
 
         Also records per-provider spend to the llm_daily_spend DB table when
-        a provider is supplied.
+        a provider is supplied. The LLM call path uses the write-behind
+        ``LlmUsageWriter`` instead (``add_spend`` now, bulk persist later).
         """
-        async with self._budget_lock:
-            self._config.current_spend_usd += cost_usd
-            await self._save()
+        self.add_spend(cost_usd)
+        await self.save_spend()
         if provider and cost_usd > 0:
             try:
                 await self._record_provider_spend(provider, cost_usd)
             except Exception as e:
                 logger.warning("llm_provider_spend_record_failed", provider=provider, error=str(e))
 
+    def add_spend(self, cost_usd: float) -> None:
+        """Bump the in-memory daily spend only; budget checks see it immediately."""
+        self._config.current_spend_usd += cost_usd
+
+    async def save_spend(self) -> None:
+        """Persist the router config (including current spend)."""
+        async with self._budget_lock:
+            await self._save()
+
+    async def record_provider_spend_bulk(self, totals: Dict[str, float], session=None) -> None:
+        """Upsert several providers' coalesced spend in one statement.
+
+        The upsert is additive: pass ``session`` to commit it together with
+        other writes so a failed batch can be retried without double counting.
+        """
+        from app.infrastructure.database import get_session
+        from sqlalchemy import text
+
+        totals = {p: float(a) for p, a in totals.items() if a > 0}
+        if not totals:
+            return
+        values = []
+        params: Dict[str, Any] = {"day": date.today()}
+        for i, (provider, amount) in enumerate(sorted(totals.items())):
+            values.append(f"(:p{i}, :day, :a{i})")
+            params[f"p{i}"] = provider
+            params[f"a{i}"] = amount
+        stmt = text(
+            "INSERT INTO llm_daily_spend (provider, day, spend_usd) VALUES "
+            + ", ".join(values)
+            + " ON CONFLICT (provider, day) "
+            "DO UPDATE SET spend_usd = llm_daily_spend.spend_usd + EXCLUDED.spend_usd"
+        )
+        if session is not None:
+            await session.execute(stmt, params)
+            return
+        async with get_session() as session:
+            await session.execute(stmt, params)
+
+    # ------------------------------------------------------------------
+    # Response cache policy + accounting
+    # ------------------------------------------------------------------
+
+    def cache_policy(self, task_type: Optional[str]) -> Tuple[Optional[int], bool]:
+        """(ttl_s, semantic) for a task type; ttl None means not cached."""
+        if task_type and task_type.startswith(HINT_PREFIX):
+            task_type = resolve_hint_task_type(task_type)
+        assignment = self._config.task_assignments.get(task_type or "")
+        if not assignment or not assignment.cache_ttl_s:
+            return None, False
+        return assignment.cache_ttl_s, assignment.cache_semantic
+
+    def record_cache_lookup(
+        self, task_type: Optional[str], *, hit: bool, saved_usd: float = 0.0
+    ) -> None:
+        """Count a response-cache lookup (and the spend a hit avoided)."""
+        entry = self._cache_stats.setdefault(
+            task_type or "default", {"hits": 0, "misses": 0, "saved_usd": 0.0}
+        )
+        if hit:
+            entry["hits"] += 1
+            entry["saved_usd"] += saved_usd
+        else:
+            entry["misses"] += 1
+
+    def cache_report(self) -> Dict[str, Any]:
+        hits = sum(e["hits"] for e in self._cache_stats.values())
+        misses = sum(e["misses"] for e in self._cache_stats.values())
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+            "saved_usd": round(sum(e["saved_usd"] for e in self._cache_stats.values()), 6),
+            "by_task": {
+                task: {**e, "saved_usd": round(e["saved_usd"], 6)}
+                for task, e in sorted(self._cache_stats.items())
+            },
+        }
+
     async def reset_daily_budget(self):
         """Reset daily spend to 0. Called by midnight scheduler job."""
         old = self._config.current_spend_usd
@@ -337,8 +418,13 @@ class LlmRouter:
         temperature: Optional[float] = None,
         num_predict: Optional[int] = None,
         keep_alive: Optional[str] = None,
+        cache_ttl_s: Optional[int] = None,
+        cache_semantic: Optional[bool] = None,
     ):
-        """Set or update the model assignment for a task type."""
+        """Set or update the model assignment for a task type.
+
+        ``cache_ttl_s=0`` turns the response cache back off for the task.
+        """
         if task_type in self._config.task_assignments:
             assignment = self._config.task_assignments[task_type]
             assignment.model = model
@@ -350,6 +436,10 @@ class LlmRouter:
                 assignment.num_predict = num_predict
             if keep_alive is not None:
                 assignment.keep_alive = keep_alive
+            if cache_ttl_s is not None:
+                assignment.cache_ttl_s = cache_ttl_s or None
+            if cache_semantic is not None:
+                assignment.cache_semantic = cache_semantic
         else:
             self._config.task_assignments[task_type] = ModelAssignment(
                 model=model,
@@ -357,6 +447,8 @@ class LlmRouter:
                 temperature=temperature,
                 num_predict=num_predict,
                 keep_alive=keep_alive,
+                cache_ttl_s=cache_ttl_s or None,
+                cache_semantic=bool(cache_semantic),
             )
         await self._save()
         logger.info("llm_router_task_updated", task_type=task_type, model=model)
@@ -0,0 +1,224 @@
+"""
+Write-behind queue for LLM usage accounting.
+
+Every LLM call produces one ``llm_usage`` row and (for paid providers) a
+spend increment. Writing those inline meant a fresh DB session + commit
+inside ``UnifiedLLMClient._call_provider``'s ``finally`` block — i.e. DB
+latency on the critical path of every call, while the caller still held
+an LLM concurrency slot.
+
+``LlmUsageWriter`` takes both off the hot path:
+  - ``record_usage`` / ``record_spend`` are synchronous and O(1): they
+    append to an in-memory buffer (spend also bumps the router's in-memory
+    daily counter immediately so budget checks stay exact).
+  - A background task flushes when ``flush_size`` rows are pending or
+    ``flush_interval_s`` has passed: one transaction holding a multi-row
+    INSERT into llm_usage and a multi-row upsert into llm_daily_spend,
+    then one router config save.
+  - ``stop()`` drains whatever is left; it runs from the app's graceful
+    shutdown before the DB pool closes.
+
+If the DB is unavailable the batch is kept (bounded by ``max_pending``)
+and retried on the next flush. The spend upsert is additive, so it commits
+in the same transaction as the usage rows: a retried batch never counts
+spend twice. A failed config save only re-marks the spend dirty.
+"""
+
+import asyncio
+from collections import defaultdict, deque
+from functools import lru_cache
+from typing import Any, Deque, Dict, List, Optional
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class LlmUsageWriter:
+    """Coalesces usage rows + spend increments and writes them in bulk."""
+
+    def __init__(
+        self,
+        *,
+        flush_size: int = 100,
+        flush_interval_s: float = 2.0,
+        max_pending: int = 10_000,
+    ):
+        self._flush_size = max(1, flush_size)
+        self._flush_interval_s = flush_interval_s
+        self._rows: Deque[Dict[str, Any]] = deque(maxlen=max_pending)
+        self._spend: Dict[str, float] = defaultdict(float)
+        self._spend_dirty = False
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._stopping = False
+        self._stats = {"rows_written": 0, "flushes": 0, "flush_failures": 0, "rows_dropped": 0}
+
+    # ------------------------------------------------------------------
+    # Hot path (sync, never touches the DB)
+    # ------------------------------------------------------------------
+
+    def record_usage(
+        self,
+        *,
+        provider: str,
+        model: str,
+        task_type: Optional[str],
+        prompt_tokens: int,
+        completion_tokens: int,
+        cost_usd: float,
+        latency_ms: float,
+        success: bool,
+        error_message: Optional[str],
+    ) -> None:
+        if len(self._rows) == self._rows.maxlen:
+            self._stats["rows_dropped"] += 1
+        self._rows.append({
+            "provider": provider,
+            "model": model,
+            "task_type": task_type,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "cost_usd": cost_usd,
+            "latency_ms": latency_ms,
+            "success": success,
+            "error_message": error_message,
+        })
+        self._kick(len(self._rows) >= self._flush_size)
+
+    def record_spend(self, cost_usd: float, provider: Optional[str] = None) -> None:
+        if cost_usd <= 0:
+            return
+        from app.infrastructure.llm_router import get_llm_router
+        get_llm_router().add_spend(cost_usd)
+        self._spend_dirty = True
+        if provider:
+            self._spend[provider] += cost_usd
+        self._kick(False)
+
+    def _kick(self, flush_now: bool) -> None:
+        """Make sure the flusher is running; wake it early on a full batch."""
+        if self._stopping:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # no loop (sync caller / tests) — stop() or flush() drains
+        if self._task is None or self._task.done():
+            self._wake = asyncio.Event()
+            self._flush_lock = self._flush_lock or asyncio.Lock()
+            self._task = loop.create_task(self._run(), name="llm_usage_writer")
+        if flush_now and self._wake is not None:
+            self._wake.set()
+
+    # ------------------------------------------------------------------
+    # Background flushing
+    # ------------------------------------------------------------------
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self._flush_interval_s)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:  # noqa: BLE001 — flusher must never die
+                logger.warning("llm_usage_flush_loop_error", error=str(e))
+
+    async def flush(self) -> int:
+        """Write everything pending now. Returns the number of usage rows written."""
+        self._flush_lock = self._flush_lock or asyncio.Lock()
+        async with self._flush_lock:
+            rows: List[Dict[str, Any]] = list(self._rows)
+            self._rows.clear()
+            spend = dict(self._spend)
+            self._spend.clear()
+            spend_dirty, self._spend_dirty = self._spend_dirty, False
+            if not rows and not spend and not spend_dirty:
+                return 0
+            try:
+                if rows or spend:
+                    await self._write(rows, spend)
+            except Exception as e:  # noqa: BLE001
+                self._stats["flush_failures"] += 1
+                # Nothing committed: put the batch back in front of anything
+                # queued meanwhile.
+                self._requeue(rows)
+                for provider, amount in spend.items():
+                    self._spend[provider] += amount
+                self._spend_dirty = self._spend_dirty or spend_dirty
+                logger.warning("llm_usage_flush_failed", rows=len(rows), error=str(e))
+                return 0
+            if spend_dirty:
+                try:
+                    await self._save_spend()
+                except Exception as e:  # noqa: BLE001 — the save is idempotent
+                    self._spend_dirty = True
+                    logger.warning("llm_spend_save_failed", error=str(e))
+            self._stats["flushes"] += 1
+            self._stats["rows_written"] += len(rows)
+            return len(rows)
+
+    def _requeue(self, rows: List[Dict[str, Any]]) -> None:
+        """Put a failed batch back ahead of newer rows. Past ``max_pending``
+        the oldest rows go, as they do on the record path."""
+        pending = rows + list(self._rows)
+        overflow = len(pending) - self._rows.maxlen
+        if overflow > 0:
+            del pending[:overflow]
+            self._stats["rows_dropped"] += overflow
+            logger.warning("llm_usage_rows_dropped", rows=overflow, max_pending=self._rows.maxlen)
+        self._rows.clear()
+        self._rows.extend(pending)
+
+    async def _write(self, rows: List[Dict[str, Any]], spend: Dict[str, float]) -> None:
+        """Usage rows and provider spend, in one transaction."""
+        from app.infrastructure.database import get_session
+        from app.infrastructure.llm_router import get_llm_router
+
+        async with get_session() as session:
+            if spend:
+                await get_llm_router().record_provider_spend_bulk(spend, session=session)
+            if rows:
+                from sqlalchemy import insert
+                from app.db.models import LlmUsageModel
+
+                await session.execute(insert(LlmUsageModel).values(rows))
+
+    async def _save_spend(self) -> None:
+        from app.infrastructure.llm_router import get_llm_router
+
+        await get_llm_router().save_spend()
+
+    async def stop(self) -> None:
+        """Stop the flusher and drain the buffer (graceful shutdown)."""
+        self._stopping = True
+        task, self._task = self._task, None
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        written = await self.flush()
+        logger.info("llm_usage_writer_drained", rows=written, pending=len(self._rows))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "pending_rows": len(self._rows),
+            "pending_spend_providers": len(self._spend),
+            "running": self._task is not None and not self._task.done(),
+        }
+
+
+@lru_cache()
+def get_llm_usage_writer() -> LlmUsageWriter:
+    """Get the singleton usage writer."""
+    return LlmUsageWriter()
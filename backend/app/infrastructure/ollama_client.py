@@ -18,13 +18,14 @@ Ollama's native ``/api/embed`` and ``/api/chat`` routes.
 import asyncio
 import random
 from functools import lru_cache
-from typing import AsyncIterator, Optional, List, Dict
+from typing import AsyncIterator, Optional, List, Dict, Tuple
 
 import httpx
 import structlog
 
 from app.infrastructure.config import get_settings
 from app.infrastructure.circuit_breaker import get_circuit_breaker
+from app.infrastructure.embedding_cache import EmbedCoalescer, get_embedding_cache
 
 logger = structlog.get_logger(__name__)
 
@@ -52,6 +53,7 @@ class OllamaClient:
             failure_threshold=5,
             recovery_timeout=120.0,
         )
+        self._coalescers: Dict[Tuple[str, int], EmbedCoalescer] = {}
 
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create the shared httpx client with connection pooling."""
@@ -164,10 +166,25 @@ class OllamaClient:
         model: Optional[str] = None,
         max_retries: int = 2,
     ) -> List[float]:
-        """Generate embedding vector for text via Bifrost embed-local."""
+        """Generate embedding vector for text via Bifrost embed-local.
+
+        Served from the embedding cache when possible; concurrent misses are
+        coalesced into one batched request when ``embed_coalesce_window_ms``
+        is set.
+        """
         settings = get_settings()
         embed_model = model or settings.vllm_embed_model
-        return await self._embed_openai(text, embed_model, max_retries)
+        cache = get_embedding_cache()
+        key = cache.key(embed_model, settings.embedding_dimension, text)
+        cached = await cache.get_many([key])
+        if key in cached:
+            return cached[key]
+        if settings.embed_coalesce_window_ms > 0:
+            vec = await self._coalescer(embed_model, max_retries).submit(text)
+        else:
+            vec = await self._embed_openai(text, embed_model, max_retries)
+        cache.put_many(embed_model, settings.embedding_dimension, {key: vec})
+        return vec
 
     async def embed_batch(
         self,
@@ -176,10 +193,52 @@ class OllamaClient:
         model: Optional[str] = None,
         max_retries: int = 2,
     ) -> List[List[float]]:
-        """Generate embeddings for multiple texts via Bifrost embed-local."""
+        """Generate embeddings for multiple texts via Bifrost embed-local.
+
+        Only texts missing from the embedding cache are sent upstream (once
+        each, however often they repeat in ``texts``).
+        """
         settings = get_settings()
         embed_model = model or settings.vllm_embed_model
-        return await self._embed_batch_openai(texts, embed_model, max_retries)
+        dim = settings.embedding_dimension
+        cache = get_embedding_cache()
+        keys = [cache.key(embed_model, dim, t) for t in texts]
+        found = await cache.get_many(keys)
+        misses: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found:
+                misses.setdefault(key, text)
+        if misses:
+            vecs = await self._embed_batch_openai(list(misses.values()), embed_model, max_retries)
+            fresh = dict(zip(misses, vecs))
+            cache.put_many(embed_model, dim, fresh)
+            found.update(fresh)
+        return [found[key] for key in keys]
+
+    def _coalescer(self, model: str, max_retries: int) -> EmbedCoalescer:
+        coalescer = self._coalescers.get((model, max_retries))
+        if coalescer is None:
+            settings = get_settings()
+
+            async def run(texts: List[str]) -> List[List[float]]:
+                return await self._embed_batch_openai(texts, model, max_retries)
+
+            coalescer = EmbedCoalescer(
+                run,
+                window_s=settings.embed_coalesce_window_ms / 1000.0,
+                max_batch=settings.embed_coalesce_max_batch,
+            )
+            self._coalescers[(model, max_retries)] = coalescer
+        return coalescer
+
+    def embed_stats(self) -> Dict[str, object]:
+        """Embedding cache and coalescer counters (``GET /api/llm/cache``)."""
+        return {
+            **get_embedding_cache().stats(),
+            "coalescers": {
+                model: c.stats() for (model, _), c in self._coalescers.items()
+            },
+        }
 
     async def embed_safe(self, text: str, **kwargs) -> Optional[List[float]]:
         """Like embed() but returns None on failure instead of raising."""
@@ -376,6 +435,9 @@ class UnifiedLLMClientWrapper:
     async def embed_safe(self, text: str, **kwargs) -> Optional[List[float]]:
         return await self._get_raw_ollama().embed_safe(text, **kwargs)
 
+    def embed_stats(self) -> Dict[str, object]:
+        return self._get_raw_ollama().embed_stats()
+
     async def is_healthy(self) -> bool:
         return await self._get_raw_ollama().is_healthy()
 
@@ -0,0 +1,78 @@
+"""
+In-process LRU cache with per-entry TTL.
+
+Small, dependency-free building block for hot-path memoisation (query
+embeddings, short-lived search results). Not thread-safe: callers use it
+from the asyncio event loop only.
+
+Usage:
+    cache = TTLCache("vault_query_embed", max_entries=512, ttl_s=3600)
+    vec = cache.get(key)
+    if vec is None:
+        vec = await embed(text)
+        cache.set(key, vec)
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """Least-recently-used map whose entries also expire after ``ttl_s``."""
+
+    def __init__(self, name: str, *, max_entries: int, ttl_s: float):
+        self.name = name
+        self._max_entries = max(1, max_entries)
+        self._ttl_s = ttl_s
+        self._data: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, ttl_s: Optional[float] = None) -> Optional[V]:
+        """Return the live value for ``key`` (refreshing its LRU slot) or None."""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > (self._ttl_s if ttl_s is None else ttl_s):
+            del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        self._data[key] = (time.monotonic(), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self._max_entries:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: Hashable) -> Optional[V]:
+        entry = self._data.pop(key, None)
+        return entry[1] if entry else None
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "name": self.name,
+            "entries": len(self._data),
+            "max_entries": self._max_entries,
+            "ttl_s": self._ttl_s,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
@@ -6,7 +6,8 @@ Routes requests through the enhanced LLM Router with:
 - Fallback chains (primary → fallback1 → fallback2 → ...)
 - Daily budget enforcement (force Ollama when budget exceeded)
 - Circuit breaker per provider
-- Usage tracking to PostgreSQL (llm_usage table)
+- Usage tracking to PostgreSQL (llm_usage table, batched write-behind)
+- Opt-in response cache for deterministic task types (llm_response_cache)
 - Metrics recording for dashboards
 
 All existing services continue to work via get_llm_client() which
@@ -22,19 +23,18 @@ from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 
 import structlog
 
+from app.infrastructure.llm_concurrency import get_llm_limiters
+from app.infrastructure.llm_response_cache import (
+    MAX_CACHEABLE_TEMPERATURE,
+    get_llm_response_cache,
+    make_cache_key,
+)
 from app.infrastructure.llm_router import get_llm_router
+from app.infrastructure.llm_usage_writer import get_llm_usage_writer
 from app.models.llm import parse_provider_model
 
 logger = structlog.get_logger(__name__)
 
-# Global semaphore to prevent LLM resource exhaustion.
-# Limits concurrent LLM calls across all providers to prevent:
-# - Ollama pool saturation (5 connections)
-# - Kimi rate limiting (3 connections)
-# - Morning peak cascading failures (9 AM: 4+ jobs fire simultaneously)
-_LLM_SEMAPHORE = asyncio.Semaphore(4)
-
-
 class StructuredOutputError(Exception):
     """Raised when structured output parsing fails after retries."""
 
@@ -121,6 +121,9 @@ class UnifiedLLMClient:
         1. Explicit model param (can be 'provider/model' or just 'model')
         2. Task type routing via LLM router
         3. Router default model
+
+        Task types with a ``cache_ttl_s`` are served from the response cache
+        at temperature <= 0.3; pass ``cache=False`` to force a fresh call.
         """
         msgs = self._build_messages(prompt, messages, system)
 
@@ -165,14 +168,62 @@ class UnifiedLLMClient:
                     model_name = _os.getenv("VLLM_CHAT_MODEL", "Qwen3-32B-AWQ")
                 fallbacks = []
 
-        return await self._execute_with_fallbacks(
+        json_mode = kwargs.get("json_mode", False)
+        cache_key, cache_ttl_s, cache_semantic = None, None, False
+        if kwargs.get("cache", True) and temperature <= MAX_CACHEABLE_TEMPERATURE:
+            cache_ttl_s, cache_semantic = get_llm_router().cache_policy(task_type)
+        if cache_ttl_s:
+            cache_key = make_cache_key(
+                provider_name, model_name, task_type, msgs, temperature, json_mode,
+                max_tokens=max_tokens,
+                thinking_mode=kwargs.get("thinking_mode", False),
+                reasoning=kwargs.get("reasoning"),
+            )
+            cached = await get_llm_response_cache().lookup(cache_key, semantic=cache_semantic)
+            get_llm_router().record_cache_lookup(
+                task_type,
+                hit=cached is not None,
+                saved_usd=self._estimate_cost(provider_name, model_name, msgs, cached),
+            )
+            if cached is not None:
+                return cached
+
+        result = await self._execute_with_fallbacks(
             provider_name, model_name, fallbacks,
             msgs, task_type, temperature, max_tokens,
-            json_mode=kwargs.get("json_mode", False),
+            json_mode=json_mode,
             thinking_mode=kwargs.get("thinking_mode", False),
             reasoning=kwargs.get("reasoning"),
         )
 
+        # Don't pin an unparseable response for a JSON task.
+        if cache_key is not None and (not json_mode or _try_recover_json(result) is not None):
+            get_llm_response_cache().store_later(
+                cache_key,
+                result,
+                ttl_s=cache_ttl_s,
+                cost_usd=self._estimate_cost(provider_name, model_name, msgs, result),
+                semantic=cache_semantic,
+            )
+        return result
+
+    def _estimate_cost(
+        self,
+        provider_name: str,
+        model_name: str,
+        messages: List[Dict[str, str]],
+        response: Optional[str],
+    ) -> float:
+        if not response:
+            return 0.0
+        try:
+            prompt_tokens = sum(len(m.get("content", "")) for m in messages) // 4
+            return self._get_provider(provider_name).estimate_cost(
+                prompt_tokens, len(response) // 4, model_name,
+            )
+        except Exception:
+            return 0.0
+
     async def chat_stream(
         self,
         prompt: str = "",
@@ -486,9 +537,9 @@ class UnifiedLLMClient:
         try:
             from app.services.metrics_service import get_metrics_service
             metrics = get_metrics_service()
-            metrics.increment("structured_chat_calls", {"task_type": task_type, "success": str(success)})
+            metrics.increment("structured_chat_calls", tags={"task_type": task_type, "success": str(success)})
             if attempts > 1:
-                metrics.increment("structured_chat_retries", {"task_type": task_type})
+                metrics.increment("structured_chat_retries", tags={"task_type": task_type})
         except Exception:
             pass
 
@@ -563,69 +614,74 @@ class UnifiedLLMClient:
     ) -> str:
         """Try primary provider, then fallback chain on failure.
 
-        Protected by global semaphore to prevent resource exhaustion
-        when multiple scheduler jobs fire simultaneously.
+        Each attempt holds a slot in that provider's adaptive limiter only
+        while the call is in flight (see ``llm_concurrency``), so a slow
+        fallback never blocks calls to other providers.
         """
-        async with _LLM_SEMAPHORE:
-            last_error = None
-
-            # Try primary with one retry on transient connection errors. LiteLLM
-            # in front of vLLM will sometimes drop the first call during a
-            # model swap ("Server disconnected without sending a response"),
-            # then succeed on the second. Retrying here avoids falling through
-            # to misconfigured fallbacks (e.g. expired MiniMax/Kimi keys).
-            for attempt in range(2):
-                try:
-                    return await self._call_provider(
-                        provider_name, model_name, messages,
-                        task_type, temperature, max_tokens,
-                        json_mode=json_mode,
-                        thinking_mode=thinking_mode,
-                        reasoning=reasoning,
-                    )
-                except Exception as e:
-                    last_error = e
-                    err_s = str(e)
-                    transient = (
-                        "Server disconnected" in err_s
-                        or "ReadError" in err_s
-                        or "ConnectError" in err_s
-                        or "RemoteProtocolError" in err_s
-                        or "ReadTimeout" in err_s
-                    )
-                    logger.warning(
-                        "llm_primary_failed",
-                        provider=provider_name,
-                        model=model_name,
-                        attempt=attempt + 1,
-                        transient=transient,
-                        error=err_s,
-                    )
-                    if attempt == 0 and transient:
-                        await asyncio.sleep(1.0)
-                        continue
-                    break
+        last_error = None
 
-            # Try fallbacks (thinking_mode disabled for fallbacks — only Kimi supports it)
-            for fb_provider, fb_model in fallbacks:
-                try:
-                    logger.info("llm_fallback_attempt", provider=fb_provider, model=fb_model)
-                    return await self._call_provider(
-                        fb_provider, fb_model, messages,
-                        task_type, temperature, max_tokens,
-                        json_mode=json_mode if fb_provider in ("bifrost", "gemini", "kimi", "vllm") else False,
-                        reasoning=reasoning,
-                    )
-                except Exception as e:
-                    last_error = e
-                    logger.warning(
-                        "llm_fallback_failed",
-                        provider=fb_provider,
-                        model=fb_model,
-                        error=str(e),
-                    )
+        # Try primary with one retry on transient connection errors. LiteLLM
+        # in front of vLLM will sometimes drop the first call during a
+        # model swap ("Server disconnected without sending a response"),
+        # then succeed on the second. Retrying here avoids falling through
+        # to misconfigured fallbacks (e.g. expired MiniMax/Kimi keys).
+        for attempt in range(2):
+            try:
+                return await self._limited_call(
+                    provider_name, model_name, messages,
+                    task_type, temperature, max_tokens,
+                    json_mode=json_mode,
+                    thinking_mode=thinking_mode,
+                    reasoning=reasoning,
+                )
+            except Exception as e:
+                last_error = e
+                err_s = str(e)
+                transient = (
+                    "Server disconnected" in err_s
+                    or "ReadError" in err_s
+                    or "ConnectError" in err_s
+                    or "RemoteProtocolError" in err_s
+                    or "ReadTimeout" in err_s
+                )
+                logger.warning(
+                    "llm_primary_failed",
+                    provider=provider_name,
+                    model=model_name,
+                    attempt=attempt + 1,
+                    transient=transient,
+                    error=err_s,
+                )
+                if attempt == 0 and transient:
+                    await asyncio.sleep(1.0)
+                    continue
+                break
 
-            raise Exception(f"All LLM providers failed. Last error: {last_error}")
+        # Try fallbacks (thinking_mode disabled for fallbacks — only Kimi supports it)
+        for fb_provider, fb_model in fallbacks:
+            try:
+                logger.info("llm_fallback_attempt", provider=fb_provider, model=fb_model)
+                return await self._limited_call(
+                    fb_provider, fb_model, messages,
+                    task_type, temperature, max_tokens,
+                    json_mode=json_mode if fb_provider in ("bifrost", "gemini", "kimi", "vllm") else False,
+                    reasoning=reasoning,
+                )
+            except Exception as e:
+                last_error = e
+                logger.warning(
+                    "llm_fallback_failed",
+                    provider=fb_provider,
+                    model=fb_model,
+                    error=str(e),
+                )
+
+        raise Exception(f"All LLM providers failed. Last error: {last_error}")
+
+    async def _limited_call(self, provider_name: str, *args, **kwargs) -> str:
+        """``_call_provider`` under the provider's concurrency limiter."""
+        async with get_llm_limiters().get(provider_name).slot():
+            return await self._call_provider(provider_name, *args, **kwargs)
 
     async def _call_provider(
         self,
@@ -707,16 +763,16 @@ class UnifiedLLMClient:
             completion_tokens = len(result) // 4 if result else 0
             cost = provider.estimate_cost(prompt_tokens, completion_tokens, model_name)
 
-            # Record spend (global + per-provider)
+            # Spend + usage go through the write-behind queue: the in-memory
+            # budget counter updates now, the DB writes happen in bulk later.
             if cost > 0:
                 try:
-                    await get_llm_router().record_spend(cost, provider=provider_name)
+                    get_llm_usage_writer().record_spend(cost, provider=provider_name)
                 except Exception:
                     pass
 
-            # Record to DB (fire-and-forget)
             try:
-                await self._record_usage(
+                self._record_usage(
                     provider_name, model_name, task_type,
                     prompt_tokens, completion_tokens, cost,
                     elapsed_ms, success, error_msg,
@@ -729,11 +785,11 @@ class UnifiedLLMClient:
                 from app.services.metrics_service import get_metrics_service
                 metrics = get_metrics_service()
                 metrics.record("llm_response_time", elapsed_ms, {"provider": provider_name})
-                metrics.increment("llm_requests", {"provider": provider_name, "success": str(success)})
+                metrics.increment("llm_requests", tags={"provider": provider_name, "success": str(success)})
             except Exception:
                 pass
 
-    async def _record_usage(
+    def _record_usage(
         self,
         provider: str,
         model: str,
@@ -745,24 +801,18 @@ class UnifiedLLMClient:
         success: bool,
         error_message: Optional[str],
     ):
-        """Persist usage record to PostgreSQL."""
-        from app.infrastructure.database import get_session
-        from app.db.models import LlmUsageModel
-
-        async with get_session() as session:
-            usage = LlmUsageModel(
-                provider=provider,
-                model=model,
-                task_type=task_type,
-                prompt_tokens=prompt_tokens,
-                completion_tokens=completion_tokens,
-                total_tokens=prompt_tokens + completion_tokens,
-                cost_usd=cost_usd,
-                latency_ms=latency_ms,
-                success=success,
-                error_message=error_message,
-            )
-            session.add(usage)
+        """Queue a usage record for the batched llm_usage writer."""
+        get_llm_usage_writer().record_usage(
+            provider=provider,
+            model=model,
+            task_type=task_type,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cost_usd=cost_usd,
+            latency_ms=latency_ms,
+            success=success,
+            error_message=error_message,
+        )
 
 
 @lru_cache()
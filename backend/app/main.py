@@ -239,6 +239,12 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning("reachy_voice_config_init_failed", error=str(e))
 
+    # Spawn the meeting worker pool so whisper/pyannote are loaded before the
+    # first recording is processed.
+    if settings.meeting_processing_prewarm:
+        from app.services.meeting_processing_queue import prewarm_meeting_workers
+        asyncio.create_task(prewarm_meeting_workers(), name="meeting_workers_prewarm")
+
     # Run startup validation checks
     from app.infrastructure.startup import run_startup_checks
     checks_passed = await run_startup_checks()
@@ -319,6 +325,16 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.warning("telegram_channel_start_failed", error=str(e))
 
+        # Vault filesystem watcher: indexes note edits within seconds and
+        # turns vault_reindex_tick into an hourly reconcile. No-op when
+        # watchdog isn't installed or the vault isn't mounted.
+        try:
+            if settings.vault_watch_enabled:
+                from app.services.vault_watcher_service import get_vault_watcher
+                await get_vault_watcher().start()
+        except Exception as e:
+            logger.warning("vault_watcher_start_failed", error=str(e))
+
         # Cross-session memory compaction: re-extract durable notes from
         # recent turns and age out low-confidence unused ones every 6 h.
         try:
@@ -660,6 +676,11 @@ async def lifespan(app: FastAPI):
             await get_telegram_channel_service().stop()
         except Exception:
             pass
+        try:
+            from app.services.vault_watcher_service import get_vault_watcher
+            await get_vault_watcher().stop()
+        except Exception:
+            pass
 
         # Close shared Ollama client
         try:
@@ -668,6 +689,32 @@ async def lifespan(app: FastAPI):
         except Exception:
             pass
 
+        try:
+            from app.services.carousel_renderer_service import shutdown_render_pool
+            shutdown_render_pool()
+        except Exception:
+            pass
+
+        try:
+            from app.services.meeting_processing_queue import shutdown_meeting_pool
+            shutdown_meeting_pool()
+        except Exception:
+            pass
+
+        # Flush + fsync the activity log's active segment
+        try:
+            from app.services.activity_log_service import get_activity_log_service
+            await get_activity_log_service().close()
+        except Exception:
+            pass
+
+        # Drain batched LLM usage/spend rows while the DB is still open
+        try:
+            from app.infrastructure.llm_usage_writer import get_llm_usage_writer
+            await get_llm_usage_writer().stop()
+        except Exception:
+            pass
+
         # Close database connections
         try:
             await close_database()
@@ -0,0 +1,45 @@
+"""GIN full-text indexes for the shared hybrid_search engine.
+
+``hybrid_search`` runs BM25 and dense ranking in one statement for meeting
+transcripts, knowledge notes and episodic memory. vault_chunks already has
+a stored ``content_tsv`` + GIN index (041); the other three tables computed
+``to_tsvector`` on the fly and had no index, so the BM25 side was a
+sequential scan. These are expression indexes whose expressions match the
+``tsv_sql`` of each spec exactly — keep them in sync.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "051"
+down_revision = "050"
+branch_labels = None
+depends_on = None
+
+
+_INDEXES = {
+    "ix_meeting_segments_text_tsv": (
+        "meeting_transcript_segments",
+        "to_tsvector('english', text)",
+    ),
+    "ix_notes_title_content_tsv": (
+        "notes",
+        "to_tsvector('english', coalesce(title, '') || ' ' || content)",
+    ),
+    "ix_episodic_memories_content_tsv": (
+        "episodic_memories",
+        "to_tsvector('english', content)",
+    ),
+}
+
+
+def upgrade() -> None:
+    for name, (table, expr) in _INDEXES.items():
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin (({expr}))")
+
+
+def downgrade() -> None:
+    for name in _INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
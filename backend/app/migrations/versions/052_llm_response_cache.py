@@ -0,0 +1,45 @@
+"""Add llm_response_cache for the opt-in LLM response cache.
+
+Backs ``app.infrastructure.llm_response_cache``: exact-match rows keyed by
+a hash of the normalized request, plus an optional embedding of the final
+user message for near-duplicate lookups within the same scope (same
+provider/model/task/system prompt). Rows carry an ``expires_at`` and are
+pruned by the cache itself (expired first, then least recently used).
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+
+revision = "052"
+down_revision = "051"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "llm_response_cache",
+        sa.Column("key", sa.String(64), primary_key=True),
+        sa.Column("scope_hash", sa.String(64), nullable=False),
+        sa.Column("provider", sa.String(50), nullable=False),
+        sa.Column("model", sa.String(200), nullable=False),
+        sa.Column("task_type", sa.String(50), nullable=True),
+        sa.Column("response", sa.Text(), nullable=False),
+        sa.Column("cost_usd", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("embedding", Vector(1024), nullable=True),
+        sa.Column("hits", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("last_hit_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_llm_response_cache_scope_hash", "llm_response_cache", ["scope_hash"])
+    op.create_index("ix_llm_response_cache_task_type", "llm_response_cache", ["task_type"])
+    op.create_index("ix_llm_response_cache_expires_at", "llm_response_cache", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("llm_response_cache")
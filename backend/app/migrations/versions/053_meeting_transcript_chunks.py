@@ -0,0 +1,91 @@
+"""Add meeting_transcript_chunks with an HNSW index for meeting search.
+
+Meeting embeddings used to be written once per chunk onto every segment of
+the chunk (``meeting_transcript_segments.embedding``), one UPDATE per
+segment, and searched with an unindexed ``ORDER BY <=>``. Chunk vectors
+now live in their own table, written with one bulk insert per meeting and
+searched through HNSW (``hnsw.ef_search`` is set per query by
+``MeetingVectorService``). Existing segment vectors are folded into chunk
+rows; the old column is left in place but no longer written.
+
+The GIN expression index matches the ``tsv_sql`` of the meeting hybrid
+search spec — keep them in sync.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+from sqlalchemy.dialects import postgresql
+
+
+revision = "053"
+down_revision = "052"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "meeting_transcript_chunks",
+        sa.Column("id", sa.String(96), primary_key=True),
+        sa.Column(
+            "meeting_id",
+            sa.String(64),
+            sa.ForeignKey("meetings.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("chunk_idx", sa.Integer(), nullable=False),
+        sa.Column("start_time", sa.Float(), nullable=False),
+        sa.Column("end_time", sa.Float(), nullable=False),
+        sa.Column("speakers", postgresql.ARRAY(sa.Text()), nullable=True),
+        sa.Column("text", sa.Text(), nullable=False),
+        sa.Column("segment_ids", postgresql.ARRAY(sa.Integer()), nullable=True),
+        sa.Column("embedding", Vector(768), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index(
+        "ix_meeting_transcript_chunks_meeting_id", "meeting_transcript_chunks", ["meeting_id"]
+    )
+
+    # Segments of one chunk all carry the same vector, so grouping by it
+    # recovers the chunks.
+    op.execute(
+        """
+        INSERT INTO meeting_transcript_chunks
+            (id, meeting_id, chunk_idx, start_time, end_time, speakers, text, segment_ids, embedding)
+        SELECT meeting_id || ':' || chunk_idx, meeting_id, chunk_idx, start_time, end_time,
+               speakers, text, segment_ids, embedding
+          FROM (
+            SELECT meeting_id,
+                   (row_number() OVER (PARTITION BY meeting_id ORDER BY min(start_time)) - 1)::int
+                       AS chunk_idx,
+                   min(start_time) AS start_time,
+                   max(end_time) AS end_time,
+                   array_agg(DISTINCT speaker) FILTER (WHERE speaker IS NOT NULL) AS speakers,
+                   string_agg(text, ' ' ORDER BY start_time) AS text,
+                   array_agg(id ORDER BY start_time) AS segment_ids,
+                   min(embedding::text)::vector AS embedding
+              FROM meeting_transcript_segments
+             WHERE embedding IS NOT NULL
+             GROUP BY meeting_id, embedding::text
+          ) grouped
+        """
+    )
+
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_meeting_transcript_chunks_embedding_hnsw "
+        "ON meeting_transcript_chunks USING hnsw (embedding vector_cosine_ops) "
+        "WITH (m = 16, ef_construction = 64)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_meeting_transcript_chunks_text_tsv "
+        "ON meeting_transcript_chunks USING gin ((to_tsvector('english', text)))"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_meeting_transcript_chunks_text_tsv")
+    op.execute("DROP INDEX IF EXISTS ix_meeting_transcript_chunks_embedding_hnsw")
+    op.drop_table("meeting_transcript_chunks")
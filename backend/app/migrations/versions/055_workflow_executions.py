@@ -0,0 +1,47 @@
+"""Add workflow_executions for the YAML workflow engine's history.
+
+Backs ``app.services.workflow_history``: one row per execution with
+indexed summary columns (workflow, status, start time) and the full state
+as JSONB. Replaces the one-JSON-file-per-execution history directory; the
+existing files are imported on first use.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+revision = "055"
+down_revision = "054"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "workflow_executions",
+        sa.Column("execution_id", sa.String(64), primary_key=True),
+        sa.Column("workflow_id", sa.String(200), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("trigger_type", sa.String(50), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("duration_ms", sa.Float(), nullable=True),
+        sa.Column("step_status", JSONB(), nullable=False, server_default="{}"),
+        sa.Column("state", JSONB(), nullable=False),
+        sa.Column("compacted", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+    op.create_index("ix_workflow_executions_started_at", "workflow_executions", ["started_at"])
+    op.create_index(
+        "idx_workflow_executions_workflow_started", "workflow_executions", ["workflow_id", "started_at"]
+    )
+    op.create_index(
+        "idx_workflow_executions_status_started", "workflow_executions", ["status", "started_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("workflow_executions")
@@ -62,6 +62,11 @@ class ModelAssignment(BaseModel):
     temperature: Optional[float] = None
     num_predict: Optional[int] = None
     keep_alive: Optional[str] = None
+    # Opt-in response cache (see llm_response_cache.py). Only calls at
+    # temperature <= 0.3 are cached; cache_semantic also serves
+    # near-duplicate prompts by embedding similarity.
+    cache_ttl_s: Optional[int] = None
+    cache_semantic: bool = False
 
 
 def parse_provider_model(spec: str) -> tuple[str, str]:
@@ -288,6 +293,8 @@ class TaskAssignmentUpdate(BaseModel):
     temperature: Optional[float] = None
     num_predict: Optional[int] = None
     keep_alive: Optional[str] = None
+    cache_ttl_s: Optional[int] = None
+    cache_semantic: Optional[bool] = None
 
 
 class DefaultModelUpdate(BaseModel):
@@ -140,15 +140,17 @@ async def sync_inbox(
     accounts = await oauth_service.list_accounts()
     if not accounts:
         raise HTTPException(401, "No Google accounts connected.")
-    service = get_gmail_service()
+    synced = await get_gmail_service().sync_accounts(
+        [acct["id"] for acct in accounts], full=True, max_results=max_results, days_back=days_back,
+    )
     results: list[dict] = []
     for acct in accounts:
-        try:
-            r = await service.sync_inbox(max_results, days_back, account_id=acct["id"])
+        r = synced[acct["id"]]
+        if r.get("status") == "error":
+            logger.error("email_sync_failed", account_id=acct["id"], error=r.get("error"))
+            results.append({"account_id": acct["id"], "email": acct["email"], "error": r.get("error")})
+        else:
             results.append({"account_id": acct["id"], "email": acct["email"], **r})
-        except Exception as e:
-            logger.error("email_sync_failed", account_id=acct["id"], error=str(e))
-            results.append({"account_id": acct["id"], "email": acct["email"], "error": str(e)})
     return {"results": results}
 
 
@@ -9,6 +9,8 @@ GET  /api/llm/resolve/{type}  - Resolve which model a task type would use
 GET  /api/llm/providers       - List all providers with health status
 GET  /api/llm/usage/today     - Today's spend + usage breakdown
 GET  /api/llm/available-models - All models grouped by provider
+GET  /api/llm/concurrency      - Per-provider adaptive limits, queue depth, wait times
+GET  /api/llm/cache            - Response + embedding cache hit rates, saved spend per task type
 """
 
 from datetime import datetime, timezone
@@ -59,6 +61,8 @@ async def set_task_model(task_type: str, req: TaskAssignmentUpdate):
         temperature=req.temperature,
         num_predict=req.num_predict,
         keep_alive=req.keep_alive,
+        cache_ttl_s=req.cache_ttl_s,
+        cache_semantic=req.cache_semantic,
     )
     return {"status": "updated", "task_type": task_type, "model": req.model}
 
@@ -220,6 +224,26 @@ async def structured_stats():
     return UnifiedLLMClient.get_structured_stats()
 
 
+@router.get("/concurrency")
+async def concurrency_stats():
+    """Per-provider adaptive concurrency limits, lane queue depths and wait times."""
+    from app.infrastructure.llm_concurrency import get_llm_limiters
+    return get_llm_limiters().stats()
+
+
+@router.get("/cache")
+async def response_cache_stats():
+    """Response cache hit rate and saved spend (per task type and overall),
+    plus embedding cache / coalescing counters."""
+    from app.infrastructure.llm_response_cache import get_llm_response_cache
+    from app.infrastructure.ollama_client import get_llm_client
+    return {
+        **get_llm_router().cache_report(),
+        "store": get_llm_response_cache().stats(),
+        "embeddings": get_llm_client().embed_stats(),
+    }
+
+
 @router.get("/available-models")
 async def available_models():
     """List all available models grouped by provider."""
@@ -165,40 +165,44 @@ async def process_meeting(meeting_id: str):
     """
     Kick off the Whisper transcription + diarization + summary pipeline for
     a meeting whose audio has already been recorded (e.g. via the host agent).
-    Runs in the background; returns immediately.
+    Queued on the meeting worker pool; returns immediately.
     """
-    import asyncio
-    from app.services.meeting_processing_pipeline import process_meeting_recording
+    from app.services.meeting_processing_queue import get_meeting_processing_queue
 
-    async def _run():
-        try:
-            async with get_session() as db:
-                await process_meeting_recording(meeting_id, db)
-            # TTS: "Summary ready" after pipeline completes
-            settings = get_settings()
-            if settings.reachy_tts_confirmations:
-                try:
-                    from app.services.reachy_service import get_reachy_service
-                    service = get_reachy_service()
-                    if await service.is_connected():
-                        await service.say("Summary ready")
-                except Exception as e:
-                    logger.debug("reachy_say_summary_ready_failed", error=str(e))
-        except Exception as e:
-            logger.error("meeting_pipeline_failed", meeting_id=meeting_id, error=str(e))
+    async def _announce():
+        # TTS: "Summary ready" after pipeline completes
+        if get_settings().reachy_tts_confirmations:
             try:
-                from sqlalchemy import update
-                from app.db.models import MeetingModel
-                async with get_session() as db:
-                    await db.execute(
-                        update(MeetingModel).where(MeetingModel.id == meeting_id).values(status="failed")
-                    )
-                    await db.commit()
-            except Exception:
-                pass
-
-    asyncio.create_task(_run())
-    return {"meeting_id": meeting_id, "status": "processing_started"}
+                from app.services.reachy_service import get_reachy_service
+                service = get_reachy_service()
+                if await service.is_connected():
+                    await service.say("Summary ready")
+            except Exception as e:
+                logger.debug("reachy_say_summary_ready_failed", error=str(e))
+
+    job = get_meeting_processing_queue().submit(meeting_id, on_complete=_announce)
+    return {"meeting_id": meeting_id, "status": "processing_started", "job": job}
+
+
+@router.get("/{meeting_id}/process")
+async def get_processing_job(meeting_id: str):
+    """Status of the meeting's processing job (queued/running/completed/failed/cancelled)."""
+    from app.services.meeting_processing_queue import get_meeting_processing_queue
+
+    job = get_meeting_processing_queue().status(meeting_id)
+    if job is None:
+        raise HTTPException(404, "No processing job for this meeting")
+    return job
+
+
+@router.post("/{meeting_id}/process/cancel")
+async def cancel_processing_job(meeting_id: str):
+    """Cancel a queued or running processing job."""
+    from app.services.meeting_processing_queue import get_meeting_processing_queue
+
+    if not get_meeting_processing_queue().cancel(meeting_id):
+        raise HTTPException(409, "No active processing job for this meeting")
+    return {"meeting_id": meeting_id, "status": "cancelling"}
 
 
 @router.get("/{meeting_id}")
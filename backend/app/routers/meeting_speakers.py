@@ -118,16 +118,20 @@ async def _upsert_voiceprints_for_mappings(
     if not by_label:
         return
 
+    from app.services.meeting_processing_queue import centroids_stage, run_meeting_stage
     from app.services.voiceprint_service import get_voiceprint_service
 
     vp_svc = get_voiceprint_service()
+    centroids = await run_meeting_stage(
+        centroids_stage,
+        str(audio_path),
+        {m.speaker_label: by_label[m.speaker_label] for m in targets if by_label.get(m.speaker_label)},
+    )
     enrolled = 0
     for m in targets:
         cluster = by_label.get(m.speaker_label)
-        if not cluster:
-            continue
-        centroid = vp_svc.compute_cluster_centroid(audio_path, cluster)
-        if centroid is None:
+        centroid = centroids.get(m.speaker_label)
+        if not cluster or centroid is None:
             continue
         await vp_svc.enroll(
             display_name=m.display_name.strip(),
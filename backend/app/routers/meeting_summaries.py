@@ -85,7 +85,12 @@ async def generate_summary(meeting_id: str):
 
         summary_svc = get_meeting_summary_service()
         t0 = time.time()
-        summary_data = await summary_svc.summarize(transcript_text, meeting_title=meeting.title)
+        from app.services.meeting_processing_pipeline import summary_progress_broadcaster
+
+        summary_data = await summary_svc.summarize(
+            transcript_text, meeting_title=meeting.title,
+            on_progress=summary_progress_broadcaster(meeting_id),
+        )
         elapsed = int((time.time() - t0) * 1000)
 
         # Delete existing
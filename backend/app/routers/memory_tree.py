@@ -72,6 +72,12 @@ async def search(
     }
 
 
+@router.post("/reindex")
+async def reindex():
+    """Rebuild the search index from the Markdown files on disk."""
+    return await get_memory_tree().reindex()
+
+
 @router.get("/entry")
 async def entry(path: str):
     """Read a single vault entry by relative path."""
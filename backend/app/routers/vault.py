@@ -8,6 +8,7 @@ from pydantic import BaseModel, Field
 from app.infrastructure.auth import require_auth
 from app.services.vault_indexer_service import get_vault_indexer
 from app.services.vault_retrieval_service import get_vault_retrieval
+from app.services.vault_watcher_service import get_vault_watcher
 from app.services.vault_writer_service import get_vault_writer
 
 router = APIRouter(
@@ -40,6 +41,9 @@ async def status():
         "vault_available": indexer.available(),
         "vault_path": str(indexer._root),
         "writer_available": writer.available(),
+        "reindex": indexer.progress(),
+        "watcher": get_vault_watcher().status(),
+        "cache": get_vault_retrieval().cache_stats(),
     }
 
 
@@ -78,3 +82,9 @@ async def reindex(force: bool = False, max_files: int = 500):
     if not indexer.available():
         raise HTTPException(503, "vault unavailable")
     return await indexer.reindex(force=force, max_files=max_files)
+
+
+@router.get("/reindex/progress")
+async def reindex_progress():
+    """Live counters (files, chunks, embed batches, chunks/s) for the current reindex."""
+    return get_vault_indexer().progress()
@@ -80,21 +80,27 @@ async def trigger_workflow(
 async def get_active_executions():
     """Get all active (running) workflow executions."""
     engine = get_workflow_engine()
-    return {"executions": engine.get_active_executions()}
+    return {"executions": await engine.get_active_executions()}
 
 
 @router.get("/executions/history")
-async def get_execution_history(limit: int = 20):
-    """Get recent execution history."""
+async def get_execution_history(
+    limit: int = 20,
+    workflow_id: Optional[str] = None,
+    status: Optional[str] = None,
+):
+    """Get recent execution history, optionally for one workflow / status."""
     engine = get_workflow_engine()
-    return {"history": engine.get_history(limit=limit)}
+    return {
+        "history": await engine.get_history(limit=limit, workflow_id=workflow_id, status=status)
+    }
 
 
 @router.get("/executions/{execution_id}/status")
 async def get_execution_status(execution_id: str):
     """Get status of a specific execution."""
     engine = get_workflow_engine()
-    state = engine.get_execution_status(execution_id)
+    state = await engine.get_execution_status(execution_id)
     if not state:
         raise HTTPException(status_code=404, detail=f"Execution '{execution_id}' not found")
     return state
@@ -114,7 +120,7 @@ async def resume_execution(execution_id: str):
 async def cancel_execution(execution_id: str):
     """Cancel an active execution."""
     engine = get_workflow_engine()
-    success = engine.cancel(execution_id)
+    success = await engine.cancel(execution_id)
     if not success:
         raise HTTPException(status_code=404, detail=f"Execution '{execution_id}' not found")
     return {"message": f"Execution '{execution_id}' cancelled"}
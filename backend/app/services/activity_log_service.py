@@ -1,33 +1,90 @@
 """
 Centralized activity log for all autonomous actions.
-Stores timestamped events in workspace/engine/activity_log.json.
+Stores timestamped events as append-only JSONL segments in
+workspace/engine/activity_log.<n>.jsonl (see infrastructure/append_log.py).
 Feeds the frontend activity feed and morning briefing.
+
+Logging an event is one line appended to the active segment, with no
+read-modify-write of the whole history. The newest ``MAX_EVENTS`` events
+are kept in memory with per-field indexes (project / event_type / source),
+so ``get_events`` never touches disk after the first load. A legacy
+activity_log.json is imported once, then renamed to *.migrated.
 """
 
 import asyncio
+import json
 import uuid
+from collections import deque
 from datetime import datetime, timedelta
 from functools import lru_cache
-from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 import structlog
 
+from app.infrastructure.append_log import SegmentedAppendLog
 from app.infrastructure.config import get_workspace_path
-from app.infrastructure.storage import JsonStorage
 
 logger = structlog.get_logger()
 
 MAX_EVENTS = 1000
+_INDEXED_FIELDS = ("project", "event_type", "source")
 
 
 class ActivityLogService:
     """Unified activity log for all autonomous actions."""
 
     def __init__(self):
-        self._storage = JsonStorage(get_workspace_path("engine"))
-        self._log_file = "activity_log.json"
-        self._lock = asyncio.Lock()
+        self._dir = get_workspace_path("engine")
+        self._log = SegmentedAppendLog(
+            self._dir,
+            "activity_log",
+            segment_max_bytes=512_000,
+            max_segments=8,
+        )
+        self._legacy_file = self._dir / "activity_log.json"
+        # Tail of (seq, event); seq is a per-process monotonically
+        # increasing position so index entries can detect eviction.
+        self._tail: Deque[Tuple[int, Dict[str, Any]]] = deque(maxlen=MAX_EVENTS)
+        self._next_seq = 0
+        self._index: Dict[str, Dict[str, Deque[int]]] = {f: {} for f in _INDEXED_FIELDS}
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+
+    async def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            events = await asyncio.to_thread(self._load_tail)
+            for event in events:
+                self._remember(event)
+            self._loaded = True
+
+    def _load_tail(self) -> List[Dict[str, Any]]:
+        if self._legacy_file.exists() and not self._log.segment_ids():
+            try:
+                legacy = json.loads(self._legacy_file.read_text(encoding="utf-8"))
+                for event in legacy.get("events", [])[-MAX_EVENTS:]:
+                    self._log.append(event)
+                self._legacy_file.rename(self._legacy_file.with_suffix(".json.migrated"))
+                logger.info("activity_log_migrated", events=len(legacy.get("events", [])))
+            except Exception as e:
+                logger.warning("activity_log_migration_failed", error=str(e))
+        return self._log.read_tail(MAX_EVENTS)
+
+    def _remember(self, event: Dict[str, Any]) -> None:
+        seq = self._next_seq
+        self._next_seq += 1
+        self._tail.append((seq, event))
+        for field in _INDEXED_FIELDS:
+            value = event.get(field)
+            if value is None:
+                continue
+            seqs = self._index[field].get(value)
+            if seqs is None:
+                seqs = self._index[field][value] = deque(maxlen=MAX_EVENTS)
+            seqs.append(seq)
 
     async def log_event(
         self,
@@ -50,14 +107,9 @@ class ActivityLogService:
             "status": status,
         }
 
-        async with self._lock:
-            data = await self._storage.read(self._log_file)
-            events = data.get("events", [])
-            events.append(event)
-            # Keep only the last MAX_EVENTS
-            if len(events) > MAX_EVENTS:
-                events = events[-MAX_EVENTS:]
-            await self._storage.write(self._log_file, {"events": events})
+        await self._ensure_loaded()
+        self._log.append(event)
+        self._remember(event)
 
         logger.info(
             "activity_logged",
@@ -76,24 +128,39 @@ class ActivityLogService:
         source: Optional[str] = None,
         since: Optional[datetime] = None,
     ) -> List[Dict[str, Any]]:
-        """Query events with optional filters."""
-        data = await self._storage.read(self._log_file)
-        events = data.get("events", [])
-
-        # Apply filters
-        if project:
-            events = [e for e in events if e.get("project") == project]
-        if event_type:
-            events = [e for e in events if e.get("event_type") == event_type]
-        if source:
-            events = [e for e in events if e.get("source") == source]
-        if since:
-            cutoff = since.isoformat()
-            events = [e for e in events if e.get("timestamp", "") >= cutoff]
-
-        # Return most recent first
-        events.reverse()
-        return events[:limit]
+        """Query events with optional filters (most recent first)."""
+        await self._ensure_loaded()
+        if not self._tail:
+            return []
+        filters = {
+            f: v for f, v in (("project", project), ("event_type", event_type), ("source", source)) if v
+        }
+        cutoff = since.isoformat() if since else None
+        first_seq = self._tail[0][0]
+
+        # Walk the smallest matching index (or the whole tail) newest-first.
+        if filters:
+            candidates = [self._index[f].get(v, ()) for f, v in filters.items()]
+            seqs = reversed(min(candidates, key=len))
+        else:
+            seqs = (seq for seq, _ in reversed(self._tail))
+
+        results: List[Dict[str, Any]] = []
+        for seq in seqs:
+            if seq < first_seq:
+                break  # evicted from the tail; everything older is too
+            event = self._tail[seq - first_seq][1]
+            if cutoff and event.get("timestamp", "") < cutoff:
+                break  # events are appended in time order
+            if all(event.get(f) == v for f, v in filters.items()):
+                results.append(event)
+                if len(results) >= limit:
+                    break
+        return results
+
+    async def close(self) -> None:
+        """Flush and fsync the active segment (graceful shutdown)."""
+        await self._log.close()
 
     async def get_summary(self, hours: int = 24) -> Dict[str, Any]:
         """Get activity summary for the last N hours."""
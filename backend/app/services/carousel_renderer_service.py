@@ -4,13 +4,31 @@ Carousel image renderer service.
 Renders carousel slides as 1080x1350 PNG images suitable for TikTok posting.
 Takes a character image + text overlay specs + slide text and composites them
 into ready-to-publish carousel slide images.
+
+Rendering pipeline (``render_carousel``):
+  1. Every background (fallback candidates + per-slide ``image_url``) is
+     downloaded concurrently over one HTTP session.
+  2. Each slide is composited and PNG-encoded in a process pool
+     (``carousel_render_workers``), so Pillow work never runs on the event
+     loop and a carousel takes about as long as its slowest slide. With
+     ``carousel_render_workers=0`` (or if the pool breaks) slides render
+     sequentially in one background thread instead.
+  3. Workers cache loaded fonts, the gradient background and fitted
+     backgrounds (the fallback image is usually shared by most slides).
+
+Output is byte-for-byte what the sequential renderer produced.
 """
 
 import asyncio
+import hashlib
 import io
 import os
 import re
 import secrets
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional, Dict, Any, Tuple, Iterable, Set
@@ -108,11 +126,126 @@ def _pack_runs_into_lines(
     return lines
 
 
+_FONT_CANDIDATES: Dict[str, Tuple[str, ...]] = {
+    "bold": (
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+        "/usr/share/fonts/TTF/DejaVuSans-Bold.ttf",
+        "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
+        "C:/Windows/Fonts/arialbd.ttf",
+        "C:/Windows/Fonts/segoeui.ttf",
+    ),
+    "normal": (
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+        "/usr/share/fonts/TTF/DejaVuSans.ttf",
+        "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+        "C:/Windows/Fonts/arial.ttf",
+        "C:/Windows/Fonts/segoeui.ttf",
+    ),
+}
+
+
+@lru_cache(maxsize=64)
+def _load_font(size: int, weight: str) -> Any:
+    """Load (once per process) the first available system font for a weight."""
+    from PIL import ImageFont
+
+    for path in _FONT_CANDIDATES["bold" if weight == "bold" else "normal"]:
+        if os.path.exists(path):
+            return ImageFont.truetype(path, size)
+    return ImageFont.load_default(size=size)
+
+
+@lru_cache(maxsize=4)
+def _gradient(width: int, height: int) -> Any:
+    """Dark vertical gradient; callers must copy before drawing on it."""
+    from PIL import Image
+
+    img = Image.new("RGB", (width, height))
+    pixels = img.load()
+    for y in range(height):
+        r = int(15 + (y / height) * 25)
+        g = int(10 + (y / height) * 15)
+        b = int(30 + (y / height) * 40)
+        for x in range(width):
+            pixels[x, y] = (r, g, b)
+    return img
+
+
+# ---------- process-pool slide rendering ----------
+
+_FITTED_CACHE_SIZE = 8
+_fitted_backgrounds: "OrderedDict[bytes, Any]" = OrderedDict()
+# Pool workers are single-threaded, but the thread fallback runs one
+# to_thread job per concurrent render_carousel call in the API process.
+_fitted_lock = threading.Lock()
+_worker_renderer: Optional["CarouselRendererService"] = None
+_render_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _fitted_background(data: bytes) -> Any:
+    """Decode + fit a background once per process (LRU by content hash)."""
+    from PIL import Image
+
+    key = hashlib.sha1(data).digest()
+    with _fitted_lock:
+        img = _fitted_backgrounds.get(key)
+        if img is not None:
+            _fitted_backgrounds.move_to_end(key)
+            return img
+    # Fit outside the lock; two threads racing on one image both fit it.
+    img = CarouselRendererService._fit_background(
+        Image.open(io.BytesIO(data)), SLIDE_WIDTH, SLIDE_HEIGHT,
+    )
+    with _fitted_lock:
+        _fitted_backgrounds[key] = img
+        while len(_fitted_backgrounds) > _FITTED_CACHE_SIZE:
+            _fitted_backgrounds.popitem(last=False)
+    return img
+
+
+def _render_slide_job(job: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Render + save one slide. Runs in a pool worker; returns its warnings."""
+    global _worker_renderer
+    if _worker_renderer is None:
+        _worker_renderer = CarouselRendererService(ensure_dirs=False)
+    bg = _fitted_background(job["bg"]) if job["bg"] else None
+    warnings: List[Dict[str, Any]] = []
+    img = _worker_renderer._render_slide(
+        bg_image=bg,
+        warnings_out=warnings,
+        no_break_terms=set(job["no_break_terms"]),
+        **job["params"],
+    )
+    img.save(job["path"], "PNG", optimize=True)
+    return warnings
+
+
+def _get_render_pool(workers: int) -> ProcessPoolExecutor:
+    global _render_pool
+    if _render_pool is None:
+        import multiprocessing
+
+        # spawn: forking the multi-threaded API process is unsafe.
+        _render_pool = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _render_pool
+
+
+def shutdown_render_pool() -> None:
+    """Stop the slide-render worker processes (graceful shutdown)."""
+    global _render_pool
+    pool, _render_pool = _render_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
 class CarouselRendererService:
     """Renders carousel slides as ready-to-publish images."""
 
-    def __init__(self):
-        RENDER_DIR.mkdir(parents=True, exist_ok=True)
+    def __init__(self, ensure_dirs: bool = True):
+        if ensure_dirs:
+            RENDER_DIR.mkdir(parents=True, exist_ok=True)
 
     async def render_carousel(
         self,
@@ -130,31 +263,25 @@ class CarouselRendererService:
         Returns dict with rendered file paths and metadata including
         per-slide render_warnings (compound breaks, contrast failures).
         """
-        from PIL import Image, ImageDraw, ImageFont
-
         output_dir = RENDER_DIR / carousel_id
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        # Download fallback character image for slides without per-slide images
-        fallback_bg = None
+        # Fallback character image for slides without per-slide images: the
+        # first candidate that downloads, in order.
         urls_to_try = []
         if character_image_url:
             urls_to_try.append(character_image_url)
         if character_image_urls:
             urls_to_try.extend(character_image_urls)
+        urls_to_try = urls_to_try[:5]
 
-        for url in urls_to_try[:5]:
-            fallback_bg = await self._download_image(url)
-            if fallback_bg:
-                break
+        slide_urls = [slide.get("image_url") for slide in slides]
+        images = await self._download_all([*urls_to_try, *(u for u in slide_urls if u)])
+        fallback_bg = next((images[u] for u in urls_to_try if images.get(u)), None)
 
-        # Download semaphore to limit concurrent image fetches
-        dl_sem = asyncio.Semaphore(3)
+        no_break_list = sorted(self._build_no_break_set(no_break_terms))
 
-        no_break_set = self._build_no_break_set(no_break_terms)
-
-        rendered_paths = []
-        render_warnings: List[Dict[str, Any]] = []
+        jobs: List[Dict[str, Any]] = []
         for i, slide in enumerate(slides):
             slide_num = i + 1
             slide_text = slide.get("text", "")
@@ -167,11 +294,7 @@ class CarouselRendererService:
                 slide_text = hook_text
 
             # Per-slide image: try slide.image_url first, then fallback
-            slide_bg = None
-            slide_image_url = slide.get("image_url")
-            if slide_image_url:
-                async with dl_sem:
-                    slide_bg = await self._download_image(slide_image_url)
+            slide_bg = images.get(slide_urls[i]) if slide_urls[i] else None
             if not slide_bg:
                 slide_bg = fallback_bg
 
@@ -182,34 +305,34 @@ class CarouselRendererService:
                     spec = s
                     break
 
-            # Render the slide (collects per-slide warnings).
-            slide_warnings: List[Dict[str, Any]] = []
-            img = self._render_slide(
-                bg_image=slide_bg,
-                slide_num=slide_num,
-                total_slides=len(slides),
-                title_text=slide_title,
-                body_text=slide_text,
-                text_position=spec.get("text_position", "center"),
-                font_weight=spec.get("font_weight", "bold"),
-                bg_overlay=spec.get("background_overlay"),
-                text_color=spec.get("text_color", "#FFFFFF"),
-                accent_color=spec.get("accent_color", "#FFD700"),
-                text_shadow=spec.get("text_shadow", True),
-                no_break_terms=no_break_set,
-                warnings_out=slide_warnings,
-            )
+            jobs.append({
+                "bg": slide_bg,
+                "path": str(output_dir / f"slide_{slide_num:02d}.png"),
+                "no_break_terms": no_break_list,
+                "params": {
+                    "slide_num": slide_num,
+                    "total_slides": len(slides),
+                    "title_text": slide_title,
+                    "body_text": slide_text,
+                    "text_position": spec.get("text_position", "center"),
+                    "font_weight": spec.get("font_weight", "bold"),
+                    "bg_overlay": spec.get("background_overlay"),
+                    "text_color": spec.get("text_color", "#FFFFFF"),
+                    "accent_color": spec.get("accent_color", "#FFD700"),
+                    "text_shadow": spec.get("text_shadow", True),
+                },
+            })
+
+        per_slide_warnings = await self._render_jobs(jobs)
+
+        rendered_paths = [job["path"] for job in jobs]
+        render_warnings: List[Dict[str, Any]] = []
+        for job, slide_warnings in zip(jobs, per_slide_warnings):
+            slide_num = job["params"]["slide_num"]
             for w in slide_warnings:
                 w.setdefault("slide_num", slide_num)
                 render_warnings.append(w)
-
-            # Save
-            filename = f"slide_{slide_num:02d}.png"
-            filepath = output_dir / filename
-            img.save(str(filepath), "PNG", optimize=True)
-            rendered_paths.append(str(filepath))
-
-            logger.debug("slide_rendered", carousel_id=carousel_id, slide=slide_num, path=str(filepath))
+            logger.debug("slide_rendered", carousel_id=carousel_id, slide=slide_num, path=job["path"])
 
         logger.info(
             "carousel_rendered",
@@ -228,6 +351,25 @@ class CarouselRendererService:
             "render_warnings": render_warnings,
         }
 
+    async def _render_jobs(self, jobs: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Render slides in the process pool; fall back to one worker thread."""
+        if not jobs:
+            return []
+        workers = get_settings().carousel_render_workers
+        if workers > 0:
+            loop = asyncio.get_running_loop()
+            try:
+                pool = _get_render_pool(workers)
+                return list(await asyncio.gather(*(
+                    loop.run_in_executor(pool, _render_slide_job, job) for job in jobs
+                )))
+            except (BrokenProcessPool, OSError) as e:
+                logger.warning("carousel_render_pool_failed", error=str(e))
+                shutdown_render_pool()
+        # One thread per call; concurrent calls share the module caches
+        # (fonts and gradients via lru_cache, fitted backgrounds under a lock).
+        return await asyncio.to_thread(lambda: [_render_slide_job(job) for job in jobs])
+
     def _render_slide(
         self,
         bg_image: Optional[Any],
@@ -253,7 +395,9 @@ class CarouselRendererService:
         from PIL import Image, ImageDraw, ImageFont
 
         # Create base image
-        if bg_image:
+        if bg_image and bg_image.size == (SLIDE_WIDTH, SLIDE_HEIGHT):
+            img = bg_image.copy()  # already fitted (see _fitted_background)
+        elif bg_image:
             img = self._fit_background(bg_image.copy(), SLIDE_WIDTH, SLIDE_HEIGHT)
         else:
             # Gradient background when no image
@@ -399,7 +543,8 @@ class CarouselRendererService:
 
         return img.convert("RGB")
 
-    def _fit_background(self, img: Any, width: int, height: int) -> Any:
+    @staticmethod
+    def _fit_background(img: Any, width: int, height: int) -> Any:
         """Resize and crop image to fill the target dimensions."""
         from PIL import Image
 
@@ -427,47 +572,11 @@ class CarouselRendererService:
 
     def _create_gradient(self, width: int, height: int) -> Any:
         """Create a dark gradient background."""
-        from PIL import Image
-
-        img = Image.new("RGB", (width, height))
-        pixels = img.load()
-        for y in range(height):
-            r = int(15 + (y / height) * 25)
-            g = int(10 + (y / height) * 15)
-            b = int(30 + (y / height) * 40)
-            for x in range(width):
-                pixels[x, y] = (r, g, b)
-        return img
+        return _gradient(width, height).copy()
 
     def _get_font(self, size: int = 40, weight: str = "bold") -> Any:
         """Get a font, falling back to default if system fonts unavailable."""
-        from PIL import ImageFont
-
-        # Try common system fonts
-        font_candidates = []
-        if weight == "bold":
-            font_candidates = [
-                "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-                "/usr/share/fonts/TTF/DejaVuSans-Bold.ttf",
-                "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
-                "C:/Windows/Fonts/arialbd.ttf",
-                "C:/Windows/Fonts/segoeui.ttf",
-            ]
-        else:
-            font_candidates = [
-                "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-                "/usr/share/fonts/TTF/DejaVuSans.ttf",
-                "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
-                "C:/Windows/Fonts/arial.ttf",
-                "C:/Windows/Fonts/segoeui.ttf",
-            ]
-
-        for path in font_candidates:
-            if os.path.exists(path):
-                return ImageFont.truetype(path, size)
-
-        # Fallback to default
-        return ImageFont.load_default(size=size)
+        return _load_font(size, weight)
 
     def _wrap_text(
         self,
@@ -614,23 +723,44 @@ class CarouselRendererService:
         darker = min(text_l, bg_l)
         return (lighter + 0.05) / (darker + 0.05)
 
-    async def _download_image(self, url: str) -> Optional[Any]:
-        """Download an image from URL and return as PIL Image."""
+    async def _download_all(self, urls: List[str]) -> Dict[str, Optional[bytes]]:
+        """Fetch every distinct URL concurrently over one session."""
+        unique = list(dict.fromkeys(u for u in urls if u))
+        if not unique:
+            return {}
+        sem = asyncio.Semaphore(6)
+        async with aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=15)
+        ) as session:
+            async def fetch(url: str) -> Optional[bytes]:
+                async with sem:
+                    return await self._download_bytes(session, url)
+
+            results = await asyncio.gather(*(fetch(u) for u in unique))
+        return dict(zip(unique, results))
+
+    async def _download_bytes(self, session: Any, url: str) -> Optional[bytes]:
+        """Download an image; returns its bytes only if Pillow can open it."""
         from PIL import Image
 
         try:
-            async with aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=15)
-            ) as session:
-                async with session.get(url) as resp:
-                    if resp.status != 200:
-                        return None
-                    data = await resp.read()
-                    return Image.open(io.BytesIO(data))
+            async with session.get(url) as resp:
+                if resp.status != 200:
+                    return None
+                data = await resp.read()
+            Image.open(io.BytesIO(data))
+            return data
         except (aiohttp.ClientError, asyncio.TimeoutError, OSError, ValueError) as e:
             logger.debug("image_download_failed", url=url[:80], error=str(e))
             return None
 
+    async def _download_image(self, url: str) -> Optional[Any]:
+        """Download an image from URL and return as PIL Image."""
+        from PIL import Image
+
+        data = (await self._download_all([url])).get(url)
+        return Image.open(io.BytesIO(data)) if data else None
+
     async def list_rendered(self, carousel_id: str) -> List[str]:
         """List rendered slide paths for a carousel."""
         output_dir = RENDER_DIR / carousel_id
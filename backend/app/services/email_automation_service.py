@@ -24,6 +24,7 @@ class EmailAutomationState(TypedDict):
     error: Optional[str]
     needs_question: bool
     matched_rule_ids: Optional[List[str]]
+    rules_evaluated: bool
     rule_actions_results: Optional[List[Dict[str, Any]]]
 
 
@@ -138,6 +139,10 @@ class EmailAutomationService:
             from app.services.email_classifier import get_email_classifier
             from app.services.gmail_service import get_gmail_service
             
+            # Already classified as part of a batch (see process_new_emails)
+            if state.get("classification"):
+                return state
+
             gmail_service = get_gmail_service()
             classifier = get_email_classifier()
             
@@ -179,21 +184,35 @@ class EmailAutomationService:
 
     async def _apply_user_rules_node(self, state: EmailAutomationState) -> EmailAutomationState:
         """Evaluate user-defined rules against the classified email."""
+        if not state.get("rules_evaluated"):
+            await self._apply_user_rules_batch([state])
+        return state
+
+    async def _apply_user_rules_batch(self, states: List[EmailAutomationState]) -> None:
+        """Evaluate user-defined rules against a batch of classified emails in one call."""
+        pending = [s for s in states if s.get("email_data")]
+        for state in states:
+            state["matched_rule_ids"] = None
+            state["rules_evaluated"] = True
+        if not pending:
+            return
+
         try:
             from app.services.email_rule_service import get_email_rule_service
 
-            email_data = state.get("email_data", {})
-            if not email_data:
-                state["matched_rule_ids"] = None
-                return state
-
             # Inject classification into email_data so category conditions work
-            if state.get("classification"):
-                email_data["category"] = state["classification"]
+            for state in pending:
+                if state.get("classification"):
+                    state["email_data"]["category"] = state["classification"]
 
             rule_service = get_email_rule_service()
-            matched_rules = await rule_service.evaluate_rules(email_data)
+            matches = await rule_service.evaluate_rules_batch([s["email_data"] for s in pending])
 
+        except Exception as e:
+            logger.error("apply_user_rules_error", error=str(e))
+            return
+
+        for state, matched_rules in zip(pending, matches):
             if matched_rules:
                 state["matched_rule_ids"] = [r.id for r in matched_rules]
                 state["action"] = "user_rules"
@@ -205,15 +224,8 @@ class EmailAutomationService:
                     rule_ids=[r.id for r in matched_rules],
                 )
             else:
-                state["matched_rule_ids"] = None
                 logger.debug("no_user_rules_matched", email_id=state["email_id"])
 
-        except Exception as e:
-            logger.error("apply_user_rules_error", error=str(e))
-            state["matched_rule_ids"] = None
-
-        return state
-
     async def _execute_rule_actions_node(self, state: EmailAutomationState) -> EmailAutomationState:
         """Execute actions for all matched user rules."""
         try:
@@ -466,13 +478,14 @@ class EmailAutomationService:
         Returns:
             Processing result
         """
-        if not self._graph:
-            self._build_graph()
-        
-        # Initialize state
-        initial_state: EmailAutomationState = {
+        return await self._run_workflow(self._initial_state(email_id))
+
+    def _initial_state(
+        self, email_id: str, email_data: Optional[Dict[str, Any]] = None
+    ) -> EmailAutomationState:
+        return {
             "email_id": email_id,
-            "email_data": None,
+            "email_data": email_data,
             "classification": None,
             "confidence": None,
             "question_id": None,
@@ -482,9 +495,16 @@ class EmailAutomationService:
             "error": None,
             "needs_question": False,
             "matched_rule_ids": None,
+            "rules_evaluated": False,
             "rule_actions_results": None,
         }
-        
+
+    async def _run_workflow(self, initial_state: EmailAutomationState) -> Dict[str, Any]:
+        """Run one email's prepared state through the automation graph."""
+        if not self._graph:
+            self._build_graph()
+
+        email_id = initial_state["email_id"]
         try:
             # Run workflow
             result = await self._graph.ainvoke(initial_state)
@@ -527,10 +547,20 @@ class EmailAutomationService:
             limit=20  # Process up to 20 at a time
         )
         
+        # Classify first so the user rules for the whole batch are evaluated
+        # against one rule set in a single call rather than once per email.
+        states = [self._initial_state(email.id, email.model_dump()) for email in unread_emails]
+        for state in states:
+            await self._classify_node(state)
+        await self._apply_user_rules_batch([s for s in states if s["status"] != "error"])
+
         results = []
-        for email in unread_emails:
-            result = await self.process_email(email.id)
-            results.append(result)
+        for state in states:
+            if state["status"] == "error":
+                logger.error("email_automation_failed", email_id=state["email_id"], error=state.get("error"))
+                results.append({"email_id": state["email_id"], "status": "error", "error": state.get("error")})
+                continue
+            results.append(await self._run_workflow(state))
         
         summary = {
             "processed": len(results),
@@ -5,10 +5,13 @@ Provides CRUD operations, rule evaluation engine, and action execution
 including LLM-based date extraction for calendar event creation.
 """
 
+import asyncio
 import json
 import re
+import time
 import uuid
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import List, Optional, Tuple, Dict, Any
 
 import structlog
@@ -21,22 +24,30 @@ from app.models.email_rule import (
     EmailRule,
     EmailRuleCreate,
     EmailRuleUpdate,
-    RuleCondition,
     ConditionsBlock,
     RuleAction,
     RuleTestResult,
     RuleTestRequest,
-    ConditionField,
-    ConditionOperator,
     ActionType,
 )
+from app.services.email_rule_engine import CompiledConditions, CompiledRuleSet, EmailView, compile_condition
 
 logger = structlog.get_logger()
 
+# Rule edits made through this process invalidate the compiled rule set
+# immediately; edits from other processes are picked up within this TTL.
+_RULE_SET_TTL_S = 60.0
+
 
 class EmailRuleService:
     """Service for email rule management and evaluation."""
 
+    def __init__(self):
+        self._rule_set: Optional[CompiledRuleSet] = None
+        self._rule_set_loaded_at = 0.0
+        self._rule_set_version = 0
+        self._rule_set_lock = asyncio.Lock()
+
     # -----------------------------------------------------------------------
     # CRUD
     # -----------------------------------------------------------------------
@@ -74,8 +85,10 @@ class EmailRuleService:
             )
             session.add(row)
             await session.flush()
-            logger.info("email_rule_created", rule_id=rule_id, name=data.name)
-            return self._to_pydantic(row)
+            rule = self._to_pydantic(row)
+        self.invalidate_rule_set()
+        logger.info("email_rule_created", rule_id=rule_id, name=data.name)
+        return rule
 
     async def update_rule(self, rule_id: str, data: EmailRuleUpdate) -> Optional[EmailRule]:
         """Update an existing rule (partial update)."""
@@ -98,8 +111,10 @@ class EmailRuleService:
             if data.actions is not None:
                 row.actions = [a.model_dump() for a in data.actions]
             await session.flush()
-            logger.info("email_rule_updated", rule_id=rule_id)
-            return self._to_pydantic(row)
+            rule = self._to_pydantic(row)
+        self.invalidate_rule_set()
+        logger.info("email_rule_updated", rule_id=rule_id)
+        return rule
 
     async def delete_rule(self, rule_id: str) -> bool:
         """Delete a rule."""
@@ -108,9 +123,10 @@ class EmailRuleService:
                 delete(EmailRuleModel).where(EmailRuleModel.id == rule_id)
             )
             deleted = result.rowcount > 0
-            if deleted:
-                logger.info("email_rule_deleted", rule_id=rule_id)
-            return deleted
+        if deleted:
+            self.invalidate_rule_set()
+            logger.info("email_rule_deleted", rule_id=rule_id)
+        return deleted
 
     async def toggle_rule(self, rule_id: str, enabled: bool) -> Optional[EmailRule]:
         """Enable or disable a rule."""
@@ -249,85 +265,33 @@ RULES:
     # Evaluation Engine
     # -----------------------------------------------------------------------
 
+    async def get_rule_set(self) -> CompiledRuleSet:
+        """Enabled rules compiled for evaluation, cached until a rule changes."""
+        if self._rule_set is not None and time.monotonic() - self._rule_set_loaded_at < _RULE_SET_TTL_S:
+            return self._rule_set
+        async with self._rule_set_lock:
+            if self._rule_set is not None and time.monotonic() - self._rule_set_loaded_at < _RULE_SET_TTL_S:
+                return self._rule_set
+            version = self._rule_set_version
+            rule_set = CompiledRuleSet(await self.list_rules(enabled_only=True))
+            # Don't cache a set read before a concurrent edit invalidated it.
+            if version == self._rule_set_version:
+                self._rule_set = rule_set
+                self._rule_set_loaded_at = time.monotonic()
+            return rule_set
+
+    def invalidate_rule_set(self) -> None:
+        """Drop the compiled rule set; the next evaluation reloads it."""
+        self._rule_set_version += 1
+        self._rule_set = None
+
     async def evaluate_rules(self, email_data: dict) -> List[EmailRule]:
         """Evaluate all enabled rules against an email. Returns matched rules in priority order."""
-        rules = await self.list_rules(enabled_only=True)
-        matched = []
-        for rule in rules:
-            if self._evaluate_conditions(rule.conditions, email_data):
-                matched.append(rule)
-                if rule.stop_after_match:
-                    break
-        return matched
-
-    def _evaluate_conditions(self, block: ConditionsBlock, email_data: dict) -> bool:
-        """Evaluate a conditions block against email data."""
-        results = [self._evaluate_condition(c, email_data) for c in block.conditions]
-        if block.match_mode == "any":
-            return any(results)
-        return all(results)
-
-    def _evaluate_condition(self, condition: RuleCondition, email_data: dict) -> bool:
-        """Evaluate a single condition against email data."""
-        field = condition.field
-        operator = condition.operator
-        expected = condition.value
-        case_sensitive = condition.case_sensitive
-
-        # Extract the actual value from email data
-        if field == ConditionField.SENDER:
-            actual = email_data.get("from_address", {})
-            if isinstance(actual, dict):
-                actual = actual.get("email", "")
-            else:
-                actual = str(actual)
-        elif field == ConditionField.SUBJECT:
-            actual = email_data.get("subject", "")
-        elif field == ConditionField.BODY:
-            actual = email_data.get("body_text", "") or email_data.get("snippet", "")
-        elif field == ConditionField.CATEGORY:
-            actual = email_data.get("category", "normal")
-        elif field == ConditionField.HAS_ATTACHMENTS:
-            attachments = email_data.get("attachments", [])
-            has = len(attachments) > 0 if attachments else False
-            return has == bool(expected)
-        elif field == ConditionField.LABEL:
-            labels = email_data.get("labels", [])
-            if isinstance(expected, list):
-                return any(lbl in labels for lbl in expected)
-            return str(expected) in labels
-        else:
-            return False
-
-        # For string fields, handle matching
-        if isinstance(expected, list):
-            return any(self._match_value(actual, operator, v, case_sensitive) for v in expected)
-        return self._match_value(actual, operator, str(expected), case_sensitive)
-
-    def _match_value(self, actual: str, operator: ConditionOperator, expected: str, case_sensitive: bool) -> bool:
-        """Core string matching."""
-        if not case_sensitive:
-            actual = actual.lower()
-            expected = expected.lower()
-
-        if operator == ConditionOperator.CONTAINS:
-            return expected in actual
-        elif operator == ConditionOperator.NOT_CONTAINS:
-            return expected not in actual
-        elif operator == ConditionOperator.EXACT:
-            return actual == expected
-        elif operator == ConditionOperator.STARTS_WITH:
-            return actual.startswith(expected)
-        elif operator == ConditionOperator.ENDS_WITH:
-            return actual.endswith(expected)
-        elif operator == ConditionOperator.REGEX:
-            try:
-                flags = 0 if case_sensitive else re.IGNORECASE
-                return bool(re.search(expected, actual, flags))
-            except re.error:
-                logger.warning("invalid_regex_in_rule", pattern=expected)
-                return False
-        return False
+        return (await self.get_rule_set()).evaluate(email_data)
+
+    async def evaluate_rules_batch(self, emails: List[dict]) -> List[List[EmailRule]]:
+        """``evaluate_rules`` for a batch of emails against one rule set."""
+        return (await self.get_rule_set()).evaluate_many(emails)
 
     # -----------------------------------------------------------------------
     # Action Execution
@@ -395,18 +359,9 @@ RULES:
         if not label:
             return {"message": "No label specified"}
         from app.services.gmail_service import get_gmail_service
-        gmail = get_gmail_service()
-        # Gmail API: modify labels
-        try:
-            service = gmail._get_service()
-            service.users().messages().modify(
-                userId="me",
-                id=email_id,
-                body={"addLabelIds": [label]}
-            ).execute()
+        if await get_gmail_service().apply_label(email_id, label):
             return {"message": f"Label '{label}' applied"}
-        except Exception as e:
-            return {"message": f"Failed to apply label: {e}"}
+        return {"message": f"Failed to apply label '{label}'"}
 
     async def _execute_notify(self, email_data: dict, params: dict) -> dict:
         from app.services.notification_service import get_notification_service
@@ -547,9 +502,10 @@ RULES:
             raise ValueError("Either rule or rule_id must be provided")
 
         # Evaluate each condition individually
+        view = EmailView(email_data)
         conditions_evaluated = []
         for c in conditions.conditions:
-            matched = self._evaluate_condition(c, email_data)
+            matched = compile_condition(c)(view)
             conditions_evaluated.append({
                 "field": c.field,
                 "operator": c.operator,
@@ -557,7 +513,7 @@ RULES:
                 "matched": matched,
             })
 
-        overall_match = self._evaluate_conditions(conditions, email_data)
+        overall_match = CompiledConditions(conditions)(view)
 
         return RuleTestResult(
             matched=overall_match,
@@ -621,6 +577,7 @@ RULES:
         return None
 
 
+@lru_cache()
 def get_email_rule_service() -> EmailRuleService:
-    """Get EmailRuleService instance."""
+    """Get the singleton EmailRuleService (it caches the compiled rule set)."""
     return EmailRuleService()
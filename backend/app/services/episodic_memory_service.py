@@ -6,26 +6,47 @@ Stores with pgvector embeddings for semantic retrieval.
 Provides few-shot enrichment for any LLM call.
 """
 
+import asyncio
 import uuid
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Sequence
 from functools import lru_cache
 
+import numpy as np
 import structlog
 from sqlalchemy import select, delete, func as sql_func, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
+from app.infrastructure.config import get_settings
 from app.infrastructure.database import get_session
 from app.infrastructure.ollama_client import get_llm_client
 from app.infrastructure.unified_llm_client import get_unified_llm_client
 from app.db.models import EpisodicMemoryModel
 from app.models.brain import EpisodicMemory, MemorySearchResult
+from app.services.hybrid_search import HybridSearchSpec, hybrid_search
 
 logger = structlog.get_logger(__name__)
 
+_EPISODIC_SPEC = HybridSearchSpec(
+    table="episodic_memories",
+    tsv_sql="to_tsvector('english', t.content)",
+    select_sql=(
+        "t.id, t.namespace, t.content, t.source_type, t.source_id, t.importance, "
+        "t.tags, t.context, t.expires_at, t.created_at, "
+        "1 - (t.embedding <=> CAST(:emb AS vector)) AS similarity"
+    ),
+    filters=("t.expires_at IS NULL OR t.expires_at > now()",),
+)
+
 DEFAULT_TTL_DAYS = 90
 HIGH_IMPORTANCE_TTL_DAYS = 180
 IMPORTANCE_THRESHOLD = 75.0
 
+# Rows per multi-row INSERT. 11 bind params per row keeps us far below
+# Postgres' 32767 parameter cap.
+_WRITE_BATCH_ROWS = 500
+
 EXTRACTION_SYSTEM_PROMPT = """You extract structured knowledge from text. For each distinct fact, decision, or outcome, output a JSON array of objects:
 [{"content": "concise fact/decision/outcome", "importance": 0-100, "tags": ["tag1", "tag2"]}]
 
@@ -37,6 +58,59 @@ Rules:
 - Return ONLY valid JSON array"""
 
 
+@dataclass(frozen=True)
+class ExtractionInput:
+    """One text to run through ``extract_and_store_many``."""
+    text: str
+    source_type: str
+    source_id: Optional[str] = None
+    namespace: str = "general"
+    context: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class _Fact:
+    source: ExtractionInput
+    content: str
+    importance: float
+    tags: List[str]
+    embedding: Optional[List[float]] = field(default=None, repr=False)
+
+
+def _ttl_days(importance: float) -> int:
+    return HIGH_IMPORTANCE_TTL_DAYS if importance >= IMPORTANCE_THRESHOLD else DEFAULT_TTL_DAYS
+
+
+def _dedupe_facts(facts: List[_Fact], threshold: float) -> List[_Fact]:
+    """Drop near-identical facts within a namespace, most important first.
+
+    Facts with an embedding are compared by cosine similarity; facts without
+    one (embedding failed) only by normalized text. Original order is kept.
+    """
+    order = sorted(range(len(facts)), key=lambda i: -facts[i].importance)
+    kept_idx: List[int] = []
+    seen_text: set = set()
+    kept_vecs: Dict[str, List[np.ndarray]] = {}
+    for i in order:
+        fact = facts[i]
+        ns = fact.source.namespace
+        key = (ns, " ".join(fact.content.lower().split()))
+        if key in seen_text:
+            continue
+        if fact.embedding:
+            vec = np.asarray(fact.embedding, dtype=np.float32)
+            norm = float(np.linalg.norm(vec))
+            if norm > 0:
+                vec = vec / norm
+                others = kept_vecs.setdefault(ns, [])
+                if others and float(np.max(np.stack(others) @ vec)) >= threshold:
+                    continue
+                others.append(vec)
+        seen_text.add(key)
+        kept_idx.append(i)
+    return [facts[i] for i in sorted(kept_idx)]
+
+
 class EpisodicMemoryService:
     """Extracts and stores facts/decisions/outcomes with semantic retrieval."""
 
@@ -52,77 +126,132 @@ class EpisodicMemoryService:
         context: Optional[Dict[str, Any]] = None,
     ) -> List[EpisodicMemory]:
         """Extract facts/decisions/outcomes from text via LLM, store with embeddings."""
-        if not text or len(text.strip()) < 20:
+        return await self.extract_and_store_many([
+            ExtractionInput(
+                text=text,
+                source_type=source_type,
+                source_id=source_id,
+                namespace=namespace,
+                context=context,
+            )
+        ])
+
+    async def extract_and_store_many(
+        self,
+        inputs: Sequence[ExtractionInput],
+        concurrency: Optional[int] = None,
+    ) -> List[EpisodicMemory]:
+        """Bulk version of ``extract_and_store``.
+
+        Runs the LLM extractions with bounded concurrency, embeds every
+        extracted fact in one ``embed_batch`` call, drops near-duplicate facts
+        (cosine similarity >= ``episodic_dedupe_similarity`` within a
+        namespace, keeping the most important), and writes the rest with one
+        multi-row INSERT in a single transaction.
+        """
+        inputs = [i for i in inputs if i.text and len(i.text.strip()) >= 20]
+        if not inputs:
+            return []
+
+        settings = get_settings()
+        sem = asyncio.Semaphore(max(1, concurrency or settings.episodic_extract_concurrency))
+
+        async def _bounded(item: ExtractionInput) -> List[_Fact]:
+            async with sem:
+                return await self._extract_facts(item)
+
+        per_input = await asyncio.gather(*(_bounded(i) for i in inputs))
+        facts = [f for batch in per_input for f in batch]
+        if not facts:
             return []
 
+        try:
+            embeddings = await get_llm_client().embed_batch([f.content for f in facts])
+            if len(embeddings) != len(facts):
+                raise ValueError(f"expected {len(facts)} embeddings, got {len(embeddings)}")
+        except Exception as e:
+            logger.warning("episodic_embed_batch_failed", count=len(facts), error=str(e))
+            embeddings = [None] * len(facts)
+        for fact, emb in zip(facts, embeddings):
+            fact.embedding = emb or None
+
+        kept = _dedupe_facts(facts, settings.episodic_dedupe_similarity)
+
+        now = datetime.now(timezone.utc)
+        memories = [
+            EpisodicMemory(
+                id=self._gen_id(),
+                namespace=f.source.namespace,
+                content=f.content,
+                source_type=f.source.source_type,
+                source_id=f.source.source_id,
+                importance=f.importance,
+                tags=f.tags,
+                context=f.source.context or {},
+                expires_at=now + timedelta(days=_ttl_days(f.importance)),
+                created_at=now,
+            )
+            for f in kept
+        ]
+        rows = [
+            {**m.model_dump(), "embedding": f.embedding}
+            for m, f in zip(memories, kept)
+        ]
+        try:
+            async with get_session() as session:
+                for i in range(0, len(rows), _WRITE_BATCH_ROWS):
+                    await session.execute(
+                        pg_insert(EpisodicMemoryModel).values(rows[i:i + _WRITE_BATCH_ROWS])
+                    )
+                await session.commit()
+        except Exception as e:
+            logger.error("episodic_batch_store_failed", count=len(rows), error=str(e))
+            return []
+
+        logger.info("episodic_memories_extracted",
+                    inputs=len(inputs), extracted=len(facts),
+                    count=len(memories), duplicates=len(facts) - len(kept))
+        return memories
+
+    async def _extract_facts(self, item: ExtractionInput) -> List[_Fact]:
+        """One LLM extraction call. Returns [] on failure."""
         try:
             llm = get_unified_llm_client()
             extracted = await llm.structured_chat(
-                prompt=f"Extract knowledge from this text:\n\n{text[:3000]}",
+                prompt=f"Extract knowledge from this text:\n\n{item.text[:3000]}",
                 system=EXTRACTION_SYSTEM_PROMPT,
                 task_type="analysis",
                 temperature=0.1,
                 max_tokens=2048,
             )
-
-            if not isinstance(extracted, list):
-                extracted = [extracted] if isinstance(extracted, dict) else []
-
-            memories = []
-            ollama = get_llm_client()
-
-            for item in extracted[:10]:  # cap at 10 per extraction
-                content = item.get("content", "")
-                if not content or len(content) < 10:
-                    continue
-
-                importance = float(item.get("importance", 50))
-                tags = item.get("tags", [])
-                ttl_days = HIGH_IMPORTANCE_TTL_DAYS if importance >= IMPORTANCE_THRESHOLD else DEFAULT_TTL_DAYS
-
-                embedding = await ollama.embed_safe(content)
-
-                mem_id = self._gen_id()
-                now = datetime.now(timezone.utc)
-
-                async with get_session() as session:
-                    model = EpisodicMemoryModel(
-                        id=mem_id,
-                        namespace=namespace,
-                        content=content,
-                        source_type=source_type,
-                        source_id=source_id,
-                        importance=importance,
-                        tags=tags,
-                        context=context or {},
-                        embedding=embedding,
-                        expires_at=now + timedelta(days=ttl_days),
-                        created_at=now,
-                    )
-                    session.add(model)
-                    await session.commit()
-
-                memories.append(EpisodicMemory(
-                    id=mem_id,
-                    namespace=namespace,
-                    content=content,
-                    source_type=source_type,
-                    source_id=source_id,
-                    importance=importance,
-                    tags=tags,
-                    context=context or {},
-                    expires_at=now + timedelta(days=ttl_days),
-                    created_at=now,
-                ))
-
-            logger.info("episodic_memories_extracted",
-                        count=len(memories), namespace=namespace, source_type=source_type)
-            return memories
-
         except Exception as e:
-            logger.error("episodic_extraction_failed", error=str(e))
+            logger.error("episodic_extraction_failed", error=str(e),
+                         source_type=item.source_type, source_id=item.source_id)
             return []
 
+        if not isinstance(extracted, list):
+            extracted = [extracted] if isinstance(extracted, dict) else []
+
+        facts: List[_Fact] = []
+        for raw in extracted[:10]:  # cap at 10 per extraction
+            if not isinstance(raw, dict):
+                continue
+            content = raw.get("content", "")
+            if not isinstance(content, str) or len(content) < 10:
+                continue
+            try:
+                importance = float(raw.get("importance", 50))
+            except (TypeError, ValueError):
+                importance = 50.0
+            tags = raw.get("tags", [])
+            facts.append(_Fact(
+                source=item,
+                content=content,
+                importance=importance,
+                tags=[str(t) for t in tags] if isinstance(tags, list) else [],
+            ))
+        return facts
+
     async def store_direct(
         self,
         content: str,
@@ -138,7 +267,7 @@ class EpisodicMemoryService:
             ollama = get_llm_client()
             embedding = await ollama.embed_safe(content)
 
-            ttl_days = HIGH_IMPORTANCE_TTL_DAYS if importance >= IMPORTANCE_THRESHOLD else DEFAULT_TTL_DAYS
+            ttl_days = _ttl_days(importance)
             now = datetime.now(timezone.utc)
             mem_id = self._gen_id()
 
@@ -181,51 +310,53 @@ class EpisodicMemoryService:
         namespace: Optional[str] = None,
         limit: int = 5,
     ) -> List[MemorySearchResult]:
-        """Semantic search over episodic memories using pgvector cosine distance."""
+        """Hybrid search over episodic memories (BM25 + pgvector RRF, one statement).
+
+        ``similarity`` stays the cosine similarity to the query so callers'
+        relevance thresholds keep their meaning; ranking is the fused score.
+        """
         try:
             ollama = get_llm_client()
             query_embedding = await ollama.embed_safe(query)
             if not query_embedding:
                 return []
 
-            now = datetime.now(timezone.utc)
+            extra_filters: list[str] = []
+            params: Dict[str, Any] = {}
+            if namespace:
+                extra_filters.append("t.namespace = :namespace")
+                params["namespace"] = namespace
+
             async with get_session() as session:
-                # Build query with cosine distance
-                distance = EpisodicMemoryModel.embedding.cosine_distance(query_embedding)
-                query_stmt = (
-                    select(EpisodicMemoryModel, distance.label("distance"))
-                    .where(EpisodicMemoryModel.embedding.isnot(None))
-                    .where(
-                        (EpisodicMemoryModel.expires_at.is_(None)) |
-                        (EpisodicMemoryModel.expires_at > now)
-                    )
+                found = await hybrid_search(
+                    session,
+                    _EPISODIC_SPEC,
+                    query=query,
+                    embedding=query_embedding,
+                    top_k=limit,
+                    per_side_k=max(limit * 4, 20),
+                    extra_filters=extra_filters,
+                    params=params,
                 )
 
-                if namespace:
-                    query_stmt = query_stmt.where(EpisodicMemoryModel.namespace == namespace)
-
-                query_stmt = query_stmt.order_by(distance).limit(limit)
-                result = await session.execute(query_stmt)
-                rows = result.all()
-
-                return [
-                    MemorySearchResult(
-                        memory=EpisodicMemory(
-                            id=row[0].id,
-                            namespace=row[0].namespace,
-                            content=row[0].content,
-                            source_type=row[0].source_type,
-                            source_id=row[0].source_id,
-                            importance=row[0].importance,
-                            tags=row[0].tags or [],
-                            context=row[0].context or {},
-                            expires_at=row[0].expires_at,
-                            created_at=row[0].created_at,
-                        ),
-                        similarity=max(0.0, 1.0 - float(row[1])),
-                    )
-                    for row in rows
-                ]
+            return [
+                MemorySearchResult(
+                    memory=EpisodicMemory(
+                        id=row["id"],
+                        namespace=row["namespace"],
+                        content=row["content"],
+                        source_type=row["source_type"],
+                        source_id=row["source_id"],
+                        importance=row["importance"],
+                        tags=row["tags"] or [],
+                        context=row["context"] or {},
+                        expires_at=row["expires_at"],
+                        created_at=row["created_at"],
+                    ),
+                    similarity=max(0.0, float(row["similarity"] or 0.0)),
+                )
+                for row in found.rows
+            ]
 
         except Exception as e:
             logger.error("episodic_search_failed", error=str(e))
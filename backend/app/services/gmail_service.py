@@ -4,6 +4,7 @@ Gmail service for email operations.
 Persistence layer uses PostgreSQL via SQLAlchemy async ORM.
 """
 
+import asyncio
 import json
 import base64
 from pathlib import Path
@@ -12,7 +13,8 @@ from functools import lru_cache
 from datetime import datetime, timedelta
 import structlog
 
-from sqlalchemy import select, update, func as sa_func
+from sqlalchemy import select, text, update, func as sa_func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.models.email import (
     Email, EmailSummary, EmailThread, EmailLabel,
@@ -37,6 +39,10 @@ class GmailService:
         # Per-account API client cache. Key: account_id (or "_default" for the
         # singleton account). Each entry holds a googleapiclient.discovery.Resource.
         self._services: dict[str, Any] = {}
+        # httplib2 clients are not thread-safe: requests run in worker threads
+        # but one at a time per client (keyed by id(); clients are cached
+        # above for the life of the service).
+        self._api_locks: dict[int, asyncio.Lock] = {}
         self._breaker = get_circuit_breaker(
             "gmail",
             failure_threshold=3,
@@ -67,7 +73,12 @@ class GmailService:
             raise RuntimeError("Gmail not connected. Complete OAuth flow first.")
         try:
             from googleapiclient.discovery import build
-            client = build("gmail", "v1", credentials=creds)
+            from app.infrastructure.config import get_settings
+            endpoint = get_settings().gmail_api_endpoint
+            client = build(
+                "gmail", "v1", credentials=creds,
+                client_options={"api_endpoint": endpoint} if endpoint else None,
+            )
             self._services[cache_key] = client
             return client
         except ImportError:
@@ -275,28 +286,222 @@ Reply with ONLY the category name, nothing else."""
     # Helper: build an ORM row from a parsed Gmail API message
     # ------------------------------------------------------------------
 
-    def _email_to_row(self, email: Email) -> EmailCacheModel:
-        """Convert an Email pydantic model to an EmailCacheModel ORM row."""
-        return EmailCacheModel(
-            id=email.id,
-            thread_id=email.thread_id,
-            subject=email.subject,
-            snippet=email.snippet,
-            body_text=email.body_text,
-            from_address=email.from_address.model_dump(),
-            to_addresses=[a.model_dump() for a in email.to_addresses],
-            cc_addresses=[a.model_dump() for a in email.cc_addresses],
-            labels=email.labels,
-            attachments=[a.model_dump() for a in email.attachments],
-            category=email.category.value,
-            status=email.status.value,
-            is_starred=email.is_starred,
-            is_important=email.is_important,
-            received_at=email.received_at,
-            internal_date=email.internal_date,
-            synced_at=email.synced_at,
+    @staticmethod
+    def _label_fields(labels: List[str]) -> Dict[str, Any]:
+        """Columns derived from a message's Gmail label ids."""
+        return {
+            "labels": labels,
+            "status": (EmailStatus.UNREAD if "UNREAD" in labels else EmailStatus.READ).value,
+            "is_starred": "STARRED" in labels,
+            "is_important": "IMPORTANT" in labels,
+        }
+
+    def _message_to_email(self, msg: Dict[str, Any]) -> Email:
+        """Parse a ``format=full`` Gmail API message."""
+        payload = msg.get("payload", {})
+        headers = self._parse_headers(payload.get("headers", []))
+        text_body, html_body = self._decode_body(payload)
+        attachments = [
+            EmailAttachment(
+                filename=part["filename"],
+                mime_type=part.get("mimeType", "application/octet-stream"),
+                size_bytes=int(part.get("body", {}).get("size", 0)),
+                attachment_id=part.get("body", {}).get("attachmentId"),
+            )
+            for part in payload.get("parts", []) if part.get("filename")
+        ]
+        labels = msg.get("labelIds", [])
+        internal_date = int(msg.get("internalDate", 0))
+        return Email(
+            id=msg["id"],
+            thread_id=msg.get("threadId", msg["id"]),
+            subject=headers.get("subject", "(No Subject)"),
+            snippet=msg.get("snippet", ""),
+            body_text=text_body,
+            body_html=html_body,
+            from_address=self._parse_email_address(headers.get("from", "")),
+            to_addresses=[
+                self._parse_email_address(a.strip())
+                for a in headers.get("to", "").split(",") if a.strip()
+            ],
+            cc_addresses=[
+                self._parse_email_address(a.strip())
+                for a in headers.get("cc", "").split(",") if a.strip()
+            ],
+            labels=labels,
+            attachments=attachments,
+            category=self._classify_email(msg, headers),
+            status=EmailStatus.UNREAD if "UNREAD" in labels else EmailStatus.READ,
+            is_starred="STARRED" in labels,
+            is_important="IMPORTANT" in labels,
+            received_at=datetime.fromtimestamp(internal_date / 1000),
+            internal_date=internal_date,
+            synced_at=datetime.utcnow(),
         )
 
+    def _email_to_values(self, email: Email, account_id: Optional[str]) -> Dict[str, Any]:
+        """email_cache column values for an Email pydantic model."""
+        return {
+            "id": email.id,
+            "account_id": account_id,
+            "thread_id": email.thread_id,
+            "subject": email.subject,
+            "snippet": email.snippet,
+            "body_text": email.body_text,
+            "from_address": email.from_address.model_dump(),
+            "to_addresses": [a.model_dump() for a in email.to_addresses],
+            "cc_addresses": [a.model_dump() for a in email.cc_addresses],
+            "labels": email.labels,
+            "attachments": [a.model_dump() for a in email.attachments],
+            "category": email.category.value,
+            "status": email.status.value,
+            "is_starred": email.is_starred,
+            "is_important": email.is_important,
+            "received_at": email.received_at,
+            "internal_date": email.internal_date,
+            "synced_at": email.synced_at,
+        }
+
+    # ------------------------------------------------------------------
+    # Gmail API transport: off-loop execution and batched fetches
+    # ------------------------------------------------------------------
+
+    async def _api(self, service: Any, request: Any) -> Any:
+        """Run a request (or batch) built on ``service`` in a worker thread,
+        through the circuit breaker. Every Gmail API call goes through here."""
+        lock = self._api_locks.setdefault(id(service), asyncio.Lock())
+        async with lock:
+            return await self._breaker.call(asyncio.to_thread, request.execute)
+
+    def _new_batch(self, service: Any, callback):
+        from app.infrastructure.config import get_settings
+        endpoint = get_settings().gmail_api_endpoint
+        if endpoint:
+            # The discovery document's batch URI always points at Google.
+            from googleapiclient.http import BatchHttpRequest
+            return BatchHttpRequest(callback=callback, batch_uri=f"{endpoint.rstrip('/')}/batch/gmail/v1")
+        return service.new_batch_http_request(callback=callback)
+
+    async def _fetch_messages(
+        self,
+        service: Any,
+        ids: List[str],
+        *,
+        fmt: str = "full",
+    ) -> tuple[List[Dict[str, Any]], List[str]]:
+        """Fetch messages by id through batch requests.
+
+        Returns (messages in ``ids`` order, per-message error strings).
+        """
+        from app.infrastructure.config import get_settings
+        batch_size = max(1, min(get_settings().gmail_batch_size, 100))
+        messages: List[Dict[str, Any]] = []
+        errors: List[str] = []
+        for i in range(0, len(ids), batch_size):
+            chunk = ids[i:i + batch_size]
+            got: Dict[str, Dict[str, Any]] = {}
+
+            def _collect(request_id, response, exception, got=got):
+                if exception is not None:
+                    errors.append(f"Error fetching {request_id}: {exception}")
+                    logger.warning("gmail_message_fetch_error", id=request_id, error=str(exception))
+                else:
+                    got[request_id] = response
+
+            batch = self._new_batch(service, _collect)
+            for msg_id in chunk:
+                batch.add(
+                    service.users().messages().get(userId="me", id=msg_id, format=fmt),
+                    request_id=msg_id,
+                )
+            try:
+                await self._api(service, batch)
+            except Exception as e:
+                errors.extend(f"Error fetching {m}: {e}" for m in chunk if m not in got)
+                logger.warning("gmail_batch_fetch_error", count=len(chunk), error=str(e))
+            messages.extend(got[m] for m in chunk if m in got)
+        return messages, errors
+
+    async def _list_message_ids(self, service: Any, query: str, max_results: int) -> List[str]:
+        """Ids of up to ``max_results`` messages matching ``query``, newest first."""
+        ids: List[str] = []
+        page_token = None
+        while len(ids) < max_results:
+            kwargs = {"userId": "me", "q": query, "maxResults": min(max_results - len(ids), 500)}
+            if page_token:
+                kwargs["pageToken"] = page_token
+            results = await self._api(service, service.users().messages().list(**kwargs))
+            ids.extend(m["id"] for m in results.get("messages", []))
+            page_token = results.get("nextPageToken")
+            if not page_token:
+                break
+        return ids[:max_results]
+
+    # ------------------------------------------------------------------
+    # Bulk email_cache writes
+    # ------------------------------------------------------------------
+
+    async def _existing_ids(self, ids: List[str]) -> set[str]:
+        """Subset of ``ids`` already cached."""
+        if not ids:
+            return set()
+        async with get_session() as session:
+            result = await session.execute(
+                select(EmailCacheModel.id).where(EmailCacheModel.id.in_(ids))
+            )
+            return {r[0] for r in result.all()}
+
+    async def _upsert_emails(self, emails: List[Email], account_id: Optional[str]) -> None:
+        """INSERT ... ON CONFLICT (id) DO UPDATE, a few hundred rows per statement."""
+        if not emails:
+            return
+        rows = [self._email_to_values(e, account_id) for e in emails]
+        async with get_session() as session:
+            for i in range(0, len(rows), 500):
+                stmt = pg_insert(EmailCacheModel).values(rows[i:i + 500])
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["id"],
+                    set_={k: stmt.excluded[k] for k in rows[0] if k != "id"},
+                )
+                await session.execute(stmt)
+
+    async def _apply_label_changes(self, labels_by_id: Dict[str, List[str]]) -> None:
+        """Refresh label-derived columns of cached messages."""
+        if not labels_by_id:
+            return
+        now = datetime.utcnow()
+        async with get_session() as session:
+            # Core executemany: ids missing from the cache are skipped, not
+            # reported as stale as an ORM bulk update would.
+            await session.execute(
+                text(
+                    "UPDATE email_cache SET labels = :labels, status = :status,"
+                    " is_starred = :is_starred, is_important = :is_important,"
+                    " synced_at = :synced_at WHERE id = :id"
+                ),
+                [
+                    {"id": msg_id, "synced_at": now, **self._label_fields(labels)}
+                    for msg_id, labels in labels_by_id.items()
+                ],
+            )
+
+    async def _store_history_id(self, account_id: Optional[str], history_id: Any) -> None:
+        """Record the history id on the account row (preferred) and mirror it
+        to the legacy SyncStatus row so code reading SyncStatusModel keeps
+        working."""
+        if account_id:
+            await get_gmail_oauth_service().update_account_metadata(
+                account_id, history_id=str(history_id)
+            )
+        async with get_session() as session:
+            legacy = await session.get(SyncStatusModel, "gmail")
+            if legacy:
+                meta = dict(legacy.metadata_ or {})
+                meta["history_id"] = str(history_id)
+                legacy.metadata_ = meta
+                legacy.last_sync = datetime.utcnow()
+                await session.merge(legacy)
+
     # ------------------------------------------------------------------
     # Core operations (PostgreSQL persistence)
     # ------------------------------------------------------------------
@@ -308,10 +513,13 @@ Reply with ONLY the category name, nothing else."""
         account_id: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
-        Sync inbox from Gmail for one account (default if account_id is None).
+        Full sync of the last ``days_back`` days for one account (default if
+        account_id is None).
 
-        Multi-account: every cached email row is tagged with the source account_id
-        so the UI can filter; history_id is stored on the account row.
+        Only messages not already cached are fetched in full; cached ones
+        are re-read in ``minimal`` format to refresh their labels. Every row
+        is tagged with the source account_id; the mailbox historyId, read
+        before listing, seeds the next ``sync_incremental``.
         """
         service = await self._get_gmail_service(account_id=account_id)
         status = await self._load_sync_status()
@@ -325,126 +533,56 @@ Reply with ONLY the category name, nothing else."""
         query = f"after:{after_date.strftime('%Y/%m/%d')}"
 
         try:
-            # Get message list (through circuit breaker)
-            async def _list_messages():
-                return service.users().messages().list(
-                    userId="me",
-                    q=query,
-                    maxResults=max_results
-                ).execute()
-
-            results = await self._breaker.call(_list_messages)
+            # Read the history id first so changes made while this sync runs
+            # are replayed by the next incremental sync.
+            profile = await self._api(service, service.users().getProfile(userId="me"))
+            ids = await self._list_message_ids(service, query, max_results)
+            existing = await self._existing_ids(ids)
+
+            fetched, fetch_errors = await self._fetch_messages(
+                service, [i for i in ids if i not in existing],
+            )
+            refreshed, refresh_errors = await self._fetch_messages(
+                service, [i for i in ids if i in existing], fmt="minimal",
+            )
+            errors = fetch_errors + refresh_errors
 
-            messages = results.get("messages", [])
             emails = []
-            errors = []
-
-            for msg_ref in messages:
+            for msg in fetched:
                 try:
-                    # Fetch full message
-                    msg = service.users().messages().get(
-                        userId="me",
-                        id=msg_ref["id"],
-                        format="full"
-                    ).execute()
-
-                    headers = self._parse_headers(msg.get("payload", {}).get("headers", []))
-                    text_body, html_body = self._decode_body(msg.get("payload", {}))
-
-                    # Parse addresses
-                    from_addr = self._parse_email_address(headers.get("from", ""))
-                    to_addrs = [
-                        self._parse_email_address(a.strip())
-                        for a in headers.get("to", "").split(",") if a.strip()
-                    ]
-                    cc_addrs = [
-                        self._parse_email_address(a.strip())
-                        for a in headers.get("cc", "").split(",") if a.strip()
-                    ]
-
-                    # Parse attachments
-                    attachments = []
-                    for part in msg.get("payload", {}).get("parts", []):
-                        if part.get("filename"):
-                            attachments.append(EmailAttachment(
-                                filename=part["filename"],
-                                mime_type=part.get("mimeType", "application/octet-stream"),
-                                size_bytes=int(part.get("body", {}).get("size", 0)),
-                                attachment_id=part.get("body", {}).get("attachmentId")
-                            ))
-
-                    # Classify
-                    category = self._classify_email(msg, headers)
-
-                    # Build email object
-                    email = Email(
-                        id=msg["id"],
-                        thread_id=msg.get("threadId", msg["id"]),
-                        subject=headers.get("subject", "(No Subject)"),
-                        snippet=msg.get("snippet", ""),
-                        body_text=text_body,
-                        body_html=html_body,
-                        from_address=from_addr,
-                        to_addresses=to_addrs,
-                        cc_addresses=cc_addrs,
-                        labels=msg.get("labelIds", []),
-                        attachments=attachments,
-                        category=category,
-                        status=EmailStatus.UNREAD if "UNREAD" in msg.get("labelIds", []) else EmailStatus.READ,
-                        is_starred="STARRED" in msg.get("labelIds", []),
-                        is_important="IMPORTANT" in msg.get("labelIds", []),
-                        received_at=datetime.fromtimestamp(int(msg.get("internalDate", 0)) / 1000),
-                        internal_date=int(msg.get("internalDate", 0)),
-                        synced_at=datetime.utcnow()
-                    )
-                    emails.append(email)
-
+                    emails.append(self._message_to_email(msg))
                 except Exception as e:
-                    errors.append(f"Error fetching {msg_ref['id']}: {str(e)}")
-                    logger.warning("gmail_message_fetch_error", id=msg_ref["id"], error=str(e))
-
-            # Upsert all emails into PostgreSQL with account tag.
-            async with get_session() as session:
-                for email in emails:
-                    row = self._email_to_row(email)
-                    row.account_id = account_id
-                    await session.merge(row)
+                    errors.append(f"Error parsing {msg.get('id')}: {str(e)}")
+                    logger.warning("gmail_message_parse_error", id=msg.get("id"), error=str(e))
 
-            # Get profile for email address
-            async def _get_profile():
-                return service.users().getProfile(userId="me").execute()
-
-            profile = await self._breaker.call(_get_profile)
+            await self._upsert_emails(emails, account_id)
+            await self._apply_label_changes(
+                {m["id"]: m.get("labelIds", []) for m in refreshed}
+            )
 
             # Update sync status
             unread = len([e for e in emails if e.status == EmailStatus.UNREAD])
+            unread += len([m for m in refreshed if "UNREAD" in m.get("labelIds", [])])
+            total = len(emails) + len(refreshed)
             sync_status = EmailSyncStatus(
                 connected=True,
                 email_address=profile.get("emailAddress"),
                 last_sync=datetime.utcnow(),
-                total_messages=len(emails),
+                total_messages=total,
                 unread_count=unread,
                 sync_errors=errors
             )
             await self._save_sync_status(sync_status)
-
-            # Store history_id for incremental sync
-            history_id = results.get("historyId") or (
-                service.users().getProfile(userId="me").execute().get("historyId")
-                if not results.get("historyId") else None
-            )
-            if history_id:
-                async with get_session() as session:
-                    row = await session.get(SyncStatusModel, "gmail")
-                    if row:
-                        meta = row.metadata_ or {}
-                        meta["history_id"] = str(history_id)
-                        row.metadata_ = meta
-                        await session.merge(row)
+            # Incremental sync would start past messages that failed to
+            # download; without a new history id the next run retries them.
+            if profile.get("historyId") and not fetch_errors:
+                await self._store_history_id(account_id, profile["historyId"])
 
             logger.info(
                 "gmail_sync_complete",
-                total=len(emails),
+                account_id=account_id,
+                total=total,
+                new=len(emails),
                 unread=unread,
                 errors=len(errors)
             )
@@ -452,7 +590,8 @@ Reply with ONLY the category name, nothing else."""
             return {
                 "status": "success",
                 "synced_at": datetime.utcnow().isoformat(),
-                "total_messages": len(emails),
+                "total_messages": total,
+                "new_emails": len(emails),
                 "unread_count": unread,
                 "errors": errors
             }
@@ -506,43 +645,35 @@ Reply with ONLY the category name, nothing else."""
     async def get_labels(self) -> List[EmailLabel]:
         """Get Gmail labels."""
         service = await self._get_gmail_service()
+        results = await self._api(service, service.users().labels().list(userId="me"))
+        labels = []
 
-        async def _fetch_labels():
-            results = service.users().labels().list(userId="me").execute()
-            labels = []
-
-            for label in results.get("labels", []):
-                # Get label details
-                label_detail = service.users().labels().get(
-                    userId="me",
-                    id=label["id"]
-                ).execute()
-
-                labels.append(EmailLabel(
-                    id=label["id"],
-                    name=label["name"],
-                    type=label.get("type", "user"),
-                    message_count=label_detail.get("messagesTotal", 0),
-                    unread_count=label_detail.get("messagesUnread", 0)
-                ))
+        for label in results.get("labels", []):
+            # Get label details
+            label_detail = await self._api(
+                service, service.users().labels().get(userId="me", id=label["id"])
+            )
 
-            return labels
+            labels.append(EmailLabel(
+                id=label["id"],
+                name=label["name"],
+                type=label.get("type", "user"),
+                message_count=label_detail.get("messagesTotal", 0),
+                unread_count=label_detail.get("messagesUnread", 0)
+            ))
 
-        return await self._breaker.call(_fetch_labels)
+        return labels
 
     async def mark_as_read(self, email_id: str) -> bool:
         """Mark email as read."""
         try:
             service = await self._get_gmail_service()
 
-            async def _mark_read():
-                service.users().messages().modify(
-                    userId="me",
-                    id=email_id,
-                    body={"removeLabelIds": ["UNREAD"]}
-                ).execute()
-
-            await self._breaker.call(_mark_read)
+            await self._api(service, service.users().messages().modify(
+                userId="me",
+                id=email_id,
+                body={"removeLabelIds": ["UNREAD"]}
+            ))
 
             # Update DB
             async with get_session() as session:
@@ -564,14 +695,11 @@ Reply with ONLY the category name, nothing else."""
         try:
             service = await self._get_gmail_service()
 
-            async def _archive():
-                service.users().messages().modify(
-                    userId="me",
-                    id=email_id,
-                    body={"removeLabelIds": ["INBOX"]}
-                ).execute()
-
-            await self._breaker.call(_archive)
+            await self._api(service, service.users().messages().modify(
+                userId="me",
+                id=email_id,
+                body={"removeLabelIds": ["INBOX"]}
+            ))
 
             # Update DB
             async with get_session() as session:
@@ -598,14 +726,11 @@ Reply with ONLY the category name, nothing else."""
         try:
             service = await self._get_gmail_service()
 
-            async def _trash():
-                service.users().messages().modify(
-                    userId="me",
-                    id=email_id,
-                    body={"addLabelIds": ["TRASH"], "removeLabelIds": ["INBOX", "UNREAD"]},
-                ).execute()
-
-            await self._breaker.call(_trash)
+            await self._api(service, service.users().messages().modify(
+                userId="me",
+                id=email_id,
+                body={"addLabelIds": ["TRASH"], "removeLabelIds": ["INBOX", "UNREAD"]},
+            ))
 
             async with get_session() as session:
                 row = await session.get(EmailCacheModel, email_id)
@@ -662,10 +787,7 @@ Reply with ONLY the category name, nothing else."""
             if thread_id:
                 payload["threadId"] = thread_id
 
-            async def _send():
-                return service.users().messages().send(userId="me", body=payload).execute()
-
-            sent = await self._breaker.call(_send)
+            sent = await self._api(service, service.users().messages().send(userId="me", body=payload))
             sent_id = sent.get("id") if isinstance(sent, dict) else None
             logger.info(
                 "email_sent",
@@ -685,14 +807,11 @@ Reply with ONLY the category name, nothing else."""
             service = await self._get_gmail_service()
             body = {"addLabelIds": ["STARRED"]} if starred else {"removeLabelIds": ["STARRED"]}
 
-            async def _star():
-                service.users().messages().modify(
-                    userId="me",
-                    id=email_id,
-                    body=body
-                ).execute()
-
-            await self._breaker.call(_star)
+            await self._api(service, service.users().messages().modify(
+                userId="me",
+                id=email_id,
+                body=body
+            ))
 
             # Update DB
             async with get_session() as session:
@@ -705,6 +824,28 @@ Reply with ONLY the category name, nothing else."""
             logger.error("star_email_failed", email_id=email_id, error=str(e))
             return False
 
+    async def apply_label(self, email_id: str, label: str) -> bool:
+        """Add a Gmail label to an email."""
+        try:
+            service = await self._get_gmail_service()
+
+            await self._api(service, service.users().messages().modify(
+                userId="me",
+                id=email_id,
+                body={"addLabelIds": [label]}
+            ))
+
+            # Update DB
+            async with get_session() as session:
+                row = await session.get(EmailCacheModel, email_id)
+                if row and label not in (row.labels or []):
+                    row.labels = list(row.labels or []) + [label]
+
+            return True
+        except Exception as e:
+            logger.error("apply_label_failed", email_id=email_id, label=label, error=str(e))
+            return False
+
     async def generate_digest(self) -> EmailDigest:
         """Generate email digest summary."""
         async with get_session() as session:
@@ -776,6 +917,11 @@ Reply with ONLY the category name, nothing else."""
         """
         Incremental sync via Gmail History API for one account.
 
+        Pages through every history record since the stored history_id:
+        added messages not yet cached are fetched in batches and inserted,
+        label changes update the cached rows in place. Cost scales with the
+        mail that changed, not with the sync window.
+
         Multi-account: history_id lives on the account's `oauth_accounts.metadata`.
         Falls back to full `sync_inbox(account_id=...)` when no history_id is
         cached or the cached id has expired (Gmail returns 404 after ~7 days).
@@ -802,108 +948,79 @@ Reply with ONLY the category name, nothing else."""
             return await self.sync_inbox(max_results=50, days_back=3, account_id=account_id)
 
         try:
-            async def _list_history():
-                return service.users().history().list(
-                    userId="me",
-                    startHistoryId=history_id,
-                    historyTypes=["messageAdded", "labelAdded", "labelRemoved"],
-                ).execute()
-
-            results = await self._breaker.call(_list_history)
-
-            new_history_id = results.get("historyId")
-            histories = results.get("history", [])
-
-            added_ids = set()
-            for h in histories:
-                for ma in h.get("messagesAdded", []):
-                    added_ids.add(ma["message"]["id"])
-
-            # Find which IDs already exist in DB
-            existing_ids: set[str] = set()
-            if added_ids:
-                async with get_session() as session:
-                    stmt = select(EmailCacheModel.id).where(
-                        EmailCacheModel.id.in_(list(added_ids))
-                    )
-                    result = await session.execute(stmt)
-                    existing_ids = {r[0] for r in result.all()}
-
-            new_emails = 0
+            added_ids: Dict[str, None] = {}  # ordered set
+            label_changes: Dict[str, List[str]] = {}
+            history_changes = 0
+            new_history_id = None
+            page_token = None
+            while True:
+                kwargs = {
+                    "userId": "me",
+                    "startHistoryId": history_id,
+                    "historyTypes": ["messageAdded", "labelAdded", "labelRemoved"],
+                    "maxResults": 500,
+                }
+                if page_token:
+                    kwargs["pageToken"] = page_token
+                results = await self._api(service, service.users().history().list(**kwargs))
+                new_history_id = results.get("historyId") or new_history_id
+                for h in results.get("history", []):
+                    history_changes += 1
+                    for ma in h.get("messagesAdded", []):
+                        added_ids[ma["message"]["id"]] = None
+                    for change in h.get("labelsAdded", []) + h.get("labelsRemoved", []):
+                        msg = change.get("message", {})
+                        if "labelIds" in msg:
+                            label_changes[msg["id"]] = msg["labelIds"]  # latest wins
+                page_token = results.get("nextPageToken")
+                if not page_token:
+                    break
+
+            existing_ids = await self._existing_ids(list(added_ids))
+            fetched, fetch_errors = await self._fetch_messages(
+                service, [i for i in added_ids if i not in existing_ids],
+            )
+            errors = list(fetch_errors)
             new_email_objects: list[Email] = []
-
-            for msg_id in added_ids:
-                if msg_id in existing_ids:
-                    continue
+            for msg in fetched:
                 try:
-                    msg = service.users().messages().get(
-                        userId="me", id=msg_id, format="full"
-                    ).execute()
-                    headers = self._parse_headers(msg.get("payload", {}).get("headers", []))
-                    text_body, html_body = self._decode_body(msg.get("payload", {}))
-                    from_addr = self._parse_email_address(headers.get("from", ""))
-                    category = self._classify_email(msg, headers)
-
-                    email = Email(
-                        id=msg["id"],
-                        thread_id=msg.get("threadId", msg["id"]),
-                        subject=headers.get("subject", "(No Subject)"),
-                        snippet=msg.get("snippet", ""),
-                        body_text=text_body,
-                        body_html=html_body,
-                        from_address=from_addr,
-                        to_addresses=[],
-                        cc_addresses=[],
-                        labels=msg.get("labelIds", []),
-                        attachments=[],
-                        category=category,
-                        status=EmailStatus.UNREAD if "UNREAD" in msg.get("labelIds", []) else EmailStatus.READ,
-                        is_starred="STARRED" in msg.get("labelIds", []),
-                        is_important="IMPORTANT" in msg.get("labelIds", []),
-                        received_at=datetime.fromtimestamp(int(msg.get("internalDate", 0)) / 1000),
-                        internal_date=int(msg.get("internalDate", 0)),
-                        synced_at=datetime.utcnow()
-                    )
-                    new_email_objects.append(email)
-                    new_emails += 1
-
-                    # Check VIP alerts
-                    await self._check_alert_rules(email)
-
+                    new_email_objects.append(self._message_to_email(msg))
                 except Exception as e:
-                    logger.warning("history_message_fetch_error", id=msg_id, error=str(e))
+                    errors.append(f"Error parsing {msg.get('id')}: {str(e)}")
+                    logger.warning("history_message_parse_error", id=msg.get("id"), error=str(e))
+
+            # Persist new emails (tagged with account_id) before alerting so
+            # alert consumers can look them up.
+            await self._upsert_emails(new_email_objects, account_id)
+            fresh = {e.id for e in new_email_objects}
+            await self._apply_label_changes(
+                {i: labels for i, labels in label_changes.items() if i not in fresh}
+            )
+            for email in new_email_objects:
+                await self._check_alert_rules(email)
 
-            # Persist new emails (tagged with account_id) and update history_id.
-            async with get_session() as session:
-                for email in new_email_objects:
-                    row = self._email_to_row(email)
-                    row.account_id = account_id
-                    await session.merge(row)
-
-            # Update history_id on the account row (preferred) and mirror to
-            # the legacy SyncStatus row for the default account so old code
-            # that reads from SyncStatusModel keeps working.
-            if new_history_id:
-                if account_id:
-                    await oauth_svc.update_account_metadata(
-                        account_id, history_id=str(new_history_id)
-                    )
-                async with get_session() as session:
-                    legacy = await session.get(SyncStatusModel, "gmail")
-                    if legacy:
-                        meta = legacy.metadata_ or {}
-                        meta["history_id"] = str(new_history_id)
-                        legacy.metadata_ = meta
-                        legacy.last_sync = datetime.utcnow()
-                        await session.merge(legacy)
+            # Keep the old history id when downloads failed (e.g. per-request
+            # 429s in a batch): the next run replays the same history and
+            # fetches only the messages still missing from the cache.
+            if new_history_id and not fetch_errors:
+                await self._store_history_id(account_id, new_history_id)
 
+            new_emails = len(new_email_objects)
             logger.info(
                 "gmail_incremental_sync_complete",
                 account_id=account_id,
                 new_emails=new_emails,
-                history_changes=len(histories),
+                label_changes=len(label_changes),
+                history_changes=history_changes,
+                errors=len(errors),
             )
-            return {"status": "success", "type": "incremental", "new_emails": new_emails, "account_id": account_id}
+            return {
+                "status": "success",
+                "type": "incremental",
+                "new_emails": new_emails,
+                "account_id": account_id,
+                "errors": errors,
+            }
 
         except Exception as e:
             if "historyId" in str(e).lower() or "404" in str(e):
@@ -911,6 +1028,39 @@ Reply with ONLY the category name, nothing else."""
                 return await self.sync_inbox(max_results=50, days_back=3, account_id=account_id)
             raise
 
+    async def sync_accounts(
+        self,
+        account_ids: Optional[List[str]] = None,
+        *,
+        full: bool = False,
+        max_results: int = 100,
+        days_back: int = 7,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Sync several accounts concurrently (all connected ones by default).
+
+        Runs ``sync_incremental``, or ``sync_inbox`` when ``full``, with at most
+        ``gmail_sync_concurrency`` accounts in flight. Returns each account's
+        result, or ``{"status": "error", "error": ...}`` for accounts that failed.
+        """
+        from app.infrastructure.config import get_settings
+
+        if account_ids is None:
+            account_ids = await self.list_account_ids()
+        semaphore = asyncio.Semaphore(max(1, get_settings().gmail_sync_concurrency))
+
+        async def _one(acct_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    if full:
+                        return await self.sync_inbox(max_results, days_back, account_id=acct_id)
+                    return await self.sync_incremental(account_id=acct_id)
+                except Exception as e:
+                    logger.warning("gmail_account_sync_failed", account_id=acct_id, error=str(e))
+                    return {"status": "error", "error": str(e)}
+
+        results = await asyncio.gather(*(_one(a) for a in account_ids))
+        return dict(zip(account_ids, results))
+
     # ========================================================================
     # EMAIL ALERT SYSTEM (Sprint 41 Task 70)
     # ========================================================================
@@ -0,0 +1,202 @@
+"""Hybrid search engine — BM25 + dense + RRF fusion in one SQL round trip.
+
+Every retrieval path in Zero (vault chunks, meeting transcripts, knowledge
+notes, episodic memory) does the same thing: rank by Postgres full-text,
+rank by pgvector cosine distance, fuse the two rankings with Reciprocal
+Rank Fusion, optionally decay by age. Doing that in Python meant two
+queries per search and pulling ``2 × per_side_k`` full ``content`` rows
+over the wire just to throw most of them away.
+
+``hybrid_search`` compiles a ``HybridSearchSpec`` into a single CTE
+statement:
+
+    bm25   — ids + rank of the top ``per_side_k`` full-text matches
+    dense  — ids + rank of the top ``per_side_k`` nearest embeddings
+             (plain ``ORDER BY <=> LIMIT`` so the HNSW index is used)
+    fused  — sum(1 / (rrf_k + rank)) per id across both sides
+    final  — join back to the table for the ``top_k`` winners only,
+             apply the optional decay expression, order by score
+
+Only the final ``top_k`` rows carry content. When no query embedding is
+available the dense side is omitted and the statement degrades to BM25.
+
+Specs reference the searched table as alias ``t``; ``filters``,
+``decay_sql`` and ``select_sql`` are trusted SQL fragments written by the
+calling service (user input only ever arrives through bind params).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+RRF_K = 60  # standard RRF constant
+
+
+@dataclass(frozen=True)
+class HybridSearchSpec:
+    """How to hybrid-search one table.
+
+    table:       table name, aliased ``t`` in every fragment
+    tsv_sql:     tsvector expression (a stored column or ``to_tsvector(...)``)
+    select_sql:  columns returned for the final top_k rows
+    id_col:      primary key column used to join the fused ids back
+    embedding_col: pgvector column (cosine distance)
+    join_sql:    extra joins for the final select only (e.g. parent titles)
+    filters:     WHERE fragments applied to both the BM25 and dense sides
+    decay_sql:   optional multiplier on the fused score, e.g. a time decay
+    """
+    table: str
+    tsv_sql: str
+    select_sql: str
+    id_col: str = "id"
+    embedding_col: str = "embedding"
+    join_sql: str = ""
+    filters: tuple[str, ...] = field(default_factory=tuple)
+    decay_sql: Optional[str] = None
+
+
+@dataclass
+class HybridSearchResult:
+    rows: list[dict[str, Any]]
+    bm25_count: int
+    dense_count: int
+    dense_enabled: bool
+
+
+def half_life_decay_sql(ts_col: str, half_life_days: float, when: Optional[str] = None) -> str:
+    """``0.5 ** (age_days / half_life_days)`` on ``ts_col``; 1.0 when ``when`` is false."""
+    decay = (
+        f"power(0.5, greatest(0.0, extract(epoch FROM (now() - {ts_col})) / 86400.0)"
+        f" / {float(half_life_days)})"
+    )
+    cond = f"{ts_col} IS NOT NULL" + (f" AND ({when})" if when else "")
+    return f"(CASE WHEN {cond} THEN {decay} ELSE 1.0 END)"
+
+
+def vector_literal(embedding: Sequence[float]) -> str:
+    """pgvector text literal for binding as ``CAST(:emb AS vector)``."""
+    return "[" + ",".join(str(float(x)) for x in embedding) + "]"
+
+
+def build_hybrid_sql(
+    spec: HybridSearchSpec,
+    *,
+    dense: bool,
+    extra_filters: Sequence[str] = (),
+    rrf_k: int = RRF_K,
+) -> str:
+    """Compile ``spec`` to the single-statement RRF query (see module docstring).
+
+    Binds: ``:q`` query text, ``:emb`` vector literal (when ``dense``),
+    ``:k`` per-side limit, ``:top_k``, plus whatever the filter fragments
+    reference.
+    """
+    where = " ".join(f"AND ({f})" for f in (*spec.filters, *extra_filters))
+    emb = "CAST(:emb AS vector)"
+
+    ctes = [
+        f"""
+        q AS (SELECT plainto_tsquery('english', :q) AS tsq),
+        bm25_top AS (
+            SELECT t.{spec.id_col} AS id, ts_rank_cd({spec.tsv_sql}, q.tsq) AS s
+              FROM {spec.table} t, q
+             WHERE {spec.tsv_sql} @@ q.tsq {where}
+             ORDER BY s DESC
+             LIMIT :k
+        ),
+        bm25 AS (
+            SELECT id, row_number() OVER (ORDER BY s DESC) AS rnk FROM bm25_top
+        )"""
+    ]
+    sides = ["SELECT id, rnk, 1 AS is_bm25 FROM bm25"]
+    if dense:
+        ctes.append(
+            f"""
+        dense_top AS (
+            SELECT t.{spec.id_col} AS id, t.{spec.embedding_col} <=> {emb} AS d
+              FROM {spec.table} t
+             WHERE t.{spec.embedding_col} IS NOT NULL {where}
+             ORDER BY t.{spec.embedding_col} <=> {emb}
+             LIMIT :k
+        ),
+        dense AS (
+            SELECT id, row_number() OVER (ORDER BY d ASC) AS rnk FROM dense_top
+        )"""
+        )
+        sides.append("SELECT id, rnk, 0 AS is_bm25 FROM dense")
+
+    union = "\n             UNION ALL ".join(sides)
+    ctes.append(
+        f"""
+        fused AS (
+            SELECT id,
+                   sum(1.0 / ({int(rrf_k)} + rnk)) AS rrf,
+                   min(rnk) FILTER (WHERE is_bm25 = 1) AS bm25_rank,
+                   min(rnk) FILTER (WHERE is_bm25 = 0) AS dense_rank
+              FROM ({union}) sides
+             GROUP BY id
+        )"""
+    )
+
+    score = f"f.rrf * {spec.decay_sql}" if spec.decay_sql else "f.rrf"
+    dense_count = "(SELECT count(*) FROM dense)" if dense else "0"
+    return (
+        "WITH" + ",".join(ctes) + f"""
+        SELECT {spec.select_sql},
+               {score} AS score,
+               f.bm25_rank,
+               f.dense_rank,
+               (SELECT count(*) FROM bm25) AS bm25_count,
+               {dense_count} AS dense_count
+          FROM fused f
+          JOIN {spec.table} t ON t.{spec.id_col} = f.id
+          {spec.join_sql}
+         ORDER BY score DESC
+         LIMIT :top_k
+        """
+    )
+
+
+async def hybrid_search(
+    session: AsyncSession,
+    spec: HybridSearchSpec,
+    *,
+    query: str,
+    embedding: Optional[Sequence[float]],
+    top_k: int,
+    per_side_k: int = 40,
+    extra_filters: Sequence[str] = (),
+    params: Optional[dict[str, Any]] = None,
+    rrf_k: int = RRF_K,
+) -> HybridSearchResult:
+    """Run one fused hybrid search. Rows are plain dicts keyed by ``select_sql`` labels.
+
+    ``bm25_count`` / ``dense_count`` are the per-side candidate counts (they
+    ride along on every row; 0 when nothing matched at all).
+    """
+    dense = embedding is not None
+    sql = build_hybrid_sql(spec, dense=dense, extra_filters=extra_filters, rrf_k=rrf_k)
+    bind: dict[str, Any] = {
+        "q": query,
+        "k": per_side_k,
+        "top_k": top_k,
+        **(params or {}),
+    }
+    if dense:
+        bind["emb"] = vector_literal(embedding)
+    rows = [dict(r) for r in (await session.execute(text(sql), bind)).mappings().all()]
+    bm25_count = int(rows[0]["bm25_count"]) if rows else 0
+    dense_count = int(rows[0]["dense_count"]) if rows else 0
+    for row in rows:
+        row.pop("bm25_count", None)
+        row.pop("dense_count", None)
+    return HybridSearchResult(
+        rows=rows,
+        bm25_count=bm25_count,
+        dense_count=dense_count,
+        dense_enabled=dense,
+    )
@@ -0,0 +1,284 @@
+"""
+Local intent routing for the orchestration gateway.
+
+Two pieces used by ``orchestration_graph.router_node``:
+
+``KeywordMatcher``
+    Aho-Corasick automaton over every route's keyword list. One pass over
+    the message finds all keyword occurrences, instead of a substring scan
+    per keyword per route. Scores match the old scan exactly: the number of
+    distinct keywords of a route found in the lowercased message.
+
+``IntentRouter``
+    Nearest-exemplar classifier over embeddings. Exemplars are the route
+    descriptions and keywords, plus recent inbound messages from
+    ``orchestrator_conversations`` that were routed by keyword or LLM.
+    A message is embedded once (through the shared embedding cache) and
+    scored per route by the mean cosine similarity of its top-k exemplars;
+    a route wins when it clears ``intent_router_min_similarity`` and beats
+    the runner-up by ``intent_router_min_margin``. Anything else falls
+    through to the LLM classifier.
+
+The exemplar index is built in the background on first use and rebuilt
+every ``intent_router_refresh_s``; until it is ready ``classify`` returns
+None and routing behaves as before.
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+_TOP_K = 3
+_EMBED_CHUNK = 64
+# Route methods whose labels are trusted enough to learn from.
+_LEARN_FROM_METHODS = ("keyword", "llm")
+
+
+class KeywordMatcher:
+    """Aho-Corasick matcher mapping keyword hits to per-route scores."""
+
+    def __init__(self, route_keywords: Dict[str, Sequence[str]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Set[int]] = [set()]
+        self._keywords: List[Tuple[str, str]] = []  # index -> (route, keyword)
+        for route, keywords in route_keywords.items():
+            for kw in dict.fromkeys(k.lower() for k in keywords):
+                if kw:
+                    self._add(kw, len(self._keywords))
+                    self._keywords.append((route, kw))
+        self._link()
+
+    def _add(self, keyword: str, index: int) -> None:
+        node = 0
+        for ch in keyword:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(set())
+            node = nxt
+        self._out[node].add(index)
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] |= self._out[self._fail[nxt]]
+
+    def matches(self, text: str) -> Set[int]:
+        """Indices of every keyword occurring in ``text`` (already lowercased)."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found: Set[int] = set()
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found |= out[node]
+        return found
+
+    def scores(self, message: str) -> Dict[str, int]:
+        """Distinct keywords matched per route (routes with no match omitted)."""
+        scores: Dict[str, int] = {}
+        for index in self.matches(message.lower()):
+            route = self._keywords[index][0]
+            scores[route] = scores.get(route, 0) + 1
+        return scores
+
+
+@dataclass(frozen=True)
+class IntentMatch:
+    route: str
+    similarity: float
+    margin: float  # over the best other route
+
+
+class IntentRouter:
+    """Nearest-exemplar intent classifier over message embeddings."""
+
+    def __init__(
+        self,
+        seeds: Dict[str, List[str]],
+        *,
+        embed_batch: Optional[Callable[[List[str]], Awaitable[List[List[float]]]]] = None,
+        min_similarity: float = 0.6,
+        min_margin: float = 0.04,
+        exemplars_per_route: int = 200,
+        history_days: int = 90,
+        refresh_s: float = 3600.0,
+    ):
+        self._seeds = seeds
+        self._embed_batch = embed_batch
+        self.min_similarity = min_similarity
+        self.min_margin = min_margin
+        self._per_route = exemplars_per_route
+        self._history_days = history_days
+        self._refresh_s = refresh_s
+        self._routes: List[str] = []
+        self._route_rows: List[np.ndarray] = []
+        self._matrix: Optional[np.ndarray] = None
+        self._built_at = 0.0
+        self._build_task: Optional[asyncio.Task] = None
+        self._stats = {"classified": 0, "accepted": 0, "not_ready": 0}
+
+    @property
+    def ready(self) -> bool:
+        return self._matrix is not None
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+
+    def ensure_fresh(self) -> None:
+        """Start a background (re)build if the index is missing or stale."""
+        stale = time.monotonic() - self._built_at > self._refresh_s
+        if (not self.ready or stale) and (self._build_task is None or self._build_task.done()):
+            self._build_task = asyncio.get_running_loop().create_task(self.build())
+
+    async def build(self) -> None:
+        """Embed every exemplar and swap in the new index."""
+        exemplars = [(route, text) for route, texts in self._seeds.items() for text in texts]
+        try:
+            exemplars += await self._history_exemplars()
+        except Exception as e:  # noqa: BLE001 — seeds alone still route
+            logger.warning("intent_router_history_failed", error=str(e))
+        exemplars = list(dict.fromkeys((r, t.strip()) for r, t in exemplars if t and t.strip()))
+        if not exemplars:
+            return
+        try:
+            vecs: List[List[float]] = []
+            texts = [t for _, t in exemplars]
+            for i in range(0, len(texts), _EMBED_CHUNK):
+                vecs.extend(await self._embed(texts[i:i + _EMBED_CHUNK]))
+        except Exception as e:  # noqa: BLE001
+            logger.warning("intent_router_build_failed", error=str(e))
+            self._built_at = time.monotonic()  # retry after refresh_s, not every message
+            return
+
+        matrix = _normalize(np.asarray(vecs, dtype=np.float32))
+        labels = [r for r, _ in exemplars]
+        routes = sorted(set(labels))
+        label_arr = np.asarray(labels)
+        self._route_rows = [np.flatnonzero(label_arr == r) for r in routes]
+        self._routes = routes
+        self._matrix = matrix
+        self._built_at = time.monotonic()
+        logger.info("intent_router_built", exemplars=len(exemplars), routes=len(routes))
+
+    async def _embed(self, texts: List[str]) -> List[List[float]]:
+        if self._embed_batch is not None:
+            return await self._embed_batch(texts)
+        from app.infrastructure.ollama_client import get_llm_client
+
+        return await get_llm_client().embed_batch(texts)
+
+    async def _history_exemplars(self) -> List[Tuple[str, str]]:
+        """Recent inbound messages with trusted routes, newest first per route."""
+        from sqlalchemy import text
+        from app.infrastructure.database import get_session
+
+        async with get_session() as session:
+            rows = (await session.execute(
+                text(
+                    "SELECT route, message FROM ("
+                    "  SELECT route, message, row_number() OVER ("
+                    "    PARTITION BY route ORDER BY created_at DESC) AS rn"
+                    "  FROM orchestrator_conversations"
+                    "  WHERE direction = 'inbound' AND error IS NULL"
+                    "    AND route = ANY(:routes) AND route <> 'general'"
+                    "    AND route_method = ANY(:methods)"
+                    "    AND created_at > now() - make_interval(days => :days)"
+                    ") t WHERE rn <= :per_route"
+                ),
+                {
+                    "routes": list(self._seeds),
+                    "methods": list(_LEARN_FROM_METHODS),
+                    "days": self._history_days,
+                    "per_route": self._per_route,
+                },
+            )).all()
+        return [(row[0], row[1][:2000]) for row in rows]
+
+    # ------------------------------------------------------------------
+    # Classification
+    # ------------------------------------------------------------------
+
+    def score(self, vec: Sequence[float]) -> List[Tuple[str, float]]:
+        """(route, similarity) for every route, best first."""
+        if self._matrix is None:
+            return []
+        q = _normalize(np.asarray(vec, dtype=np.float32)[None, :])[0]
+        if q.shape[0] != self._matrix.shape[1]:
+            return []
+        sims = self._matrix @ q
+        scored = []
+        for route, rows in zip(self._routes, self._route_rows):
+            s = sims[rows]
+            k = min(_TOP_K, s.size)
+            scored.append((route, float(np.partition(s, s.size - k)[-k:].mean())))
+        scored.sort(key=lambda rs: rs[1], reverse=True)
+        return scored
+
+    async def classify(self, message: str) -> Optional[IntentMatch]:
+        """Best route for ``message`` if it clears the similarity and margin
+        thresholds; None when unsure or the index is not built yet."""
+        self.ensure_fresh()
+        if not self.ready:
+            self._stats["not_ready"] += 1
+            return None
+        from app.infrastructure.ollama_client import get_llm_client
+
+        vec = await get_llm_client().embed(message[:4000])
+        scored = self.score(vec)
+        self._stats["classified"] += 1
+        if not scored:
+            return None
+        route, best = scored[0]
+        margin = best - (scored[1][1] if len(scored) > 1 else -1.0)
+        if best < self.min_similarity or margin < self.min_margin:
+            return None
+        self._stats["accepted"] += 1
+        return IntentMatch(route=route, similarity=round(best, 4), margin=round(margin, 4))
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            **self._stats,
+            "ready": self.ready,
+            "exemplars": 0 if self._matrix is None else int(self._matrix.shape[0]),
+            "routes": len(self._routes),
+        }
+
+
+def _normalize(m: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(m, axis=1, keepdims=True)
+    return m / np.maximum(norms, 1e-12)
+
+
+def parse_route_descriptions(prompt: str, routes: Iterable[str]) -> Dict[str, str]:
+    """``- route: description`` lines of a classifier prompt, by route."""
+    wanted = set(routes)
+    out: Dict[str, str] = {}
+    for line in prompt.splitlines():
+        line = line.strip()
+        if line.startswith("- ") and ":" in line:
+            route, desc = line[2:].split(":", 1)
+            if route.strip() in wanted:
+                out[route.strip()] = desc.strip()
+    return out
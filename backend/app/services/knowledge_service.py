@@ -19,9 +19,16 @@ from app.models.knowledge import (
 )
 from app.infrastructure.database import get_session
 from app.db.models import NoteModel, UserProfileModel, UserFactModel, UserContactModel, KnowledgeCategoryModel
+from app.services.hybrid_search import HybridSearchSpec, hybrid_search
 
 logger = structlog.get_logger()
 
+_NOTES_SPEC = HybridSearchSpec(
+    table="notes",
+    tsv_sql="to_tsvector('english', coalesce(t.title, '') || ' ' || t.content)",
+    select_sql="t.id",
+)
+
 
 class KnowledgeService:
     """Service for knowledge management and second brain functionality."""
@@ -69,14 +76,17 @@ class KnowledgeService:
                     for r in rows
                 ]
             else:
-                result = await session.execute(
-                    text(
-                        "SELECT id FROM notes WHERE embedding IS NOT NULL "
-                        "ORDER BY embedding <=> :vec LIMIT :lim"
-                    ),
-                    {"vec": str(query_embedding), "lim": limit},
+                # Notes go through the shared one-statement BM25 + dense RRF
+                # engine so exact-term matches aren't lost to vector-only ranking.
+                found = await hybrid_search(
+                    session,
+                    _NOTES_SPEC,
+                    query=query,
+                    embedding=query_embedding,
+                    top_k=limit,
+                    per_side_k=max(limit * 4, 20),
                 )
-                note_ids = [r[0] for r in result.fetchall()]
+                note_ids = [r["id"] for r in found.rows]
 
                 if not note_ids:
                     # No embeddings yet — fall back to text search
@@ -54,24 +54,18 @@ class MeetingDiarizationService:
         return segments
 
     def align_with_transcript(self, diarization_segments: list[dict], transcript_segments: list[dict]) -> list[dict]:
-        aligned = []
-        for tseg in transcript_segments:
-            t_start, t_end = tseg["start"], tseg["end"]
-            t_duration = t_end - t_start
-            best_speaker, best_overlap = "UNKNOWN", 0.0
-            for dseg in diarization_segments:
-                overlap = max(0.0, min(t_end, dseg["end"]) - max(t_start, dseg["start"]))
-                if overlap > best_overlap:
-                    best_overlap = overlap
-                    best_speaker = dseg["speaker"]
-            if t_duration > 0 and (best_overlap / t_duration) <= 0.5:
-                best_speaker = "UNKNOWN"
-            aligned.append({
-                "start": tseg["start"], "end": tseg["end"], "text": tseg["text"],
-                "speaker": best_speaker, "confidence": tseg["confidence"],
-            })
-        assigned = sum(1 for s in aligned if s["speaker"] != "UNKNOWN")
-        logger.info("alignment_complete", assigned=assigned, total=len(aligned))
+        """Attribute transcript segments to speakers (sort-and-sweep, see speaker_alignment).
+
+        Segments with word timestamps are split where the speaker changes.
+        """
+        from app.services.speaker_alignment import UNKNOWN, align_segments
+
+        start = time.perf_counter()
+        aligned = align_segments(diarization_segments, transcript_segments)
+        assigned = sum(1 for s in aligned if s["speaker"] != UNKNOWN)
+        logger.info("alignment_complete", assigned=assigned, total=len(aligned),
+                    input_segments=len(transcript_segments),
+                    elapsed=f"{time.perf_counter() - start:.3f}s")
         return aligned
 
 
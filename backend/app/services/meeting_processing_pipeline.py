@@ -1,4 +1,10 @@
-"""Meeting AI processing pipeline: transcribe -> diarize -> store -> summarize -> embed."""
+"""Meeting AI processing pipeline: transcribe -> diarize -> store -> summarize -> embed.
+
+The model-bound stages (transcription, diarization, voiceprint centroids)
+run in the meeting worker pool via ``run_meeting_stage``; callers normally
+go through ``MeetingProcessingQueue`` rather than calling
+``process_meeting_recording`` directly. See meeting_processing_queue.
+"""
 
 import json
 import time
@@ -67,6 +73,36 @@ async def broadcast_processing_progress(data: dict) -> None:
             _ws_clients.remove(ws)
 
 
+def summary_progress_broadcaster(meeting_id: str):
+    """``on_progress`` callback for MeetingSummaryService that streams sections to the WS."""
+
+    async def _on_progress(event: dict) -> None:
+        if event.get("stage") == "reduce":
+            await broadcast_processing_progress({
+                "meeting_id": meeting_id, "stage": "summarizing", "progress": 0.9,
+                "message": "Combining section summaries...",
+            })
+            return
+        done, total = event["completed"], event["total"]
+        section = event.get("section") or {}
+        await broadcast_processing_progress({
+            "meeting_id": meeting_id, "stage": "summarizing",
+            # Sections are the bulk of the work; leave the tail for the reduce.
+            "progress": round(0.9 * done / max(1, total), 3),
+            "message": f"Summarized section {done} of {total}",
+            "section": {
+                "index": event.get("section_index"),
+                "summary": section.get("section_summary", ""),
+                "key_topics": section.get("key_topics", []),
+                "action_items": section.get("action_items", []),
+                "decisions": section.get("decisions", []),
+                "cached": event.get("cached", False),
+            },
+        })
+
+    return _on_progress
+
+
 async def process_meeting_recording(meeting_id: str, db: AsyncSession) -> dict:
     total_start = time.time()
     result = {"meeting_id": meeting_id, "steps": {}}
@@ -84,21 +120,21 @@ async def process_meeting_recording(meeting_id: str, db: AsyncSession) -> dict:
     if not audio_path.exists():
         raise FileNotFoundError(f"Audio file not found: {audio_path}")
 
-    # --- Step 1: Transcribe ---
-    await broadcast_processing_progress({"stage": "transcribing", "progress": 0.0, "message": "Loading transcription model..."})
-
-    from app.services.meeting_transcription_service import get_meeting_transcription_service
-    transcription = get_meeting_transcription_service()
-    if not transcription.is_loaded:
-        transcription.load_model()
+    from app.services.meeting_processing_queue import (
+        centroids_stage,
+        diarize_stage,
+        run_meeting_stage,
+        transcribe_stage,
+    )
 
-    await broadcast_processing_progress({"stage": "transcribing", "progress": 0.2, "message": "Transcribing audio..."})
+    # --- Step 1: Transcribe ---
+    await broadcast_processing_progress({"meeting_id": meeting_id, "stage": "transcribing", "progress": 0.2, "message": "Transcribing audio..."})
 
     t0 = time.time()
-    segments = transcription.transcribe(audio_path)
+    segments = await run_meeting_stage(transcribe_stage, str(audio_path))
     result["steps"]["transcription"] = {"segments": len(segments), "elapsed_ms": int((time.time() - t0) * 1000)}
 
-    await broadcast_processing_progress({"stage": "transcribing", "progress": 1.0, "message": f"Transcribed {len(segments)} segments"})
+    await broadcast_processing_progress({"meeting_id": meeting_id, "stage": "transcribing", "progress": 1.0, "message": f"Transcribed {len(segments)} segments"})
 
     if not segments:
         meeting_result = await db.execute(select(MeetingModel).where(MeetingModel.id == meeting_id))
@@ -106,22 +142,17 @@ async def process_meeting_recording(meeting_id: str, db: AsyncSession) -> dict:
         if meeting:
             meeting.status = "completed"
             await db.commit()
-        await broadcast_processing_progress({"stage": "complete", "progress": 1.0, "message": "No speech detected"})
+        await broadcast_processing_progress({"meeting_id": meeting_id, "stage": "complete", "progress": 1.0, "message": "No speech detected"})
         return result
 
     # --- Step 2: Diarize ---
     diar_segments_raw: list = []
     try:
-        await broadcast_processing_progress({"stage": "diarizing", "progress": 0.0, "message": "Running speaker diarization..."})
-        from app.services.meeting_diarization_service import get_meeting_diarization_service
-        diarization = get_meeting_diarization_service()
-        if not diarization.is_loaded:
-            diarization.load_model()
+        await broadcast_processing_progress({"meeting_id": meeting_id, "stage": "diarizing", "progress": 0.0, "message": "Running speaker diarization..."})
         t0 = time.time()
-        diar_segments_raw = diarization.diarize(audio_path)
-        segments = diarization.align_with_transcript(diar_segments_raw, segments)
+        diar_segments_raw, segments = await run_meeting_stage(diarize_stage, str(audio_path), segments)
         result["steps"]["diarization"] = {"speakers": len(set(s.get("speaker", "") for s in segments)), "elapsed_ms": int((time.time() - t0) * 1000)}
-        await broadcast_processing_progress({"stage": "diarizing", "progress": 1.0, "message": "Diarization complete"})
+        await broadcast_processing_progress({"meeting_id": meeting_id, "stage": "diarizing", "progress": 1.0, "message": "Diarization complete"})
     except Exception as e:
         logger.warning("diarization_skipped", error=str(e))
         result["steps"]["diarization"] = {"skipped": True, "reason": str(e)}
@@ -141,9 +172,10 @@ async def process_meeting_recording(meeting_id: str, db: AsyncSession) -> dict:
                 clusters.setdefault(d["speaker"], []).append(d)
 
             t0 = time.time()
+            await broadcast_processing_progress({"meeting_id": meeting_id, "stage": "identifying", "progress": 0.0, "message": "Matching voiceprints..."})
+            centroids = await run_meeting_stage(centroids_stage, str(audio_path), clusters)
             matched = 0
-            for label, cluster_segs in clusters.items():
-                centroid = vp_svc.compute_cluster_centroid(audio_path, cluster_segs)
+            for label, centroid in centroids.items():
                 if centroid is None:
                     continue
                 match = await vp_svc.match(centroid)
@@ -190,7 +222,7 @@ async def process_meeting_recording(meeting_id: str, db: AsyncSession) -> dict:
             result["steps"]["voiceprint_match"] = {"skipped": True, "reason": str(e)}
 
     # --- Step 3: Store segments ---
-    await broadcast_processing_progress({"stage": "storing", "progress": 0.0, "message": "Saving transcript..."})
+    await broadcast_processing_progress({"meeting_id": meeting_id, "stage": "storing", "progress": 0.0, "message": "Saving transcript..."})
 
     await db.execute(delete(MeetingTranscriptSegmentModel).where(MeetingTranscriptSegmentModel.meeting_id == meeting_id))
     stored_segments = []
@@ -208,7 +240,7 @@ async def process_meeting_recording(meeting_id: str, db: AsyncSession) -> dict:
         await db.refresh(ts)
 
     # --- Step 4: Summarize ---
-    await broadcast_processing_progress({"stage": "summarizing", "progress": 0.0, "message": "Generating summary..."})
+    await broadcast_processing_progress({"meeting_id": meeting_id, "stage": "summarizing", "progress": 0.0, "message": "Generating summary..."})
     try:
         from app.services.meeting_summary_service import get_meeting_summary_service
         summary_svc = get_meeting_summary_service()
@@ -221,7 +253,10 @@ async def process_meeting_recording(meeting_id: str, db: AsyncSession) -> dict:
         title = meeting.title if meeting else ""
 
         t0 = time.time()
-        summary_data = await summary_svc.summarize(transcript_text, meeting_title=title)
+        summary_data = await summary_svc.summarize(
+            transcript_text, meeting_title=title,
+            on_progress=summary_progress_broadcaster(meeting_id),
+        )
         elapsed = int((time.time() - t0) * 1000)
 
         await db.execute(delete(MeetingSummaryModel).where(MeetingSummaryModel.meeting_id == meeting_id))
@@ -236,21 +271,25 @@ async def process_meeting_recording(meeting_id: str, db: AsyncSession) -> dict:
         ))
         await db.commit()
         result["steps"]["summarization"] = {"elapsed_ms": elapsed}
-        await broadcast_processing_progress({"stage": "summarizing", "progress": 1.0, "message": "Summary generated"})
+        await broadcast_processing_progress({"meeting_id": meeting_id, "stage": "summarizing", "progress": 1.0, "message": "Summary generated"})
     except Exception as e:
         logger.warning("summarization_failed", error=str(e))
         result["steps"]["summarization"] = {"skipped": True, "reason": str(e)}
 
     # --- Step 5: Embed ---
-    await broadcast_processing_progress({"stage": "embedding", "progress": 0.0, "message": "Indexing for search..."})
+    await broadcast_processing_progress({"meeting_id": meeting_id, "stage": "embedding", "progress": 0.0, "message": "Indexing for search..."})
     try:
         from app.services.meeting_vector_service import get_meeting_vector_service
         vector_svc = get_meeting_vector_service()
 
-        seg_dicts = [{"id": ts.id, "text": ts.text, "start_time": ts.start_time} for ts in stored_segments]
+        seg_dicts = [
+            {"id": ts.id, "text": ts.text, "start_time": ts.start_time,
+             "end_time": ts.end_time, "speaker": ts.speaker}
+            for ts in stored_segments
+        ]
         count = await vector_svc.embed_segments(meeting_id, seg_dicts, db)
         result["steps"]["embedding"] = {"chunks_indexed": count}
-        await broadcast_processing_progress({"stage": "embedding", "progress": 1.0, "message": f"Indexed {count} chunks"})
+        await broadcast_processing_progress({"meeting_id": meeting_id, "stage": "embedding", "progress": 1.0, "message": f"Indexed {count} chunks"})
     except Exception as e:
         logger.warning("embedding_failed", error=str(e))
         result["steps"]["embedding"] = {"skipped": True, "reason": str(e)}
@@ -323,6 +362,6 @@ async def process_meeting_recording(meeting_id: str, db: AsyncSession) -> dict:
 
     total_elapsed = int((time.time() - total_start) * 1000)
     result["total_elapsed_ms"] = total_elapsed
-    await broadcast_processing_progress({"stage": "complete", "progress": 1.0, "message": f"Processing complete ({total_elapsed / 1000:.1f}s)"})
+    await broadcast_processing_progress({"meeting_id": meeting_id, "stage": "complete", "progress": 1.0, "message": f"Processing complete ({total_elapsed / 1000:.1f}s)"})
     logger.info("meeting_processing_complete", meeting_id=meeting_id, elapsed_ms=total_elapsed)
     return result
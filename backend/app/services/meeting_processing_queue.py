@@ -0,0 +1,324 @@
+"""Meeting-processing job queue and the worker pool behind it.
+
+``process_meeting_recording`` used to call faster-whisper, pyannote and the
+voiceprint model directly from the event loop, freezing the API for the
+length of a transcription. The blocking stages now run in a spawn-based
+process pool (``meeting_processing_workers`` processes) whose workers load
+the models once at start-up and keep them warm:
+
+    transcribe   audio -> whisper segments
+    diarize      audio + segments -> raw speaker turns + aligned segments
+    centroids    audio + speaker turns -> one voiceprint centroid per label
+
+The async pipeline awaits each stage via ``run_meeting_stage`` and reports
+progress between stages. ``MeetingProcessingQueue`` runs whole recordings
+as background jobs, at most ``meeting_processing_workers`` at a time, one
+job per meeting, with status and cancellation. Cancelling a job stops it at
+the next await; a stage already running in a worker finishes there and its
+result is dropped.
+
+With ``meeting_processing_workers=0`` stages run in a single background
+thread in the API process instead — still off the event loop, just not in
+parallel. A stage whose worker died (broken pool) reruns there too; the
+next stage starts a fresh pool.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import structlog
+
+from app.infrastructure.config import get_settings
+
+logger = structlog.get_logger(__name__)
+
+
+# ---------- worker-side stages (run in pool processes) ----------
+
+
+def _warm_worker() -> None:
+    """Pool initializer: load the meeting models before the first job arrives."""
+    from app.services.meeting_diarization_service import get_meeting_diarization_service
+    from app.services.meeting_transcription_service import get_meeting_transcription_service
+    from app.services.voiceprint_service import get_voiceprint_service
+
+    loaders = [get_meeting_transcription_service()]
+    if get_settings().hf_token:
+        loaders += [get_meeting_diarization_service(), get_voiceprint_service()]
+    for svc in loaders:
+        try:
+            if not svc.is_loaded:
+                svc.load_model()
+        except Exception as e:  # noqa: BLE001 - the stage retries and reports
+            logger.warning("meeting_worker_warmup_failed", model=type(svc).__name__, error=str(e))
+
+
+def _ping() -> bool:
+    return True
+
+
+def transcribe_stage(audio_path: str) -> List[Dict[str, Any]]:
+    from app.services.meeting_transcription_service import get_meeting_transcription_service
+
+    transcription = get_meeting_transcription_service()
+    if not transcription.is_loaded:
+        transcription.load_model()
+    return transcription.transcribe(Path(audio_path))
+
+
+def diarize_stage(
+    audio_path: str, segments: List[Dict[str, Any]]
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Returns (raw diarization turns, transcript segments with speakers)."""
+    from app.services.meeting_diarization_service import get_meeting_diarization_service
+
+    diarization = get_meeting_diarization_service()
+    if not diarization.is_loaded:
+        diarization.load_model()
+    raw = diarization.diarize(Path(audio_path))
+    return raw, diarization.align_with_transcript(raw, segments)
+
+
+def centroids_stage(audio_path: str, clusters: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """Voiceprint centroid (or None) per diarization label."""
+    from app.services.voiceprint_service import get_voiceprint_service
+
+    vp_svc = get_voiceprint_service()
+    return {
+        label: vp_svc.compute_cluster_centroid(Path(audio_path), segs)
+        for label, segs in clusters.items()
+    }
+
+
+# ---------- pool ----------
+
+_pool: Optional[ProcessPoolExecutor] = None
+_thread_pool: Optional[ThreadPoolExecutor] = None
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: forking the multi-threaded API process (and CUDA) is unsafe.
+        _pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_worker,
+        )
+    return _pool
+
+
+def _get_thread_pool() -> ThreadPoolExecutor:
+    global _thread_pool
+    if _thread_pool is None:
+        # One thread: the in-process models are not safe to share across threads.
+        _thread_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="meeting-stage")
+    return _thread_pool
+
+
+def shutdown_meeting_pool() -> None:
+    """Stop the worker processes (graceful shutdown)."""
+    global _pool, _thread_pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+    threads, _thread_pool = _thread_pool, None
+    if threads is not None:
+        threads.shutdown(wait=False, cancel_futures=True)
+
+
+def _discard_broken_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next stage starts a fresh one.
+
+    Other stages' futures on it fail with BrokenProcessPool by themselves;
+    nothing is cancelled here.
+    """
+    global _pool
+    if _pool is pool:
+        _pool = None
+        pool.shutdown(wait=False)
+
+
+async def run_meeting_stage(fn: Callable[..., Any], *args: Any) -> Any:
+    """Run a blocking meeting stage off the event loop (process pool, else thread).
+
+    Exceptions raised by the stage itself propagate; only a broken pool
+    sends this stage to the thread fallback.
+    """
+    loop = asyncio.get_running_loop()
+    workers = get_settings().meeting_processing_workers
+    if workers > 0:
+        pool = _get_pool(workers)
+        try:
+            return await loop.run_in_executor(pool, fn, *args)
+        except BrokenProcessPool as e:
+            logger.warning("meeting_pool_broken", stage=fn.__name__, error=str(e))
+            _discard_broken_pool(pool)
+    return await loop.run_in_executor(_get_thread_pool(), fn, *args)
+
+
+async def prewarm_meeting_workers() -> None:
+    """Start every worker now so the models are loaded before the first meeting."""
+    workers = get_settings().meeting_processing_workers
+    if workers <= 0:
+        return
+    loop = asyncio.get_running_loop()
+    try:
+        pool = _get_pool(workers)
+        await asyncio.gather(*(loop.run_in_executor(pool, _ping) for _ in range(workers)))
+        logger.info("meeting_workers_warm", workers=workers)
+    except Exception as e:  # noqa: BLE001
+        logger.warning("meeting_workers_prewarm_failed", error=str(e))
+
+
+# ---------- job queue ----------
+
+
+@dataclass
+class MeetingJob:
+    meeting_id: str
+    status: str = "queued"  # queued | running | completed | failed | cancelled
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "meeting_id": self.meeting_id,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+            "total_elapsed_ms": (self.result or {}).get("total_elapsed_ms"),
+        }
+
+
+class MeetingProcessingQueue:
+    """Background meeting-processing jobs, bounded by the worker count."""
+
+    _KEEP_FINISHED = 50
+
+    def __init__(self) -> None:
+        self._jobs: Dict[str, MeetingJob] = {}
+        self._sem: Optional[asyncio.Semaphore] = None
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(max(1, get_settings().meeting_processing_workers))
+        return self._sem
+
+    def submit(
+        self,
+        meeting_id: str,
+        on_complete: Optional[Callable[[], Awaitable[None]]] = None,
+    ) -> Dict[str, Any]:
+        """Queue ``meeting_id`` for processing; a no-op if it is already queued or running."""
+        job = self._jobs.get(meeting_id)
+        if job is not None and job.status in ("queued", "running"):
+            return job.to_dict()
+        job = MeetingJob(meeting_id=meeting_id)
+        self._jobs[meeting_id] = job
+        job.task = asyncio.create_task(self._run(job, on_complete))
+        self._prune()
+        return job.to_dict()
+
+    def status(self, meeting_id: str) -> Optional[Dict[str, Any]]:
+        job = self._jobs.get(meeting_id)
+        return job.to_dict() if job else None
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        return [j.to_dict() for j in sorted(self._jobs.values(), key=lambda j: j.submitted_at)]
+
+    def cancel(self, meeting_id: str) -> bool:
+        job = self._jobs.get(meeting_id)
+        if job is None or job.task is None or job.task.done():
+            return False
+        job.task.cancel()
+        return True
+
+    async def _run(
+        self,
+        job: MeetingJob,
+        on_complete: Optional[Callable[[], Awaitable[None]]],
+    ) -> None:
+        from app.infrastructure.database import get_session
+        from app.services.meeting_processing_pipeline import (
+            broadcast_processing_progress,
+            process_meeting_recording,
+        )
+
+        try:
+            async with self._semaphore():
+                job.status = "running"
+                job.started_at = time.time()
+                async with get_session() as db:
+                    job.result = await process_meeting_recording(job.meeting_id, db)
+            job.status = "completed"
+            logger.info("meeting_pipeline_complete", meeting_id=job.meeting_id)
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            logger.info("meeting_pipeline_cancelled", meeting_id=job.meeting_id)
+            await self._mark_meeting(job.meeting_id, "cancelled")
+            await broadcast_processing_progress({
+                "meeting_id": job.meeting_id, "stage": "cancelled", "progress": 1.0,
+                "message": "Processing cancelled",
+            })
+            return
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            logger.error("meeting_pipeline_failed", meeting_id=job.meeting_id, error=str(e))
+            await self._mark_meeting(job.meeting_id, "failed")
+            return
+        finally:
+            job.finished_at = time.time()
+
+        if on_complete is not None:
+            try:
+                await on_complete()
+            except Exception as e:  # noqa: BLE001
+                logger.debug("meeting_pipeline_on_complete_failed", error=str(e))
+
+    @staticmethod
+    async def _mark_meeting(meeting_id: str, status: str) -> None:
+        try:
+            from sqlalchemy import update
+
+            from app.db.models import MeetingModel
+            from app.infrastructure.database import get_session
+
+            async with get_session() as db:
+                await db.execute(
+                    update(MeetingModel).where(MeetingModel.id == meeting_id).values(status=status)
+                )
+                await db.commit()
+        except Exception:
+            logger.error("failed_to_mark_meeting", meeting_id=meeting_id, status=status)
+
+    def _prune(self) -> None:
+        finished = [j for j in self._jobs.values() if j.status not in ("queued", "running")]
+        finished.sort(key=lambda j: j.submitted_at)
+        for job in finished[: max(0, len(finished) - self._KEEP_FINISHED)]:
+            self._jobs.pop(job.meeting_id, None)
+
+
+_queue: Optional[MeetingProcessingQueue] = None
+
+
+def get_meeting_processing_queue() -> MeetingProcessingQueue:
+    global _queue
+    if _queue is None:
+        _queue = MeetingProcessingQueue()
+    return _queue
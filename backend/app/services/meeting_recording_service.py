@@ -12,7 +12,6 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models import MeetingModel, MeetingRecordingModel
 from app.infrastructure.config import get_settings, get_recordings_path
-from app.infrastructure.database import get_session
 logger = structlog.get_logger(__name__)
 
 _audio_capture = None
@@ -252,7 +251,7 @@ async def stop_recording(db: AsyncSession) -> dict | None:
             pass
 
         meeting_id = recording.meeting_id
-        asyncio.create_task(_run_processing_pipeline(meeting_id))
+        await _run_processing_pipeline(meeting_id)
 
         return {
             "meeting_id": meeting_id, "recording_id": recording.id,
@@ -262,24 +261,13 @@ async def stop_recording(db: AsyncSession) -> dict | None:
 
 
 async def _run_processing_pipeline(meeting_id: str) -> None:
-    try:
-        from app.services.meeting_processing_pipeline import process_meeting_recording
-        async with get_session() as db:
-            await process_meeting_recording(meeting_id, db)
-            logger.info("meeting_pipeline_complete", meeting_id=meeting_id)
+    from app.services.meeting_processing_queue import get_meeting_processing_queue
+
+    async def _announce() -> None:
         if get_settings().reachy_tts_confirmations:
             asyncio.create_task(_reachy_say_quiet("Summary ready"))
-    except Exception as e:
-        logger.error("meeting_pipeline_failed", meeting_id=meeting_id, error=str(e))
-        try:
-            async with get_session() as db:
-                result = await db.execute(select(MeetingModel).where(MeetingModel.id == meeting_id))
-                meeting = result.scalar_one_or_none()
-                if meeting:
-                    meeting.status = "failed"
-                    await db.commit()
-        except Exception:
-            logger.error("failed_to_mark_meeting_failed", meeting_id=meeting_id)
+
+    get_meeting_processing_queue().submit(meeting_id, on_complete=_announce)
 
 
 async def _reachy_say_quiet(text: str) -> None:
@@ -1,14 +1,79 @@
-"""Meeting search: full-text (PostgreSQL tsvector) + semantic (pgvector) hybrid."""
+"""Meeting search: full-text (PostgreSQL tsvector) + semantic (pgvector) hybrid.
+
+The hybrid mode fuses both rankings with RRF in a single statement. The
+BM25 side ranks transcript segments, so meetings whose chunks were never
+embedded (pending, failed or pre-chunk transcripts) are still found; the
+dense side ranks the embedded chunks (see meeting_vector_service). A
+segment hit is fused into the chunk that contains it, or stands alone
+when its meeting has no chunk rows. Snippets are cut in SQL so only the
+final ``limit`` rows cross the wire. Full-text mode stays per segment.
+"""
 
 from typing import Optional
 import structlog
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.services.hybrid_search import RRF_K, vector_literal
 from app.services.meeting_vector_service import get_meeting_vector_service
 
 logger = structlog.get_logger(__name__)
 
+# The BM25 tsvector must match ix_meeting_segments_text_tsv (migration 051).
+_BM25_CTES = """
+    q AS (SELECT plainto_tsquery('english', :q) AS tsq),
+    bm25_top AS (
+        SELECT s.id AS seg_id, s.meeting_id, ts_rank_cd(to_tsvector('english', s.text), q.tsq) AS r
+          FROM meeting_transcript_segments s, q
+         WHERE to_tsvector('english', s.text) @@ q.tsq
+         ORDER BY r DESC
+         LIMIT :k
+    ),
+    bm25 AS (
+        SELECT coalesce(c.id, 'segment:' || b.seg_id) AS key, b.seg_id,
+               row_number() OVER (ORDER BY b.r DESC) AS rnk
+          FROM bm25_top b
+          LEFT JOIN meeting_transcript_chunks c
+            ON c.meeting_id = b.meeting_id AND b.seg_id = ANY(c.segment_ids)
+    )"""
+
+_DENSE_CTES = """
+    dense_top AS (
+        SELECT c.id, c.embedding <=> CAST(:emb AS vector) AS d
+          FROM meeting_transcript_chunks c
+         WHERE c.embedding IS NOT NULL
+         ORDER BY c.embedding <=> CAST(:emb AS vector)
+         LIMIT :k
+    ),
+    dense AS (
+        SELECT id AS key, NULL::int AS seg_id, row_number() OVER (ORDER BY d ASC) AS rnk
+          FROM dense_top
+    )"""
+
+
+def _hybrid_sql(dense: bool) -> str:
+    sides = "SELECT * FROM bm25" + (" UNION ALL SELECT * FROM dense" if dense else "")
+    return f"""
+        WITH {_BM25_CTES},{_DENSE_CTES if dense else ""}{"," if dense else ""}
+        fused AS (
+            SELECT key, sum(1.0 / ({RRF_K} + rnk)) AS rrf, min(seg_id) AS seg_id
+              FROM ({sides}) sides
+             GROUP BY key
+        )
+        SELECT coalesce(c.meeting_id, s.meeting_id) AS meeting_id,
+               m.title AS meeting_title,
+               left(coalesce(c.text, s.text), 300) AS snippet,
+               coalesce(c.start_time, s.start_time) AS start_time,
+               coalesce(array_to_string(c.speakers, ', '), s.speaker) AS speaker,
+               f.rrf AS score
+          FROM fused f
+          LEFT JOIN meeting_transcript_chunks c ON c.id = f.key
+          LEFT JOIN meeting_transcript_segments s ON c.id IS NULL AND s.id = f.seg_id
+          JOIN meetings m ON m.id = coalesce(c.meeting_id, s.meeting_id)
+         ORDER BY score DESC
+         LIMIT :top_k
+    """
+
 
 class MeetingSearchService:
     async def search(
@@ -26,14 +91,26 @@ class MeetingSearchService:
         elif search_type == "fulltext":
             return await self._fulltext_search(query, db, limit)
         else:
-            # Hybrid: combine both, deduplicate (graceful if semantic fails)
-            ft_results = await self._fulltext_search(query, db, limit)
-            try:
-                sem_results = await self._semantic_search(query, db, limit)
-            except Exception as e:
-                logger.warning("semantic_search_fallback", error=str(e))
-                sem_results = []
-            return self._merge_results(ft_results, sem_results, limit)
+            return await self._hybrid_search(query, db, limit)
+
+    async def _hybrid_search(self, query: str, db: AsyncSession, limit: int) -> list[dict]:
+        """One-statement BM25 + dense RRF (degrades to BM25 if embedding fails)."""
+        try:
+            embedding = await get_meeting_vector_service().embed_text(query)
+        except Exception as e:
+            logger.warning("semantic_search_fallback", error=str(e))
+            embedding = None
+        params = {"q": query, "k": max(limit, 20), "top_k": limit}
+        if embedding:
+            params["emb"] = vector_literal(embedding)
+        result = await db.execute(text(_hybrid_sql(dense=bool(embedding))), params)
+        return [
+            {"meeting_id": r.meeting_id, "meeting_title": r.meeting_title or "",
+             "snippet": r.snippet or "", "score": float(r.score),
+             "timestamp": r.start_time, "speaker": r.speaker,
+             "source": "hybrid"}
+            for r in result.fetchall()
+        ]
 
     async def _fulltext_search(self, query: str, db: AsyncSession, limit: int) -> list[dict]:
         sql = text("""
@@ -65,17 +142,6 @@ class MeetingSearchService:
             for r in results
         ]
 
-    def _merge_results(self, ft: list[dict], sem: list[dict], limit: int) -> list[dict]:
-        seen = set()
-        merged = []
-        for r in ft + sem:
-            key = (r["meeting_id"], r.get("timestamp"))
-            if key not in seen:
-                seen.add(key)
-                merged.append(r)
-        merged.sort(key=lambda x: x["score"], reverse=True)
-        return merged[:limit]
-
 
 _instance: MeetingSearchService | None = None
 
@@ -2,11 +2,28 @@
 
 Uses the UnifiedLLMClient so routing honors LOCAL_LLM_BACKEND (vllm or ollama)
 plus the budget fallback to Kimi / OpenRouter when the local backend fails.
+
+Long transcripts are split into sections that are summarized concurrently
+(``meeting_summary_concurrency``); each finished section is reported through
+the optional ``on_progress`` callback as it lands. Section summaries are
+cached by a hash of their input, in memory and as JSON files under
+``<workspace>/cache/meeting_sections``, so reprocessing a meeting or retrying
+a failed reduce only pays for sections that never completed. When the
+section summaries are themselves too long for one reduce call they are
+merged in groups first (also cached), level by level, until they fit.
 """
 
+import asyncio
+import hashlib
 import json
+import os
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
 import structlog
 
+from app.infrastructure.config import get_settings
+from app.infrastructure.ttl_cache import TTLCache
 from app.infrastructure.unified_llm_client import get_unified_llm_client
 
 logger = structlog.get_logger(__name__)
@@ -14,6 +31,12 @@ logger = structlog.get_logger(__name__)
 _CHARS_PER_TOKEN = 4
 _SINGLE_PASS_TOKEN_LIMIT = 4000
 _CHUNK_TOKEN_TARGET = 3000
+# Largest combined section text sent to a single reduce call.
+_REDUCE_TOKEN_LIMIT = 6000
+# Bump when the section / merge prompts change so old cache entries miss.
+_SECTION_CACHE_VERSION = 1
+
+ProgressCallback = Callable[[dict], Awaitable[None]]
 
 _SUMMARIZE_SYSTEM = (
     "You are an expert meeting analyst. You produce concise, well-structured "
@@ -112,6 +135,29 @@ Respond with a JSON object containing exactly these fields:
 """
 
 
+_MERGE_PROMPT = """\
+Merge these consecutive section summaries of a meeting transcript into one
+section summary covering all of them.
+
+Meeting title: {title}
+
+Section summaries:
+---
+{section_summaries}
+---
+
+Respond with a JSON object:
+{{
+  "section_summary": "<summary of these sections>",
+  "key_topics": ["<topic>", ...],
+  "action_items": [
+    {{"owner": "<person or 'Unassigned'>", "description": "<task>", "due": "<deadline or null>"}}
+  ],
+  "decisions": ["<decision>", ...]
+}}
+"""
+
+
 def _estimate_tokens(text: str) -> int:
     return len(text) // _CHARS_PER_TOKEN
 
@@ -147,8 +193,96 @@ def _parse_json_response(raw: str) -> dict:
     return json.loads(text)
 
 
+def _format_sections(sections: list[dict], start: int = 1) -> str:
+    return "\n\n".join(
+        f"--- Section {i} ---\nSummary: {s.get('section_summary', '')}\nTopics: {', '.join(s.get('key_topics', []))}"
+        for i, s in enumerate(sections, start=start)
+    )
+
+
+def _group_sections(sections: list[dict], token_limit: int) -> list[list[dict]]:
+    """Consecutive groups whose formatted text stays under ``token_limit`` (at least 2 per group)."""
+    groups: list[list[dict]] = []
+    current: list[dict] = []
+    for section in sections:
+        if len(current) >= 2 and _estimate_tokens(_format_sections(current + [section])) > token_limit:
+            groups.append(current)
+            current = []
+        current.append(section)
+    if current:
+        groups.append(current)
+    return groups
+
+
+class SectionCache:
+    """Section summaries keyed by content hash: an in-process LRU over JSON files."""
+
+    def __init__(self, directory: Optional[Path] = None):
+        self._dir = directory
+        self._memory: TTLCache[dict] = TTLCache("meeting_sections", max_entries=1024, ttl_s=7 * 86400)
+
+    @property
+    def directory(self) -> Path:
+        if self._dir is None:
+            self._dir = Path(get_settings().workspace_dir).resolve() / "cache" / "meeting_sections"
+        return self._dir
+
+    @staticmethod
+    def key(kind: str, title: str, text: str) -> str:
+        payload = json.dumps([_SECTION_CACHE_VERSION, kind, title, text], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[dict]:
+        hit = self._memory.get(key)
+        if hit is not None:
+            return hit
+        try:
+            hit = await asyncio.to_thread(self._read, key)
+        except Exception as e:  # noqa: BLE001 - a bad cache entry is a miss
+            logger.debug("meeting_section_cache_read_failed", error=str(e))
+            return None
+        if hit is not None:
+            self._memory.set(key, hit)
+        return hit
+
+    async def set(self, key: str, value: dict) -> None:
+        self._memory.set(key, value)
+        try:
+            await asyncio.to_thread(self._write, key, value)
+        except Exception as e:  # noqa: BLE001
+            logger.debug("meeting_section_cache_write_failed", error=str(e))
+
+    def _read(self, key: str) -> Optional[dict]:
+        path = self.directory / f"{key}.json"
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def _write(self, key: str, value: dict) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{key}.json"
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(value, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+
+
 class MeetingSummaryService:
-    async def summarize(self, transcript_text: str, meeting_title: str = "") -> dict:
+    def __init__(self, cache: Optional[SectionCache] = None) -> None:
+        self._cache = cache or SectionCache()
+
+    async def summarize(
+        self,
+        transcript_text: str,
+        meeting_title: str = "",
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> dict:
+        """Summarize a transcript.
+
+        ``on_progress`` (long transcripts only) is awaited with
+        ``{"completed", "total", "section_index", "section", "cached"}`` as
+        each section finishes, then with ``{"stage": "reduce", ...}`` before
+        each reduce level.
+        """
         if not transcript_text.strip():
             return {"summary_text": "", "key_topics": [], "action_items": [], "decisions": []}
         title = meeting_title or "Untitled Meeting"
@@ -156,7 +290,7 @@ class MeetingSummaryService:
         logger.info("summarizing_meeting", title=title, estimated_tokens=estimated_tokens)
         if estimated_tokens <= _SINGLE_PASS_TOKEN_LIMIT:
             return await self._single_pass(transcript_text, title)
-        return await self._map_reduce(transcript_text, title)
+        return await self._map_reduce(transcript_text, title, on_progress)
 
     async def _single_pass(self, transcript: str, title: str) -> dict:
         client = get_unified_llm_client()
@@ -168,28 +302,60 @@ class MeetingSummaryService:
         result = _parse_json_response(raw)
         return self._normalize(result)
 
-    async def _map_reduce(self, transcript: str, title: str) -> dict:
+    async def _map_reduce(
+        self,
+        transcript: str,
+        title: str,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> dict:
         client = get_unified_llm_client()
         chunks = _split_transcript(transcript)
         total = len(chunks)
         logger.info("map_reduce_summarization", chunks=total)
-        section_summaries = []
-        for i, chunk in enumerate(chunks, start=1):
-            prompt = _CHUNK_SUMMARY_PROMPT.format(title=title, chunk_index=i, total_chunks=total, chunk=chunk)
-            try:
-                raw = await client.chat(
-                    prompt, system=_SUMMARIZE_SYSTEM, temperature=0.1,
-                    task_type="summary",
-                )
-                section_summaries.append(_parse_json_response(raw))
-            except Exception as e:
-                logger.warning("chunk_summarization_failed", chunk=i, error=str(e))
-                section_summaries.append({"section_summary": f"[Section {i} failed]", "key_topics": [], "action_items": [], "decisions": []})
-        combined = "\n\n".join(
-            f"--- Section {i} ---\nSummary: {s.get('section_summary', '')}\nTopics: {', '.join(s.get('key_topics', []))}"
-            for i, s in enumerate(section_summaries, start=1)
-        )
-        reduce_prompt = _COMBINE_PROMPT.format(title=title, section_summaries=combined)
+
+        sem = asyncio.Semaphore(max(1, get_settings().meeting_summary_concurrency))
+        section_summaries: list[Optional[dict]] = [None] * total
+        completed = 0
+
+        async def _map(i: int, chunk: str) -> None:
+            nonlocal completed
+            key = self._cache.key("section", title, chunk)
+            section = await self._cache.get(key)
+            cached = section is not None
+            if section is None:
+                prompt = _CHUNK_SUMMARY_PROMPT.format(title=title, chunk_index=i + 1, total_chunks=total, chunk=chunk)
+                try:
+                    async with sem:
+                        raw = await client.chat(
+                            prompt, system=_SUMMARIZE_SYSTEM, temperature=0.1,
+                            task_type="summary",
+                        )
+                    section = _parse_json_response(raw)
+                    await self._cache.set(key, section)
+                except Exception as e:
+                    logger.warning("chunk_summarization_failed", chunk=i + 1, error=str(e))
+                    section = {"section_summary": f"[Section {i + 1} failed]", "key_topics": [], "action_items": [], "decisions": []}
+            section_summaries[i] = section
+            completed += 1
+            await self._report(on_progress, {
+                "completed": completed, "total": total, "section_index": i + 1,
+                "section": section, "cached": cached,
+            })
+
+        await asyncio.gather(*(_map(i, chunk) for i, chunk in enumerate(chunks)))
+        sections: list[dict] = [s for s in section_summaries if s is not None]
+
+        # Hierarchical reduce: merge groups of sections until one call fits.
+        level = 0
+        while len(sections) > 1 and _estimate_tokens(_format_sections(sections)) > _REDUCE_TOKEN_LIMIT:
+            level += 1
+            groups = _group_sections(sections, _REDUCE_TOKEN_LIMIT)
+            await self._report(on_progress, {"stage": "reduce", "level": level, "groups": len(groups)})
+            logger.info("map_reduce_merge_level", level=level, sections=len(sections), groups=len(groups))
+            sections = list(await asyncio.gather(*(self._merge(group, title, sem) for group in groups)))
+
+        await self._report(on_progress, {"stage": "reduce", "level": level + 1, "groups": 1})
+        reduce_prompt = _COMBINE_PROMPT.format(title=title, section_summaries=_format_sections(sections))
         raw = await client.chat(
             reduce_prompt, system=_SUMMARIZE_SYSTEM, temperature=0.1,
             task_type="summary",
@@ -197,6 +363,33 @@ class MeetingSummaryService:
         result = _parse_json_response(raw)
         return self._normalize(result)
 
+    async def _merge(self, group: list[dict], title: str, sem: asyncio.Semaphore) -> dict:
+        """Merge consecutive section summaries into one (cached like sections)."""
+        if len(group) == 1:
+            return group[0]
+        text = _format_sections(group)
+        key = self._cache.key("merge", title, text)
+        merged = await self._cache.get(key)
+        if merged is not None:
+            return merged
+        async with sem:
+            raw = await get_unified_llm_client().chat(
+                _MERGE_PROMPT.format(title=title, section_summaries=text),
+                system=_SUMMARIZE_SYSTEM, temperature=0.1, task_type="summary",
+            )
+        merged = _parse_json_response(raw)
+        await self._cache.set(key, merged)
+        return merged
+
+    @staticmethod
+    async def _report(on_progress: Optional[ProgressCallback], event: dict) -> None:
+        if on_progress is None:
+            return
+        try:
+            await on_progress(event)
+        except Exception as e:  # noqa: BLE001 - progress is best-effort
+            logger.debug("summary_progress_callback_failed", error=str(e))
+
     async def live_tick(
         self,
         chunk_text: str,
@@ -51,6 +51,7 @@ class MeetingTranscriptionService:
         segments_iter, info = self._model.transcribe(
             str(audio_path), language=settings.whisper_language,
             beam_size=5, vad_filter=True, vad_parameters=dict(min_silence_duration_ms=500),
+            word_timestamps=settings.whisper_word_timestamps,
         )
         segments = []
         for seg in segments_iter:
@@ -60,12 +61,20 @@ class MeetingTranscriptionService:
                 getattr(seg, "avg_logprob", None)
                 or getattr(seg, "avg_log_prob", None)
             )
-            segments.append({
+            entry = {
                 "start": round(seg.start, 3),
                 "end": round(seg.end, 3),
                 "text": seg.text.strip(),
                 "confidence": round(confidence, 4) if confidence is not None else None,
-            })
+            }
+            # Word timings let diarization alignment split a segment at a
+            # speaker change; they are not stored.
+            if getattr(seg, "words", None):
+                entry["words"] = [
+                    {"start": round(w.start, 3), "end": round(w.end, 3), "word": w.word}
+                    for w in seg.words
+                ]
+            segments.append(entry)
         elapsed = time.perf_counter() - start
         logger.info("transcription_complete", segments=len(segments), elapsed=f"{elapsed:.2f}s",
                     audio_duration=f"{info.duration:.1f}s", language=info.language)
@@ -1,16 +1,32 @@
-"""Meeting vector search using pgvector + the shared embedding client."""
+"""Meeting vector search using pgvector + the shared embedding client.
 
+Transcripts are grouped into ~500-token chunks of consecutive segments;
+each chunk is embedded once (``embed_batch``, several chunks per call) and
+stored as a row of ``meeting_transcript_chunks`` with one bulk insert per
+meeting. Search across meetings runs against that table's HNSW index,
+with ``hnsw.ef_search`` set per query from ``meeting_vector_ef_search``;
+search within one meeting is an exact scan of that meeting's chunks.
+"""
+
+import asyncio
 from typing import Optional
 
 import structlog
-from sqlalchemy import select, text, delete
+from sqlalchemy import delete, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.models import MeetingTranscriptSegmentModel, MeetingModel
+from app.db.models import MeetingTranscriptChunkModel
+from app.infrastructure.config import get_settings
 from app.infrastructure.ollama_client import get_llm_client
+from app.services.hybrid_search import vector_literal
 
 logger = structlog.get_logger(__name__)
 
+# Rows per multi-row INSERT. 9 bind params per row keeps us far below
+# Postgres' 32767 parameter cap.
+_WRITE_BATCH_ROWS = 500
+
 
 class MeetingVectorService:
     """Embedding and vector search for meeting transcripts using pgvector."""
@@ -20,27 +36,56 @@ class MeetingVectorService:
         return await get_llm_client().embed(text_input)
 
     async def embed_segments(self, meeting_id: str, segments: list[dict], db: AsyncSession) -> int:
-        """Generate embeddings for transcript segments and store in DB."""
-        # Chunk segments into groups for embedding
+        """Embed transcript chunks in batches and replace the meeting's chunk rows.
+
+        Returns the number of chunks stored. A failed embed batch drops only
+        its own chunks.
+        """
         chunks = self._chunk_segments(segments, max_tokens=500)
-        embedded_count = 0
+        embeddings = await self._embed_chunks([c["text"] for c in chunks])
+
+        rows = [
+            {
+                "id": f"{meeting_id}:{idx}",
+                "meeting_id": meeting_id,
+                "chunk_idx": idx,
+                "start_time": chunk["start"] or 0.0,
+                "end_time": chunk["end"] or chunk["start"] or 0.0,
+                "speakers": chunk["speakers"],
+                "text": chunk["text"],
+                "segment_ids": chunk["segment_ids"],
+                "embedding": emb,
+            }
+            for idx, (chunk, emb) in enumerate(zip(chunks, embeddings))
+            if emb
+        ]
 
-        for chunk in chunks:
+        await db.execute(
+            delete(MeetingTranscriptChunkModel).where(MeetingTranscriptChunkModel.meeting_id == meeting_id)
+        )
+        for i in range(0, len(rows), _WRITE_BATCH_ROWS):
+            await db.execute(pg_insert(MeetingTranscriptChunkModel).values(rows[i:i + _WRITE_BATCH_ROWS]))
+        await db.commit()
+        logger.info("segments_embedded", meeting_id=meeting_id, chunks=len(rows), total=len(chunks))
+        return len(rows)
+
+    async def _embed_chunks(self, texts: list[str]) -> list[Optional[list[float]]]:
+        """``embed_batch`` over ``texts`` in concurrent slices; None where a slice failed."""
+        size = max(1, get_settings().meeting_embed_batch_size)
+        client = get_llm_client()
+
+        async def _one(batch: list[str]) -> list[Optional[list[float]]]:
             try:
-                embedding = await self.embed_text(chunk["text"])
-                # Update the transcript segments that belong to this chunk
-                for seg_id in chunk.get("segment_ids", []):
-                    await db.execute(
-                        text("UPDATE meeting_transcript_segments SET embedding = :emb WHERE id = :id"),
-                        {"emb": str(embedding), "id": seg_id},
-                    )
-                embedded_count += 1
+                vecs = await client.embed_batch(batch)
+                if len(vecs) == len(batch):
+                    return list(vecs)
+                logger.warning("embedding_batch_size_mismatch", expected=len(batch), got=len(vecs))
             except Exception as e:
-                logger.warning("embedding_failed", chunk=chunk.get("text", "")[:50], error=str(e))
+                logger.warning("embedding_failed", chunks=len(batch), error=str(e))
+            return [None] * len(batch)
 
-        await db.commit()
-        logger.info("segments_embedded", meeting_id=meeting_id, chunks=embedded_count)
-        return embedded_count
+        results = await asyncio.gather(*(_one(texts[i:i + size]) for i in range(0, len(texts), size)))
+        return [vec for batch in results for vec in batch]
 
     async def search_similar(
         self,
@@ -48,87 +93,103 @@ class MeetingVectorService:
         db: AsyncSession,
         meeting_id: Optional[str] = None,
         top_k: int = 8,
+        ef_search: Optional[int] = None,
     ) -> list[dict]:
-        """Search for similar transcript segments using cosine distance."""
+        """Nearest transcript chunks by cosine distance.
+
+        Without ``meeting_id`` this is an HNSW search; ``ef_search``
+        overrides ``meeting_vector_ef_search`` for it and must be at least
+        ``top_k`` for HNSW to return ``top_k`` rows. With ``meeting_id`` the
+        meeting's chunks are scanned exactly: HNSW applies the WHERE filter
+        after collecting ``ef_search`` candidates, so a filtered index scan
+        returns fewer than ``top_k`` rows whenever the meeting holds only a
+        small share of the table.
+        """
         query_embedding = await self.embed_text(query)
 
-        # Build query with pgvector cosine distance
-        emb_str = "[" + ",".join(str(x) for x in query_embedding) + "]"
-
         if meeting_id:
-            sql = text("""
-                SELECT ts.id, ts.meeting_id, ts.speaker, ts.start_time, ts.end_time, ts.text,
-                       ts.embedding <=> CAST(:emb AS vector) AS distance,
-                       m.title as meeting_title
-                FROM meeting_transcript_segments ts
-                JOIN meetings m ON m.id = ts.meeting_id
-                WHERE ts.embedding IS NOT NULL AND ts.meeting_id = :mid
-                ORDER BY ts.embedding <=> CAST(:emb AS vector)
-                LIMIT :k
-            """)
-            result = await db.execute(sql, {"emb": emb_str, "mid": meeting_id, "k": top_k})
+            # MATERIALIZED keeps the planner from pushing the ORDER BY into
+            # the HNSW index; the meeting's rows come off the meeting_id index.
+            scope = """WITH scoped AS MATERIALIZED (
+                SELECT * FROM meeting_transcript_chunks WHERE meeting_id = :mid
+            )"""
+            source = "scoped"
         else:
-            sql = text("""
-                SELECT ts.id, ts.meeting_id, ts.speaker, ts.start_time, ts.end_time, ts.text,
-                       ts.embedding <=> CAST(:emb AS vector) AS distance,
-                       m.title as meeting_title
-                FROM meeting_transcript_segments ts
-                JOIN meetings m ON m.id = ts.meeting_id
-                WHERE ts.embedding IS NOT NULL
-                ORDER BY ts.embedding <=> CAST(:emb AS vector)
-                LIMIT :k
-            """)
-            result = await db.execute(sql, {"emb": emb_str, "k": top_k})
-
-        rows = result.fetchall()
-        results = []
-        for row in rows:
-            results.append({
+            ef = max(int(ef_search or get_settings().meeting_vector_ef_search), top_k)
+            # SET LOCAL lasts until the end of the current transaction, which
+            # is the one the search below runs in. It takes no bind params.
+            await db.execute(text(f"SET LOCAL hnsw.ef_search = {ef}"))
+            scope, source = "", "meeting_transcript_chunks"
+
+        sql = text(f"""
+            {scope}
+            SELECT c.id, c.meeting_id, c.speakers, c.start_time, c.end_time, c.text,
+                   c.segment_ids, c.distance, m.title AS meeting_title
+              FROM (
+                SELECT c.*, c.embedding <=> CAST(:emb AS vector) AS distance
+                  FROM {source} c
+                 ORDER BY c.embedding <=> CAST(:emb AS vector)
+                 LIMIT :k
+              ) c
+              JOIN meetings m ON m.id = c.meeting_id
+             ORDER BY c.distance
+        """)
+        params = {"emb": vector_literal(query_embedding), "k": top_k}
+        if meeting_id:
+            params["mid"] = meeting_id
+        result = await db.execute(sql, params)
+
+        return [
+            {
                 "id": row.id,
                 "meeting_id": row.meeting_id,
                 "meeting_title": row.meeting_title,
-                "speaker": row.speaker,
+                "speaker": ", ".join(row.speakers) if row.speakers else None,
                 "start_time": row.start_time,
                 "end_time": row.end_time,
                 "text": row.text,
+                "segment_ids": list(row.segment_ids or []),
                 "distance": row.distance,
-            })
-        return results
+            }
+            for row in result.fetchall()
+        ]
 
     async def delete_meeting_vectors(self, meeting_id: str, db: AsyncSession) -> None:
-        """Clear embeddings for a meeting (segments still exist, just embedding=NULL)."""
+        """Drop a meeting's chunk vectors (the transcript segments are untouched)."""
         await db.execute(
-            text("UPDATE meeting_transcript_segments SET embedding = NULL WHERE meeting_id = :mid"),
-            {"mid": meeting_id},
+            delete(MeetingTranscriptChunkModel).where(MeetingTranscriptChunkModel.meeting_id == meeting_id)
         )
         await db.commit()
 
     def _chunk_segments(self, segments: list[dict], max_tokens: int = 500) -> list[dict]:
-        """Group segments into chunks for embedding."""
+        """Group consecutive segments into chunks of roughly ``max_tokens``."""
         chunks = []
-        current_text = ""
-        current_ids = []
-        current_start = None
+        current: dict | None = None
 
         for seg in segments:
             seg_text = seg.get("text", "").strip()
-            estimated_tokens = len(current_text + " " + seg_text) // 4
-            if estimated_tokens > max_tokens and current_text:
-                chunks.append({"text": current_text.strip(), "segment_ids": current_ids, "start": current_start})
-                current_text = ""
-                current_ids = []
-                current_start = None
-            if current_start is None:
-                current_start = seg.get("start_time", seg.get("start", 0))
-            current_text += " " + seg_text
+            if current is not None:
+                estimated_tokens = len(current["text"] + " " + seg_text) // 4
+                if estimated_tokens > max_tokens and current["text"].strip():
+                    chunks.append(current)
+                    current = None
+            if current is None:
+                current = {"text": "", "segment_ids": [], "speakers": [], "start": None, "end": None}
+                current["start"] = seg.get("start_time", seg.get("start", 0))
+            current["text"] += " " + seg_text
+            current["end"] = seg.get("end_time", seg.get("end", current["start"]))
             if "id" in seg:
-                current_ids.append(seg["id"])
+                current["segment_ids"].append(seg["id"])
+            speaker = seg.get("speaker")
+            if speaker and speaker not in current["speakers"]:
+                current["speakers"].append(speaker)
 
-        if current_text.strip():
-            chunks.append({"text": current_text.strip(), "segment_ids": current_ids, "start": current_start})
+        if current is not None and current["text"].strip():
+            chunks.append(current)
+        for chunk in chunks:
+            chunk["text"] = chunk["text"].strip()
         return chunks
 
-
 _instance: MeetingVectorService | None = None
 
 def get_meeting_vector_service() -> MeetingVectorService:
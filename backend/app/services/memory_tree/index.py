@@ -0,0 +1,623 @@
+"""
+On-disk inverted index for Memory Vault search.
+
+Lives next to the Markdown it indexes, under ``<vault root>/.index/``
+(dot-folders are hidden from Obsidian), and is plain files, so the vault
+stays inspectable and DB-free:
+
+    manifest.json            version, generation, doc count, length totals
+    base-<g>.docs.jsonl      one JSON line per doc: path, title, source, level
+    base-<g>.docmeta.npy     per doc: docs.jsonl offset, body/title length,
+                             scope, group (source / entity folder)
+    base-<g>.lexicon.txt     sorted terms, one per line
+    base-<g>.lexicon.npy     per term: byte offset in lexicon.txt, postings
+                             start, postings count
+    base-<g>.postings.npy    (doc, body tf, title tf) grouped by term
+    delta-<g>.jsonl          adds (with term counts) and tombstones since <g>
+
+Queries memory-map the base files and binary-search the lexicon, so a
+search touches only the postings of its own terms plus the few files it
+returns snippets from. Writers append to the delta log; once it holds
+``MERGE_THRESHOLD`` docs it is merged into a new base generation. Any
+process can follow the delta log, and a missing or outdated index is
+rebuilt from the Markdown files.
+
+Scoring is BM25F over body and title (title weighted ``TITLE_WEIGHT``).
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import mmap
+import os
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+import structlog
+
+from app.services.memory_tree.vault import VaultEntry, list_entries, read_entry
+
+logger = structlog.get_logger(__name__)
+
+INDEX_DIRNAME = ".index"
+INDEX_VERSION = 1
+MERGE_THRESHOLD = 1000
+
+K1 = 1.2
+B = 0.75
+TITLE_WEIGHT = 3.0
+
+SCOPE_SOURCE, SCOPE_TOPIC, SCOPE_GLOBAL = 0, 1, 2
+_SCOPE_DIRS = {"sources": SCOPE_SOURCE, "topics": SCOPE_TOPIC, "global": SCOPE_GLOBAL}
+_SCOPE_NAMES = {"source": SCOPE_SOURCE, "topic": SCOPE_TOPIC, "global": SCOPE_GLOBAL}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_AUDIT_RE = re.compile(r"<!-- agent-run-id: .*?-->", flags=re.DOTALL)
+
+_POSTING = np.dtype([("doc", "<u4"), ("tf", "<u2"), ("ttf", "<u2")])
+_DOCMETA = np.dtype([
+    ("offset", "<u8"), ("blen", "<u4"), ("tlen", "<u4"), ("scope", "u1"), ("group", "<u4"),
+])
+_TF_MAX = np.iinfo(np.uint16).max
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+@dataclass(frozen=True)
+class IndexedHit:
+    path: Path
+    score: float
+    title: str
+    source: str
+    level: Optional[int]
+    entry: VaultEntry
+
+
+def _doc_from_entry(root: Path, entry: VaultEntry) -> Optional[dict[str, Any]]:
+    """Index record for a vault file, or None if it is outside the scopes."""
+    try:
+        parts = entry.path.relative_to(root).parts
+    except ValueError:
+        return None
+    scope = _SCOPE_DIRS.get(parts[0]) if parts else None
+    if scope is None:
+        return None
+    fm = entry.frontmatter
+    body_tokens = tokenize(_AUDIT_RE.sub(" ", entry.body))
+    title_tokens = tokenize(fm.get("title", ""))
+    return {
+        "path": "/".join(parts),
+        "title": fm.get("title", entry.path.stem),
+        "source": fm.get("source", fm.get("entity", "global")),
+        "level": fm.get("level"),
+        "scope": scope,
+        "group": parts[1] if scope != SCOPE_GLOBAL and len(parts) > 2 else "",
+        "blen": len(body_tokens),
+        "tlen": len(title_tokens),
+        "tf": dict(Counter(body_tokens)),
+        "ttf": dict(Counter(title_tokens)),
+    }
+
+
+def _parse_level(raw: Any) -> Optional[int]:
+    try:
+        return int(raw) if raw is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _map_file(path: Path) -> bytes | mmap.mmap:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class VaultIndex:
+    """BM25F inverted index over one vault root. Thread-safe."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.dir = root / INDEX_DIRNAME
+        self._lock = threading.RLock()
+        self._generation: Optional[int] = None
+        self._reset_base()
+        self._reset_delta()
+
+    # ------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------
+
+    def _reset_base(self) -> None:
+        self._n_base = 0
+        self._groups: list[str] = []
+        self._base_blen_sum = 0
+        self._base_tlen_sum = 0
+        self._docmeta = np.zeros(0, dtype=_DOCMETA)
+        self._postings = np.zeros(0, dtype=_POSTING)
+        self._lexicon = np.zeros((0, 3), dtype=np.int64)
+        self._lexicon_text: bytes | mmap.mmap = b""
+        self._docs_text: bytes | mmap.mmap = b""
+        self._alive = np.ones(0, dtype=bool)
+
+    def _reset_delta(self) -> None:
+        self._delta_docs: list[dict[str, Any]] = []
+        self._delta_postings: dict[str, list[tuple[int, int, int]]] = {}
+        self._delta_paths: dict[str, int] = {}
+        self._delta_dead: set[int] = set()
+        self._delta_offset = 0
+        self._delta_blen_sum = 0
+        self._delta_tlen_sum = 0
+
+    def _path(self, name: str, generation: Optional[int] = None) -> Path:
+        g = self._generation if generation is None else generation
+        return self.dir / name.format(g=g)
+
+    def _manifest_path(self) -> Path:
+        return self.dir / "manifest.json"
+
+    def _refresh(self) -> bool:
+        """Load the base if needed and apply new delta lines.
+
+        Returns True if the index had to be rebuilt from the vault.
+        """
+        manifest = self._read_manifest()
+        if manifest is None or manifest.get("version") != INDEX_VERSION:
+            self._rebuild_locked()
+            return True
+        if manifest["generation"] != self._generation:
+            self._load_base(manifest)
+        self._catch_up()
+        return False
+
+    def _read_manifest(self) -> Optional[dict]:
+        try:
+            return json.loads(self._manifest_path().read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _load_base(self, manifest: dict) -> None:
+        self._reset_base()
+        self._reset_delta()
+        self._generation = manifest["generation"]
+        try:
+            self._n_base = manifest["docs"]
+            self._groups = manifest["groups"]
+            self._base_blen_sum = manifest["body_tokens"]
+            self._base_tlen_sum = manifest["title_tokens"]
+            if self._n_base:
+                self._docmeta = np.load(self._path("base-{g}.docmeta.npy"), mmap_mode="r")
+                self._docs_text = _map_file(self._path("base-{g}.docs.jsonl"))
+            if manifest["terms"]:
+                self._lexicon = np.load(self._path("base-{g}.lexicon.npy"), mmap_mode="r")
+                self._lexicon_text = _map_file(self._path("base-{g}.lexicon.txt"))
+                self._postings = np.load(self._path("base-{g}.postings.npy"), mmap_mode="r")
+            self._alive = np.ones(self._n_base, dtype=bool)
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning("memory_vault_index_load_failed", error=str(e))
+            self._rebuild_locked()
+
+    # ------------------------------------------------------------------
+    # Delta log
+    # ------------------------------------------------------------------
+
+    def _catch_up(self) -> None:
+        path = self._path("delta-{g}.jsonl")
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            return
+        if size <= self._delta_offset:
+            return
+        with open(path, "rb") as f:
+            f.seek(self._delta_offset)
+            data = f.read(size - self._delta_offset)
+        # Only consume whole lines; a concurrent writer may be mid-line.
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            try:
+                self._apply(json.loads(line))
+            except ValueError:
+                logger.warning("memory_vault_index_torn_line", path=str(path))
+        self._delta_offset += end
+
+    def _apply(self, record: dict) -> None:
+        op = record.get("op")
+        if op == "add":
+            if record["path"] in self._delta_paths:
+                return
+            idx = len(self._delta_docs)
+            self._delta_paths[record["path"]] = idx
+            self._delta_docs.append({k: record[k] for k in (
+                "path", "title", "source", "level", "scope", "group", "blen", "tlen",
+            )})
+            self._delta_blen_sum += record["blen"]
+            self._delta_tlen_sum += record["tlen"]
+            ttf = record["ttf"]
+            for term in set(record["tf"]) | set(ttf):
+                self._delta_postings.setdefault(term, []).append(
+                    (idx, record["tf"].get(term, 0), ttf.get(term, 0))
+                )
+        elif op == "del":
+            if "base" in record and record["base"] < self._n_base:
+                self._alive[record["base"]] = False
+            elif "delta" in record:
+                self._delta_dead.add(record["delta"])
+
+    def _append(self, record: dict) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with open(self._path("delta-{g}.jsonl"), "a", encoding="utf-8") as f:
+            f.write(line)
+        self._catch_up()
+
+    # ------------------------------------------------------------------
+    # Writers
+    # ------------------------------------------------------------------
+
+    def ensure_ready(self) -> None:
+        """Load the index, building it from the vault if it is missing."""
+        with self._lock:
+            self._refresh()
+
+    def add(self, path: Path) -> bool:
+        """Index a file just written to the vault. Returns False if skipped."""
+        entry = read_entry(path)
+        doc = _doc_from_entry(self.root, entry) if entry else None
+        if doc is None:
+            return False
+        with self._lock:
+            if self._refresh() or doc["path"] in self._delta_paths:
+                return True
+            self._append({"op": "add", **doc})
+            if len(self._delta_docs) >= MERGE_THRESHOLD:
+                self._merge_locked()
+        return True
+
+    def rebuild(self) -> int:
+        """Re-index every file in the vault. Returns the doc count."""
+        with self._lock:
+            self._rebuild_locked()
+            return self._n_base
+
+    def _rebuild_locked(self) -> None:
+        docs = []
+        for entry in list_entries(self.root):
+            doc = _doc_from_entry(self.root, entry)
+            if doc is not None:
+                docs.append(doc)
+        docs.sort(key=lambda d: d["path"])
+
+        vocab: dict[str, int] = {}
+        terms, doc_ids, tfs, ttfs = [], [], [], []
+        for i, doc in enumerate(docs):
+            ttf = doc["ttf"]
+            for term in set(doc["tf"]) | set(ttf):
+                terms.append(vocab.setdefault(term, len(vocab)))
+                doc_ids.append(i)
+                tfs.append(doc["tf"].get(term, 0))
+                ttfs.append(ttf.get(term, 0))
+        self._write_generation(
+            docs,
+            list(vocab),
+            np.array(terms, dtype=np.int64),
+            np.array(doc_ids, dtype=np.int64),
+            np.array(tfs, dtype=np.int64),
+            np.array(ttfs, dtype=np.int64),
+        )
+        logger.info("memory_vault_index_rebuilt", docs=len(docs), terms=len(vocab))
+
+    def _merge_locked(self) -> None:
+        """Fold the delta log (and tombstones) into a new base generation."""
+        alive_ids = np.flatnonzero(self._alive)
+        remap = np.full(self._n_base, -1, dtype=np.int64)
+        remap[alive_ids] = np.arange(alive_ids.size)
+
+        docs = [self._base_doc(int(i)) for i in alive_ids]
+        vocab = self._base_terms()
+        term_index = {t: i for i, t in enumerate(vocab)}
+
+        counts = self._lexicon[:, 2] if len(vocab) else np.zeros(0, dtype=np.int64)
+        terms = np.repeat(np.arange(len(vocab), dtype=np.int64), counts)
+        base = np.asarray(self._postings)
+        doc_ids = remap[base["doc"].astype(np.int64)] if base.size else np.zeros(0, np.int64)
+        keep = doc_ids >= 0
+        parts = [(terms[keep], doc_ids[keep], base["tf"][keep], base["ttf"][keep])]
+
+        d_terms, d_docs, d_tf, d_ttf = [], [], [], []
+        delta_new_id: dict[int, int] = {}
+        for idx, doc in enumerate(self._delta_docs):
+            if idx not in self._delta_dead:
+                delta_new_id[idx] = len(docs)
+                docs.append(doc)
+        for term, postings in self._delta_postings.items():
+            tid = term_index.get(term)
+            if tid is None:
+                tid = term_index[term] = len(vocab)
+                vocab.append(term)
+            for idx, tf, ttf in postings:
+                new_id = delta_new_id.get(idx)
+                if new_id is not None:
+                    d_terms.append(tid)
+                    d_docs.append(new_id)
+                    d_tf.append(tf)
+                    d_ttf.append(ttf)
+        parts.append((
+            np.array(d_terms, dtype=np.int64), np.array(d_docs, dtype=np.int64),
+            np.array(d_tf, dtype=np.int64), np.array(d_ttf, dtype=np.int64),
+        ))
+        self._write_generation(docs, vocab, *(
+            np.concatenate([p[k].astype(np.int64) for p in parts]) for k in range(4)
+        ))
+        logger.info("memory_vault_index_merged", docs=len(docs), terms=len(vocab))
+
+    def _write_generation(
+        self,
+        docs: list[dict[str, Any]],
+        vocab: list[str],
+        terms: np.ndarray,
+        doc_ids: np.ndarray,
+        tfs: np.ndarray,
+        ttfs: np.ndarray,
+    ) -> None:
+        """Write base files for a new generation, then switch the manifest."""
+        self.dir.mkdir(parents=True, exist_ok=True)
+        old = self._generation
+        manifest = self._read_manifest()
+        g = max(old or 0, (manifest or {}).get("generation", 0)) + 1
+
+        # Sort the vocabulary and group postings by term, then doc.
+        order = sorted(range(len(vocab)), key=vocab.__getitem__)
+        rank = np.empty(len(vocab), dtype=np.int64)
+        rank[order] = np.arange(len(vocab))
+        terms = rank[terms] if terms.size else terms
+        sort = np.lexsort((doc_ids, terms))
+        terms = terms[sort]
+        postings = np.zeros(terms.size, dtype=_POSTING)
+        postings["doc"] = doc_ids[sort]
+        postings["tf"] = np.minimum(tfs[sort], _TF_MAX)
+        postings["ttf"] = np.minimum(ttfs[sort], _TF_MAX)
+        counts = np.bincount(terms, minlength=len(vocab))
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1])) if len(vocab) else counts
+
+        sorted_vocab = [vocab[i] for i in order]
+        used = counts > 0
+        lex_terms = [t for t, u in zip(sorted_vocab, used.tolist()) if u]
+        term_bytes = [t.encode("utf-8") for t in lex_terms]
+        lexicon = np.zeros((len(lex_terms), 3), dtype=np.int64)
+        if lex_terms:
+            lexicon[:, 0] = np.concatenate(([0], np.cumsum([len(t) + 1 for t in term_bytes])[:-1]))
+            lexicon[:, 1] = starts[used]
+            lexicon[:, 2] = counts[used]
+
+        groups: dict[str, int] = {}
+        docmeta = np.zeros(len(docs), dtype=_DOCMETA)
+        offset = 0
+        with open(self._path("base-{g}.docs.jsonl", g), "wb") as f:
+            for i, doc in enumerate(docs):
+                line = json.dumps(
+                    {k: doc[k] for k in ("path", "title", "source", "level")},
+                    ensure_ascii=False, separators=(",", ":"),
+                ).encode("utf-8") + b"\n"
+                f.write(line)
+                docmeta[i] = (
+                    offset, doc["blen"], doc["tlen"], doc["scope"],
+                    groups.setdefault(doc["group"], len(groups)),
+                )
+                offset += len(line)
+        with open(self._path("base-{g}.lexicon.txt", g), "wb") as f:
+            f.write(b"".join(t + b"\n" for t in term_bytes))
+        np.save(self._path("base-{g}.docmeta.npy", g), docmeta)
+        np.save(self._path("base-{g}.lexicon.npy", g), lexicon)
+        np.save(self._path("base-{g}.postings.npy", g), postings)
+        self._path("delta-{g}.jsonl", g).touch()
+
+        tmp = self.dir / "manifest.json.tmp"
+        tmp.write_text(json.dumps({
+            "version": INDEX_VERSION,
+            "generation": g,
+            "docs": len(docs),
+            "terms": len(lex_terms),
+            "postings": int(postings.size),
+            "groups": list(groups),
+            "body_tokens": int(docmeta["blen"].sum()),
+            "title_tokens": int(docmeta["tlen"].sum()),
+        }, indent=2), encoding="utf-8")
+        os.replace(tmp, self._manifest_path())
+
+        self._load_base(self._read_manifest())
+        self._remove_stale(keep=g)
+
+    def _remove_stale(self, keep: int) -> None:
+        for path in self.dir.glob("*-*.*"):
+            stem = path.name.split(".", 1)[0]
+            g = stem.rsplit("-", 1)[-1]
+            if g.isdigit() and int(g) != keep:
+                try:
+                    path.unlink()
+                except OSError:  # still mapped elsewhere (Windows) - next merge
+                    pass
+
+    # ------------------------------------------------------------------
+    # Base lookups
+    # ------------------------------------------------------------------
+
+    def _term_at(self, i: int) -> bytes:
+        start = int(self._lexicon[i, 0])
+        end = int(self._lexicon[i + 1, 0]) - 1 if i + 1 < len(self._lexicon) else len(self._lexicon_text) - 1
+        return self._lexicon_text[start:end]
+
+    def _find_term(self, term: str) -> Optional[tuple[int, int]]:
+        key = term.encode("utf-8")
+        lo, hi = 0, len(self._lexicon)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._term_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self._lexicon) and self._term_at(lo) == key:
+            return int(self._lexicon[lo, 1]), int(self._lexicon[lo, 2])
+        return None
+
+    def _base_terms(self) -> list[str]:
+        text = bytes(self._lexicon_text[:])
+        return text.decode("utf-8").splitlines()
+
+    def _base_doc(self, i: int) -> dict[str, Any]:
+        start = int(self._docmeta[i]["offset"])
+        end = self._docs_text.find(b"\n", start)
+        doc = json.loads(self._docs_text[start:end])
+        meta = self._docmeta[i]
+        doc.update(
+            blen=int(meta["blen"]), tlen=int(meta["tlen"]), scope=int(meta["scope"]),
+            group=self._groups[int(meta["group"])],
+        )
+        return doc
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def search(
+        self,
+        query_tokens: list[str],
+        *,
+        scope: Optional[str] = None,
+        source: Optional[str] = None,
+        entity: Optional[str] = None,
+        limit: int = 10,
+    ) -> list[IndexedHit]:
+        """Top ``limit`` files by BM25F, with the same filters as ``list_entries``."""
+        from app.services.memory_tree.vault import slugify
+
+        with self._lock:
+            self._refresh()
+            n_docs = self._n_base + len(self._delta_docs)
+            if not query_tokens or not n_docs:
+                return []
+            avg_blen = max(1e-9, (self._base_blen_sum + self._delta_blen_sum) / n_docs)
+            avg_tlen = max(1e-9, (self._base_tlen_sum + self._delta_tlen_sum) / n_docs)
+
+            base_scores = np.zeros(self._n_base, dtype=np.float64)
+            delta_scores = np.zeros(len(self._delta_docs), dtype=np.float64)
+            delta_blen = np.array([d["blen"] for d in self._delta_docs], dtype=np.float64)
+            delta_tlen = np.array([d["tlen"] for d in self._delta_docs], dtype=np.float64)
+            for term in query_tokens:
+                found = self._find_term(term)
+                base = self._postings[found[0]:found[0] + found[1]] if found else None
+                delta = self._delta_postings.get(term)
+                df = (found[1] if found else 0) + (len(delta) if delta else 0)
+                if not df:
+                    continue
+                idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+                if base is not None:
+                    docs = base["doc"].astype(np.int64)
+                    meta = self._docmeta[docs]
+                    base_scores[docs] += self._bm25(
+                        idf, base["tf"], base["ttf"], meta["blen"], meta["tlen"], avg_blen, avg_tlen,
+                    )
+                if delta:
+                    arr = np.array(delta, dtype=np.int64)
+                    idx = arr[:, 0]
+                    delta_scores[idx] += self._bm25(
+                        idf, arr[:, 1], arr[:, 2], delta_blen[idx], delta_tlen[idx], avg_blen, avg_tlen,
+                    )
+
+            base_ids = np.flatnonzero(base_scores > 0)
+            base_ids = base_ids[self._alive[base_ids]]
+            base_ids = base_ids[self._filter_mask(
+                self._docmeta["scope"][base_ids], self._docmeta["group"][base_ids],
+                self._groups, scope, slugify(source) if source else None,
+                slugify(entity) if entity else None,
+            )]
+            delta_ids = np.array([
+                i for i in np.flatnonzero(delta_scores > 0).tolist() if i not in self._delta_dead
+            ], dtype=np.int64)
+            if delta_ids.size:
+                groups = sorted({self._delta_docs[i]["group"] for i in delta_ids.tolist()})
+                gid = {g: n for n, g in enumerate(groups)}
+                delta_ids = delta_ids[self._filter_mask(
+                    np.array([self._delta_docs[i]["scope"] for i in delta_ids.tolist()]),
+                    np.array([gid[self._delta_docs[i]["group"]] for i in delta_ids.tolist()]),
+                    groups, scope, slugify(source) if source else None,
+                    slugify(entity) if entity else None,
+                )]
+
+            # (score, is_delta, id), best first; ties keep path order stable.
+            candidates = sorted(
+                [(s, 0, i) for s, i in zip(base_scores[base_ids].tolist(), base_ids.tolist())]
+                + [(s, 1, i) for s, i in zip(delta_scores[delta_ids].tolist(), delta_ids.tolist())],
+                key=lambda c: (-c[0], c[1], c[2]),
+            )
+            hits: list[IndexedHit] = []
+            for score, is_delta, i in candidates:
+                doc = self._delta_docs[i] if is_delta else self._base_doc(i)
+                path = self.root / doc["path"]
+                entry = read_entry(path)
+                if entry is None:
+                    # Deleted outside the service: tombstone it.
+                    self._append({"op": "del", ("delta" if is_delta else "base"): i})
+                    continue
+                hits.append(IndexedHit(
+                    path=path,
+                    score=score,
+                    title=doc["title"],
+                    source=doc["source"],
+                    level=_parse_level(doc["level"]),
+                    entry=entry,
+                ))
+                if len(hits) >= limit:
+                    break
+            return hits
+
+    @staticmethod
+    def _bm25(idf, tf, ttf, blen, tlen, avg_blen, avg_tlen) -> np.ndarray:
+        tf = np.asarray(tf, dtype=np.float64)
+        ttf = np.asarray(ttf, dtype=np.float64)
+        weighted = (
+            tf / (1.0 - B + B * np.asarray(blen, dtype=np.float64) / avg_blen)
+            + TITLE_WEIGHT * ttf / (1.0 - B + B * np.asarray(tlen, dtype=np.float64) / avg_tlen)
+        )
+        return idf * weighted * (K1 + 1.0) / (weighted + K1)
+
+    @staticmethod
+    def _filter_mask(
+        scopes: np.ndarray,
+        group_ids: np.ndarray,
+        groups: list[str],
+        scope: Optional[str],
+        source_slug: Optional[str],
+        entity_slug: Optional[str],
+    ) -> np.ndarray:
+        """Same semantics as ``list_entries``: filters apply within their scope."""
+        mask = np.zeros(scopes.shape, dtype=bool)
+        for name, code in _SCOPE_NAMES.items():
+            if scope not in (None, name):
+                continue
+            in_scope = scopes == code
+            wanted = {SCOPE_SOURCE: source_slug, SCOPE_TOPIC: entity_slug}.get(code)
+            if wanted:
+                gid = groups.index(wanted) if wanted in groups else -1
+                in_scope &= group_ids == gid
+            mask |= in_scope
+        return mask
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            self._refresh()
+            return {
+                "generation": self._generation,
+                "base_docs": self._n_base,
+                "delta_docs": len(self._delta_docs),
+                "terms": len(self._lexicon),
+                "deleted": int(self._n_base - self._alive.sum()) + len(self._delta_dead),
+            }
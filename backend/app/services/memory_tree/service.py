@@ -9,9 +9,11 @@ Three operations:
 
     search(query, scope="source|topic|global", source=..., limit=10)
 
-Search uses a lightweight in-process BM25-ish keyword scorer over chunk
-bodies. It deliberately does not require pgvector because the vault is
-designed to be inspectable on disk regardless of whether the DB is up. A
+Search is BM25F over chunk bodies and titles, served from an on-disk
+inverted index under ``<root>/.index/`` (see ``index.py``) that the writers
+below keep current. It deliberately does not require pgvector because the
+vault is designed to be inspectable on disk regardless of whether the DB is
+up; if the index is unusable, search falls back to scanning the files. A
 heavier semantic layer can be added later by indexing each .md file into
 ``EpisodicMemoryService`` (which already uses pgvector).
 """
@@ -20,7 +22,6 @@ from __future__ import annotations
 
 import asyncio
 import math
-import re
 from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
@@ -30,6 +31,7 @@ import structlog
 
 from app.infrastructure.config import get_settings
 from app.services.memory_tree.chunker import chunk_text
+from app.services.memory_tree.index import VaultIndex, tokenize
 from app.services.memory_tree.vault import (
     VaultEntry,
     list_entries,
@@ -46,7 +48,6 @@ logger = structlog.get_logger(__name__)
 
 _DEFAULT_DATA_DIR = Path(__file__).resolve().parents[2] / "data"
 _DATA_DIR = _DEFAULT_DATA_DIR
-_TOKEN_RE = re.compile(r"[a-z0-9]+")
 
 
 @dataclass(frozen=True)
@@ -60,14 +61,14 @@ class SearchHit:
 
 
 def _tokens(text: str) -> list[str]:
-    return _TOKEN_RE.findall(text.lower())
+    return tokenize(text)
 
 
 def _score_entry(entry: VaultEntry, query_tokens: list[str]) -> float:
     """Crude BM25-ish: sum of (1 + log(tf)) for each query token in body.
 
-    Title matches are weighted x3. Heavier scoring belongs in pgvector; this
-    keeps the vault self-contained for demos and offline reads.
+    Title matches are weighted x3. Only used by the file-scan fallback when
+    the index cannot be used.
     """
     body_tokens = _tokens(entry.body)
     title_tokens = _tokens(entry.frontmatter.get("title", ""))
@@ -124,6 +125,21 @@ class MemoryTreeService:
             # Tests pass a temporary base directory and retain the historical
             # <tmp>/vault layout for isolation.
             self._root = vault_root(data_dir)
+        self._index = VaultIndex(self._root)
+
+    def _index_ready(self) -> None:
+        """Load (or build) the index before a write so the write is an append."""
+        try:
+            self._index.ensure_ready()
+        except Exception as e:
+            logger.warning("memory_vault_index_unavailable", error=str(e))
+
+    def _index_add(self, paths: list[Path]) -> None:
+        try:
+            for path in paths:
+                self._index.add(path)
+        except Exception as e:
+            logger.warning("memory_vault_index_add_failed", error=str(e))
 
     # ------------------------------------------------------------------
     # Writers
@@ -168,6 +184,7 @@ class MemoryTreeService:
         tags,
         parent,
     ) -> list[Path]:
+        self._index_ready()
         paths: list[Path] = []
         for i, ch in enumerate(chunks):
             chunk_title = title or f"{source} L{level} part {i+1}"
@@ -182,6 +199,7 @@ class MemoryTreeService:
                 extra_meta={"part": i + 1, "of": len(chunks)},
             )
             paths.append(p)
+        self._index_add(paths)
         logger.info(
             "memory_vault_wrote_chunks",
             source=source,
@@ -201,8 +219,8 @@ class MemoryTreeService:
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(
             None,
-            lambda: _write_topic(
-                self._root,
+            lambda: self._write_indexed(
+                _write_topic,
                 entity=entity,
                 title=title or entity,
                 body=body,
@@ -220,14 +238,20 @@ class MemoryTreeService:
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(
             None,
-            lambda: _write_global_digest(
-                self._root,
+            lambda: self._write_indexed(
+                _write_global_digest,
                 title=title,
                 body=body,
                 sources=sources,
             ),
         )
 
+    def _write_indexed(self, writer, **kwargs) -> Path:
+        self._index_ready()
+        path = writer(self._root, **kwargs)
+        self._index_add([path])
+        return path
+
     # ------------------------------------------------------------------
     # Search
     # ------------------------------------------------------------------
@@ -265,6 +289,34 @@ class MemoryTreeService:
         tokens = _tokens(query)
         if not tokens:
             return []
+        try:
+            indexed = self._index.search(
+                tokens, scope=scope, source=source, entity=entity, limit=limit,
+            )
+        except Exception as e:
+            logger.warning("memory_vault_index_search_failed", error=str(e))
+            return self._scan_search(tokens, scope, source, entity, limit)
+        return [
+            SearchHit(
+                path=h.path,
+                score=h.score,
+                title=h.title,
+                source=h.source,
+                level=h.level,
+                snippet=_snippet(h.entry.body, tokens),
+            )
+            for h in indexed
+        ]
+
+    def _scan_search(
+        self,
+        tokens: list[str],
+        scope: Optional[str],
+        source: Optional[str],
+        entity: Optional[str],
+        limit: int,
+    ) -> list[SearchHit]:
+        """Score every file on disk. Fallback for when the index is unusable."""
         entries = list_entries(
             self._root,
             source=source,
@@ -294,6 +346,15 @@ class MemoryTreeService:
         hits.sort(key=lambda h: h.score, reverse=True)
         return hits[:limit]
 
+    async def reindex(self) -> dict:
+        """Rebuild the search index from the files on disk.
+
+        Needed only after files are added to the vault by something other
+        than this service (deletions are noticed at query time).
+        """
+        docs = await asyncio.get_event_loop().run_in_executor(None, self._index.rebuild)
+        return {"indexed": docs, "root": str(self._root)}
+
     # ------------------------------------------------------------------
     # Stats / listing (for the UI page)
     # ------------------------------------------------------------------
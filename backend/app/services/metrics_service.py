@@ -1,109 +1,293 @@
 """
 Metrics collection service for ZERO.
 
-Tracks operational metrics in-memory (24h ring buffer) with hourly PostgreSQL snapshots.
+Tracks operational metrics in-memory with hourly PostgreSQL snapshots.
 Provides aggregated data for the system health dashboard.
+
+Storage is columnar and allocation-free on the hot path. Each
+(name, tagset) series owns:
+  - a preallocated numpy ring of (timestamp, value) samples, used for
+    ``get_timeseries`` bucketing (vectorised with ``np.bincount``)
+  - one slot per hour (``HOURS_RETAINED``) holding count/sum/min/max plus a
+    log-bucketed HDR-style histogram (~2.5% relative error), used for
+    ``get_summary`` quantiles
+
+``record`` is O(1): a couple of array stores, no per-sample dicts.
+``get_summary`` cost depends on series × hours × histogram bins, not on
+how many samples were recorded, so dashboard polls stay flat at millions
+of samples. Summaries aggregate every tagset of a name and also report
+each tagset under ``"tags"``.
 """
 
 import json
+import math
 import time
-from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from functools import lru_cache
+
+import numpy as np
 import structlog
 
 logger = structlog.get_logger()
 
-# Maximum entries per metric in the ring buffer (24h at 1/min = 1440)
-MAX_BUFFER_SIZE = 1500
+# Raw samples kept per (name, tagset) for timeseries charts.
+MAX_BUFFER_SIZE = 4096
+# Hourly summary slots kept per series (24h window + the current hour).
+HOURS_RETAINED = 25
+
+# Histogram layout: bin 0 holds values <= _HIST_MIN (zero, negatives), then
+# geometric bins growing by _HIST_GROWTH up to _HIST_MAX (clamped above).
+_HIST_MIN = 1e-3
+_HIST_MAX = 1e9
+_HIST_GROWTH = 1.05
+_LOG_GROWTH = math.log(_HIST_GROWTH)
+_HIST_BINS = int(math.ceil(math.log(_HIST_MAX / _HIST_MIN) / _LOG_GROWTH)) + 2
+# Representative value of each bin (geometric midpoint).
+_BIN_VALUES = np.concatenate((
+    [0.0],
+    _HIST_MIN * _HIST_GROWTH ** (np.arange(1, _HIST_BINS) - 0.5),
+))
+
+TagSet = Tuple[Tuple[str, str], ...]
+
+
+def _tagset(tags: Optional[Dict]) -> TagSet:
+    if not tags:
+        return ()
+    return tuple(sorted((str(k), str(v)) for k, v in tags.items()))
+
+
+def _tag_label(tagset: TagSet) -> str:
+    return ",".join(f"{k}={v}" for k, v in tagset)
+
+
+def _bin(value: float) -> int:
+    if value <= _HIST_MIN:
+        return 0
+    return min(_HIST_BINS - 1, 1 + int(math.log(value / _HIST_MIN) / _LOG_GROWTH))
+
+
+class _Series:
+    """One (name, tagset) time series: sample ring + hourly sketches.
+
+    Per-hour scalars live in plain lists (cheaper than numpy scalar stores
+    on the record path); the histograms are one numpy row per hour.
+    """
+
+    __slots__ = (
+        "ts", "vals", "head", "size",
+        "hour", "h_count", "h_sum", "h_min", "h_max", "hist",
+    )
+
+    def __init__(self, capacity: int = MAX_BUFFER_SIZE):
+        self.ts = np.zeros(capacity, dtype=np.float64)
+        self.vals = np.zeros(capacity, dtype=np.float64)
+        self.head = 0
+        self.size = 0
+        self.hour = [-1] * HOURS_RETAINED
+        self.h_count = [0] * HOURS_RETAINED
+        self.h_sum = [0.0] * HOURS_RETAINED
+        self.h_min = [0.0] * HOURS_RETAINED
+        self.h_max = [0.0] * HOURS_RETAINED
+        self.hist = np.zeros((HOURS_RETAINED, _HIST_BINS), dtype=np.int64)
+
+    def add(self, ts: float, value: float) -> None:
+        i = self.head
+        self.ts[i] = ts
+        self.vals[i] = value
+        self.head = (i + 1) % self.ts.shape[0]
+        if self.size < self.ts.shape[0]:
+            self.size += 1
+
+        hour = int(ts // 3600)
+        slot = hour % HOURS_RETAINED
+        if self.hour[slot] != hour:
+            self.hour[slot] = hour
+            self.h_count[slot] = 0
+            self.h_sum[slot] = 0.0
+            self.h_min[slot] = value
+            self.h_max[slot] = value
+            self.hist[slot].fill(0)
+        self.h_count[slot] += 1
+        self.h_sum[slot] += value
+        if value < self.h_min[slot]:
+            self.h_min[slot] = value
+        elif value > self.h_max[slot]:
+            self.h_max[slot] = value
+        self.hist[slot, _bin(value)] += 1
+
+    def window_slots(self, hours: int, last_hour: int) -> List[int]:
+        return [
+            slot for slot, hour in enumerate(self.hour)
+            if last_hour - hours < hour <= last_hour
+        ]
+
+    def samples_since(self, cutoff: float) -> Tuple[np.ndarray, np.ndarray]:
+        ts = self.ts[:self.size]
+        keep = ts >= cutoff
+        return ts[keep], self.vals[:self.size][keep]
+
+
+class _Agg:
+    """Accumulates hourly slots from one or more series into a summary."""
+
+    __slots__ = ("count", "total", "lo", "hi", "hist")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.lo = math.inf
+        self.hi = -math.inf
+        self.hist = np.zeros(_HIST_BINS, dtype=np.int64)
+
+    def add(self, series: _Series, slots: List[int]) -> None:
+        if not slots:
+            return
+        self.count += sum(series.h_count[s] for s in slots)
+        self.total += sum(series.h_sum[s] for s in slots)
+        self.lo = min(self.lo, min(series.h_min[s] for s in slots))
+        self.hi = max(self.hi, max(series.h_max[s] for s in slots))
+        self.hist += series.hist[slots].sum(axis=0)
+
+    def summary(self) -> Dict[str, Any]:
+        cum = np.cumsum(self.hist)
+        ranks = np.array([0.5, 0.95, 0.99]) * self.count
+        idx = np.minimum(np.searchsorted(cum, ranks, side="right"), _HIST_BINS - 1)
+        p50, p95, p99 = np.clip(_BIN_VALUES[idx], self.lo, self.hi).tolist()
+        return {
+            "count": self.count,
+            "avg": self.total / self.count,
+            "min": self.lo,
+            "max": self.hi,
+            "p50": p50,
+            "p95": p95,
+            "p99": p99,
+        }
 
 
 class MetricsService:
     """In-memory metrics collection with PostgreSQL persistence."""
 
-    def __init__(self):
-        self._buffers: Dict[str, deque] = {}
+    def __init__(self, buffer_size: int = MAX_BUFFER_SIZE):
+        self._buffer_size = buffer_size
+        self._series: Dict[str, Dict[TagSet, _Series]] = {}
         self._counters: Dict[str, int] = {}
+        self._tagged_counters: Dict[str, Dict[TagSet, int]] = {}
         self._gauges: Dict[str, float] = {}
 
     def record(self, name: str, value: float, tags: Optional[Dict] = None):
         """Record a timestamped metric value."""
-        if name not in self._buffers:
-            self._buffers[name] = deque(maxlen=MAX_BUFFER_SIZE)
-        self._buffers[name].append({
-            "ts": time.time(),
-            "value": value,
-            "tags": tags or {},
-        })
-
-    def increment(self, name: str, amount: int = 1):
-        """Increment a counter."""
+        by_tags = self._series.get(name)
+        if by_tags is None:
+            by_tags = self._series[name] = {}
+        key = _tagset(tags)
+        series = by_tags.get(key)
+        if series is None:
+            series = by_tags[key] = _Series(self._buffer_size)
+        series.add(time.time(), float(value))
+
+    def increment(self, name: str, amount: int = 1, tags: Optional[Dict] = None):
+        """Increment a counter (and its per-tagset breakdown when tagged)."""
         self._counters[name] = self._counters.get(name, 0) + amount
+        if tags:
+            by_tags = self._tagged_counters.setdefault(name, {})
+            key = _tagset(tags)
+            by_tags[key] = by_tags.get(key, 0) + amount
 
     def gauge(self, name: str, value: float):
         """Set a gauge value (current state)."""
         self._gauges[name] = value
 
-    def get_summary(self, hours: int = 24) -> Dict[str, Any]:
-        """Get aggregated metrics for the last N hours."""
-        cutoff = time.time() - (hours * 3600)
+    def get_summary(self, hours: int = 24, *, last_hour: Optional[int] = None) -> Dict[str, Any]:
+        """Get aggregated metrics for the last N hours.
+
+        Windows are whole hours. By default they end with the current,
+        partial hour and also include the N complete hours before it, so
+        ``hours=1`` never covers less than the last 60 minutes. With
+        ``last_hour`` (hours since the epoch) the window is exactly the N
+        hours ending with it. Capped at ``HOURS_RETAINED`` slots.
+        """
+        hours = max(1, min(hours, HOURS_RETAINED - 1))
+        if last_hour is None:
+            last_hour = int(time.time() // 3600)
+            span = hours + 1
+        else:
+            span = hours
         summary = {}
 
-        for name, buf in self._buffers.items():
-            recent = [e for e in buf if e["ts"] >= cutoff]
-            if not recent:
+        for name, by_tags in self._series.items():
+            total = _Agg()
+            per_tag: Dict[str, Dict[str, Any]] = {}
+            for tagset, series in by_tags.items():
+                slots = series.window_slots(span, last_hour)
+                total.add(series, slots)
+                if tagset:
+                    agg = _Agg()
+                    agg.add(series, slots)
+                    if agg.count:
+                        per_tag[_tag_label(tagset)] = agg.summary()
+            if not total.count:
                 continue
-
-            values = [e["value"] for e in recent]
-            values.sort()
-
-            summary[name] = {
-                "count": len(values),
-                "avg": sum(values) / len(values) if values else 0,
-                "min": values[0] if values else 0,
-                "max": values[-1] if values else 0,
-                "p50": values[len(values) // 2] if values else 0,
-                "p95": values[int(len(values) * 0.95)] if values else 0,
-                "p99": values[int(len(values) * 0.99)] if values else 0,
-            }
+            summary[name] = total.summary()
+            if per_tag:
+                summary[name]["tags"] = per_tag
 
         return {
             "period_hours": hours,
             "timestamp": datetime.utcnow().isoformat(),
             "metrics": summary,
             "counters": dict(self._counters),
+            "counters_by_tags": {
+                name: {_tag_label(k): v for k, v in by_tags.items()}
+                for name, by_tags in self._tagged_counters.items()
+            },
             "gauges": dict(self._gauges),
         }
 
-    def get_timeseries(self, name: str, hours: int = 24, resolution_minutes: int = 5) -> List[Dict]:
-        """Get time-bucketed data for a specific metric (for charts)."""
-        if name not in self._buffers:
+    def get_timeseries(
+        self,
+        name: str,
+        hours: int = 24,
+        resolution_minutes: int = 5,
+        tags: Optional[Dict] = None,
+    ) -> List[Dict]:
+        """Get time-bucketed data for a specific metric (for charts).
+
+        Aggregates every tagset of ``name`` unless ``tags`` selects one.
+        """
+        by_tags = self._series.get(name)
+        if not by_tags:
             return []
+        if tags is not None:
+            series = by_tags.get(_tagset(tags))
+            selected = [series] if series is not None else []
+        else:
+            selected = list(by_tags.values())
 
         cutoff = time.time() - (hours * 3600)
-        bucket_size = resolution_minutes * 60
-        recent = [e for e in self._buffers[name] if e["ts"] >= cutoff]
-
-        if not recent:
+        parts = [s.samples_since(cutoff) for s in selected]
+        ts = np.concatenate([p[0] for p in parts]) if parts else np.empty(0)
+        if ts.size == 0:
             return []
+        vals = np.concatenate([p[1] for p in parts])
 
-        # Bucket by time
-        buckets: Dict[int, List[float]] = {}
-        for entry in recent:
-            bucket_key = int(entry["ts"] // bucket_size) * bucket_size
-            if bucket_key not in buckets:
-                buckets[bucket_key] = []
-            buckets[bucket_key].append(entry["value"])
+        bucket_size = max(1, resolution_minutes) * 60
+        keys = (ts // bucket_size).astype(np.int64)
+        uniq, inverse = np.unique(keys, return_inverse=True)
+        counts = np.bincount(inverse)
+        sums = np.bincount(inverse, weights=vals)
+        maxes = np.full(uniq.shape[0], -np.inf)
+        np.maximum.at(maxes, inverse, vals)
 
         return [
             {
-                "timestamp": datetime.utcfromtimestamp(ts).isoformat(),
-                "avg": sum(vals) / len(vals),
-                "count": len(vals),
-                "max": max(vals),
+                "timestamp": datetime.utcfromtimestamp(int(k) * bucket_size).isoformat(),
+                "avg": s / c,
+                "count": int(c),
+                "max": m,
             }
-            for ts, vals in sorted(buckets.items())
+            for k, c, s, m in zip(uniq.tolist(), counts.tolist(), sums.tolist(), maxes.tolist())
         ]
 
     async def persist_snapshot(self):
@@ -112,7 +296,10 @@ class MetricsService:
             from app.infrastructure.database import get_session
             from sqlalchemy import text
 
-            summary = self.get_summary(hours=1)
+            # The job runs on the hour: snapshot the hour that just ended,
+            # not the seconds-old current one.
+            last_hour = int(time.time() // 3600) - 1
+            summary = self.get_summary(hours=1, last_hour=last_hour)
 
             async with get_session() as session:
                 await session.execute(
@@ -121,7 +308,7 @@ class MetricsService:
                         "VALUES (:ts, CAST(:data AS jsonb), :period)"
                     ),
                     {
-                        "ts": datetime.utcnow(),
+                        "ts": datetime.utcfromtimestamp((last_hour + 1) * 3600),
                         "data": json.dumps(summary),
                         "period": "hourly",
                     },
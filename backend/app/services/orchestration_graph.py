@@ -1,9 +1,10 @@
 """
 LangGraph Orchestration Gateway for Zero.
 
-Two-tier intelligent routing: fast keyword matching for unambiguous requests,
-LLM-based classification for ambiguous queries. Includes response synthesis
-for natural conversational output.
+Tiered intelligent routing: keyword matching (Aho-Corasick) for unambiguous
+requests, a local embedding nearest-exemplar router for most of the rest,
+and LLM-based classification only when both are unsure. Includes response
+synthesis for natural conversational output.
 
 Routes: sprint, email, calendar, enhancement, briefing, research, notion,
         money_maker, knowledge, task, workflow, system, general.
@@ -12,6 +13,7 @@ Routes: sprint, email, calendar, enhancement, briefing, research, notion,
 from typing import TypedDict, Annotated, Optional, Any
 from datetime import datetime, timezone
 from functools import lru_cache
+import asyncio
 import re
 import time as _time
 
@@ -219,20 +221,22 @@ _HELP_MENU = (
 )
 
 
-def classify_route_keywords(message: str) -> tuple[str, int]:
-    """Tier 1: Fast keyword-based classification. Returns (route, confidence_score)."""
-    msg_lower = message.lower()
+@lru_cache()
+def _keyword_matcher():
+    from app.services.intent_router import KeywordMatcher
+    return KeywordMatcher(ROUTE_KEYWORDS)
 
-    scores = {}
-    for route, keywords in ROUTE_KEYWORDS.items():
-        score = sum(1 for kw in keywords if kw in msg_lower)
-        if score > 0:
-            scores[route] = score
 
+def classify_route_keywords(message: str) -> tuple[str, int]:
+    """Tier 1: Fast keyword-based classification. Returns (route, confidence_score)."""
+    scores = _keyword_matcher().scores(message)
     if not scores:
         return "general", 0
 
-    best_route = max(scores, key=scores.get)
+    # Ties go to the route listed first in ROUTE_KEYWORDS.
+    best_route = max(
+        (r for r in ROUTE_KEYWORDS if r in scores), key=scores.get,
+    )
     return best_route, scores[best_route]
 
 
@@ -242,8 +246,59 @@ def classify_route(message: str) -> str:
     return route
 
 
+@lru_cache()
+def get_intent_router():
+    """Embedding router seeded with route descriptions and keywords."""
+    from app.infrastructure.config import get_settings
+    from app.services.intent_router import IntentRouter, parse_route_descriptions
+
+    settings = get_settings()
+    descriptions = parse_route_descriptions(CLASSIFICATION_SYSTEM_PROMPT, VALID_ROUTES)
+    seeds = {
+        route: ([descriptions[route]] if route in descriptions else []) + list(ROUTE_KEYWORDS.get(route, []))
+        for route in sorted(VALID_ROUTES - {"general"})
+    }
+    return IntentRouter(
+        seeds,
+        min_similarity=settings.intent_router_min_similarity,
+        min_margin=settings.intent_router_min_margin,
+        exemplars_per_route=settings.intent_router_exemplars_per_route,
+        history_days=settings.intent_router_history_days,
+        refresh_s=settings.intent_router_refresh_s,
+    )
+
+
+async def classify_route_embedding(message: str):
+    """Tier 2: nearest-exemplar embedding router. Returns an IntentMatch or None."""
+    from app.infrastructure.config import get_settings
+    if not get_settings().intent_router_enabled:
+        return None
+    try:
+        return await get_intent_router().classify(message)
+    except Exception as e:
+        logger.warning("embedding_classification_failed", error=str(e))
+        return None
+
+
+async def retrieve_memories(content: str) -> list:
+    """Top knowledge notes for the message (semantic search); [] on failure."""
+    memories = []
+    try:
+        from app.services.knowledge_service import get_knowledge_service
+        ks = get_knowledge_service()
+        memory_notes = await ks.semantic_search(content, limit=3, table="notes")
+        for note in memory_notes:
+            if hasattr(note, "content"):
+                memories.append({"type": "note", "title": note.title, "content": note.content[:200]})
+            elif isinstance(note, dict):
+                memories.append(note)
+    except Exception as e:
+        logger.debug("memory_retrieval_skipped", error=str(e))
+    return memories
+
+
 async def classify_route_llm(message: str) -> str:
-    """Tier 2: LLM-based intent classification for ambiguous queries (via Kimi)."""
+    """Tier 3: LLM-based intent classification for ambiguous queries (via Kimi)."""
     try:
         from app.infrastructure.unified_llm_client import get_unified_llm_client
         client = get_unified_llm_client()
@@ -266,43 +321,45 @@ async def classify_route_llm(message: str) -> str:
 # =============================================================================
 
 async def router_node(state: OrchestratorState) -> dict:
-    """Two-tier supervisor: keyword fast path + LLM fallback for ambiguous queries."""
+    """Tiered supervisor: keyword fast path, embedding router, LLM fallback.
+
+    Memory retrieval runs concurrently with classification; the message is
+    embedded once for both (shared embedding cache / coalescer).
+    """
     messages = state.get("messages", [])
     if not messages:
         return {"route": "general", "context": {"reason": "no messages"}}
 
     last_message = messages[-1]
     content = last_message.content if hasattr(last_message, "content") else str(last_message)
+    started = _time.perf_counter()
+    memories_task = asyncio.create_task(retrieve_memories(content))
 
     # Tier 1: Fast keyword match
     route, confidence = classify_route_keywords(content)
     method = "keyword"
+    similarity = None
 
-    # Tier 2: LLM classification if keyword confidence is low
     if confidence < KEYWORD_CONFIDENCE_THRESHOLD:
-        llm_route = await classify_route_llm(content)
-        if llm_route != "general" or route == "general":
-            route = llm_route
-            method = "llm"
+        # Tier 2: local embedding router
+        match = await classify_route_embedding(content)
+        if match is not None:
+            route, method, similarity = match.route, "embedding", match.similarity
         else:
-            method = "keyword_low_confidence"
+            # Tier 3: LLM classification
+            llm_route = await classify_route_llm(content)
+            if llm_route != "general" or route == "general":
+                route = llm_route
+                method = "llm"
+            else:
+                method = "keyword_low_confidence"
+    routing_ms = round((_time.perf_counter() - started) * 1000, 2)
 
     logger.info("orchestrator_routed", route=route, method=method,
-                keyword_confidence=confidence, message_preview=content[:80])
+                keyword_confidence=confidence, similarity=similarity,
+                routing_ms=routing_ms, message_preview=content[:80])
 
-    # Retrieve relevant memories from knowledge service (semantic search)
-    memories = []
-    try:
-        from app.services.knowledge_service import get_knowledge_service
-        ks = get_knowledge_service()
-        memory_notes = await ks.semantic_search(content, limit=3, table="notes")
-        for note in memory_notes:
-            if hasattr(note, "content"):
-                memories.append({"type": "note", "title": note.title, "content": note.content[:200]})
-            elif isinstance(note, dict):
-                memories.append(note)
-    except Exception as e:
-        logger.debug("memory_retrieval_skipped", error=str(e))
+    memories = await memories_task
 
     return {
         "route": route,
@@ -312,6 +369,8 @@ async def router_node(state: OrchestratorState) -> dict:
             "route": route,
             "method": method,
             "keyword_confidence": confidence,
+            "embedding_similarity": similarity,
+            "routing_ms": routing_ms,
             "message_length": len(content),
             "original_message": content,
         },
@@ -728,7 +787,7 @@ async def workflow_node(state: OrchestratorState) -> dict:
 
         # Read: active executions
         elif any(kw in msg_lower for kw in ["active", "running", "executing"]):
-            active = engine.get_active_executions()
+            active = await engine.get_active_executions()
             if active:
                 lines = ["Active workflow executions:"]
                 for ex in active:
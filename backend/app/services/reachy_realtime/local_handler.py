@@ -29,8 +29,10 @@ Pipeline:
               with system=profile instructions, tools=registry specs
         → tool calls dispatched via tools.dispatch (Reachy motion)
         → token stream split on sentence boundaries
-        → TTSService.synthesize per sentence
-        → decoded to PCM16 24 kHz mono → emitted as audio.delta to client
+        → TTSService.synthesize per sentence, one sentence ahead of playback
+          (PCM for recurring phrases served from a per-voice LRU)
+        → decoded + polyphase-resampled to PCM16 24 kHz mono → emitted as
+          audio.delta to client
         → on_assistant_audio callback also fires (head wobbler + Reachy speaker)
 
 Barge-in:
@@ -44,8 +46,10 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import functools
 import io
 import json
+import math
 import os
 import re
 import time
@@ -57,6 +61,7 @@ import numpy as np
 import structlog
 
 from app.infrastructure.config import get_settings
+from app.infrastructure.ttl_cache import TTLCache
 from app.services.reachy_realtime import tools as tool_registry
 from app.services.reachy_realtime.bg_tool_manager import (
     BackgroundToolManager,
@@ -188,6 +193,14 @@ SPEAKER_CALLBACK_TIMEOUT_S = float(
     os.getenv("REACHY_LOCAL_SPEAKER_CALLBACK_TIMEOUT_S", "0.25")
 )
 TTS_TIMEOUT_S = float(os.getenv("REACHY_LOCAL_TTS_TIMEOUT_S", "12"))
+# Sentences synthesized ahead of the one currently playing. One is enough to
+# hide synthesis latency; more only wastes TTS work when the user barges in.
+TTS_LOOKAHEAD = max(1, int(os.getenv("REACHY_LOCAL_TTS_LOOKAHEAD", "1")))
+# Decoded PCM for short recurring phrases (persona intros, acknowledgements,
+# nudges), keyed by (voice, text). ~48 KB per second of 24 kHz audio.
+TTS_CACHE_ENTRIES = int(os.getenv("REACHY_LOCAL_TTS_CACHE_ENTRIES", "64"))
+TTS_CACHE_MAX_CHARS = int(os.getenv("REACHY_LOCAL_TTS_CACHE_MAX_CHARS", "160"))
+TTS_CACHE_TTL_S = float(os.getenv("REACHY_LOCAL_TTS_CACHE_TTL_S", "86400"))
 STT_TIMEOUT_S = float(os.getenv("REACHY_LOCAL_STT_TIMEOUT_S", "8"))
 LLM_TURN_TIMEOUT_S = float(os.getenv("REACHY_LOCAL_LLM_TURN_TIMEOUT_S", "30"))
 LLM_FIRST_TOKEN_TIMEOUT_S = float(
@@ -228,6 +241,10 @@ ASSISTANT_NAME_WORDS = {
 }
 EDGE_TTS_VOICE_RE = re.compile(r"^[a-z]{2}-[A-Z]{2}-[A-Za-z0-9]+Neural$")
 PIPER_VOICE_RE = re.compile(r"^[a-z]{2}_[A-Z]{2}-.+")
+# Process-wide so a persona's greeting is synthesized once, not per session.
+_PCM_CACHE: TTLCache[bytes] = TTLCache(
+    "reachy_local_tts_pcm", max_entries=TTS_CACHE_ENTRIES, ttl_s=TTS_CACHE_TTL_S,
+)
 
 
 def _is_edge_tts_voice(voice: str) -> bool:
@@ -895,6 +912,11 @@ class LocalRealtimeHandler:
 
         self._http: Optional[httpx.AsyncClient] = None
         self._tts_service = None  # lazy
+        self._piper_voice_applied: Optional[str] = None
+        # Per-turn speech pipeline: _speak_chunk queues text, the pipeline
+        # task synthesizes ahead and a player task emits audio in order.
+        self._speech_queue: Optional[asyncio.Queue] = None
+        self._speech_task: Optional[asyncio.Task] = None
         self._whisper_model = None  # lazy, cached for the session lifetime
 
     def health_snapshot(self) -> dict[str, Any]:
@@ -1510,6 +1532,28 @@ class LocalRealtimeHandler:
         """Stream tokens from the local model, dispatch tool calls, speak as we go."""
         if self._http is None:
             return
+        started = time.perf_counter()
+        try:
+            completed = await self._run_llm_rounds()
+        finally:
+            # Replies are spoken by the background speech pipeline; the turn
+            # (and its phase) only ends once the audio has played out.
+            await self._finish_speech()
+        if not completed:
+            return
+        if self._on_turn_end is not None:
+            try:
+                await self._on_turn_end()
+            except Exception as e:
+                logger.debug("on_turn_end_failed", error=str(e))
+        logger.info(
+            "local_llm_turn_done",
+            elapsed_s=round(time.perf_counter() - started, 3),
+            messages=len(self._messages),
+        )
+
+    async def _run_llm_rounds(self) -> bool:
+        """Tool-calling rounds of one turn. False when the turn was cut short."""
         enabled = list(resolve_tools(self.profile_id))
         tool_specs = tool_registry.get_tool_specs(enabled=enabled)
         chat_tools = _convert_tools_for_chat_completions(tool_specs)
@@ -1523,13 +1567,12 @@ class LocalRealtimeHandler:
             messages=len(self._messages),
             tools=len(chat_tools),
         )
-        started = time.perf_counter()
         assistant_replied = False
         self._last_error = None
         for _round in range(3):
             if self._cancel_response.is_set():
                 logger.info("local_llm_turn_cancelled", round=_round)
-                return
+                return False
             completion = await self._stream_completion(chat_tools)
             if len(completion) == 2:
                 assistant_text, tool_calls = completion
@@ -1543,7 +1586,7 @@ class LocalRealtimeHandler:
                     "message": "Local Qwen timed out while thinking. Use Recover Voice and try a shorter prompt.",
                 })
                 await self._emit_phase("stalled", reason="llm_timeout")
-                return
+                return False
             # Persist the cleaned (think-block-stripped) reply in conversation
             # history; otherwise the model's own prior chain-of-thought would
             # bias the next turn.
@@ -1622,7 +1665,7 @@ class LocalRealtimeHandler:
                     "content": json.dumps(result, default=str),
                 })
                 if tool_timed_out:
-                    return
+                    return False
 
         if not assistant_replied and not self._cancel_response.is_set():
             fallback = "I heard you, but I couldn't complete that action."
@@ -1634,17 +1677,7 @@ class LocalRealtimeHandler:
                 "content": fallback,
             })
             await self._speak_chunk(fallback)
-
-        if self._on_turn_end is not None:
-            try:
-                await self._on_turn_end()
-            except Exception as e:
-                logger.debug("on_turn_end_failed", error=str(e))
-        logger.info(
-            "local_llm_turn_done",
-            elapsed_s=round(time.perf_counter() - started, 3),
-            messages=len(self._messages),
-        )
+        return True
 
     async def _stream_completion(
         self, chat_tools: list[dict]
@@ -1845,19 +1878,114 @@ class LocalRealtimeHandler:
         return spoken_to_idx + last_break
 
     async def _speak_chunk(self, text: str) -> None:
+        """Queue ``text`` for speech and return without waiting for playback.
+
+        Synthesis starts right away (while any earlier sentence is still
+        playing); ``_finish_speech`` waits for the queue to play out.
+        """
         text = self._tone_guard.clean(text.strip())
         if not text or self._cancel_response.is_set():
             return
         await self._emit_phase("speaking")
+        if self._speech_task is None or self._speech_task.done():
+            self._speech_queue = asyncio.Queue()
+            self._speech_task = asyncio.create_task(
+                self._speech_pipeline(self._speech_queue)
+            )
+        self._speech_queue.put_nowait(text)
+
+    async def _finish_speech(self) -> None:
+        """Close this turn's speech queue and wait until it has played out
+        (or was cut off by barge-in / cancel_response)."""
+        task, queue = self._speech_task, self._speech_queue
+        if task is None or queue is None:
+            return
+        queue.put_nowait(None)
+        try:
+            await asyncio.gather(task, return_exceptions=True)
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+        finally:
+            if self._speech_task is task:
+                self._speech_task = None
+                self._speech_queue = None
+
+    async def _until_cancelled(self, aw: Awaitable[Any]) -> tuple[bool, Any]:
+        """Await ``aw`` unless the response is cancelled first.
+
+        Returns ``(True, result)``, or ``(False, None)`` after cancelling
+        ``aw`` because barge-in / cancel_response fired.
+        """
+        task = asyncio.ensure_future(aw)
+        waiter = asyncio.create_task(self._cancel_response.wait())
+        try:
+            await asyncio.wait({task, waiter}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            waiter.cancel()
+            if not task.done():
+                task.cancel()
+        if task.cancelled():
+            return False, None
+        return True, task.result()
+
+    async def _speech_pipeline(self, queue: asyncio.Queue) -> None:
+        """Synthesis stage: turn queued text into PCM, at most
+        ``TTS_LOOKAHEAD`` sentences ahead of the player."""
+        ready: asyncio.Queue = asyncio.Queue(maxsize=TTS_LOOKAHEAD)
+        player = asyncio.create_task(self._speech_player(ready))
+        stopped = True
+        try:
+            while True:
+                text = await queue.get()
+                if text is None or self._cancel_response.is_set():
+                    break
+                ok, pcm = await self._until_cancelled(self._synthesize_pcm(text))
+                if not ok:
+                    break
+                if not pcm:
+                    continue
+                ok, _ = await self._until_cancelled(ready.put((text, pcm)))
+                if not ok:
+                    break
+            if not self._cancel_response.is_set():
+                stopped = not (await self._until_cancelled(ready.put(None)))[0]
+        finally:
+            # Barge-in: drop whatever is still queued or mid-playback.
+            if stopped:
+                player.cancel()
+        await asyncio.gather(player, return_exceptions=True)
+
+    async def _speech_player(self, ready: asyncio.Queue) -> None:
+        while True:
+            item = await ready.get()
+            if item is None:
+                return
+            text, pcm = item
+            await self._play_pcm(text, pcm)
+            if self._cancel_response.is_set():
+                return
+
+    async def _synthesize_pcm(self, text: str) -> bytes:
+        """PCM16 mono OUTPUT_RATE for ``text`` in the session voice; b'' on
+        failure (after surfacing the error to the client)."""
+        voice = self.voice
+        cache_key = (voice, text)
+        cacheable = len(text) <= TTS_CACHE_MAX_CHARS
+        if cacheable:
+            cached = _PCM_CACHE.get(cache_key)
+            if cached is not None:
+                return cached
         wav_bytes: bytes = b""
         try:
             from app.services.tts_service import get_tts_service
             self._tts_service = self._tts_service or get_tts_service()
-            voice_override = self.voice if (
-                self.voice.startswith("fish:") or _is_edge_tts_voice(self.voice)
+            voice_override = voice if (
+                voice.startswith("fish:") or _is_edge_tts_voice(voice)
             ) else None
-            if _is_piper_voice(self.voice):
-                await self._tts_service.set_piper_voice(self.voice)
+            if _is_piper_voice(voice) and self._piper_voice_applied != voice:
+                await self._tts_service.set_piper_voice(voice)
+                self._piper_voice_applied = voice
             wav_bytes, _meta = await asyncio.wait_for(
                 self._tts_service.synthesize_with_meta(
                     text,
@@ -1867,36 +1995,43 @@ class LocalRealtimeHandler:
             )
         except asyncio.TimeoutError:
             self._last_error = "tts synthesis timed out"
-            logger.warning("local_tts_timeout", voice=self.voice, timeout_s=TTS_TIMEOUT_S)
+            logger.warning("local_tts_timeout", voice=voice, timeout_s=TTS_TIMEOUT_S)
             await self._emit({
                 "type": "error",
                 "code": "tts_timeout",
                 "message": "TTS synthesis timed out. Use Recover Voice or pick a faster voice.",
             })
             await self._emit_phase("stalled", reason="tts_timeout")
-            return
+            return b""
         except Exception as e:
-            logger.warning("local_tts_failed", voice=self.voice, error=str(e))
+            logger.warning("local_tts_failed", voice=voice, error=str(e))
             await self._emit({
                 "type": "error",
                 "code": "tts_failed",
-                "message": f"TTS synthesis failed for voice '{self.voice}': {e}",
+                "message": f"TTS synthesis failed for voice '{voice}': {e}",
             })
-            return
+            return b""
         if not wav_bytes:
-            logger.warning("local_tts_empty", voice=self.voice)
+            logger.warning("local_tts_empty", voice=voice)
             await self._emit({
                 "type": "error",
                 "code": "tts_empty",
-                "message": f"TTS returned no audio for voice '{self.voice}'. Try a different voice in settings.",
+                "message": f"TTS returned no audio for voice '{voice}'. Try a different voice in settings.",
             })
-            return
+            return b""
         # Decode WAV → PCM16 mono OUTPUT_RATE.
-        pcm = await asyncio.get_event_loop().run_in_executor(
+        pcm = await asyncio.get_running_loop().run_in_executor(
             None, _wav_bytes_to_pcm16, wav_bytes, OUTPUT_RATE
         )
-        if not pcm or self._cancel_response.is_set():
+        if pcm and cacheable:
+            _PCM_CACHE.set(cache_key, pcm)
+        return pcm
+
+    async def _play_pcm(self, text: str, pcm: bytes) -> None:
+        if self._cancel_response.is_set():
             return
+        if self._phase != "speaking":
+            await self._emit_phase("speaking")
         speech_seconds = (len(pcm) / 2) / float(OUTPUT_RATE)
         self._ignore_input_until = max(
             self._ignore_input_until,
@@ -1998,10 +2133,63 @@ def _wav_bytes_to_pcm16(wav_bytes: bytes, target_rate: int) -> bytes:
     if data.ndim > 1:
         data = data.mean(axis=1)
     if samplerate != target_rate:
-        ratio = target_rate / float(samplerate)
-        new_len = max(1, int(round(data.size * ratio)))
-        xs = np.linspace(0, data.size - 1, num=new_len, dtype=np.float32)
-        data = np.interp(xs, np.arange(data.size, dtype=np.float32), data).astype(np.float32)
+        data = _resample_polyphase(data, int(samplerate), target_rate)
     clipped = np.clip(data, -1.0, 1.0)
     pcm = (clipped * 32767.0).astype("<i2").tobytes()
     return pcm
+
+
+# Zero crossings of the windowed-sinc on each side of the centre tap.
+_RESAMPLE_ZERO_CROSSINGS = 10
+_RESAMPLE_KAISER_BETA = 5.0
+# Output samples computed per vectorised block (bounds the gather matrix).
+_RESAMPLE_BLOCK = 16384
+
+
+@functools.lru_cache(maxsize=16)
+def _polyphase_bank(up: int, down: int) -> np.ndarray:
+    """Kaiser-windowed sinc low-pass split into ``up`` phases of equal length.
+
+    ``bank[p, j]`` is tap ``p + j * up`` of the prototype filter, pre-scaled
+    by ``up`` so the interpolated signal keeps unit gain.
+    """
+    factor = max(up, down)
+    length = 2 * _RESAMPLE_ZERO_CROSSINGS * factor + 1
+    t = np.arange(length, dtype=np.float64) - (length - 1) / 2.0
+    h = np.sinc(t / factor) * np.kaiser(length, _RESAMPLE_KAISER_BETA)
+    h *= up / h.sum()
+    taps = -(-length // up)
+    padded = np.zeros(taps * up, dtype=np.float64)
+    padded[:length] = h
+    return padded.reshape(taps, up).T.astype(np.float32)
+
+
+def _resample_polyphase(data: np.ndarray, src_rate: int, dst_rate: int) -> np.ndarray:
+    """Band-limited rational resampling (upsample by ``up``, low-pass, keep
+    every ``down``-th sample), evaluated only at the kept output positions.
+
+    Unlike linear interpolation this filters above the lower Nyquist, so
+    22.05 kHz Piper / 24 kHz edge-tts / 48 kHz audio lands on OUTPUT_RATE
+    without aliasing hiss.
+    """
+    g = math.gcd(src_rate, dst_rate)
+    up, down = dst_rate // g, src_rate // g
+    if up == down or data.size == 0:
+        return data.astype(np.float32, copy=False)
+    bank = _polyphase_bank(up, down)
+    taps = bank.shape[1]
+    centre = _RESAMPLE_ZERO_CROSSINGS * max(up, down)
+    x = np.concatenate([
+        np.zeros(taps, dtype=np.float32),
+        data.astype(np.float32, copy=False),
+        np.zeros(taps, dtype=np.float32),
+    ])
+    n_out = -(-data.size * up // down)
+    out = np.empty(n_out, dtype=np.float32)
+    j = np.arange(taps)
+    for start in range(0, n_out, _RESAMPLE_BLOCK):
+        n = np.arange(start, min(start + _RESAMPLE_BLOCK, n_out), dtype=np.int64)
+        m = n * down + centre  # position in the upsampled stream, delay-compensated
+        idx = (m // up)[:, None] - j[None, :] + taps
+        out[start:start + n.size] = np.einsum("ij,ij->i", bank[m % up], x[idx])
+    return out
@@ -24,6 +24,7 @@ from apscheduler.triggers.interval import IntervalTrigger
 from sqlalchemy import select, func as sa_func, case
 
 from app.infrastructure.database import get_session
+from app.infrastructure.llm_concurrency import LlmPriority, llm_priority
 from app.db.models import SchedulerAuditLogModel, ServiceConfigModel
 
 logger = structlog.get_logger(__name__)
@@ -1116,9 +1117,11 @@ class SchedulerService:
             logger.warning("no_handler_for_job", job=job_name)
             return
 
-        # Wrap handler with audit logging
+        # Wrap handler with audit logging; scheduled LLM calls run in the
+        # background lane so they can't starve interactive turns.
         async def audited_handler(_name=job_name, _handler=handler):
-            await self._run_with_audit(_name, _handler)
+            with llm_priority(LlmPriority.BACKGROUND):
+                await self._run_with_audit(_name, _handler)
 
         trigger = CronTrigger.from_crontab(config["cron"])
 
@@ -2360,23 +2363,24 @@ Have a great evening!"""
             if not accounts:
                 return  # No Google accounts connected, skip silently
 
+            results = await gmail.sync_accounts([acct["id"] for acct in accounts])
             for acct in accounts:
-                try:
-                    result = await gmail.sync_incremental(account_id=acct["id"])
-                    new_count = result.get("new_emails", 0)
-                    if new_count > 0:
-                        logger.info(
-                            "gmail_check_new_emails",
-                            account_id=acct["id"],
-                            email=acct["email"],
-                            count=new_count,
-                        )
-                except Exception as e:
+                result = results[acct["id"]]
+                if result.get("status") == "error":
                     logger.warning(
                         "gmail_check_account_failed",
                         account_id=acct["id"],
                         email=acct["email"],
-                        error=str(e),
+                        error=result.get("error"),
+                    )
+                    continue
+                new_count = result.get("new_emails", 0)
+                if new_count > 0:
+                    logger.info(
+                        "gmail_check_new_emails",
+                        account_id=acct["id"],
+                        email=acct["email"],
+                        count=new_count,
                     )
         except Exception as e:
             logger.debug("gmail_check_skipped", error=str(e))
@@ -3902,13 +3906,22 @@ Have a great evening!"""
             logger.error("ambient_vision_tick_failed", error=str(e))
 
     async def _run_vault_reindex_tick(self):
-        """SecondBrain Phase 2: incremental reindex of the Obsidian vault."""
+        """SecondBrain Phase 2: incremental reindex of the Obsidian vault.
+
+        While the filesystem watcher is live it indexes edits as they land,
+        so this tick only runs the periodic reconciliation scan.
+        """
         try:
             from app.services.vault_indexer_service import get_vault_indexer
+            from app.services.vault_watcher_service import get_vault_watcher
             indexer = get_vault_indexer()
             if not indexer.available():
                 return
+            watcher = get_vault_watcher()
+            if not watcher.reconcile_due():
+                return
             result = await indexer.reindex(force=False, max_files=200)
+            watcher.mark_reconciled()
             safe = {k: (str(v) if hasattr(v, "isoformat") else v) for k, v in result.items() if v is not None}
             logger.info("vault_reindex_tick", **safe)
         except Exception as e:
@@ -5518,7 +5531,10 @@ Have a great evening!"""
     async def _run_brain_episodic_extract(self):
         logger.info("running_brain_episodic_extract")
         try:
-            from app.services.episodic_memory_service import get_episodic_memory_service
+            from app.services.episodic_memory_service import (
+                ExtractionInput,
+                get_episodic_memory_service,
+            )
             from app.db.models import LlmUsageModel
             from sqlalchemy import select
             from datetime import timedelta
@@ -5537,7 +5553,7 @@ Have a great evening!"""
                 result = await session.execute(query)
                 recent = result.scalars().all()
 
-            extracted = 0
+            inputs = []
             for usage in recent:
                 # response_preview is not currently a column on LlmUsageModel —
                 # earlier code referenced it as an attribute and 500'd every
@@ -5546,15 +5562,16 @@ Have a great evening!"""
                 # error every run.
                 preview = getattr(usage, "response_preview", None)
                 if usage.task_type and preview:
-                    await svc.extract_and_store(
+                    inputs.append(ExtractionInput(
                         text=f"Task: {usage.task_type}. Response: {preview[:500]}",
                         source_type="llm_interaction",
                         source_id=usage.id,
                         namespace="general",
-                    )
-                    extracted += 1
+                    ))
 
-            logger.info("brain_episodic_extract_complete", extracted=extracted)
+            stored = await svc.extract_and_store_many(inputs) if inputs else []
+            logger.info("brain_episodic_extract_complete",
+                        extracted=len(inputs), stored=len(stored))
         except Exception as e:
             logger.error("brain_episodic_extract_failed", error=str(e))
 
@@ -0,0 +1,221 @@
+"""Sort-and-sweep alignment of transcript text to diarization speaker turns.
+
+Replaces the O(N×M) "every segment against every turn" loop. Turns are
+sorted by start once; for each query interval (a transcript segment or a
+word) the turns that can overlap it form one contiguous index range:
+
+    hi = first turn starting at or after the interval's end
+    lo = first turn whose running max end passes the interval's start
+
+Those (interval, turn) pairs are materialised with numpy, their overlaps
+summed per speaker, and the speaker with the most overlap wins. Cost is
+O((N + M) log M + pairs), where pairs is the number of actual overlaps —
+near-linear for real diarization output.
+
+Summing per speaker (instead of taking the single longest turn) keeps a
+segment with the speaker pyannote split into several short turns. When
+faster-whisper word timestamps are present, each word is attributed
+separately and the segment is split where the speaker changes; every
+part, split or not, is held to the same ``MIN_COVERAGE`` rule.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+UNKNOWN = "UNKNOWN"
+# A segment needs more than this share of its duration covered by one
+# speaker to be attributed to them.
+MIN_COVERAGE = 0.5
+# Speaker runs shorter than this many words are folded into a neighbour
+# instead of becoming their own segment (diarization jitter at turn edges).
+MIN_SPLIT_WORDS = 2
+# Candidate (interval, turn) pairs materialised at once.
+_MAX_PAIRS = 1_000_000
+
+
+def assign_speakers(
+    starts: Sequence[float],
+    ends: Sequence[float],
+    turns: Sequence[Dict[str, Any]],
+    min_coverage: float = MIN_COVERAGE,
+) -> List[str]:
+    """Speaker label per interval, or ``UNKNOWN`` when coverage is too low."""
+    q_start = np.asarray(starts, dtype=np.float64)
+    q_end = np.asarray(ends, dtype=np.float64)
+    n = q_start.size
+    labels = np.full(n, UNKNOWN, dtype=object)
+    if n == 0 or not turns:
+        return labels.tolist()
+
+    speakers = sorted({str(t["speaker"]) for t in turns})
+    code = {s: i for i, s in enumerate(speakers)}
+    d_start = np.fromiter((float(t["start"]) for t in turns), dtype=np.float64, count=len(turns))
+    d_end = np.fromiter((float(t["end"]) for t in turns), dtype=np.float64, count=len(turns))
+    d_spk = np.fromiter((code[str(t["speaker"])] for t in turns), dtype=np.int64, count=len(turns))
+    order = np.argsort(d_start, kind="stable")
+    d_start, d_end, d_spk = d_start[order], d_end[order], d_spk[order]
+    run_max_end = np.maximum.accumulate(d_end)
+
+    hi = np.searchsorted(d_start, q_end, side="left")
+    lo = np.searchsorted(run_max_end, q_start, side="right")
+    counts = np.maximum(hi - lo, 0)
+
+    per_speaker = np.zeros((n, len(speakers)), dtype=np.float64)
+    # Materialise candidate pairs in blocks of queries so one very long turn
+    # (which widens every range after it) cannot blow up memory.
+    cum = np.cumsum(counts)
+    block_start = 0
+    while block_start < n:
+        base = int(cum[block_start - 1]) if block_start else 0
+        block_end = max(block_start + 1, int(np.searchsorted(cum, base + _MAX_PAIRS, side="right")))
+        block_end = min(block_end, n)
+        _accumulate(
+            per_speaker, block_start, counts[block_start:block_end], lo[block_start:block_end],
+            q_start, q_end, d_start, d_end, d_spk,
+        )
+        block_start = block_end
+
+    best = per_speaker.argmax(axis=1)
+    best_overlap = per_speaker[np.arange(n), best]
+    duration = q_end - q_start
+    has_span = duration > 0
+    coverage = np.divide(best_overlap, duration, out=np.zeros(n), where=has_span)
+    assigned = (best_overlap > 0) & (~has_span | (coverage > min_coverage))
+    names = np.asarray(speakers, dtype=object)
+    labels[assigned] = names[best[assigned]]
+    return labels.tolist()
+
+
+def _accumulate(
+    per_speaker: np.ndarray,
+    offset: int,
+    counts: np.ndarray,
+    lo: np.ndarray,
+    q_start: np.ndarray,
+    q_end: np.ndarray,
+    d_start: np.ndarray,
+    d_end: np.ndarray,
+    d_spk: np.ndarray,
+) -> None:
+    """Add per-speaker overlap for queries ``offset .. offset+len(counts)``."""
+    total = int(counts.sum())
+    if total == 0:
+        return
+    q_idx = offset + np.repeat(np.arange(counts.size), counts)
+    group_start = np.cumsum(counts) - counts
+    d_idx = np.repeat(lo, counts) + (np.arange(total) - np.repeat(group_start, counts))
+    overlap = np.minimum(q_end[q_idx], d_end[d_idx]) - np.maximum(q_start[q_idx], d_start[d_idx])
+    keep = overlap > 0
+    np.add.at(per_speaker, (q_idx[keep], d_spk[d_idx[keep]]), overlap[keep])
+
+
+def _smooth_runs(labels: List[str]) -> List[str]:
+    """Fill UNKNOWN words from their neighbours and fold too-short runs."""
+    out = list(labels)
+    last: Optional[str] = None
+    for i, lab in enumerate(out):
+        if lab == UNKNOWN:
+            if last is not None:
+                out[i] = last
+        else:
+            last = lab
+    first_known = next((lab for lab in out if lab != UNKNOWN), None)
+    if first_known is None:
+        return out
+    out = [first_known if lab == UNKNOWN else lab for lab in out]
+
+    runs = _runs(out)
+    if len(runs) > 1:
+        for r, (lab, a, b) in enumerate(runs):
+            if b - a < MIN_SPLIT_WORDS:
+                fill = runs[r - 1][0] if r > 0 else runs[r + 1][0]
+                out[a:b] = [fill] * (b - a)
+                runs[r] = (fill, a, b)
+    return out
+
+
+def _runs(labels: List[str]) -> List[Tuple[str, int, int]]:
+    runs: List[Tuple[str, int, int]] = []
+    for i, lab in enumerate(labels):
+        if runs and runs[-1][0] == lab:
+            runs[-1] = (lab, runs[-1][1], i + 1)
+        else:
+            runs.append((lab, i, i + 1))
+    return runs
+
+
+def _segment(base: Dict[str, Any], speaker: str, **overrides: Any) -> Dict[str, Any]:
+    seg = {
+        "start": base["start"], "end": base["end"], "text": base["text"],
+        "speaker": speaker, "confidence": base.get("confidence"),
+    }
+    seg.update(overrides)
+    return seg
+
+
+def align_segments(
+    turns: Sequence[Dict[str, Any]],
+    transcript_segments: Sequence[Dict[str, Any]],
+    split_on_words: bool = True,
+) -> List[Dict[str, Any]]:
+    """Attribute transcript segments to speakers.
+
+    Segments carrying faster-whisper ``words`` (dicts with start/end/word)
+    are split at speaker changes when ``split_on_words``; others get the
+    speaker covering most of their span.
+    """
+    seg_labels = assign_speakers(
+        [s["start"] for s in transcript_segments],
+        [s["end"] for s in transcript_segments],
+        turns,
+    )
+
+    worded = [
+        i for i, s in enumerate(transcript_segments)
+        if split_on_words and s.get("words")
+    ]
+    word_labels: Dict[int, List[str]] = {}
+    if worded:
+        flat = [(i, w) for i in worded for w in transcript_segments[i]["words"]]
+        labels = assign_speakers(
+            [float(w["start"]) for _, w in flat], [float(w["end"]) for _, w in flat], turns,
+        )
+        for (i, _), lab in zip(flat, labels):
+            word_labels.setdefault(i, []).append(lab)
+
+    # Word labels only decide where a segment splits; each resulting part
+    # (or the whole segment, when it stays in one piece) still needs more
+    # than MIN_COVERAGE of its span from its speaker.
+    splits: Dict[int, List[Tuple[str, int, int]]] = {}
+    for i, labels in word_labels.items():
+        runs = _runs(_smooth_runs(labels))
+        if len(runs) > 1:
+            splits[i] = runs
+    run_starts: List[float] = []
+    run_ends: List[float] = []
+    for i, runs in splits.items():
+        words = transcript_segments[i]["words"]
+        for _, a, b in runs:
+            run_starts.append(float(words[a]["start"]))
+            run_ends.append(float(words[b - 1]["end"]))
+    covered = iter(assign_speakers(run_starts, run_ends, turns))
+
+    aligned: List[Dict[str, Any]] = []
+    for i, seg in enumerate(transcript_segments):
+        runs = splits.get(i)
+        if runs is None:
+            aligned.append(_segment(seg, seg_labels[i]))
+            continue
+        words = seg["words"]
+        for lab, a, b in runs:
+            part = words[a:b]
+            aligned.append(_segment(
+                seg, lab if next(covered) == lab else UNKNOWN,
+                start=round(float(part[0]["start"]), 3),
+                end=round(float(part[-1]["end"]), 3),
+                text="".join(str(w["word"]) for w in part).strip(),
+            ))
+    return aligned
@@ -1,11 +1,25 @@
 """Vault Indexer — incremental markdown -> pgvector + tsvector pipeline.
 
-Every tick:
-  1. Walk the vault (skip .obsidian, .git, .trash, 90_Archive).
-  2. Hash each .md file. Skip unchanged. Track deleted files (orphan sweep).
-  3. For changed files: parse frontmatter, split by heading hierarchy into
-     ~512-token chunks preserving `[[wikilinks]]`, upsert into vault_chunks.
-  4. Embed each new chunk via the shared LiteLLM embedder (qwen3-embed).
+Every tick runs a streaming pipeline:
+  1. Load the stored file hash for every indexed path in one query.
+  2. Walk the vault (skip .obsidian, .git, .trash, 90_Archive). Read, hash,
+     parse frontmatter and split changed files by heading hierarchy into
+     ~512-token chunks preserving `[[wikilinks]]` — in a small worker pool
+     so disk IO and YAML parsing stay off the event loop.
+  3. Embed chunks via the shared embedder (qwen3-embed) with ``embed_batch``,
+     several bounded batches in flight at once. Chunks whose text is
+     unchanged keep their stored vector (matched on the per-chunk half of
+     ``content_hash``), so editing one paragraph re-embeds one chunk.
+  4. Write rows with a multi-row ``INSERT ... ON CONFLICT`` per batch of
+     files and sweep orphaned paths.
+
+A full forced reindex is therefore bounded by embedder throughput rather
+than per-chunk HTTP and DB round trips. Live counters are exposed through
+``VaultIndexerService.progress()``.
+
+Between ticks, ``vault_watcher_service`` feeds filesystem change events into
+``index_paths`` so edits are searchable within seconds; the cron tick then
+only acts as a periodic reconciliation pass.
 
 Partition rules (drive retrieval weighting):
     10_Atlas/**, 40_Resources/**  -> reference
@@ -25,15 +39,15 @@ from __future__ import annotations
 import asyncio
 import hashlib
 import re
-import uuid
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Iterable, Optional
 
 import structlog
 import yaml
-from sqlalchemy import and_, delete, select, update
+from sqlalchemy import and_, delete, func, select
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.db.models import VaultChunkModel
@@ -48,6 +62,10 @@ _SKIP_DIR_PARTS = {".obsidian", ".git", ".trash", "90_Archive", "node_modules"}
 _MAX_CHUNK_CHARS = 2000  # ~500 tokens with overlap
 _OVERLAP_CHARS = 240
 _FRONTMATTER_RE = re.compile(r"^---\n(.*?)\n---\n(.*)$", re.DOTALL)
+_EMBED_DIM = 1024  # pgvector column dim; Matryoshka-truncate / pad to fit
+# Rows per multi-row INSERT. 13 bind params per row keeps us far below
+# Postgres' 32767 parameter cap.
+_WRITE_BATCH_ROWS = 200
 
 
 def _partition_for(rel_path: Path) -> str:
@@ -168,15 +186,147 @@ def _iter_markdown(root: Path) -> Iterable[Path]:
         yield p
 
 
+@dataclass
+class _PreparedFile:
+    """A changed file, parsed and chunked, waiting for embeddings."""
+    rel: str
+    file_hash: str
+    partition: str
+    tags: list[str]
+    frontmatter: Optional[dict[str, Any]]
+    mtime: datetime
+    chunks: list[_Chunk]
+    embeddings: list[Optional[list[float]]] = field(default_factory=list)
+
+
+@dataclass
+class ReindexProgress:
+    """Live counters for the running (or most recent) reindex."""
+    running: bool = False
+    mode: str = "full"  # full | incremental
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    files_scanned: int = 0
+    files_changed: int = 0
+    chunks_embedded: int = 0
+    chunks_reused: int = 0
+    chunks_written: int = 0
+    embed_batches: int = 0
+    embed_failures: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        end = self.finished_at or time.monotonic()
+        elapsed = (end - self.started_at) if self.started_at else 0.0
+        return {
+            "running": self.running,
+            "mode": self.mode,
+            "elapsed_s": round(elapsed, 2),
+            "files_scanned": self.files_scanned,
+            "files_changed": self.files_changed,
+            "chunks_embedded": self.chunks_embedded,
+            "chunks_reused": self.chunks_reused,
+            "chunks_written": self.chunks_written,
+            "embed_batches": self.embed_batches,
+            "embed_failures": self.embed_failures,
+            "chunks_per_s": round(self.chunks_embedded / elapsed, 2) if elapsed > 0 else 0.0,
+        }
+
+
+def _invalidate_search_cache() -> None:
+    """vault_chunks changed; cached retrieval results are now stale."""
+    try:
+        from app.services.vault_retrieval_service import get_vault_retrieval
+        get_vault_retrieval().invalidate_results()
+    except Exception as e:  # noqa: BLE001
+        logger.debug("vault_search_cache_invalidate_failed", error=str(e))
+
+
+def _chunk_id(rel: str, idx: int) -> str:
+    """Stable row id per (path, chunk_idx) so re-writes upsert in place."""
+    return _sha256_bytes(rel.encode("utf-8"))[:28] + str(idx).zfill(4)
+
+
+def _fit_dim(vec: list[float]) -> list[float]:
+    # vLLM returns 1024; Matryoshka-truncate anything longer and pad shorter
+    # (shouldn't happen with Qwen3-Embedding).
+    if len(vec) > _EMBED_DIM:
+        return vec[:_EMBED_DIM]
+    if len(vec) < _EMBED_DIM:
+        return vec + [0.0] * (_EMBED_DIM - len(vec))
+    return vec
+
+
+def _chunk_body(body: str) -> list[_Chunk]:
+    sections = _split_by_headings(body)
+    all_chunks: list[_Chunk] = []
+    global_idx = 0
+    for heading_path, section_body in sections:
+        for ch in _chunk_section(heading_path, section_body):
+            ch.idx = global_idx
+            all_chunks.append(ch)
+            global_idx += 1
+    if not all_chunks and body.strip():
+        # file with no headings; treat as one chunk
+        all_chunks = [_Chunk(idx=0, heading_path="", content=body.strip(), token_count=len(body) // 4)]
+    return all_chunks
+
+
+def _prepare_file(
+    fp: Path, rel: str, existing_hash: Optional[str], force: bool
+) -> Optional[_PreparedFile]:
+    """Read + hash + parse + chunk one file. Runs in a worker thread.
+
+    Returns None when the file is unreadable or unchanged (and not forced).
+    """
+    try:
+        raw = fp.read_bytes()
+        mtime = datetime.fromtimestamp(fp.stat().st_mtime, tz=timezone.utc)
+    except Exception:  # noqa: BLE001
+        return None
+    file_hash = _sha256_bytes(raw)
+    if not force and existing_hash and existing_hash.startswith(file_hash[:16]):
+        return None
+
+    text = raw.decode("utf-8", errors="replace")
+    fm, body = _parse_frontmatter(text)
+    partition_override = (fm or {}).get("partition")
+    partition = partition_override if isinstance(partition_override, str) else _partition_for(Path(rel))
+    tags: list[str] = []
+    raw_tags = (fm or {}).get("tags")
+    if isinstance(raw_tags, list):
+        tags = [str(t) for t in raw_tags if t]
+    elif isinstance(raw_tags, str):
+        tags = [raw_tags]
+
+    return _PreparedFile(
+        rel=rel,
+        file_hash=file_hash,
+        partition=partition,
+        tags=tags,
+        frontmatter=fm if fm else None,
+        mtime=mtime,
+        chunks=_chunk_body(body),
+    )
+
+
 class VaultIndexerService:
     def __init__(self) -> None:
         self._settings = get_settings()
         self._root = Path(self._settings.vault_path)
-        self._embed_dim = 1024  # pgvector column dim; Matryoshka-truncate to 512 for journal below
+        self._embed_dim = _EMBED_DIM
+        self._embed_batch_size = max(1, self._settings.vault_index_embed_batch_size)
+        self._embed_concurrency = max(1, self._settings.vault_index_embed_concurrency)
+        self._chunk_workers = max(1, self._settings.vault_index_chunk_workers)
+        self._progress = ReindexProgress()
+        self._lock = asyncio.Lock()
 
     def available(self) -> bool:
         return self._root.is_dir()
 
+    def progress(self) -> dict[str, Any]:
+        """Counters for the running (or last finished) reindex."""
+        return self._progress.as_dict()
+
     async def _embed(self, text: str) -> Optional[list[float]]:
         """Embed via the shared LiteLLM embedder. Returns None on failure."""
         try:
@@ -184,146 +334,331 @@ class VaultIndexerService:
             vec = await client.embed(text, max_retries=1)
             if not vec:
                 return None
-            # Ensure we fit the vector(1024) column. vLLM returns 1024; Matryoshka-truncate
-            # anything longer and pad shorter (shouldn't happen with Qwen3-Embedding).
-            if len(vec) > self._embed_dim:
-                vec = vec[: self._embed_dim]
-            elif len(vec) < self._embed_dim:
-                vec = vec + [0.0] * (self._embed_dim - len(vec))
-            return vec
+            return _fit_dim(vec)
         except Exception as e:  # noqa: BLE001
             logger.warning("vault_embed_failed", error=str(e))
             return None
 
+    async def _embed_many(self, texts: list[str]) -> list[Optional[list[float]]]:
+        """Embed texts in bounded concurrent ``embed_batch`` calls.
+
+        A failed batch yields None for its members (rows are still written so
+        BM25 keeps working; the next forced reindex fills the vectors in).
+        """
+        if not texts:
+            return []
+        client = get_llm_client()
+        sem = asyncio.Semaphore(self._embed_concurrency)
+        size = self._embed_batch_size
+
+        async def _one(batch: list[str]) -> list[Optional[list[float]]]:
+            async with sem:
+                try:
+                    vecs = await client.embed_batch(batch, max_retries=1)
+                except Exception as e:  # noqa: BLE001
+                    self._progress.embed_failures += 1
+                    logger.warning("vault_embed_batch_failed", count=len(batch), error=str(e))
+                    return [None] * len(batch)
+                self._progress.embed_batches += 1
+                self._progress.chunks_embedded += len(batch)
+                return [_fit_dim(v) if v else None for v in vecs]
+
+        results = await asyncio.gather(
+            *(_one(texts[i:i + size]) for i in range(0, len(texts), size))
+        )
+        return [vec for batch in results for vec in batch]
+
+    async def _load_file_hashes(self, paths: Optional[Iterable[str]] = None) -> dict[str, str]:
+        """One round trip: {path: content_hash} for every (or each given) indexed file."""
+        stmt = select(VaultChunkModel.path, func.min(VaultChunkModel.content_hash))
+        if paths is not None:
+            stmt = stmt.where(VaultChunkModel.path.in_(list(paths)))
+        async with get_session() as session:
+            result = await session.execute(stmt.group_by(VaultChunkModel.path))
+            return {path: h for path, h in result.all()}
+
+    async def _load_chunk_embeddings(self, paths: list[str]) -> dict[tuple[str, str], list[float]]:
+        """{(path, chunk_hash[:16]): embedding} for already-embedded chunks of ``paths``.
+
+        The trailing 16 chars of ``content_hash`` are the per-chunk hash, so
+        a chunk whose text survived an edit keeps its vector.
+        """
+        async with get_session() as session:
+            result = await session.execute(
+                select(
+                    VaultChunkModel.path,
+                    VaultChunkModel.content_hash,
+                    VaultChunkModel.embedding,
+                ).where(
+                    and_(
+                        VaultChunkModel.path.in_(paths),
+                        VaultChunkModel.embedding.isnot(None),
+                    )
+                )
+            )
+            return {
+                (path, content_hash[16:]): [float(v) for v in embedding]
+                for path, content_hash, embedding in result.all()
+            }
+
     async def reindex(self, *, force: bool = False, max_files: int = 500) -> dict[str, Any]:
         """Scan vault, upsert changed files, drop orphaned chunks."""
         if not self.available():
             return {"status": "skipped", "reason": "vault_unavailable", "path": str(self._root)}
 
-        scanned = 0
-        files_changed = 0
-        chunks_written = 0
-        chunks_deleted = 0
+        async with self._lock:
+            self._progress = ReindexProgress(running=True, started_at=time.monotonic())
+            try:
+                return await self._reindex(force=force, max_files=max_files)
+            finally:
+                self._progress.running = False
+                self._progress.finished_at = time.monotonic()
+
+    async def index_paths(self, rel_paths: Iterable[str]) -> dict[str, Any]:
+        """Re-index specific vault-relative paths (the file-watcher entry point).
+
+        Paths that no longer exist on disk have their chunks dropped; changed
+        files go through the same chunk/embed/write pipeline as ``reindex``,
+        so only chunks whose text actually changed are re-embedded.
+        """
+        if not self.available():
+            return {"status": "skipped", "reason": "vault_unavailable", "path": str(self._root)}
 
-        # Build a set of live paths for orphan detection.
-        live_paths: set[str] = set()
+        rels = sorted({
+            rel for rel in rel_paths
+            if rel.endswith(".md") and not any(part in _SKIP_DIR_PARTS for part in Path(rel).parts)
+        })
+        if not rels:
+            return {"status": "ok", "files_changed": 0, "chunks_written": 0, "chunks_deleted": 0}
 
-        for fp in _iter_markdown(self._root):
-            if scanned >= max_files:
-                break
-            scanned += 1
-            rel = fp.relative_to(self._root).as_posix()
-            live_paths.add(rel)
+        async with self._lock:
+            self._progress = ReindexProgress(
+                running=True, mode="incremental", started_at=time.monotonic()
+            )
             try:
-                raw = fp.read_bytes()
-            except Exception:  # noqa: BLE001
-                continue
-            file_hash = _sha256_bytes(raw)
-
-            # Skip unchanged files unless forced
-            if not force:
-                async with get_session() as session:
-                    result = await session.execute(
-                        select(VaultChunkModel.content_hash)
-                        .where(VaultChunkModel.path == rel)
-                        .limit(1)
-                    )
-                    existing_hash = result.scalar_one_or_none()
-                if existing_hash and existing_hash.startswith(file_hash[:16]):
-                    continue
+                present = [rel for rel in rels if (self._root / rel).is_file()]
+                gone = [rel for rel in rels if rel not in present]
+                existing = await self._load_file_hashes(present)
+                await self._run_pipeline(
+                    [(self._root / rel, rel) for rel in present], existing, force=False
+                )
+                chunks_deleted = await self._delete_paths(gone)
+            finally:
+                self._progress.running = False
+                self._progress.finished_at = time.monotonic()
+
+        progress = self._progress
+        result = {
+            "status": "ok",
+            "files_changed": progress.files_changed,
+            "chunks_embedded": progress.chunks_embedded,
+            "chunks_reused": progress.chunks_reused,
+            "chunks_written": progress.chunks_written,
+            "chunks_deleted": chunks_deleted,
+            "elapsed_s": progress.as_dict()["elapsed_s"],
+        }
+        logger.info("vault_index_paths", paths=len(rels), **result)
+        return result
 
-            files_changed += 1
-            written = await self._index_file(fp, rel, raw, file_hash)
-            chunks_written += written
+    async def _reindex(self, *, force: bool, max_files: int) -> dict[str, Any]:
+        progress = self._progress
+        existing = await self._load_file_hashes()
 
-        # Orphan sweep: remove chunks whose source file no longer exists.
-        async with get_session() as session:
-            result = await session.execute(select(VaultChunkModel.path).distinct())
-            db_paths = {p for (p,) in result.all()}
-            orphans = db_paths - live_paths
-            if orphans:
-                await session.execute(
-                    delete(VaultChunkModel).where(VaultChunkModel.path.in_(orphans))
-                )
-                await session.commit()
-                chunks_deleted = len(orphans)
-
-        logger.info(
-            "vault_reindex",
-            scanned=scanned,
-            files_changed=files_changed,
-            chunks_written=chunks_written,
-            chunks_deleted=chunks_deleted,
+        # Walk one past the cap so we know whether the scan was truncated.
+        paths = await asyncio.to_thread(
+            lambda: [p for _, p in zip(range(max_files + 1), _iter_markdown(self._root))]
         )
-        return {
+        truncated = len(paths) > max_files
+        paths = paths[:max_files]
+        files = [(p, p.relative_to(self._root).as_posix()) for p in paths]
+        live_paths = {rel for _, rel in files}
+
+        await self._run_pipeline(files, existing, force=force)
+
+        chunks_deleted = await self._sweep_orphans(set(existing), live_paths, truncated)
+
+        result = {
             "status": "ok",
-            "scanned": scanned,
-            "files_changed": files_changed,
-            "chunks_written": chunks_written,
+            "scanned": progress.files_scanned,
+            "files_changed": progress.files_changed,
+            "chunks_written": progress.chunks_written,
+            "chunks_reused": progress.chunks_reused,
             "chunks_deleted": chunks_deleted,
+            "embed_batches": progress.embed_batches,
+            "embed_failures": progress.embed_failures,
+            "elapsed_s": progress.as_dict()["elapsed_s"],
         }
+        logger.info("vault_reindex", **result)
+        return result
+
+    async def _run_pipeline(
+        self, files: list[tuple[Path, str]], existing: dict[str, str], *, force: bool
+    ) -> None:
+        """chunk -> embed -> write over ``files``, updating ``self._progress``.
+
+        Unless ``force`` is set, chunks whose text is unchanged reuse their
+        stored embedding instead of going back to the embedder.
+        """
+        progress = self._progress
+
+        # Stage queues are bounded so a huge vault never sits fully in memory.
+        prepared_q: asyncio.Queue[Optional[_PreparedFile]] = asyncio.Queue(
+            maxsize=self._chunk_workers * 4
+        )
+        embedded_q: asyncio.Queue[Optional[list[_PreparedFile]]] = asyncio.Queue(maxsize=2)
 
-    async def _index_file(self, fp: Path, rel: str, raw: bytes, file_hash: str) -> int:
-        try:
-            text = raw.decode("utf-8", errors="replace")
-        except Exception:  # noqa: BLE001
-            return 0
-        fm, body = _parse_frontmatter(text)
-        partition_override = (fm or {}).get("partition")
-        partition = partition_override if isinstance(partition_override, str) else _partition_for(Path(rel))
-        tags = []
-        raw_tags = (fm or {}).get("tags")
-        if isinstance(raw_tags, list):
-            tags = [str(t) for t in raw_tags if t]
-        elif isinstance(raw_tags, str):
-            tags = [raw_tags]
+        async def _chunk_stage() -> None:
+            sem = asyncio.Semaphore(self._chunk_workers)
 
-        mtime = datetime.fromtimestamp(fp.stat().st_mtime, tz=timezone.utc)
+            async def _one(fp: Path, rel: str) -> None:
+                async with sem:
+                    prepared = await asyncio.to_thread(
+                        _prepare_file, fp, rel, existing.get(rel), force
+                    )
+                progress.files_scanned += 1
+                if prepared is not None:
+                    progress.files_changed += 1
+                    await prepared_q.put(prepared)
+
+            try:
+                await asyncio.gather(*(_one(fp, rel) for fp, rel in files))
+            finally:
+                await prepared_q.put(None)
+
+        async def _embed_stage() -> None:
+            window_chunks = self._embed_batch_size * self._embed_concurrency
+            window: list[_PreparedFile] = []
+            pending = 0
+
+            async def _flush() -> None:
+                nonlocal window, pending
+                if not window:
+                    return
+                reuse: dict[tuple[str, str], list[float]] = {}
+                if not force:
+                    reuse = await self._load_chunk_embeddings([pf.rel for pf in window])
+                todo: list[tuple[_PreparedFile, int]] = []
+                for pf in window:
+                    pf.embeddings = []
+                    for i, chunk in enumerate(pf.chunks):
+                        key = (pf.rel, _sha256_bytes(chunk.content.encode("utf-8"))[:16])
+                        pf.embeddings.append(reuse.get(key))
+                        if pf.embeddings[-1] is None:
+                            todo.append((pf, i))
+                progress.chunks_reused += sum(len(pf.chunks) for pf in window) - len(todo)
+                vecs = await self._embed_many([pf.chunks[i].content for pf, i in todo])
+                for (pf, i), vec in zip(todo, vecs):
+                    pf.embeddings[i] = vec
+                await embedded_q.put(window)
+                window, pending = [], 0
 
-        # Split + chunk
-        sections = _split_by_headings(body)
-        all_chunks: list[_Chunk] = []
-        global_idx = 0
-        for heading_path, section_body in sections:
-            for ch in _chunk_section(heading_path, section_body):
-                ch.idx = global_idx
-                all_chunks.append(ch)
-                global_idx += 1
-        if not all_chunks and body.strip():
-            # file with no headings; treat as one chunk
-            all_chunks = [_Chunk(idx=0, heading_path="", content=body.strip(), token_count=len(body) // 4)]
-
-        # Wipe prior chunks for this path (simpler + correct vs per-chunk upsert).
+            try:
+                while True:
+                    pf = await prepared_q.get()
+                    if pf is None:
+                        break
+                    window.append(pf)
+                    pending += len(pf.chunks)
+                    if pending >= window_chunks:
+                        await _flush()
+                await _flush()
+            finally:
+                await embedded_q.put(None)
+
+        async def _write_stage() -> None:
+            while True:
+                batch = await embedded_q.get()
+                if batch is None:
+                    break
+                progress.chunks_written += await self._write_files(batch)
+
+        stages = [
+            asyncio.create_task(_chunk_stage()),
+            asyncio.create_task(_embed_stage()),
+            asyncio.create_task(_write_stage()),
+        ]
+        try:
+            await asyncio.gather(*stages)
+        except BaseException:
+            # A dead stage would leave its neighbours blocked on a full queue.
+            for task in stages:
+                task.cancel()
+            raise
+
+    async def _sweep_orphans(self, db_paths: set[str], live_paths: set[str], truncated: bool) -> int:
+        """Remove chunks whose source file no longer exists."""
+        orphans = db_paths - live_paths
+        if truncated:
+            # We didn't see the whole vault; only drop paths that are really gone.
+            orphans = {p for p in orphans if not (self._root / p).is_file()}
+        return await self._delete_paths(orphans)
+
+    async def _delete_paths(self, paths: Iterable[str]) -> int:
+        paths = list(paths)
+        if not paths:
+            return 0
         async with get_session() as session:
-            await session.execute(delete(VaultChunkModel).where(VaultChunkModel.path == rel))
-            await session.commit()
+            await session.execute(
+                delete(VaultChunkModel).where(VaultChunkModel.path.in_(paths))
+            )
+        _invalidate_search_cache()
+        return len(paths)
 
-        written = 0
-        for chunk in all_chunks:
-            embedding = await self._embed(chunk.content)
+    def _rows_for(self, pf: _PreparedFile) -> list[dict[str, Any]]:
+        rows = []
+        for chunk, embedding in zip(pf.chunks, pf.embeddings or [None] * len(pf.chunks)):
             chunk_hash = _sha256_bytes(chunk.content.encode("utf-8"))
-            # content_hash per chunk stores file_hash[:16] + chunk_hash[:16] so
-            # reindex-skip in reindex() can check any chunk row for the file hash.
-            content_hash = file_hash[:16] + chunk_hash[:16]
-            row = VaultChunkModel(
-                id=uuid.uuid4().hex[:16] + str(chunk.idx).zfill(4),
-                path=rel,
-                partition=partition,
-                chunk_idx=chunk.idx,
-                heading_path=chunk.heading_path or None,
-                content=chunk.content,
-                content_hash=content_hash,
-                token_count=chunk.token_count,
-                tags=tags,
-                frontmatter=fm if fm else None,
-                embedding=embedding,
-                file_mtime=mtime,
-            )
-            async with get_session() as session:
-                session.add(row)
-                await session.commit()
-            written += 1
-        return written
+            rows.append({
+                "id": _chunk_id(pf.rel, chunk.idx),
+                "path": pf.rel,
+                "partition": pf.partition,
+                "chunk_idx": chunk.idx,
+                "heading_path": chunk.heading_path or None,
+                "content": chunk.content,
+                # content_hash per chunk stores file_hash[:16] + chunk_hash[:16] so
+                # reindex() can check any chunk row for the file hash.
+                "content_hash": pf.file_hash[:16] + chunk_hash[:16],
+                "token_count": chunk.token_count,
+                "tags": pf.tags,
+                "frontmatter": pf.frontmatter,
+                "embedding": embedding,
+                "file_mtime": pf.mtime,
+                "updated_at": datetime.now(timezone.utc),
+            })
+        return rows
+
+    async def _write_files(self, files: list[_PreparedFile]) -> int:
+        """Replace the chunks of ``files`` in one transaction.
+
+        Stale rows (chunks past the new end, or legacy random ids) are deleted
+        per path; the new rows go in as multi-row upserts keyed on the stable
+        chunk id.
+        """
+        rows = [row for pf in files for row in self._rows_for(pf)]
+        async with get_session() as session:
+            for pf in files:
+                keep = [_chunk_id(pf.rel, c.idx) for c in pf.chunks]
+                await session.execute(
+                    delete(VaultChunkModel).where(
+                        and_(VaultChunkModel.path == pf.rel, VaultChunkModel.id.notin_(keep))
+                    )
+                )
+            for i in range(0, len(rows), _WRITE_BATCH_ROWS):
+                stmt = pg_insert(VaultChunkModel).values(rows[i:i + _WRITE_BATCH_ROWS])
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[VaultChunkModel.id],
+                    set_={
+                        col: stmt.excluded[col]
+                        for col in (
+                            "path", "partition", "chunk_idx", "heading_path", "content",
+                            "content_hash", "token_count", "tags", "frontmatter",
+                            "embedding", "file_mtime", "updated_at",
+                        )
+                    },
+                )
+                await session.execute(stmt)
+        _invalidate_search_cache()
+        return len(rows)
 
 
 _singleton: Optional[VaultIndexerService] = None
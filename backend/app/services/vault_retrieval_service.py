@@ -2,19 +2,29 @@
 
 Each query:
   1. Embed the query via the shared LiteLLM embedder.
-  2. BM25 over the tsvector column (Postgres `plainto_tsquery + ts_rank_cd`).
-  3. Dense cosine over the HNSW-indexed `embedding vector(1024)` column.
-  4. Reciprocal Rank Fusion: combine both rankings (k=60). Journal partition gets
-     an additional time-decay multiplier (0.5 ** (age_days / 30)) per SecondBrain §4.
-  5. Optional partition filter so 'what did I do Monday' queries don't retrieve
+  2. One SQL statement (see hybrid_search) that ranks BM25 over the tsvector
+     column (`plainto_tsquery + ts_rank_cd`) and dense cosine over the
+     HNSW-indexed `embedding vector(1024)` column, fuses both with Reciprocal
+     Rank Fusion (k=60), and applies the journal time-decay multiplier
+     (0.5 ** (age_days / 30)) per SecondBrain §4 — content is only fetched
+     for the final top_k.
+  3. Optional partition filter so 'what did I do Monday' queries don't retrieve
      reference docs.
 
 Returns the top-N chunks plus distinct file paths for follow-up reads.
+
+Two in-process caches sit in front of this, since Reachy voice turns, the
+briefing services and MCP tools repeat the same lookups constantly:
+  * query embeddings (LRU + TTL, keyed by normalized query text + embed
+    model) — a hit skips the embedder round trip entirely;
+  * full search results (short TTL, keyed by query/partitions/top_k) —
+    dropped whenever the vault indexer writes to vault_chunks.
+Hit/miss counters are published through MetricsService.
 """
 
 from __future__ import annotations
 
-from datetime import datetime, timezone
+import copy
 from typing import Any, Optional
 
 import structlog
@@ -23,11 +33,34 @@ from sqlalchemy import text
 from app.infrastructure.config import get_settings
 from app.infrastructure.database import get_session
 from app.infrastructure.ollama_client import get_llm_client
+from app.infrastructure.ttl_cache import TTLCache
+from app.services.hybrid_search import HybridSearchSpec, half_life_decay_sql, hybrid_search
 
 logger = structlog.get_logger(__name__)
 
 
-_RRF_K = 60  # standard RRF constant
+# Journal partition gets a 30-day half-life; the other partitions don't decay.
+_VAULT_SPEC = HybridSearchSpec(
+    table="vault_chunks",
+    tsv_sql="t.content_tsv",
+    select_sql=(
+        "t.id, t.path, t.partition, t.heading_path, t.chunk_idx, "
+        "left(t.content, 1200) AS content"
+    ),
+    decay_sql=half_life_decay_sql("t.file_mtime", 30.0, when="t.partition = 'journal'"),
+)
+
+
+def _normalize_query(text_: str) -> str:
+    return " ".join(text_.split()).casefold()
+
+
+def _count(metric: str) -> None:
+    try:
+        from app.services.metrics_service import get_metrics_service
+        get_metrics_service().increment(metric)
+    except Exception:  # noqa: BLE001
+        pass
 
 
 async def _embed_query(text_: str) -> Optional[list[float]]:
@@ -49,6 +82,44 @@ async def _embed_query(text_: str) -> Optional[list[float]]:
 class VaultRetrievalService:
     def __init__(self) -> None:
         self._settings = get_settings()
+        self._embed_cache: TTLCache[list[float]] = TTLCache(
+            "vault_query_embed",
+            max_entries=self._settings.vault_query_embed_cache_size,
+            ttl_s=self._settings.vault_query_embed_cache_ttl_s,
+        )
+        self._result_cache: TTLCache[dict[str, Any]] = TTLCache(
+            "vault_search_results",
+            max_entries=self._settings.vault_search_cache_size,
+            ttl_s=self._settings.vault_search_cache_ttl_s,
+        )
+        # Bumped by every invalidation; a search that started before an
+        # index write must not cache its (pre-write) result.
+        self._results_generation = 0
+
+    async def _cached_query_embedding(self, query: str) -> Optional[list[float]]:
+        key = (_normalize_query(query), self._settings.vllm_embed_model)
+        vec = self._embed_cache.get(key)
+        if vec is not None:
+            _count("vault_query_embed_cache_hit")
+            return vec
+        _count("vault_query_embed_cache_miss")
+        vec = await _embed_query(query)
+        if vec is not None:
+            self._embed_cache.set(key, vec)
+        return vec
+
+    def invalidate_results(self) -> None:
+        """Drop cached search results. Called by the indexer after every write."""
+        self._results_generation += 1
+        if len(self._result_cache):
+            self._result_cache.clear()
+            _count("vault_search_cache_invalidated")
+
+    def cache_stats(self) -> dict[str, Any]:
+        return {
+            "query_embeddings": self._embed_cache.stats(),
+            "results": self._result_cache.stats(),
+        }
 
     async def search(
         self,
@@ -62,88 +133,70 @@ class VaultRetrievalService:
 
         partitions: optional list in {reference, projects, journal, inbox}. Empty = all.
         """
-        embedding = await _embed_query(query)
+        cache_key = (
+            _normalize_query(query),
+            tuple(sorted(partitions or ())),
+            top_k,
+            per_side_k,
+        )
+        cached = self._result_cache.get(cache_key)
+        if cached is not None:
+            _count("vault_search_cache_hit")
+            result = copy.deepcopy(cached)
+            result["query"] = query
+            return result
+        _count("vault_search_cache_miss")
+
+        generation = self._results_generation
+        result = await self._search_uncached(
+            query, partitions=partitions, top_k=top_k, per_side_k=per_side_k
+        )
+        # Don't pin a BM25-only answer for the TTL when the embedder hiccupped.
+        if result.get("dense_enabled") and generation == self._results_generation:
+            self._result_cache.set(cache_key, copy.deepcopy(result))
+        return result
+
+    async def _search_uncached(
+        self,
+        query: str,
+        *,
+        partitions: Optional[list[str]],
+        top_k: int,
+        per_side_k: int,
+    ) -> dict[str, Any]:
+        embedding = await self._cached_query_embedding(query)
 
-        part_filter_sql = ""
-        params: dict[str, Any] = {"q": query, "k": per_side_k}
+        extra_filters: list[str] = []
+        params: dict[str, Any] = {}
         if partitions:
             params["partitions"] = list(partitions)
-            part_filter_sql = "AND partition = ANY(:partitions)"
-
-        # BM25 side
-        bm25_sql = text(
-            f"""
-            SELECT id, path, partition, heading_path, chunk_idx, content, file_mtime,
-                   ts_rank_cd(content_tsv, plainto_tsquery('english', :q)) AS rank
-              FROM vault_chunks
-             WHERE content_tsv @@ plainto_tsquery('english', :q)
-               {part_filter_sql}
-             ORDER BY rank DESC
-             LIMIT :k
-            """
-        )
+            extra_filters.append("t.partition = ANY(:partitions)")
 
-        # Dense side (only if we got an embedding)
-        dense_rows: list[dict[str, Any]] = []
         async with get_session() as session:
-            bm25_rows = (await session.execute(bm25_sql, params)).mappings().all()
-            bm25_rows = [dict(r) for r in bm25_rows]
-
-            if embedding is not None:
-                dense_sql = text(
-                    f"""
-                    SELECT id, path, partition, heading_path, chunk_idx, content, file_mtime,
-                           1 - (embedding <=> (:emb)::vector) AS cosine_sim
-                      FROM vault_chunks
-                     WHERE embedding IS NOT NULL
-                       {part_filter_sql}
-                     ORDER BY embedding <=> (:emb)::vector
-                     LIMIT :k
-                    """
-                )
-                dense_params = dict(params)
-                dense_params["emb"] = str(embedding)
-                dense_rows = [dict(r) for r in (await session.execute(dense_sql, dense_params)).mappings().all()]
-
-        # RRF fuse
-        scores: dict[str, dict[str, Any]] = {}
-        for rank, row in enumerate(bm25_rows, start=1):
-            sid = row["id"]
-            scores.setdefault(sid, {"row": row, "bm25": 0.0, "dense": 0.0})
-            scores[sid]["bm25"] += 1.0 / (_RRF_K + rank)
-        for rank, row in enumerate(dense_rows, start=1):
-            sid = row["id"]
-            scores.setdefault(sid, {"row": row, "bm25": 0.0, "dense": 0.0})
-            scores[sid]["dense"] += 1.0 / (_RRF_K + rank)
-
-        now = datetime.now(timezone.utc)
-        fused = []
-        for sid, agg in scores.items():
-            row = agg["row"]
-            raw = agg["bm25"] + agg["dense"]
-            # Journal time-decay only.
-            if row["partition"] == "journal" and row.get("file_mtime"):
-                mtime = row["file_mtime"]
-                if isinstance(mtime, datetime):
-                    age_days = max(0.0, (now - mtime).total_seconds() / 86400.0)
-                    raw *= 0.5 ** (age_days / 30.0)
-            fused.append((raw, row))
-        fused.sort(key=lambda t: t[0], reverse=True)
-
-        results = []
-        for score, row in fused[:top_k]:
-            results.append(
-                {
-                    "id": row["id"],
-                    "path": row["path"],
-                    "partition": row["partition"],
-                    "heading_path": row.get("heading_path"),
-                    "chunk_idx": row["chunk_idx"],
-                    "content": (row["content"] or "")[:1200],
-                    "score": round(float(score), 6),
-                }
+            found = await hybrid_search(
+                session,
+                _VAULT_SPEC,
+                query=query,
+                embedding=embedding,
+                top_k=top_k,
+                per_side_k=per_side_k,
+                extra_filters=extra_filters,
+                params=params,
             )
 
+        results = [
+            {
+                "id": row["id"],
+                "path": row["path"],
+                "partition": row["partition"],
+                "heading_path": row.get("heading_path"),
+                "chunk_idx": row["chunk_idx"],
+                "content": row["content"] or "",
+                "score": round(float(row["score"]), 6),
+            }
+            for row in found.rows
+        ]
+
         # Distinct paths for file-level follow-up
         distinct_paths: list[str] = []
         seen: set[str] = set()
@@ -158,9 +211,9 @@ class VaultRetrievalService:
             "top_k": top_k,
             "hits": results,
             "paths": distinct_paths,
-            "bm25_count": len(bm25_rows),
-            "dense_count": len(dense_rows),
-            "dense_enabled": embedding is not None,
+            "bm25_count": found.bm25_count,
+            "dense_count": found.dense_count,
+            "dense_enabled": found.dense_enabled,
         }
 
     async def get_file(self, path: str) -> dict[str, Any]:
@@ -10,12 +10,14 @@ where steps become nodes and depends_on edges become graph edges.
 """
 
 import asyncio
+import contextlib
 import json
 import re
+import time
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, TypedDict, Annotated
+from typing import Any, Dict, List, Optional, Set, Tuple, TypedDict, Annotated
 from functools import lru_cache
 
 import yaml
@@ -24,6 +26,8 @@ import httpx
 
 from langgraph.graph import StateGraph, START, END
 
+from app.services.workflow_history import WorkflowExecutionStore, get_workflow_execution_store
+
 logger = structlog.get_logger(__name__)
 
 
@@ -439,54 +443,188 @@ STEP_HANDLERS: Dict[str, StepHandler] = {
 # =============================================================================
 
 class StateManager:
-    """Persist workflow execution state for resume after crashes."""
+    """Persist workflow execution state for resume after crashes.
+
+    An active execution is a JSON snapshot plus an append-only checkpoint
+    journal (``<id>.jsonl``, one finished step per line). ``load_state``
+    replays the journal over the snapshot, so per-step checkpoints cost one
+    small append instead of rewriting the whole state.
+
+    Finished executions go to ``store`` (the indexed ``workflow_executions``
+    table) when one is given, otherwise to one JSON file each under
+    ``history/``.
+    """
 
-    def __init__(self, state_dir: str = "workspace/orchestration/state"):
+    def __init__(
+        self,
+        state_dir: str = "workspace/orchestration/state",
+        store: Optional[WorkflowExecutionStore] = None,
+    ):
         self.state_dir = Path(state_dir)
         self.executions_dir = self.state_dir / "executions"
         self.history_dir = self.state_dir / "history"
         self.executions_dir.mkdir(parents=True, exist_ok=True)
         self.history_dir.mkdir(parents=True, exist_ok=True)
+        self.store = store
+        self._live: Dict[str, Dict[str, Any]] = {}
+        self._imported = False
+        self._import_lock = asyncio.Lock()
+
+    def _journal_path(self, execution_id: str) -> Path:
+        return self.executions_dir / f"{execution_id}.jsonl"
 
     def save_state(self, execution_id: str, state: Dict[str, Any]):
-        """Save execution state to JSON."""
+        """Save a full execution snapshot (supersedes the checkpoint journal)."""
         path = self.executions_dir / f"{execution_id}.json"
         with open(path, "w") as f:
             json.dump(state, f, indent=2, default=str)
+        self._journal_path(execution_id).unlink(missing_ok=True)
+
+    def append_checkpoint(self, execution_id: str, lines: List[str]):
+        """Append encoded step checkpoints (see ``encode_checkpoint``)."""
+        with open(self._journal_path(execution_id), "a") as f:
+            f.write("".join(line + "\n" for line in lines))
+
+    @staticmethod
+    def encode_checkpoint(step_id: str, result: Dict[str, Any]) -> str:
+        return json.dumps({"step_id": step_id, "result": result}, default=str)
 
     def load_state(self, execution_id: str) -> Optional[Dict[str, Any]]:
-        """Load execution state from JSON."""
+        """Load execution state: snapshot plus any journaled step results."""
         path = self.executions_dir / f"{execution_id}.json"
-        if path.exists():
-            with open(path) as f:
-                return json.load(f)
-        return None
+        if not path.exists():
+            return None
+        with open(path) as f:
+            state = json.load(f)
+        journal = self._journal_path(execution_id)
+        if journal.exists():
+            with open(journal) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break  # torn final line from a crash mid-append
+                    state.setdefault("steps", {})[record["step_id"]] = record["result"]
+        return state
 
     def complete_execution(self, execution_id: str, state: Dict[str, Any]):
-        """Move completed execution to history."""
+        """Move completed execution to the JSON history directory.
+
+        Used without an execution store, or when the store is unreachable
+        (the file is imported into the store later).
+        """
         state["completed_at"] = datetime.utcnow().isoformat()
         # Save to history
         history_path = self.history_dir / f"{execution_id}.json"
         with open(history_path, "w") as f:
             json.dump(state, f, indent=2, default=str)
-        # Remove from active
+        self._remove_active(execution_id)
+
+    def _remove_active(self, execution_id: str):
         active_path = self.executions_dir / f"{execution_id}.json"
         if active_path.exists():
             active_path.unlink()
+        self._journal_path(execution_id).unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------
+    # Execution store (indexed history)
+    # ------------------------------------------------------------------
+
+    async def record_start(self, state: Dict[str, Any]):
+        """Register a running execution (live view + store row)."""
+        self._live[state["execution_id"]] = state
+        if self.store is not None:
+            try:
+                await self.store.upsert(state)
+            except Exception as e:
+                logger.warning("workflow_store_write_failed", error=str(e))
+
+    async def finish(self, execution_id: str, state: Dict[str, Any]):
+        """Record a finished (completed/failed/cancelled) execution."""
+        self._live.pop(execution_id, None)
+        if self.store is not None:
+            state["completed_at"] = datetime.utcnow().isoformat()
+            try:
+                await self.store.upsert(state)
+                await asyncio.to_thread(self._remove_active, execution_id)
+                return
+            except Exception as e:
+                logger.warning("workflow_store_write_failed", error=str(e))
+                self._imported = False
+        await asyncio.to_thread(self.complete_execution, execution_id, state)
+
+    async def get_execution(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        """Live, active (on disk) or stored state of one execution."""
+        if execution_id in self._live:
+            return self._live[execution_id]
+        state = await asyncio.to_thread(self.load_state, execution_id)
+        if state is None and self.store is not None:
+            try:
+                await self._ensure_imported()
+                state = await self.store.get(execution_id)
+            except Exception as e:
+                logger.warning("workflow_store_read_failed", error=str(e))
+        return state
+
+    async def get_active_executions(self) -> List[Dict[str, Any]]:
+        """Get all active (incomplete) executions.
 
-    def get_active_executions(self) -> List[Dict[str, Any]]:
-        """Get all active (incomplete) executions."""
+        Executions running in this process are returned live; with a store,
+        the rest are its ``running`` rows (interrupted runs awaiting resume).
+        """
+        stored = None
+        if self.store is not None:
+            try:
+                stored = await self.store.running()
+            except Exception as e:
+                logger.warning("workflow_store_read_failed", error=str(e))
+        if stored is None:
+            stored = await asyncio.to_thread(self._file_active_executions)
+        live = list(self._live.values())
+        return live + [s for s in stored if s.get("execution_id") not in self._live]
+
+    async def get_history(
+        self,
+        limit: int = 20,
+        *,
+        workflow_id: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get recent execution history, newest first."""
+        if self.store is not None:
+            try:
+                await self._ensure_imported()
+                return await self.store.history(limit, workflow_id=workflow_id, status=status)
+            except Exception as e:
+                logger.warning("workflow_store_read_failed", error=str(e))
+        filtered = bool(workflow_id or status)
+        history = await asyncio.to_thread(self._file_history, None if filtered else limit)
+        return [
+            h for h in history
+            if (not workflow_id or h.get("workflow_id") == workflow_id)
+            and (not status or h.get("status") == status)
+        ][:limit]
+
+    async def _ensure_imported(self):
+        if self._imported:
+            return
+        async with self._import_lock:
+            if not self._imported:
+                await self.store.import_json_dir(self.history_dir)
+                self._imported = True
+
+    def _file_active_executions(self) -> List[Dict[str, Any]]:
         results = []
         for path in self.executions_dir.glob("*.json"):
             try:
-                with open(path) as f:
-                    results.append(json.load(f))
+                state = self.load_state(path.stem)
+                if state is not None:
+                    results.append(state)
             except Exception:
                 pass
         return results
 
-    def get_history(self, limit: int = 20) -> List[Dict[str, Any]]:
-        """Get recent execution history."""
+    def _file_history(self, limit: Optional[int]) -> List[Dict[str, Any]]:
         files = sorted(
             self.history_dir.glob("*.json"),
             key=lambda p: p.stat().st_mtime,
@@ -564,20 +702,102 @@ class WorkflowParser:
 
 
 # =============================================================================
-# DAG Executor (LangGraph-powered)
+# DAG Executor
 # =============================================================================
 
+# Max concurrently running steps per step type, shared by all executions.
+# Types not listed are unbounded.
+STEP_TYPE_CONCURRENCY: Dict[str, int] = {
+    "llm": 4,
+    "skill": 4,
+    "http": 8,
+    "notify": 4,
+}
+
+
+class _CheckpointWriter:
+    """Appends step checkpoints to the journal off the event loop.
+
+    Records are encoded when queued (the step result is final by then) and
+    written in batches by a single drain task, so appends stay in order.
+    """
+
+    def __init__(self, state_manager: StateManager, execution_id: str):
+        self._state_manager = state_manager
+        self._execution_id = execution_id
+        self._pending: List[str] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def append(self, step_id: str, result: Dict[str, Any]):
+        self._pending.append(StateManager.encode_checkpoint(step_id, result))
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._drain())
+
+    async def _drain(self):
+        while self._pending:
+            batch, self._pending = self._pending, []
+            try:
+                await asyncio.to_thread(
+                    self._state_manager.append_checkpoint, self._execution_id, batch
+                )
+            except Exception as e:
+                logger.warning(
+                    "workflow_checkpoint_failed",
+                    execution_id=self._execution_id,
+                    error=str(e),
+                )
+
+    async def flush(self):
+        if self._task is not None:
+            await self._task
+
+
+def critical_path(
+    steps: List[dict], spans: Dict[str, Tuple[float, float]]
+) -> Tuple[float, List[str]]:
+    """Longest chain of step durations through the ``depends_on`` graph.
+
+    ``spans`` maps step id to (start, end) seconds; steps without a span
+    (not run in this execution) count as zero. Returns (seconds, step ids).
+    """
+    deps = {s["id"]: s.get("depends_on", []) for s in steps}
+    best: Dict[str, Tuple[float, Optional[str]]] = {}
+
+    def longest(sid: str) -> float:
+        if sid not in best:
+            start, end = spans.get(sid, (0.0, 0.0))
+            prev = max(deps[sid], key=longest, default=None)
+            best[sid] = ((longest(prev) if prev else 0.0) + (end - start), prev)
+        return best[sid][0]
+
+    tail = max(deps, key=longest, default=None)
+    path: List[str] = []
+    while tail is not None:
+        path.append(tail)
+        tail = best[tail][1]
+    return (best[path[0]][0] if path else 0.0), path[::-1]
+
+
 class DAGExecutor:
     """
-    Execute workflow steps as a LangGraph StateGraph.
+    Execute workflow steps in dependency order.
 
-    Each step becomes a graph node. Dependencies become edges.
-    Parallel waves are executed concurrently via asyncio.gather.
+    Steps are scheduled from a ready queue: each one starts as soon as every
+    step in its ``depends_on`` has finished (not when a whole topological
+    wave has), subject to the per-type limits in ``STEP_TYPE_CONCURRENCY``.
+    Each finished step is checkpointed to the state journal, and the
+    execution's ``timing`` reports wall time against the critical path.
     """
 
-    def __init__(self, state_manager: Optional[StateManager] = None):
+    def __init__(
+        self,
+        state_manager: Optional[StateManager] = None,
+        concurrency: Optional[Dict[str, int]] = None,
+    ):
         self.state_manager = state_manager or StateManager()
         self._active: Dict[str, asyncio.Task] = {}
+        limits = STEP_TYPE_CONCURRENCY if concurrency is None else concurrency
+        self._limits = {t: asyncio.Semaphore(n) for t, n in limits.items()}
 
     async def execute_workflow(
         self,
@@ -585,7 +805,7 @@ class DAGExecutor:
         trigger: Optional[Dict[str, Any]] = None,
         variables: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
-        """Execute a workflow definition using topological wave execution."""
+        """Execute a workflow definition, launching steps as they become ready."""
         execution_id = str(uuid.uuid4())[:12]
         merged_vars = workflow.get_default_variables()
         if variables:
@@ -604,7 +824,8 @@ class DAGExecutor:
             "completed_at": None,
         }
 
-        self.state_manager.save_state(execution_id, state)
+        await asyncio.to_thread(self.state_manager.save_state, execution_id, state)
+        await self.state_manager.record_start(state)
 
         logger.info(
             "workflow_execution_start",
@@ -614,72 +835,131 @@ class DAGExecutor:
         )
 
         try:
-            waves = workflow.topological_order()
-
-            for wave_idx, wave in enumerate(waves):
-                logger.info(
-                    "workflow_wave_start",
-                    wave=wave_idx + 1,
-                    total_waves=len(waves),
-                    steps=wave,
-                )
-
-                # Build template context
-                context = {
-                    "variables": state["variables"],
-                    "trigger": state["trigger"],
-                    "steps": state["steps"],
-                    "now": datetime.utcnow().isoformat(),
-                }
-
-                # Execute steps in this wave concurrently
-                tasks = []
-                for step_id in wave:
-                    step_def = workflow.get_step(step_id)
-                    if step_def:
-                        tasks.append(
-                            self._execute_step(step_def, context, state)
-                        )
-
-                results = await asyncio.gather(*tasks, return_exceptions=True)
-
-                # Process results
-                for step_id, result in zip(wave, results):
-                    if isinstance(result, Exception):
-                        state["steps"][step_id] = {
-                            "output": None,
-                            "status": "failed",
-                            "error": str(result),
-                        }
-                        step_def = workflow.get_step(step_id)
-                        if step_def and step_def.get("on_error") != "continue":
-                            state["status"] = "failed"
-                            state["error"] = f"Step '{step_id}' failed: {result}"
-                            self.state_manager.complete_execution(execution_id, state)
-                            return state
-
-                # Checkpoint after each wave
-                self.state_manager.save_state(execution_id, state)
-
-            state["status"] = "completed"
-            state["completed_at"] = datetime.utcnow().isoformat()
+            workflow.topological_order()  # rejects cycles up front
+            error = await self._run_steps(workflow, state, set())
+            if error:
+                state["status"] = "failed"
+                state["error"] = error
+            else:
+                state["status"] = "completed"
+                state["completed_at"] = datetime.utcnow().isoformat()
 
         except Exception as e:
             state["status"] = "failed"
             state["error"] = str(e)
             logger.error("workflow_execution_failed", error=str(e))
 
-        self.state_manager.complete_execution(execution_id, state)
+        await self.state_manager.finish(execution_id, state)
 
         logger.info(
             "workflow_execution_complete",
             workflow=workflow.name,
             execution_id=execution_id,
             status=state["status"],
+            **{k: v for k, v in state.get("timing", {}).items() if k.endswith("_ms")},
         )
 
         return state
 
+    async def _run_steps(
+        self,
+        workflow: WorkflowDefinition,
+        state: Dict[str, Any],
+        done: Set[str],
+    ) -> Optional[str]:
+        """Run every step not in ``done``; returns the failure message if a
+        step raised without ``on_error: continue``.
+
+        A failure stops new launches; steps already running are allowed to
+        finish, as the wave executor did.
+        """
+        steps = {s["id"]: s for s in workflow.steps}
+        waiting = {
+            sid: set(s.get("depends_on", [])) - done
+            for sid, s in steps.items() if sid not in done
+        }
+        dependents: Dict[str, List[str]] = {sid: [] for sid in steps}
+        for sid, s in steps.items():
+            for dep in s.get("depends_on", []):
+                dependents[dep].append(sid)
+
+        checkpoints = _CheckpointWriter(self.state_manager, state["execution_id"])
+        spans: Dict[str, Tuple[float, float]] = {}
+        t0 = time.monotonic()
+        running: Dict[asyncio.Task, str] = {}
+        error: Optional[str] = None
+
+        def launch_ready():
+            for sid in [sid for sid, pending in waiting.items() if not pending]:
+                del waiting[sid]
+                task = asyncio.create_task(self._run_limited(steps[sid], state, spans, t0))
+                running[task] = sid
+
+        try:
+            launch_ready()
+            while running:
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    sid = running.pop(task)
+                    exc = task.exception()
+                    if exc is not None:
+                        state["steps"][sid] = {
+                            "output": None,
+                            "status": "failed",
+                            "error": str(exc),
+                        }
+                        if steps[sid].get("on_error") != "continue" and error is None:
+                            error = f"Step '{sid}' failed: {exc}"
+                    checkpoints.append(sid, state["steps"].get(sid, {}))
+                    done.add(sid)
+                    for child in dependents[sid]:
+                        if child in waiting:
+                            waiting[child].discard(sid)
+                if error is None:
+                    launch_ready()
+        finally:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+            await checkpoints.flush()
+
+        wall = time.monotonic() - t0
+        cp_s, cp_steps = critical_path(workflow.steps, spans)
+        state["timing"] = {
+            "wall_ms": round(wall * 1000, 1),
+            "critical_path_ms": round(cp_s * 1000, 1),
+            "critical_path": cp_steps,
+            "step_total_ms": round(sum(e - s for s, e in spans.values()) * 1000, 1),
+            "steps": {
+                sid: {"start_ms": round(s * 1000, 1), "end_ms": round(e * 1000, 1)}
+                for sid, (s, e) in spans.items()
+            },
+        }
+        return error
+
+    async def _run_limited(
+        self,
+        step_def: dict,
+        state: Dict[str, Any],
+        spans: Dict[str, Tuple[float, float]],
+        t0: float,
+    ) -> Dict[str, Any]:
+        """Run one step under its type's concurrency limit, recording its span."""
+        limit = self._limits.get(step_def["type"])
+        async with limit if limit is not None else contextlib.nullcontext():
+            # Context is built at launch so it sees every finished dependency.
+            context = {
+                "variables": state["variables"],
+                "trigger": state["trigger"],
+                "steps": state["steps"],
+                "now": datetime.utcnow().isoformat(),
+            }
+            start = time.monotonic() - t0
+            try:
+                return await self._execute_step(step_def, context, state)
+            finally:
+                spans[step_def["id"]] = (start, time.monotonic() - t0)
+
     async def _execute_step(
         self,
         step_def: dict,
@@ -738,7 +1018,7 @@ class DAGExecutor:
 
     async def resume_execution(self, execution_id: str) -> Optional[Dict[str, Any]]:
         """Resume a crashed/interrupted execution."""
-        state = self.state_manager.load_state(execution_id)
+        state = await asyncio.to_thread(self.state_manager.load_state, execution_id)
         if not state:
             return None
 
@@ -756,42 +1036,24 @@ class DAGExecutor:
 
         # Re-execute remaining steps
         state["status"] = "running"
-        waves = workflow.topological_order()
+        await asyncio.to_thread(self.state_manager.save_state, execution_id, state)
+        await self.state_manager.record_start(state)
+        error = await self._run_steps(workflow, state, completed_steps)
 
-        for wave in waves:
-            remaining = [s for s in wave if s not in completed_steps]
-            if not remaining:
-                continue
-
-            context = {
-                "variables": state["variables"],
-                "trigger": state["trigger"],
-                "steps": state["steps"],
-                "now": datetime.utcnow().isoformat(),
-            }
-
-            tasks = []
-            for step_id in remaining:
-                step_def = workflow.get_step(step_id)
-                if step_def:
-                    tasks.append(self._execute_step(step_def, context, state))
-
-            await asyncio.gather(*tasks, return_exceptions=True)
-            self.state_manager.save_state(execution_id, state)
-
-        state["status"] = "completed"
+        state["status"] = "failed" if error else "completed"
+        state["error"] = error
         state["completed_at"] = datetime.utcnow().isoformat()
-        self.state_manager.complete_execution(execution_id, state)
+        await self.state_manager.finish(execution_id, state)
         return state
 
-    def cancel_execution(self, execution_id: str) -> bool:
+    async def cancel_execution(self, execution_id: str) -> bool:
         """Cancel an active execution."""
-        state = self.state_manager.load_state(execution_id)
+        state = await asyncio.to_thread(self.state_manager.load_state, execution_id)
         if not state:
             return False
         state["status"] = "cancelled"
         state["completed_at"] = datetime.utcnow().isoformat()
-        self.state_manager.complete_execution(execution_id, state)
+        await self.state_manager.finish(execution_id, state)
         return True
 
 
@@ -804,7 +1066,7 @@ class WorkflowEngine:
 
     def __init__(self):
         self.parser = WorkflowParser()
-        self.state_manager = StateManager()
+        self.state_manager = StateManager(store=get_workflow_execution_store())
         self.executor = DAGExecutor(self.state_manager)
         self._loaded = False
 
@@ -836,17 +1098,23 @@ class WorkflowEngine:
     async def resume(self, execution_id: str) -> Optional[Dict[str, Any]]:
         return await self.executor.resume_execution(execution_id)
 
-    def cancel(self, execution_id: str) -> bool:
-        return self.executor.cancel_execution(execution_id)
+    async def cancel(self, execution_id: str) -> bool:
+        return await self.executor.cancel_execution(execution_id)
 
-    def get_execution_status(self, execution_id: str) -> Optional[Dict[str, Any]]:
-        return self.state_manager.load_state(execution_id)
+    async def get_execution_status(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        return await self.state_manager.get_execution(execution_id)
 
-    def get_active_executions(self) -> List[Dict[str, Any]]:
-        return self.state_manager.get_active_executions()
+    async def get_active_executions(self) -> List[Dict[str, Any]]:
+        return await self.state_manager.get_active_executions()
 
-    def get_history(self, limit: int = 20) -> List[Dict[str, Any]]:
-        return self.state_manager.get_history(limit)
+    async def get_history(
+        self,
+        limit: int = 20,
+        *,
+        workflow_id: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        return await self.state_manager.get_history(limit, workflow_id=workflow_id, status=status)
 
 
 # Singleton
@@ -0,0 +1,273 @@
+"""
+Indexed execution history for the YAML workflow engine.
+
+``StateManager`` used to keep one indented JSON file per finished execution
+and answered every history request by globbing the directory, stat-ing
+each file to sort by mtime and parsing the newest N, on the event loop.
+Executions now live in the ``workflow_executions`` table: summary columns
+(workflow, status, started_at) are indexed, so history and dashboard
+queries are an index range scan with a LIMIT however many executions have
+run. The full state is kept as JSONB.
+
+Retention (``workflow_history_*`` settings), applied every few hundred
+writes:
+  - rows older than ``compact_after_days`` drop step outputs, variables and
+    trigger payload; per-step statuses survive in ``step_status``
+  - rows older than ``retention_days`` are deleted
+
+Existing history files are imported once (``import_json_dir``) and moved
+to ``history/imported/``.
+"""
+
+import asyncio
+import json
+import shutil
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+_MAINTAIN_EVERY = 200
+_IMPORT_CHUNK = 200
+
+
+def _parse_ts(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        ts = value
+    else:
+        try:
+            ts = datetime.fromisoformat(str(value))
+        except ValueError:
+            return None
+    # The engine writes naive UTC (datetime.utcnow()).
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+def execution_row(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Column values for one execution state dict."""
+    started = _parse_ts(state.get("started_at")) or datetime.now(timezone.utc)
+    completed = _parse_ts(state.get("completed_at"))
+    duration_ms = (state.get("timing") or {}).get("wall_ms")
+    if duration_ms is None and completed is not None:
+        duration_ms = round((completed - started).total_seconds() * 1000, 1)
+    # Round-trip through JSON so non-JSON values (datetimes, objects) are
+    # stored as strings, as the history files did.
+    payload = json.loads(json.dumps(state, default=str))
+    return {
+        "execution_id": str(state["execution_id"])[:64],
+        "workflow_id": str(state.get("workflow_id") or "")[:200],
+        "status": str(state.get("status") or "unknown")[:20],
+        "trigger_type": str((state.get("trigger") or {}).get("type") or "")[:50] or None,
+        "error": state.get("error"),
+        "started_at": started,
+        "completed_at": completed,
+        "duration_ms": duration_ms,
+        "step_status": {
+            sid: (info or {}).get("status")
+            for sid, info in (payload.get("steps") or {}).items()
+        },
+        "state": payload,
+        "compacted": False,
+    }
+
+
+def _row_state(state: Dict[str, Any], step_status: Dict[str, Any], compacted: bool) -> Dict[str, Any]:
+    if compacted:
+        state = {**state, "steps": {sid: {"status": st} for sid, st in (step_status or {}).items()}}
+    return state
+
+
+class WorkflowExecutionStore:
+    """Postgres-backed store of workflow engine executions."""
+
+    def __init__(self, *, compact_after_days: int = 14, retention_days: int = 180):
+        self._compact_after_days = compact_after_days
+        self._retention_days = retention_days
+        self._writes_since_maintain = 0
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    async def upsert(self, state: Dict[str, Any]) -> None:
+        """Insert or replace one execution."""
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        from app.db.models import WorkflowExecutionRecordModel
+        from app.infrastructure.database import get_session
+
+        row = execution_row(state)
+        stmt = pg_insert(WorkflowExecutionRecordModel).values(row)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["execution_id"],
+            set_={k: stmt.excluded[k] for k in row if k != "execution_id"},
+        )
+        async with get_session() as session:
+            await session.execute(stmt)
+
+        self._writes_since_maintain += 1
+        if self._writes_since_maintain >= _MAINTAIN_EVERY:
+            self._writes_since_maintain = 0
+            try:
+                await self.maintain()
+            except Exception as e:  # noqa: BLE001 — retention is best effort
+                logger.warning("workflow_history_maintain_failed", error=str(e))
+
+    async def maintain(self) -> Dict[str, int]:
+        """Apply the compaction and retention policy."""
+        from sqlalchemy import text
+        from app.infrastructure.database import get_session
+
+        async with get_session() as session:
+            compacted = await session.execute(
+                text(
+                    "UPDATE workflow_executions"
+                    "   SET state = state - 'steps' - 'variables' - 'trigger', compacted = true"
+                    " WHERE NOT compacted AND status <> 'running'"
+                    "   AND started_at < now() - make_interval(days => :days)"
+                ),
+                {"days": self._compact_after_days},
+            )
+            deleted = await session.execute(
+                text(
+                    "DELETE FROM workflow_executions"
+                    " WHERE status <> 'running'"
+                    "   AND started_at < now() - make_interval(days => :days)"
+                ),
+                {"days": self._retention_days},
+            )
+        result = {"compacted": compacted.rowcount or 0, "deleted": deleted.rowcount or 0}
+        if any(result.values()):
+            logger.info("workflow_history_maintained", **result)
+        return result
+
+    async def import_json_dir(self, history_dir: Path) -> int:
+        """One-time import of legacy ``<execution_id>.json`` history files.
+
+        Imported files are moved to ``history_dir/imported``; rows already in
+        the table win over files.
+        """
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        from app.db.models import WorkflowExecutionRecordModel
+        from app.infrastructure.database import get_session
+
+        paths = await asyncio.to_thread(lambda: sorted(history_dir.glob("*.json")))
+        if not paths:
+            return 0
+        done_dir = history_dir / "imported"
+        imported = 0
+        for i in range(0, len(paths), _IMPORT_CHUNK):
+            chunk = paths[i:i + _IMPORT_CHUNK]
+            rows = []
+            for path, state in zip(chunk, await asyncio.to_thread(_read_states, chunk)):
+                if state is None:
+                    continue
+                state.setdefault("execution_id", path.stem)
+                rows.append(execution_row(state))
+            if rows:
+                stmt = pg_insert(WorkflowExecutionRecordModel).values(rows)
+                stmt = stmt.on_conflict_do_nothing(index_elements=["execution_id"])
+                async with get_session() as session:
+                    await session.execute(stmt)
+            await asyncio.to_thread(_move_all, chunk, done_dir)
+            imported += len(rows)
+        logger.info("workflow_history_imported", files=len(paths), rows=imported)
+        return imported
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    async def get(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        from sqlalchemy import text
+        from app.infrastructure.database import get_session
+
+        async with get_session() as session:
+            row = (await session.execute(
+                text(
+                    "SELECT state, step_status, compacted FROM workflow_executions"
+                    " WHERE execution_id = :id"
+                ),
+                {"id": execution_id},
+            )).first()
+        return _row_state(*row) if row else None
+
+    async def history(
+        self,
+        limit: int = 20,
+        *,
+        workflow_id: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Most recently started finished executions, newest first."""
+        from sqlalchemy import text
+        from app.infrastructure.database import get_session
+
+        where = ["status <> 'running'"]
+        params: Dict[str, Any] = {"limit": max(1, min(int(limit), 500))}
+        if workflow_id:
+            where.append("workflow_id = :workflow_id")
+            params["workflow_id"] = workflow_id
+        if status:
+            where.append("status = :status")
+            params["status"] = status
+        async with get_session() as session:
+            rows = (await session.execute(
+                text(
+                    "SELECT state, step_status, compacted FROM workflow_executions"
+                    f" WHERE {' AND '.join(where)}"
+                    " ORDER BY started_at DESC LIMIT :limit"
+                ),
+                params,
+            )).all()
+        return [_row_state(*row) for row in rows]
+
+    async def running(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Executions recorded as started but never finished."""
+        from sqlalchemy import text
+        from app.infrastructure.database import get_session
+
+        async with get_session() as session:
+            rows = (await session.execute(
+                text(
+                    "SELECT state, step_status, compacted FROM workflow_executions"
+                    " WHERE status = 'running' ORDER BY started_at DESC LIMIT :limit"
+                ),
+                {"limit": limit},
+            )).all()
+        return [_row_state(*row) for row in rows]
+
+
+def _read_states(paths: List[Path]) -> List[Optional[Dict[str, Any]]]:
+    states: List[Optional[Dict[str, Any]]] = []
+    for path in paths:
+        try:
+            with open(path) as f:
+                states.append(json.load(f))
+        except Exception as e:
+            logger.warning("workflow_history_import_skip", path=str(path), error=str(e))
+            states.append(None)
+    return states
+
+
+def _move_all(paths: List[Path], dest: Path) -> None:
+    dest.mkdir(parents=True, exist_ok=True)
+    for path in paths:
+        shutil.move(str(path), str(dest / path.name))
+
+
+@lru_cache()
+def get_workflow_execution_store() -> WorkflowExecutionStore:
+    """Get the singleton workflow execution store."""
+    from app.infrastructure.config import get_settings
+
+    settings = get_settings()
+    return WorkflowExecutionStore(
+        compact_after_days=settings.workflow_history_compact_after_days,
+        retention_days=settings.workflow_history_retention_days,
+    )
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.infrastructure.llm_concurrency import (
+    AdaptiveLimiter,
+    LimiterConfig,
+    LlmLimiterRegistry,
+    LlmPriority,
+    is_overload_error,
+    llm_priority,
+)
+
+
+class _RateLimited(Exception):
+    class response:
+        status_code = 429
+
+
+@pytest.mark.asyncio
+async def test_background_cannot_take_reserved_interactive_slot():
+    limiter = AdaptiveLimiter("vllm", LimiterConfig(initial=3, max_limit=3, reserved_interactive=1))
+
+    await limiter.acquire(LlmPriority.BACKGROUND)
+    await limiter.acquire(LlmPriority.BACKGROUND)
+    third_bg = asyncio.create_task(limiter.acquire(LlmPriority.BACKGROUND))
+    await asyncio.sleep(0)
+    assert not third_bg.done()
+    assert limiter.stats()["queue_depth"]["background"] == 1
+
+    # The reserved slot is still free for an interactive turn.
+    assert await asyncio.wait_for(limiter.acquire(LlmPriority.INTERACTIVE), 1) is LlmPriority.INTERACTIVE
+
+    limiter.release(LlmPriority.BACKGROUND)
+    await asyncio.wait_for(third_bg, 1)
+    assert limiter.stats()["in_flight"] == {"interactive": 1, "background": 2}
+
+
+@pytest.mark.asyncio
+async def test_interactive_waiters_are_served_first():
+    limiter = AdaptiveLimiter("bifrost", LimiterConfig(initial=1, max_limit=1, reserved_interactive=0))
+    await limiter.acquire(LlmPriority.INTERACTIVE)
+
+    order: list[str] = []
+
+    async def wait(priority):
+        await limiter.acquire(priority)
+        order.append(priority.value)
+        limiter.release(priority)
+
+    bg = asyncio.create_task(wait(LlmPriority.BACKGROUND))
+    await asyncio.sleep(0)
+    fg = asyncio.create_task(wait(LlmPriority.INTERACTIVE))
+    await asyncio.sleep(0)
+
+    limiter.release(LlmPriority.INTERACTIVE)
+    await asyncio.wait_for(asyncio.gather(bg, fg), 1)
+    assert order == ["interactive", "background"]
+
+
+@pytest.mark.asyncio
+async def test_aimd_grows_under_load_and_backs_off_on_429():
+    limiter = AdaptiveLimiter("kimi", LimiterConfig(initial=2, max_limit=8, cooldown_s=0))
+    for _ in range(20):
+        await limiter.acquire(LlmPriority.INTERACTIVE)
+        await limiter.acquire(LlmPriority.INTERACTIVE)
+        limiter.release(LlmPriority.INTERACTIVE, latency_ms=100)
+        limiter.release(LlmPriority.INTERACTIVE, latency_ms=100)
+    grown = limiter.limit
+    assert grown > 2
+
+    with pytest.raises(_RateLimited):
+        async with limiter.slot(LlmPriority.INTERACTIVE):
+            raise _RateLimited("too many requests")
+    assert limiter.limit < grown
+    assert limiter.stats()["overloads"] == 1
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_latency_spike_backs_off():
+    limiter = AdaptiveLimiter("vllm", LimiterConfig(initial=4, max_limit=4, cooldown_s=0))
+    for _ in range(30):
+        await limiter.acquire(LlmPriority.INTERACTIVE)
+        limiter.release(LlmPriority.INTERACTIVE, latency_ms=100)
+    for _ in range(5):
+        await limiter.acquire(LlmPriority.INTERACTIVE)
+        limiter.release(LlmPriority.INTERACTIVE, latency_ms=2000)
+    assert limiter.limit < 4
+    assert limiter.stats()["latency_backoffs"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_queue():
+    limiter = AdaptiveLimiter("vllm", LimiterConfig(initial=1, max_limit=1, reserved_interactive=0))
+    await limiter.acquire(LlmPriority.INTERACTIVE)
+    waiter = asyncio.create_task(limiter.acquire(LlmPriority.INTERACTIVE))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    limiter.release(LlmPriority.INTERACTIVE)
+    assert limiter.in_flight == 0
+    assert limiter.stats()["queue_depth"]["interactive"] == 0
+
+
+@pytest.mark.asyncio
+async def test_priority_context_and_registry_lanes():
+    registry = LlmLimiterRegistry(max_limit=4, reserved_interactive=1)
+    assert registry.get("bifrost") is registry.get("bifrost")
+    assert registry.get("bifrost").stats()["max_limit"] == 4
+
+    with llm_priority(LlmPriority.BACKGROUND):
+        async with registry.get("vllm").slot():
+            assert registry.get("vllm").stats()["in_flight"]["background"] == 1
+    assert registry.get("vllm").stats()["in_flight"]["background"] == 0
+    assert set(registry.stats()) == {"bifrost", "vllm"}
+
+
+def test_is_overload_error():
+    assert is_overload_error(_RateLimited("x"))
+    assert is_overload_error(asyncio.TimeoutError())
+    assert not is_overload_error(ValueError("bad json"))
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import math
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.infrastructure import database
+from app.infrastructure import llm_response_cache as lrc
+from app.infrastructure import ollama_client
+from app.infrastructure import unified_llm_client as ulc
+from app.infrastructure.llm_response_cache import LlmResponseCache, make_cache_key
+from app.infrastructure.llm_router import LlmRouter
+from app.models.llm import ModelAssignment
+
+
+def test_cache_key_normalizes_whitespace_and_scopes_by_context():
+    a = make_cache_key("vllm", "m", "classification", [
+        {"role": "system", "content": "Label it."},
+        {"role": "user", "content": "is  this\nspam?"},
+    ], 0.0, True)
+    b = make_cache_key("vllm", "m", "classification", [
+        {"role": "system", "content": "Label it. "},
+        {"role": "user", "content": "is this spam?"},
+    ], 0.0, True)
+    c = make_cache_key("vllm", "m", "classification", [
+        {"role": "system", "content": "Label it."},
+        {"role": "user", "content": "is this ham?"},
+    ], 0.0, True)
+    d = make_cache_key("vllm", "m", "classification", [
+        {"role": "system", "content": "Label it."},
+        {"role": "user", "content": "is this spam?"},
+    ], 0.0, False)
+
+    assert a.key == b.key
+    assert a.key != c.key and a.scope_hash == c.scope_hash
+    assert c.probe_text == "is this ham?"
+    assert a.key != d.key and a.scope_hash != d.scope_hash
+
+
+def test_cache_key_covers_output_limits_and_reasoning():
+    msgs = [{"role": "user", "content": "summarise"}]
+    short = make_cache_key("vllm", "m", "extraction", msgs, 0.0, False, max_tokens=64)
+    long = make_cache_key("vllm", "m", "extraction", msgs, 0.0, False, max_tokens=2048)
+    thinking = make_cache_key("vllm", "m", "extraction", msgs, 0.0, False, max_tokens=64, thinking_mode=True)
+    effort = make_cache_key(
+        "vllm", "m", "extraction", msgs, 0.0, False, max_tokens=64, reasoning={"effort": "high"},
+    )
+
+    assert len({short.key, long.key, thinking.key, effort.key}) == 4
+    assert short.scope_hash != long.scope_hash
+
+
+@pytest.mark.asyncio
+async def test_lookup_falls_through_memory_then_db(monkeypatch):
+    cache = LlmResponseCache()
+    ck = make_cache_key("vllm", "m", "extraction", [{"role": "user", "content": "x"}], 0.1, False)
+    db_calls: list[str] = []
+
+    async def fake_exact(key):
+        db_calls.append(key)
+        return None
+
+    monkeypatch.setattr(cache, "_db_exact", fake_exact)
+    assert await cache.lookup(ck) is None
+    assert db_calls == [ck.key]
+
+    stored: list = []
+
+    async def fake_store(ck, response, **kwargs):
+        stored.append((response, kwargs))
+
+    monkeypatch.setattr(cache, "_store", fake_store)
+    cache.store_later(ck, "answer", ttl_s=60, cost_usd=0.01)
+    assert await cache.lookup(ck) == "answer"
+    assert db_calls == [ck.key]  # served from memory
+    for task in list(cache._pending):
+        await task
+    assert stored == [("answer", {"ttl_s": 60, "cost_usd": 0.01, "semantic": False})]
+
+
+@pytest.mark.asyncio
+async def test_lookup_errors_are_misses(monkeypatch):
+    cache = LlmResponseCache()
+    ck = make_cache_key("vllm", "m", "t", [{"role": "user", "content": "x"}], 0.0, False)
+
+    async def broken(key):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(cache, "_db_exact", broken)
+    assert await cache.lookup(ck) is None
+    assert cache.stats()["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_client_serves_opted_in_task_from_cache(monkeypatch):
+    router = LlmRouter()
+    router._config.task_assignments["classification"] = ModelAssignment(
+        model="vllm/qwen3-chat", cache_ttl_s=600,
+    )
+    cache = LlmResponseCache()
+
+    async def miss(key):
+        return None
+
+    async def fake_store(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(cache, "_db_exact", miss)
+    monkeypatch.setattr(cache, "_store", fake_store)
+    monkeypatch.setattr(ulc, "get_llm_router", lambda: router)
+    monkeypatch.setattr(ulc, "get_llm_response_cache", lambda: cache)
+
+    client = ulc.UnifiedLLMClient()
+    calls: list = []
+
+    async def fake_execute(*args, **kwargs):
+        calls.append(args)
+        return '{"label": "spam"}'
+
+    class FakeProvider:
+        def estimate_cost(self, prompt_tokens, completion_tokens, model):
+            return 0.002
+
+    monkeypatch.setattr(client, "_execute_with_fallbacks", fake_execute)
+    monkeypatch.setattr(client, "_get_provider", lambda name: FakeProvider())
+
+    for _ in range(3):
+        out = await client.chat("spam?", task_type="classification", temperature=0.0, json_mode=True)
+        assert out == '{"label": "spam"}'
+    assert len(calls) == 1
+
+    # Warm temperatures and explicit opt-outs always go to the provider.
+    await client.chat("spam?", task_type="classification", temperature=0.7)
+    await client.chat("spam?", task_type="classification", temperature=0.0, json_mode=True, cache=False)
+    assert len(calls) == 3
+
+    report = router.cache_report()
+    assert report["hits"] == 2 and report["misses"] == 1
+    assert report["saved_usd"] == pytest.approx(0.004)
+    assert report["by_task"]["classification"]["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_client_does_not_cache_invalid_json(monkeypatch):
+    router = LlmRouter()
+    router._config.task_assignments["structured_output"] = ModelAssignment(
+        model="vllm/qwen3-chat", cache_ttl_s=600,
+    )
+    cache = LlmResponseCache()
+
+    async def miss(key):
+        return None
+
+    monkeypatch.setattr(cache, "_db_exact", miss)
+    monkeypatch.setattr(ulc, "get_llm_router", lambda: router)
+    monkeypatch.setattr(ulc, "get_llm_response_cache", lambda: cache)
+
+    client = ulc.UnifiedLLMClient()
+
+    async def fake_execute(*args, **kwargs):
+        return "not json at all"
+
+    monkeypatch.setattr(client, "_execute_with_fallbacks", fake_execute)
+    monkeypatch.setattr(client, "_get_provider", lambda name: None)
+
+    await client.chat("x", task_type="structured_output", temperature=0.1, json_mode=True)
+    assert len(cache._memory) == 0
+
+
+def test_router_cache_policy_is_opt_in():
+    router = LlmRouter()
+    assert router.cache_policy("classification") == (None, False)
+    router._config.task_assignments["classification"].cache_ttl_s = 300
+    router._config.task_assignments["classification"].cache_semantic = True
+    assert router.cache_policy("classification") == (300, True)
+    assert router.cache_policy("hint:classify") == (300, True)
+    assert router.cache_policy(None) == (None, False)
+    assert lrc.MAX_CACHEABLE_TEMPERATURE == 0.3
+
+
+class _FakeCacheTable:
+    """llm_response_cache rows kept in memory; answers the exact and
+    similarity queries the way Postgres/pgvector would."""
+
+    def __init__(self):
+        self.rows: dict = {}
+
+    @asynccontextmanager
+    async def session(self):
+        yield self
+
+    async def execute(self, stmt, params=None):
+        from sqlalchemy.dialects import postgresql
+
+        if params is None:  # the upsert from _store
+            values = stmt.compile(dialect=postgresql.dialect()).params
+            self.rows[values["key"]] = values
+            return None
+        if "<=>" not in str(stmt):
+            return _Result(None)
+        probe = [float(x) for x in params["emb"].strip("[]").split(",")]
+        best = max(
+            (r for r in self.rows.values() if r["scope_hash"] == params["scope"] and r["embedding"]),
+            key=lambda r: _cosine(probe, r["embedding"]),
+            default=None,
+        )
+        if best is None or _cosine(probe, best["embedding"]) < params["threshold"]:
+            return _Result(None)
+        return _Result((best["response"],))
+
+
+class _Result:
+    def __init__(self, row):
+        self._row = row
+
+    def first(self):
+        return self._row
+
+
+def _cosine(a, b):
+    dot = sum(x * y for x, y in zip(a, b))
+    return dot / (math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b)))
+
+
+@pytest.mark.asyncio
+async def test_semantic_lookup_hits_a_near_duplicate(monkeypatch):
+    table = _FakeCacheTable()
+
+    class FakeEmbedder:
+        async def embed_safe(self, text):
+            # 768-dim letter histogram, the default embedding_dimension.
+            vec = [0.0] * 768
+            for ch in text.lower():
+                if ch.isalpha():
+                    vec[ord(ch) % 768] += 1.0
+            return vec
+
+    monkeypatch.setattr(database, "get_session", table.session)
+    monkeypatch.setattr(ollama_client, "get_llm_client", lambda: FakeEmbedder())
+    cache = LlmResponseCache(similarity_threshold=0.97)
+
+    def key(question):
+        return make_cache_key("vllm", "m", "classification", [
+            {"role": "system", "content": "Label it."},
+            {"role": "user", "content": question},
+        ], 0.0, True, max_tokens=64)
+
+    cache.store_later(key("Is this email spam?"), '{"label": "spam"}', ttl_s=60, semantic=True)
+    for task in list(cache._pending):
+        await task
+    (row,) = table.rows.values()
+    assert len(row["embedding"]) == 1024
+
+    assert await cache.lookup(key("is this e-mail spam??"), semantic=True) == '{"label": "spam"}'
+    assert await cache.lookup(key("What time is the quarterly review?"), semantic=True) is None
+    assert cache.stats()["semantic_hits"] == 1
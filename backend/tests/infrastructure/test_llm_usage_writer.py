@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.infrastructure import database, llm_router
+from app.infrastructure.llm_usage_writer import LlmUsageWriter
+
+
+class _FakeRouter:
+    def __init__(self):
+        self.spend = 0.0
+        self.saves = 0
+
+    def add_spend(self, cost_usd):
+        self.spend += cost_usd
+
+    async def save_spend(self):
+        self.saves += 1
+
+    async def record_provider_spend_bulk(self, totals, session=None):
+        await session.execute("UPSERT llm_daily_spend", dict(totals))
+
+
+def _usage(writer: LlmUsageWriter, provider: str = "kimi") -> None:
+    writer.record_usage(
+        provider=provider,
+        model="m",
+        task_type="chat",
+        prompt_tokens=10,
+        completion_tokens=5,
+        cost_usd=0.01,
+        latency_ms=12.0,
+        success=True,
+        error_message=None,
+    )
+
+
+@pytest.fixture
+def router(monkeypatch):
+    fake = _FakeRouter()
+    monkeypatch.setattr(llm_router, "get_llm_router", lambda: fake)
+    return fake
+
+
+@pytest.mark.asyncio
+async def test_flush_coalesces_rows_and_spend_into_one_write(router, monkeypatch):
+    writer = LlmUsageWriter(flush_size=1000, flush_interval_s=60)
+    writes: list = []
+
+    async def fake_write(rows, spend):
+        writes.append((rows, spend))
+
+    monkeypatch.setattr(writer, "_write", fake_write)
+
+    for _ in range(3):
+        _usage(writer)
+        writer.record_spend(0.25, provider="kimi")
+    writer.record_spend(0.5, provider="openai")
+
+    # Budget counter is updated synchronously, before any DB write.
+    assert router.spend == pytest.approx(1.25)
+    assert writes == []
+
+    assert await writer.flush() == 3
+    assert len(writes) == 1
+    rows, spend = writes[0]
+    assert len(rows) == 3 and rows[0]["total_tokens"] == 15
+    assert spend == {"kimi": pytest.approx(0.75), "openai": pytest.approx(0.5)}
+    assert router.saves == 1
+    assert await writer.flush() == 0
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_requeues_batch(router, monkeypatch):
+    writer = LlmUsageWriter(flush_size=1000, flush_interval_s=60)
+    calls: list = []
+
+    async def failing_write(rows, spend):
+        calls.append(len(rows))
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(writer, "_write", failing_write)
+    _usage(writer, "a")
+    _usage(writer, "b")
+    writer.record_spend(1.0, provider="a")
+
+    assert await writer.flush() == 0
+    assert writer.stats()["pending_rows"] == 2
+    assert writer.stats()["flush_failures"] == 1
+
+    written: list = []
+
+    async def ok_write(rows, spend):
+        written.append(([r["provider"] for r in rows], spend))
+
+    monkeypatch.setattr(writer, "_write", ok_write)
+    _usage(writer, "c")
+    await writer.stop()
+
+    assert written == [(["a", "b", "c"], {"a": 1.0})]
+    assert writer.stats()["pending_rows"] == 0
+
+
+@pytest.mark.asyncio
+async def test_requeue_past_max_pending_drops_oldest_and_counts_them(router, monkeypatch):
+    writer = LlmUsageWriter(flush_size=1000, flush_interval_s=60, max_pending=3)
+
+    async def failing_write(rows, spend):
+        _usage(writer, "c")  # recorded while the write is in flight
+        _usage(writer, "d")
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(writer, "_write", failing_write)
+    _usage(writer, "a")
+    _usage(writer, "b")
+
+    assert await writer.flush() == 0
+    assert [r["provider"] for r in writer._rows] == ["b", "c", "d"]
+    assert writer.stats()["rows_dropped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_full_batch_wakes_background_flusher(router, monkeypatch):
+    import asyncio
+
+    writer = LlmUsageWriter(flush_size=2, flush_interval_s=60)
+    flushed = asyncio.Event()
+
+    async def fake_write(rows, spend):
+        flushed.set()
+
+    monkeypatch.setattr(writer, "_write", fake_write)
+    _usage(writer)
+    assert writer.stats()["running"] is True
+    _usage(writer)
+
+    await asyncio.wait_for(flushed.wait(), timeout=2)
+    await writer.stop()
+    assert writer.stats()["rows_written"] == 2
+
+
+@pytest.mark.asyncio
+async def test_spend_is_counted_once_when_usage_insert_fails(router, monkeypatch):
+    committed = {"spend": {}, "usage_rows": 0}
+    failures = [RuntimeError("insert failed")]
+
+    class FakeSession:
+        def __init__(self):
+            self.pending = []
+
+        async def execute(self, stmt, params=None):
+            sql = str(stmt)
+            if sql.startswith("INSERT INTO llm_usage") and failures:
+                raise failures.pop()
+            self.pending.append((sql, params))
+
+    @asynccontextmanager
+    async def get_session():
+        session = FakeSession()
+        yield session  # an exception here discards session.pending (rollback)
+        for sql, params in session.pending:
+            if "llm_daily_spend" in sql:
+                for provider, amount in params.items():
+                    committed["spend"][provider] = committed["spend"].get(provider, 0.0) + amount
+            else:
+                committed["usage_rows"] += 1
+
+    monkeypatch.setattr(database, "get_session", get_session)
+    writer = LlmUsageWriter(flush_size=1000, flush_interval_s=60)
+    _usage(writer)
+    writer.record_spend(0.5, provider="kimi")
+
+    assert await writer.flush() == 0
+    assert committed == {"spend": {}, "usage_rows": 0}
+    assert await writer.flush() == 1
+
+    assert committed == {"spend": {"kimi": pytest.approx(0.5)}, "usage_rows": 1}
+    assert router.saves == 1
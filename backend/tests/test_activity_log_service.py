@@ -0,0 +1,83 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.infrastructure.append_log import SegmentedAppendLog
+from app.services import activity_log_service as als
+from app.services.activity_log_service import ActivityLogService
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(als, "get_workspace_path", lambda sub="": tmp_path / sub)
+    return ActivityLogService()
+
+
+def test_append_log_rotates_compacts_and_reads_tail(tmp_path):
+    log = SegmentedAppendLog(tmp_path, "events", segment_max_bytes=200, max_segments=3)
+    for i in range(40):
+        log.append({"i": i, "pad": "x" * 20})
+    assert len(log.segment_ids()) > 3
+
+    assert [r["i"] for r in log.read_tail(5)] == [35, 36, 37, 38, 39]
+    removed = log.compact()
+    assert removed > 0 and len(log.segment_ids()) == 3
+    tail = log.read_tail(1000)
+    assert tail[-1]["i"] == 39 and tail == sorted(tail, key=lambda r: r["i"])
+
+    # A torn final line (crash mid-write) is skipped, not fatal.
+    with open(log._segment_path(log.segment_ids()[-1]), "a", encoding="utf-8") as f:
+        f.write('{"i": 40, "pad"')
+    assert log.read_tail(1)[0]["i"] == 39
+
+
+@pytest.mark.asyncio
+async def test_log_event_appends_without_rewriting_history(service, tmp_path):
+    for i in range(5):
+        await service.log_event("execute_complete", f"proj{i % 2}", f"t{i}", source="engine")
+    await service.close()
+
+    seg = tmp_path / "engine" / "activity_log.000001.jsonl"
+    lines = seg.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["title"] for line in lines] == ["t0", "t1", "t2", "t3", "t4"]
+
+    # A fresh instance rebuilds the tail + indexes from the segments.
+    again = ActivityLogService()
+    events = await again.get_events(project="proj0")
+    assert [e["title"] for e in events] == ["t4", "t2", "t0"]
+
+
+@pytest.mark.asyncio
+async def test_get_events_filters_use_indexes_and_respect_eviction(service, monkeypatch):
+    monkeypatch.setattr(als, "MAX_EVENTS", 4)
+    svc = ActivityLogService()
+    svc._log = service._log
+    for i, (project, source) in enumerate(
+        [("a", "engine"), ("b", "engine"), ("a", "scheduler"), ("a", "engine"), ("b", "engine"), ("a", "engine")]
+    ):
+        await svc.log_event("tick", project, f"t{i}", source=source)
+
+    # Only the newest 4 events (t2..t5) are in the tail.
+    assert [e["title"] for e in await svc.get_events(project="a")] == ["t5", "t3", "t2"]
+    assert [e["title"] for e in await svc.get_events(project="a", source="engine")] == ["t5", "t3"]
+    assert [e["title"] for e in await svc.get_events(limit=2)] == ["t5", "t4"]
+    assert await svc.get_events(event_type="missing") == []
+    future = datetime.utcnow() + timedelta(hours=1)
+    assert await svc.get_events(since=future) == []
+    await svc.close()
+
+
+@pytest.mark.asyncio
+async def test_legacy_json_is_imported_once(service, tmp_path):
+    legacy = tmp_path / "engine" / "activity_log.json"
+    legacy.write_text(json.dumps({"events": [
+        {"event_id": "EVT-1", "timestamp": "2026-01-01T00:00:00Z", "event_type": "x",
+         "project": "p", "title": "old", "source": "engine", "status": "info"},
+    ]}), encoding="utf-8")
+
+    summary = await service.get_summary(hours=24 * 365 * 10)
+    assert summary["total_events"] == 1
+    assert not legacy.exists()
+    assert (tmp_path / "engine" / "activity_log.json.migrated").exists()
+    await service.close()
@@ -0,0 +1,122 @@
+import io
+
+import pytest
+from PIL import Image
+
+from app.services import carousel_renderer_service as crs
+from app.services.carousel_renderer_service import CarouselRendererService
+
+
+def _png(size, color) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", size, color).save(buf, "PNG")
+    return buf.getvalue()
+
+
+SLIDES = [
+    {"title": "Hook", "text": ""},
+    {"title": "Two", "text": "Tony Stark **built** it", "image_url": "http://img/s2.png"},
+    {"title": "", "text": "a plain closing line", "image_url": "http://img/broken.png"},
+]
+
+
+@pytest.fixture
+def renderer(tmp_path, monkeypatch):
+    monkeypatch.setattr(crs, "RENDER_DIR", tmp_path)
+    monkeypatch.setattr(crs.get_settings(), "carousel_render_workers", 0)
+    images = {
+        "http://img/char.png": _png((800, 600), (200, 40, 40)),
+        "http://img/s2.png": _png((1200, 3000), (20, 120, 220)),
+    }
+    fetched = []
+
+    async def fake_download(self, session, url):
+        fetched.append(url)
+        return images.get(url)
+
+    monkeypatch.setattr(CarouselRendererService, "_download_bytes", fake_download)
+    r = CarouselRendererService()
+    r.images, r.fetched = images, fetched
+    return r
+
+
+async def test_render_matches_sequential_slide_render(renderer):
+    result = await renderer.render_carousel(
+        "c1", SLIDES, [{"slide_num": 2, "text_position": "top"}],
+        character_image_url="http://img/missing.png",
+        character_image_urls=["http://img/char.png"],
+        hook_text="The hook",
+    )
+
+    assert sorted(renderer.fetched) == sorted({
+        "http://img/missing.png", "http://img/char.png",
+        "http://img/s2.png", "http://img/broken.png",
+    })
+    assert [p.rsplit("/", 1)[-1] for p in result["paths"]] == [
+        "slide_01.png", "slide_02.png", "slide_03.png",
+    ]
+    nums = [w["slide_num"] for w in result["render_warnings"]]
+    assert nums == sorted(nums)
+
+    # Slide 3's image failed, so it uses the first fallback that downloaded.
+    expected_bg = {1: "http://img/char.png", 2: "http://img/s2.png", 3: "http://img/char.png"}
+    for i, path in enumerate(result["paths"], start=1):
+        slide = SLIDES[i - 1]
+        spec_position = "top" if i == 2 else "center"
+        reference = renderer._render_slide(
+            bg_image=Image.open(io.BytesIO(renderer.images[expected_bg[i]])),
+            slide_num=i,
+            total_slides=3,
+            title_text=slide["title"],
+            body_text=slide["text"] or "The hook",
+            text_position=spec_position,
+            font_weight="bold",
+            bg_overlay=None,
+            text_color="#FFFFFF",
+            accent_color="#FFD700",
+            text_shadow=True,
+            warnings_out=[],
+            no_break_terms=renderer._build_no_break_set(None),
+        )
+        with Image.open(path) as out:
+            assert out.size == (crs.SLIDE_WIDTH, crs.SLIDE_HEIGHT)
+            assert out.convert("RGB").tobytes() == reference.convert("RGB").tobytes()
+
+
+async def test_render_without_images_uses_gradient(renderer):
+    result = await renderer.render_carousel("c2", [{"title": "t", "text": "body"}], [])
+    with Image.open(result["paths"][0]) as out:
+        assert out.size == (crs.SLIDE_WIDTH, crs.SLIDE_HEIGHT)
+    assert renderer.fetched == []
+
+
+async def test_broken_pool_falls_back_to_thread(renderer, monkeypatch):
+    monkeypatch.setattr(crs.get_settings(), "carousel_render_workers", 2)
+
+    class BrokenPool:
+        def submit(self, *args, **kwargs):
+            raise crs.BrokenProcessPool("worker died")
+
+        def shutdown(self, **kwargs):
+            pass
+
+    monkeypatch.setattr(crs, "_render_pool", BrokenPool())
+    result = await renderer.render_carousel("c3", SLIDES[:2], [])
+    assert result["rendered_slides"] == 2
+    assert crs._render_pool is None
+
+
+def test_fitted_background_cache_is_thread_safe(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    monkeypatch.setattr(crs, "_fitted_backgrounds", crs.OrderedDict())
+    monkeypatch.setattr(
+        CarouselRendererService, "_fit_background", staticmethod(lambda img, w, h: img.getpixel((0, 0))),
+    )
+    blobs = [_png((4, 4), (i, 0, 0)) for i in range(3 * crs._FITTED_CACHE_SIZE)]
+
+    with ThreadPoolExecutor(8) as pool:
+        fitted = list(pool.map(crs._fitted_background, blobs * 20))
+
+    assert fitted == [(i, 0, 0) for i in range(len(blobs))] * 20
+    assert len(crs._fitted_backgrounds) == crs._FITTED_CACHE_SIZE
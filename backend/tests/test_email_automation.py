@@ -281,6 +281,63 @@ class TestIntegration:
         assert state["status"] == "pending"
         assert state["needs_question"] is False
 
+    @pytest.mark.asyncio
+    async def test_new_emails_are_rule_matched_in_one_batch(self, temp_workspace, monkeypatch):
+        """process_new_emails evaluates the whole unread batch with one rule call."""
+        from types import SimpleNamespace
+        import app.services.email_classifier as email_classifier
+        import app.services.email_rule_service as email_rule_service
+        import app.services.gmail_service as gmail_service
+        from app.services.email_automation_service import EmailAutomationService
+
+        class FakeEmail:
+            def __init__(self, email_id, subject):
+                self.id = email_id
+                self.subject = subject
+
+            def model_dump(self):
+                return {"id": self.id, "subject": self.subject, "from_address": {"email": "a@b.c"}}
+
+        class FakeGmail:
+            async def list_emails(self, status=None, limit=None):
+                return [FakeEmail("m1", "Invoice 42"), FakeEmail("m2", "Lunch?")]
+
+        class FakeClassifier:
+            async def classify(self, subject, from_addr, body_preview):
+                return "normal", 0.9
+
+        batches = []
+
+        class FakeRules:
+            async def evaluate_rules(self, email_data):
+                raise AssertionError("rules evaluated per email")
+
+            async def evaluate_rules_batch(self, emails):
+                batches.append([e["id"] for e in emails])
+                return [[SimpleNamespace(id="r1")] if "Invoice" in e["subject"] else [] for e in emails]
+
+        monkeypatch.setattr(gmail_service, "get_gmail_service", lambda: FakeGmail())
+        monkeypatch.setattr(email_classifier, "get_email_classifier", lambda: FakeClassifier())
+        monkeypatch.setattr(email_rule_service, "get_email_rule_service", lambda: FakeRules())
+
+        service = EmailAutomationService(workspace_path=temp_workspace)
+        ran = []
+
+        async def run_workflow(state):
+            await service._classify_node(state)
+            await service._apply_user_rules_node(state)
+            ran.append(state)
+            return {"email_id": state["email_id"], "status": "completed"}
+
+        monkeypatch.setattr(service, "_run_workflow", run_workflow)
+
+        summary = await service.process_new_emails()
+
+        assert batches == [["m1", "m2"]]
+        assert [(s["email_id"], s["matched_rule_ids"]) for s in ran] == [("m1", ["r1"]), ("m2", None)]
+        assert all(s["email_data"]["category"] == "normal" for s in ran)
+        assert summary["processed"] == 2
+
 
 def test_requirements_installed():
     """Test that required packages are installed."""
@@ -0,0 +1,175 @@
+import asyncio
+import random
+from datetime import datetime
+
+import pytest
+
+from app.models.email_rule import ConditionsBlock, EmailRule, RuleAction, RuleCondition
+from app.services.email_rule_engine import CompiledConditions, CompiledRuleSet, EmailView, compile_condition
+from app.services.email_rule_service import EmailRuleService
+
+EMAIL = {
+    "id": "m1",
+    "from_address": {"email": "Billing@Example.com", "name": "Billing"},
+    "subject": "Your Invoice #123 is ready",
+    "body_text": "Amount due: $40",
+    "category": "normal",
+    "labels": ["INBOX", "Receipts"],
+    "attachments": [{"filename": "invoice.pdf"}],
+}
+
+
+def _cond(field, operator="contains", value="", case_sensitive=False):
+    return RuleCondition(field=field, operator=operator, value=value, case_sensitive=case_sensitive)
+
+
+def _rule(rule_id, *conditions, match_mode="all", priority=100, stop=False):
+    return EmailRule(
+        id=rule_id,
+        name=rule_id,
+        priority=priority,
+        stop_after_match=stop,
+        conditions=ConditionsBlock(match_mode=match_mode, conditions=list(conditions)),
+        actions=[RuleAction(type="star")],
+        created_at=datetime(2026, 1, 1),
+    )
+
+
+@pytest.mark.parametrize("condition, expected", [
+    (_cond("sender", "ends_with", "@example.com"), True),
+    (_cond("sender", "ends_with", "@example.com", case_sensitive=True), False),
+    (_cond("sender", "exact", "billing@example.com"), True),
+    (_cond("subject", "contains", ["refund", "invoice"]), True),
+    (_cond("subject", "not_contains", "invoice"), False),
+    (_cond("subject", "not_contains", ["invoice", "refund"]), True),
+    (_cond("subject", "starts_with", ["re:", "your"]), True),
+    (_cond("subject", "regex", r"INVOICE\s#\d+"), True),
+    (_cond("subject", "regex", r"Invoice\S"), False),
+    (_cond("subject", "regex", "(unclosed"), False),
+    (_cond("body", "contains", "$40"), True),
+    (_cond("category", "exact", "NORMAL"), True),
+    (_cond("label", value=["Work", "Receipts"]), True),
+    (_cond("label", value="receipts"), False),
+    (_cond("has_attachments", "exact", True), True),
+    (_cond("has_attachments", "exact", False), False),
+])
+def test_compiled_condition_semantics(condition, expected):
+    assert compile_condition(condition)(EmailView(EMAIL)) is expected
+
+
+def test_body_falls_back_to_snippet_and_missing_fields_do_not_raise():
+    view = EmailView({"snippet": "see attached", "subject": None, "from_address": "raw@x.org"})
+
+    assert compile_condition(_cond("body", value="attached"))(view)
+    assert not compile_condition(_cond("subject", value="x"))(view)
+    assert compile_condition(_cond("sender", "ends_with", "x.org"))(view)
+
+
+def test_rules_match_in_priority_order_and_stop_after_match():
+    rule_set = CompiledRuleSet([
+        _rule("late", _cond("subject", value="invoice"), priority=300),
+        _rule("stopper", _cond("sender", "exact", "billing@example.com"), priority=200, stop=True),
+        _rule("first", _cond("label", value="Receipts"), priority=100),
+        _rule("miss", _cond("subject", value="refund"), priority=50),
+    ])
+
+    assert [r.id for r in rule_set.evaluate(EMAIL)] == ["first", "stopper"]
+    assert rule_set.get("late").priority == 300
+
+
+def _reference(rules, email):
+    """Every rule in priority order, no index."""
+    view, matched = EmailView(email), []
+    for rule in sorted(rules, key=lambda r: r.priority):
+        if CompiledConditions(rule.conditions)(view):
+            matched.append(rule)
+            if rule.stop_after_match:
+                break
+    return matched
+
+
+def test_literal_index_matches_unindexed_evaluation():
+    rnd = random.Random(7)
+    senders = ["a@x.com", "B@x.com", "c@y.org", "d@z.net"]
+    subjects = ["Invoice ready", "Lunch?", "invoice overdue", "Weekly digest"]
+    labels = ["INBOX", "Work", "Receipts", "STARRED"]
+
+    def condition():
+        kind = rnd.choice(["sender_exact", "label", "subject", "category"])
+        if kind == "sender_exact":
+            return _cond("sender", "exact", rnd.choice(senders), case_sensitive=rnd.random() < 0.3)
+        if kind == "label":
+            return _cond("label", value=rnd.sample(labels, rnd.randint(1, 2)))
+        if kind == "category":
+            return _cond("category", "exact", rnd.choice(["normal", "urgent"]))
+        return _cond("subject", rnd.choice(["contains", "not_contains", "starts_with"]), rnd.choice(["invoice", "lunch", "Weekly"]))
+
+    rules = [
+        _rule(
+            f"r{i}",
+            *[condition() for _ in range(rnd.randint(1, 3))],
+            match_mode=rnd.choice(["all", "any"]),
+            priority=rnd.randint(1, 20),
+            stop=rnd.random() < 0.15,
+        )
+        for i in range(60)
+    ]
+    emails = [
+        {
+            "from_address": {"email": rnd.choice(senders)},
+            "subject": rnd.choice(subjects),
+            "category": rnd.choice(["normal", "urgent"]),
+            "labels": rnd.sample(labels, rnd.randint(0, 3)),
+        }
+        for _ in range(300)
+    ]
+    rule_set = CompiledRuleSet(rules)
+
+    results = rule_set.evaluate_many(emails)
+
+    assert [[r.id for r in got] for got in results] == [
+        [r.id for r in _reference(rules, e)] for e in emails
+    ]
+    assert any(results)
+
+
+@pytest.mark.asyncio
+async def test_rule_set_is_cached_until_invalidated(monkeypatch):
+    service = EmailRuleService()
+    loads = []
+
+    async def list_rules(enabled_only=False):
+        loads.append(enabled_only)
+        return [_rule("r1", _cond("subject", value="invoice"))]
+
+    monkeypatch.setattr(service, "list_rules", list_rules)
+
+    assert [r.id for r in await service.evaluate_rules(EMAIL)] == ["r1"]
+    assert [[r.id for r in m] for m in await service.evaluate_rules_batch([EMAIL, {}])] == [["r1"], []]
+    assert loads == [True]
+
+    service.invalidate_rule_set()
+    await service.evaluate_rules(EMAIL)
+    assert loads == [True, True]
+
+
+@pytest.mark.asyncio
+async def test_set_loaded_across_an_invalidation_is_not_cached(monkeypatch):
+    service = EmailRuleService()
+    loads = 0
+
+    async def list_rules(enabled_only=False):
+        nonlocal loads
+        loads += 1
+        if loads == 1:
+            service.invalidate_rule_set()  # a rule edit lands mid-load
+        await asyncio.sleep(0)
+        return []
+
+    monkeypatch.setattr(service, "list_rules", list_rules)
+
+    await service.get_rule_set()
+    await service.get_rule_set()
+    await service.get_rule_set()
+
+    assert loads == 2
@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+from app.infrastructure import ollama_client
+from app.infrastructure.embedding_cache import EmbedCoalescer, EmbeddingCache, embedding_cache_key
+from app.infrastructure.ollama_client import OllamaClient
+
+
+def test_key_depends_on_model_dimension_and_exact_text():
+    base = embedding_cache_key("embed-local", 768, "hello")
+    assert base == embedding_cache_key("embed-local", 768, "hello")
+    assert base != embedding_cache_key("embed-other", 768, "hello")
+    assert base != embedding_cache_key("embed-local", 1024, "hello")
+    assert base != embedding_cache_key("embed-local", 768, "hello ")
+
+
+@pytest.mark.asyncio
+async def test_memory_tier_roundtrips_float16():
+    cache = EmbeddingCache(persist=False)
+    vec = [0.1234567, -0.5, 0.0, 0.999]
+    cache.put_many("m", 4, {"k": vec})
+
+    found = await cache.get_many(["k", "absent"])
+
+    assert list(found) == ["k"]
+    assert found["k"] == pytest.approx(vec, abs=1e-3)
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["misses"]) == (1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_never_hits():
+    cache = EmbeddingCache(persist=False, enabled=False)
+    cache.put_many("m", 4, {"k": [1.0]})
+    assert await cache.get_many(["k"]) == {}
+
+
+@pytest.mark.asyncio
+async def test_coalescer_merges_concurrent_submits_into_one_batch():
+    calls = []
+
+    async def embed_batch(texts):
+        calls.append(list(texts))
+        return [[float(len(t))] for t in texts]
+
+    coalescer = EmbedCoalescer(embed_batch, window_s=0.01, max_batch=32)
+    results = await asyncio.gather(*(coalescer.submit(t) for t in ["a", "bb", "a", "ccc"]))
+
+    assert results == [[1.0], [2.0], [1.0], [3.0]]
+    assert calls == [["a", "bb", "ccc"]]
+    assert coalescer.stats()["requests"] == 4
+
+
+@pytest.mark.asyncio
+async def test_coalescer_flushes_at_max_batch_and_propagates_errors():
+    calls = []
+
+    async def embed_batch(texts):
+        calls.append(list(texts))
+        if "bad" in texts:
+            raise RuntimeError("upstream down")
+        return [[0.0] for _ in texts]
+
+    coalescer = EmbedCoalescer(embed_batch, window_s=10.0, max_batch=2)
+    assert await asyncio.gather(coalescer.submit("x"), coalescer.submit("y")) == [[0.0], [0.0]]
+
+    results = await asyncio.gather(
+        coalescer.submit("bad"), coalescer.submit("z"), return_exceptions=True,
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert calls == [["x", "y"], ["bad", "z"]]
+
+
+@pytest.fixture
+def cached_client(monkeypatch):
+    cache = EmbeddingCache(persist=False)
+    monkeypatch.setattr(ollama_client, "get_embedding_cache", lambda: cache)
+    client = OllamaClient()
+    calls = []
+
+    async def fake_batch(texts, model, max_retries):
+        calls.append(list(texts))
+        return [[float(len(t)), 1.0] for t in texts]
+
+    monkeypatch.setattr(client, "_embed_batch_openai", fake_batch)
+    return client, calls
+
+
+@pytest.mark.asyncio
+async def test_embed_batch_only_sends_uncached_unique_texts(cached_client):
+    client, calls = cached_client
+
+    first = await client.embed_batch(["a", "bb", "a"])
+    second = await client.embed_batch(["bb", "dddd", "a"])
+
+    assert first == [[1.0, 1.0], [2.0, 1.0], [1.0, 1.0]]
+    assert second == [[2.0, 1.0], [4.0, 1.0], [1.0, 1.0]]
+    assert calls == [["a", "bb"], ["dddd"]]
+
+
+@pytest.mark.asyncio
+async def test_embed_reuses_batch_results_and_coalesces_misses(cached_client):
+    client, calls = cached_client
+    await client.embed_batch(["known"])
+
+    assert await client.embed("known") == [5.0, 1.0]
+    results = await asyncio.gather(client.embed("x"), client.embed("yy"), client.embed("x"))
+
+    assert results == [[1.0, 1.0], [2.0, 1.0], [1.0, 1.0]]
+    assert calls == [["known"], ["x", "yy"]]
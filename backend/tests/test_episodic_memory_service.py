@@ -0,0 +1,86 @@
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.services import episodic_memory_service as ems
+from app.services.episodic_memory_service import EpisodicMemoryService, ExtractionInput
+
+
+def _fact(content, importance=50.0, namespace="general", embedding=None):
+    return ems._Fact(
+        source=ExtractionInput(text="x" * 20, source_type="test", namespace=namespace),
+        content=content,
+        importance=importance,
+        tags=[],
+        embedding=embedding,
+    )
+
+
+def test_dedupe_keeps_most_important_of_near_duplicates():
+    facts = [
+        _fact("deploys fail on fridays", 40, embedding=[1.0, 0.0, 0.0]),
+        _fact("friday deploys tend to fail", 90, embedding=[0.99, 0.05, 0.0]),
+        _fact("tiktok posts do best at 7pm", 60, embedding=[0.0, 1.0, 0.0]),
+        _fact("deploys fail on fridays", 40, namespace="ops", embedding=[1.0, 0.0, 0.0]),
+        _fact("Tiktok posts  do best at 7pm", 10),
+    ]
+    kept = ems._dedupe_facts(facts, threshold=0.95)
+    assert [(f.content, f.source.namespace) for f in kept] == [
+        ("friday deploys tend to fail", "general"),
+        ("tiktok posts do best at 7pm", "general"),
+        ("deploys fail on fridays", "ops"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_extract_and_store_many_embeds_once_and_inserts_once(monkeypatch):
+    calls = {"chat": 0, "embed": [], "execute": 0, "commit": 0}
+
+    class FakeLLM:
+        async def structured_chat(self, prompt, **kwargs):
+            calls["chat"] += 1
+            return [
+                {"content": "shared fact that repeats everywhere", "importance": 80, "tags": ["a"]},
+                {"content": f"unique fact from call {calls['chat']}", "importance": 50},
+                {"content": "short"},
+            ]
+
+    class FakeEmbedder:
+        async def embed_batch(self, texts, **kwargs):
+            calls["embed"].append(len(texts))
+            # One-hot per text, except every "shared" fact gets the same vector.
+            return [
+                [1.0 if j == (0 if "shared" in t else i + 1) else 0.0 for j in range(len(texts) + 1)]
+                for i, t in enumerate(texts)
+            ]
+
+    class FakeSession:
+        async def execute(self, stmt):
+            calls["execute"] += 1
+
+        async def commit(self):
+            calls["commit"] += 1
+
+    @asynccontextmanager
+    async def fake_session():
+        yield FakeSession()
+
+    monkeypatch.setattr(ems, "get_unified_llm_client", lambda: FakeLLM())
+    monkeypatch.setattr(ems, "get_llm_client", lambda: FakeEmbedder())
+    monkeypatch.setattr(ems, "get_session", fake_session)
+
+    inputs = [
+        ExtractionInput(text=f"some long enough source text {i}", source_type="test", source_id=str(i))
+        for i in range(3)
+    ] + [ExtractionInput(text="too short", source_type="test")]
+    memories = await EpisodicMemoryService().extract_and_store_many(inputs, concurrency=2)
+
+    assert calls["chat"] == 3
+    assert calls["embed"] == [6]
+    assert calls["execute"] == 1 and calls["commit"] == 1
+    contents = [m.content for m in memories]
+    assert contents.count("shared fact that repeats everywhere") == 1
+    assert len(memories) == 4
+    shared = next(m for m in memories if m.content.startswith("shared"))
+    assert shared.tags == ["a"]
+    assert (shared.expires_at - shared.created_at).days == ems.HIGH_IMPORTANCE_TTL_DAYS
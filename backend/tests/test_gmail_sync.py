@@ -0,0 +1,352 @@
+import asyncio
+import base64
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.infrastructure.circuit_breaker import CircuitBreaker
+from app.infrastructure.config import get_settings
+from app.models.email import EmailSyncStatus
+from app.services import gmail_service
+from app.services.gmail_service import GmailService
+
+
+def _message(msg_id, labels=("INBOX", "UNREAD")):
+    return {
+        "id": msg_id,
+        "threadId": f"t-{msg_id}",
+        "snippet": f"snippet {msg_id}",
+        "labelIds": list(labels),
+        "internalDate": "1760000000000",
+        "payload": {
+            "mimeType": "text/plain",
+            "headers": [
+                {"name": "From", "value": "Alice <alice@example.com>"},
+                {"name": "To", "value": "me@example.com"},
+                {"name": "Subject", "value": f"Subject {msg_id}"},
+            ],
+            "body": {"data": base64.urlsafe_b64encode(b"hello").decode()},
+        },
+    }
+
+
+class _Request:
+    def __init__(self, fn):
+        self._fn = fn
+
+    def execute(self):
+        return self._fn()
+
+
+class FakeGmail:
+    """In-process stand-in for the googleapiclient Gmail resource."""
+
+    def __init__(self, messages=(), history_pages=(), history_id="950", page_size=2):
+        self.messages_by_id = {m["id"]: m for m in messages}
+        self.history_pages = list(history_pages)
+        self.history_id = history_id
+        self.page_size = page_size
+        self.batches = []  # [(format, [ids])]
+        self.unbatched_gets = 0
+
+    def users(self):
+        return self
+
+    def messages(self):
+        return self
+
+    def history(self):
+        return _History(self)
+
+    def labels(self):
+        return _Labels()
+
+    def getProfile(self, userId):
+        return _Request(lambda: {"emailAddress": "me@example.com", "historyId": self.history_id})
+
+    def list(self, userId, q, maxResults, pageToken=None):
+        start = int(pageToken or 0)
+        ids = sorted(self.messages_by_id)[start:start + min(maxResults, self.page_size)]
+
+        def _page():
+            page = {"messages": [{"id": i} for i in ids]}
+            if start + len(ids) < len(self.messages_by_id):
+                page["nextPageToken"] = str(start + len(ids))
+            return page
+        return _Request(_page)
+
+    def get(self, userId, id, format):
+        def _get():
+            msg = self.messages_by_id[id]
+            if format == "minimal":
+                return {k: msg[k] for k in ("id", "threadId", "labelIds")}
+            return msg
+        req = _Request(_get)
+        req.msg_id, req.format = id, format
+        return req
+
+    def new_batch_http_request(self, callback):
+        return _Batch(self, callback)
+
+
+class _History:
+    def __init__(self, gmail):
+        self._gmail = gmail
+
+    def list(self, userId, startHistoryId, historyTypes, maxResults, pageToken=None):
+        def _page():
+            index = int(pageToken or 0)
+            page = dict(self._gmail.history_pages[index])
+            if index + 1 < len(self._gmail.history_pages):
+                page["nextPageToken"] = str(index + 1)
+            return page
+        return _Request(_page)
+
+
+class _Labels:
+    def list(self, userId):
+        return _Request(lambda: {"labels": [{"id": "INBOX", "name": "INBOX", "type": "system"}]})
+
+    def get(self, userId, id):
+        return _Request(lambda: {"messagesTotal": 3, "messagesUnread": 1})
+
+
+class _Batch:
+    def __init__(self, gmail, callback):
+        self._gmail = gmail
+        self._callback = callback
+        self._requests = []
+
+    def add(self, request, request_id):
+        self._requests.append((request_id, request))
+
+    def execute(self):
+        self._gmail.batches.append(
+            (self._requests[0][1].format, [rid for rid, _ in self._requests])
+        )
+        for request_id, request in self._requests:
+            try:
+                response = request.execute()
+            except KeyError as e:
+                self._callback(request_id, None, RuntimeError(f"404 not found: {e}"))
+            else:
+                self._callback(request_id, response, None)
+
+
+@pytest.fixture
+def sync(monkeypatch, tmp_path):
+    """GmailService wired to a FakeGmail with the Postgres writes captured."""
+    svc = GmailService(workspace_path=str(tmp_path))
+    svc._breaker = CircuitBreaker("gmail_test")
+    recorded = SimpleNamespace(
+        gmail=FakeGmail(), existing=set(), upserts=[], labels={}, history_ids=[], alerts=[],
+    )
+
+    async def get_service(account_id=None):
+        return recorded.gmail
+
+    async def existing_ids(ids):
+        return {i for i in ids if i in recorded.existing}
+
+    async def upsert(emails, account_id):
+        recorded.upserts.extend((e.id, account_id) for e in emails)
+
+    async def apply_labels(labels_by_id):
+        recorded.labels.update(labels_by_id)
+
+    async def store_history_id(account_id, history_id):
+        recorded.history_ids.append((account_id, history_id))
+
+    async def load_status():
+        return EmailSyncStatus()
+
+    async def save_status(status):
+        return None
+
+    async def check_alerts(email):
+        recorded.alerts.append(email.id)
+
+    class FakeOAuth:
+        async def get_account(self, account_id=None):
+            return SimpleNamespace(id="acct1", metadata_={"history_id": "100"})
+
+    monkeypatch.setattr(svc, "_get_gmail_service", get_service)
+    monkeypatch.setattr(svc, "_existing_ids", existing_ids)
+    monkeypatch.setattr(svc, "_upsert_emails", upsert)
+    monkeypatch.setattr(svc, "_apply_label_changes", apply_labels)
+    monkeypatch.setattr(svc, "_store_history_id", store_history_id)
+    monkeypatch.setattr(svc, "_load_sync_status", load_status)
+    monkeypatch.setattr(svc, "_save_sync_status", save_status)
+    monkeypatch.setattr(svc, "_check_alert_rules", check_alerts)
+    monkeypatch.setattr(gmail_service, "get_gmail_oauth_service", lambda: FakeOAuth())
+    return svc, recorded
+
+
+@pytest.mark.asyncio
+async def test_incremental_sync_batch_fetches_only_new_messages(sync):
+    svc, rec = sync
+    rec.existing = {"m3", "m4"}
+    rec.gmail = FakeGmail(
+        messages=[_message(i) for i in ("m1", "m2", "m3", "m4")],
+        history_pages=[
+            {"history": [{"messagesAdded": [{"message": {"id": "m1"}}, {"message": {"id": "m2"}}]}]},
+            {
+                "historyId": "950",
+                "history": [
+                    {"messagesAdded": [{"message": {"id": "m3"}}]},
+                    {"labelsAdded": [{"message": {"id": "m4", "labelIds": ["INBOX", "STARRED"]}}]},
+                    {"labelsRemoved": [{"message": {"id": "m1", "labelIds": ["INBOX"]}}]},
+                ],
+            },
+        ],
+    )
+
+    result = await svc.sync_incremental()
+
+    assert result == {
+        "status": "success", "type": "incremental", "new_emails": 2, "account_id": "acct1", "errors": [],
+    }
+    assert rec.gmail.batches == [("full", ["m1", "m2"])]
+    assert rec.upserts == [("m1", "acct1"), ("m2", "acct1")]
+    # m1 was fetched after its label change; only the cached m4 is patched.
+    assert rec.labels == {"m4": ["INBOX", "STARRED"]}
+    assert rec.alerts == ["m1", "m2"]
+    assert rec.history_ids == [("acct1", "950")]
+
+
+@pytest.mark.asyncio
+async def test_full_sync_refreshes_cached_messages_in_minimal_format(sync, monkeypatch):
+    svc, rec = sync
+    monkeypatch.setattr(get_settings(), "gmail_batch_size", 2)
+    rec.existing = {"m2"}
+    rec.gmail = FakeGmail(
+        messages=[_message("m2", labels=("INBOX",))] + [_message(i) for i in ("m1", "m3", "m4", "m5")],
+        history_id="777",
+    )
+
+    result = await svc.sync_inbox(max_results=10, days_back=7)
+
+    assert rec.gmail.batches == [
+        ("full", ["m1", "m3"]),
+        ("full", ["m4", "m5"]),
+        ("minimal", ["m2"]),
+    ]
+    assert [i for i, _ in rec.upserts] == ["m1", "m3", "m4", "m5"]
+    assert rec.labels == {"m2": ["INBOX"]}
+    assert (result["total_messages"], result["new_emails"], result["unread_count"]) == (5, 4, 4)
+    assert rec.history_ids == [("acct1", "777")]
+
+
+@pytest.mark.asyncio
+async def test_full_sync_respects_max_results_across_pages(sync):
+    svc, rec = sync
+    rec.gmail = FakeGmail(messages=[_message(f"m{i}") for i in range(7)], page_size=2)
+
+    result = await svc.sync_inbox(max_results=3)
+
+    assert [i for i, _ in rec.upserts] == ["m0", "m1", "m2"]
+    assert result["total_messages"] == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_message_in_batch_does_not_fail_the_sync(sync):
+    svc, rec = sync
+    rec.gmail = FakeGmail(
+        history_pages=[{"historyId": "950", "history": [
+            {"messagesAdded": [{"message": {"id": "m1"}}, {"message": {"id": "gone"}}]},
+        ]}],
+        messages=[_message("m1")],
+    )
+
+    result = await svc.sync_incremental()
+
+    assert result["new_emails"] == 1
+    assert rec.upserts == [("m1", "acct1")]
+    assert len(result["errors"]) == 1 and "gone" in result["errors"][0]
+    # The history id stays put so the next run retries the failed message.
+    assert rec.history_ids == []
+
+    rec.existing = {"m1"}
+    rec.gmail.messages_by_id["gone"] = _message("gone")
+    result = await svc.sync_incremental()
+
+    assert result["errors"] == []
+    assert rec.gmail.batches[-1] == ("full", ["gone"])
+    assert rec.history_ids == [("acct1", "950")]
+
+
+@pytest.mark.asyncio
+async def test_gmail_requests_run_off_the_loop_one_at_a_time(sync, monkeypatch):
+    svc, rec = sync
+    rec.gmail = FakeGmail(
+        history_pages=[{"historyId": "950", "history": [{"messagesAdded": [{"message": {"id": "m1"}}]}]}],
+        messages=[_message("m1")],
+    )
+    loop_thread = threading.get_ident()
+    calls = {"now": 0, "peak": 0, "on_loop": 0}
+    execute = _Request.execute
+
+    def tracked(self):
+        calls["now"] += 1
+        calls["peak"] = max(calls["peak"], calls["now"])
+        calls["on_loop"] += threading.get_ident() == loop_thread
+        time.sleep(0.01)
+        try:
+            return execute(self)
+        finally:
+            calls["now"] -= 1
+
+    monkeypatch.setattr(_Request, "execute", tracked)
+
+    labels, result = await asyncio.gather(svc.get_labels(), svc.sync_incremental())
+
+    assert [(l.id, l.message_count) for l in labels] == [("INBOX", 3)]
+    assert result["new_emails"] == 1
+    assert (calls["peak"], calls["on_loop"]) == (1, 0)
+
+
+@pytest.mark.asyncio
+async def test_expired_history_id_falls_back_to_full_sync(sync, monkeypatch):
+    svc, rec = sync
+    full_syncs = []
+
+    def expired(*args, **kwargs):
+        raise RuntimeError("<HttpError 404 Requested entity was not found.>")
+
+    async def sync_inbox(max_results=100, days_back=7, account_id=None):
+        full_syncs.append((max_results, days_back, account_id))
+        return {"status": "success"}
+
+    monkeypatch.setattr(_History, "list", expired)
+    monkeypatch.setattr(svc, "sync_inbox", sync_inbox)
+
+    assert await svc.sync_incremental() == {"status": "success"}
+    assert full_syncs == [(50, 3, "acct1")]
+
+
+@pytest.mark.asyncio
+async def test_sync_accounts_is_concurrent_and_isolates_failures(sync, monkeypatch):
+    svc, _ = sync
+    monkeypatch.setattr(get_settings(), "gmail_sync_concurrency", 2)
+    running = {"now": 0, "peak": 0}
+
+    async def sync_incremental(account_id=None):
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        try:
+            await asyncio.sleep(0.01)
+            if account_id == "b":
+                raise RuntimeError("token revoked")
+            return {"status": "success", "new_emails": 1}
+        finally:
+            running["now"] -= 1
+
+    monkeypatch.setattr(svc, "sync_incremental", sync_incremental)
+
+    results = await svc.sync_accounts(["a", "b", "c", "d"])
+
+    assert running["peak"] == 2
+    assert results["b"] == {"status": "error", "error": "token revoked"}
+    assert all(results[a]["status"] == "success" for a in ("a", "c", "d"))
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from host_agent.audio_buffer import RingBuffer
+
+
+@pytest.fixture
+def ring():
+    buf = RingBuffer(8)
+    yield buf
+    buf.close()
+
+
+def _ramp(start, n):
+    return np.arange(start, start + n, dtype=np.float32)
+
+
+def test_reads_are_contiguous_views_across_the_wrap(ring):
+    ring.write(_ramp(0, 6))
+    ring.write(_ramp(6, 5))  # wraps: holds samples 3..10
+
+    latest = ring.read_latest(8)
+    assert latest.tolist() == list(range(3, 11))
+    assert np.shares_memory(latest, ring.buffer)
+    assert not latest.flags.writeable
+
+    first, since = ring.read_since(0)
+    assert first == 3  # 0..2 were overwritten
+    assert since.tolist() == list(range(3, 11))
+    assert ring.read_since(11)[1].size == 0
+
+
+def test_oversized_write_keeps_the_newest_samples(ring):
+    ring.write(_ramp(0, 20))
+
+    assert ring.samples_written == 20
+    assert ring.read_latest(100).tolist() == list(range(12, 20))
+
+
+def test_readers_keep_independent_cursors(ring):
+    fast = ring.reader()
+    slow = ring.reader()
+    ring.write(_ramp(0, 3))
+
+    assert fast.read().tolist() == [0, 1, 2]
+    ring.write(_ramp(3, 3))
+    assert fast.read(max_samples=2).tolist() == [3, 4]
+    assert fast.read().tolist() == [5]
+
+    ring.write(_ramp(6, 6))  # slow reader is lapped
+    assert slow.read().tolist() == list(range(4, 12))
+    assert slow.dropped == 4
+    assert fast.dropped == 0 and fast.available == 6
+
+
+def test_attach_by_name_shares_samples_without_copying(ring):
+    other = RingBuffer.attach(ring.name)
+    try:
+        reader = other.reader(from_start=True)
+        ring.write(_ramp(0, 5))
+        assert other.capacity == 8
+        assert reader.read().tolist() == [0, 1, 2, 3, 4]
+    finally:
+        other.close()
@@ -0,0 +1,118 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from host_agent.audio_buffer import RingBuffer
+from host_agent.live_transcription import (
+    LiveTranscriptionService,
+    _CpuBudget,
+    _LocalAgreement,
+)
+
+SR = 16000
+
+
+def _w(start, text):
+    return (start, start + 0.4, text)
+
+
+def test_local_agreement_commits_prefix_once():
+    la = _LocalAgreement()
+
+    assert la.update([_w(0.0, "so"), _w(0.5, "the")]) == []
+    assert la.update([_w(0.0, "So,"), _w(0.5, "the"), _w(1.0, "plan")]) == [_w(0.0, "So,"), _w(0.5, "the")]
+    # The next window starts at the committed word and re-hears it.
+    assert la.update([_w(0.5, "the"), _w(1.0, "plan"), _w(1.5, "is")]) == [_w(1.0, "plan")]
+    assert la.pending
+    assert la.flush() == [_w(1.5, "is")]
+    assert la.committed_end == pytest.approx(1.9)
+    assert la.prompt() == "So, the plan is"
+
+
+def test_cpu_budget_refills_at_fraction_of_wall_time():
+    now = [0.0]
+    budget = _CpuBudget(0.25, burst_s=1.0, clock=lambda: now[0])
+
+    assert budget.allow()
+    budget.spend(1.5)
+    assert not budget.allow()
+    now[0] = 3.0  # +0.75 s of decode credit
+    assert budget.allow()
+    assert _CpuBudget(0.0).allow()
+
+
+class ScriptedModel:
+    """Hears word k over [k/2, k/2 + 0.4] s of the recording.
+
+    The test audio encodes its absolute sample index, so the fake can tell
+    which part of the recording each decode window covers.
+    """
+
+    def __init__(self):
+        self.windows = []
+
+    def transcribe(self, audio, **kwargs):
+        first = int(round((float(audio[0]) - 0.1) * 1e7))
+        start_s, end_s = first / SR, (first + audio.size) / SR
+        self.windows.append((start_s, end_s))
+        words = [
+            SimpleNamespace(start=k / 2 - start_s, end=k / 2 + 0.4 - start_s, word=f" w{k}")
+            for k in range(12)  # 6 s of speech
+            if k / 2 >= start_s - 1e-6 and k / 2 + 0.4 <= end_s + 1e-6
+        ]
+        return [SimpleNamespace(words=words)], None
+
+
+def test_stream_decodes_only_uncommitted_speech(monkeypatch):
+    ring = RingBuffer(SR * 30)
+    capture = SimpleNamespace(ring_buffer=ring, is_recording=True, duration_seconds=0.0)
+    svc = LiveTranscriptionService(cpu_budget=0.0)
+    svc._model = model = ScriptedModel()
+    svc._capture = capture
+    svc._reset_stream(capture)
+    monkeypatch.setattr(LiveTranscriptionService, "_has_speech", lambda self, a: float(np.abs(a).max()) > 0.05)
+    segments = []
+    svc.subscribe(segments.append)
+
+    tick = int(1.2 * SR)
+    for _ in range(5):  # 6 s of speech
+        pos = ring.samples_written
+        ring.write((0.1 + np.arange(pos, pos + tick) / 1e7).astype(np.float32))
+        svc._tick()
+    decodes = len(model.windows)
+    for _ in range(3):  # silence
+        ring.write(np.zeros(tick, dtype=np.float32))
+        svc._tick()
+
+    text = " ".join(s["text"] for s in segments).split()
+    assert text == [f"w{k}" for k in range(12)]
+    assert segments[0]["start"] == 0.0
+    assert segments[-1]["end"] == pytest.approx(5.9)
+    # Windows slide past committed audio; silence costs one settling decode.
+    assert [round(s, 1) for s, _ in model.windows[:3]] == [0.0, 0.0, 0.9]
+    assert len(model.windows) == decodes + 1
+
+
+def test_decode_gets_a_copy_of_the_ring(monkeypatch):
+    ring = RingBuffer(SR * 2)
+    capture = SimpleNamespace(ring_buffer=ring, is_recording=True, duration_seconds=0.0)
+    svc = LiveTranscriptionService(cpu_budget=0.0)
+    svc._capture = capture
+    svc._reset_stream(capture)
+    monkeypatch.setattr(LiveTranscriptionService, "_has_speech", lambda self, a: True)
+    heard = []
+
+    class OverwritingModel:
+        def transcribe(self, audio, **kwargs):
+            # The capture thread laps the ring while Whisper is decoding.
+            ring.write(np.zeros(ring.capacity, dtype=np.float32))
+            heard.append(audio.copy())
+            return [], None
+
+    svc._model = OverwritingModel()
+    ring.write(np.full(SR, 0.5, dtype=np.float32))
+    svc._tick()
+
+    assert len(heard) == 1 and heard[0].size == SR
+    assert np.all(heard[0] == 0.5)
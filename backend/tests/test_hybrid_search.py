@@ -0,0 +1,76 @@
+import pytest
+
+from app.services.hybrid_search import (
+    HybridSearchSpec,
+    build_hybrid_sql,
+    half_life_decay_sql,
+    hybrid_search,
+    vector_literal,
+)
+
+SPEC = HybridSearchSpec(
+    table="docs",
+    tsv_sql="t.content_tsv",
+    select_sql="t.id, left(t.content, 10) AS content",
+    filters=("t.deleted IS NOT TRUE",),
+    decay_sql=half_life_decay_sql("t.mtime", 30.0, when="t.kind = 'journal'"),
+)
+
+
+def test_sql_fuses_both_sides_and_fetches_content_only_for_winners():
+    sql = build_hybrid_sql(SPEC, dense=True, extra_filters=["t.kind = ANY(:kinds)"])
+
+    assert "bm25_top AS" in sql and "dense_top AS" in sql
+    assert "UNION ALL" in sql
+    assert sql.count("t.deleted IS NOT TRUE") == 2
+    assert sql.count("t.kind = ANY(:kinds)") == 2
+    assert "ORDER BY t.embedding <=> CAST(:emb AS vector)" in sql
+    assert "power(0.5" in sql
+    # content only appears in the final projection
+    ctes = sql.split("left(t.content, 10)")[0]
+    assert "content" not in ctes.replace("content_tsv", "")
+    assert sql.rstrip().endswith("LIMIT :top_k")
+
+
+def test_sql_without_embedding_is_bm25_only():
+    sql = build_hybrid_sql(SPEC, dense=False)
+    assert "dense_top" not in sql
+    assert ":emb" not in sql
+    assert "0 AS dense_count" in sql
+
+
+def test_vector_literal():
+    assert vector_literal([1, 0.5]) == "[1.0,0.5]"
+
+
+@pytest.mark.asyncio
+async def test_hybrid_search_binds_params_and_strips_counts():
+    captured = {}
+
+    class FakeResult:
+        def mappings(self):
+            return self
+
+        def all(self):
+            return [
+                {"id": "a", "score": 0.03, "bm25_rank": 1, "dense_rank": 2, "bm25_count": 3, "dense_count": 5},
+                {"id": "b", "score": 0.01, "bm25_rank": None, "dense_rank": 1, "bm25_count": 3, "dense_count": 5},
+            ]
+
+    class FakeSession:
+        async def execute(self, stmt, params):
+            captured["sql"] = str(stmt)
+            captured["params"] = params
+            return FakeResult()
+
+    found = await hybrid_search(
+        FakeSession(), SPEC, query="hello", embedding=[0.1, 0.2], top_k=2, per_side_k=7,
+        params={"kinds": ["x"]},
+    )
+
+    assert [r["id"] for r in found.rows] == ["a", "b"]
+    assert "bm25_count" not in found.rows[0]
+    assert (found.bm25_count, found.dense_count, found.dense_enabled) == (3, 5, True)
+    assert captured["params"]["emb"] == "[0.1,0.2]"
+    assert captured["params"]["k"] == 7 and captured["params"]["top_k"] == 2
+    assert captured["params"]["kinds"] == ["x"]
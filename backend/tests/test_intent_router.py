@@ -0,0 +1,125 @@
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services import intent_router as ir
+from app.services.intent_router import IntentRouter, KeywordMatcher, parse_route_descriptions
+
+VOCAB = ["inbox", "email", "meeting", "calendar", "gpu", "health", "hello"]
+
+
+def _bow(text):
+    """Bag-of-words embedding over a tiny vocabulary (plus a bias dim)."""
+    words = text.lower().split()
+    return [float(sum(w.startswith(v) for w in words)) for v in VOCAB] + [0.1]
+
+
+async def _embed_batch(texts):
+    return [_bow(t) for t in texts]
+
+
+@pytest.fixture
+def router(monkeypatch):
+    async def no_history(self):
+        return [("email", "any new email in my inbox")]
+
+    monkeypatch.setattr(IntentRouter, "_history_exemplars", no_history)
+
+    async def embed(text):
+        return _bow(text)
+
+    client = SimpleNamespace(embed=embed)
+    monkeypatch.setattr(
+        "app.infrastructure.ollama_client.get_llm_client", lambda: client
+    )
+    return IntentRouter(
+        {
+            "email": ["inbox email"],
+            "calendar": ["calendar meeting"],
+            "system": ["gpu health"],
+        },
+        embed_batch=_embed_batch,
+        min_similarity=0.5,
+        min_margin=0.1,
+    )
+
+
+def test_keyword_matcher_counts_distinct_overlapping_keywords():
+    matcher = KeywordMatcher({"a": ["task", "create task", "ask"], "b": ["reate", "zzz"]})
+
+    assert matcher.scores("Please CREATE TASK, task task") == {"a": 3, "b": 1}
+    assert matcher.scores("") == {}
+
+
+@pytest.mark.asyncio
+async def test_classify_returns_none_until_index_is_built(router):
+    assert await router.classify("check my inbox") is None
+    await router._build_task
+
+    match = await router.classify("check my inbox")
+
+    assert match.route == "email"
+    assert match.similarity > 0.5
+    assert router.stats()["exemplars"] == 4  # 3 seeds + 1 learned
+
+
+@pytest.mark.asyncio
+async def test_ambiguous_or_unrelated_messages_fall_through(router):
+    await router.build()
+
+    assert await router.classify("hello there") is None
+    assert await router.classify("email about the meeting") is None  # no margin
+    assert (await router.classify("gpu health please")).route == "system"
+
+
+def test_score_ranks_routes_by_top_k_similarity(router):
+    asyncio.run(router.build())
+
+    scored = router.score(_bow("calendar meeting tomorrow"))
+
+    assert [r for r, _ in scored][0] == "calendar"
+    assert scored[0][1] == pytest.approx(1.0, abs=0.01)
+    assert router.score(np.ones(3)) == []  # wrong dimension
+
+
+def test_parse_route_descriptions():
+    prompt = "Classify:\n- email: Gmail, inbox\n- nope: x\n- general: Anything else\n"
+
+    assert parse_route_descriptions(prompt, ["email", "general"]) == {
+        "email": "Gmail, inbox",
+        "general": "Anything else",
+    }
+
+
+@pytest.mark.asyncio
+async def test_router_node_uses_embedding_tier_and_fetches_memories_concurrently(monkeypatch):
+    from langchain_core.messages import HumanMessage
+    from app.services import orchestration_graph as og
+
+    order = []
+
+    async def memories(content):
+        order.append("memories")
+        return [{"type": "note"}]
+
+    async def embedding(content):
+        order.append("classify_start")
+        await asyncio.sleep(0)
+        order.append("classify_end")
+        return ir.IntentMatch(route="calendar", similarity=0.9, margin=0.3)
+
+    async def llm(content):
+        raise AssertionError("LLM tier should not run")
+
+    monkeypatch.setattr(og, "retrieve_memories", memories)
+    monkeypatch.setattr(og, "classify_route_embedding", embedding)
+    monkeypatch.setattr(og, "classify_route_llm", llm)
+
+    out = await og.router_node({"messages": [HumanMessage(content="am I around on thursday")]})
+
+    assert out["route"] == "calendar"
+    assert out["context"]["method"] == "embedding"
+    assert out["memories"] == [{"type": "note"}]
+    assert order == ["classify_start", "memories", "classify_end"]
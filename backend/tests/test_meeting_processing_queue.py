@@ -0,0 +1,131 @@
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import meeting_processing_queue as mpq
+
+
+def _settings(workers):
+    return SimpleNamespace(meeting_processing_workers=workers)
+
+
+def _thread_name():
+    return threading.current_thread().name
+
+
+@pytest.mark.asyncio
+async def test_stage_runs_off_the_event_loop_without_workers(monkeypatch):
+    monkeypatch.setattr(mpq, "get_settings", lambda: _settings(0))
+    try:
+        name = await mpq.run_meeting_stage(_thread_name)
+    finally:
+        mpq.shutdown_meeting_pool()
+    assert name.startswith("meeting-stage")
+
+
+class FakePool:
+    def __init__(self, error):
+        self.error = error
+        self.shutdowns = []
+
+    def submit(self, *args, **kwargs):
+        raise self.error
+
+    def shutdown(self, **kwargs):
+        self.shutdowns.append(kwargs)
+
+
+@pytest.mark.asyncio
+async def test_broken_pool_falls_back_to_thread(monkeypatch):
+    pool = FakePool(mpq.BrokenProcessPool("worker died"))
+    monkeypatch.setattr(mpq, "get_settings", lambda: _settings(2))
+    monkeypatch.setattr(mpq, "_pool", pool)
+    try:
+        name = await mpq.run_meeting_stage(_thread_name)
+        assert mpq._pool is None
+    finally:
+        mpq.shutdown_meeting_pool()
+    assert name.startswith("meeting-stage")
+    # Other meetings' queued stages are not cancelled.
+    assert pool.shutdowns == [{"wait": False}]
+
+
+@pytest.mark.asyncio
+async def test_stage_errors_propagate_and_keep_the_pool(monkeypatch):
+    pool = FakePool(OSError("model file missing"))
+    monkeypatch.setattr(mpq, "get_settings", lambda: _settings(2))
+    monkeypatch.setattr(mpq, "_pool", pool)
+
+    with pytest.raises(OSError, match="model file missing"):
+        await mpq.run_meeting_stage(_thread_name)
+
+    assert mpq._pool is pool
+    assert pool.shutdowns == []
+
+
+@pytest.fixture
+def fake_pipeline(monkeypatch):
+    from app.infrastructure import database
+    from app.services import meeting_processing_pipeline as pipeline
+
+    state = {"running": 0, "peak": 0, "release": asyncio.Event(), "marked": {}}
+
+    async def fake_process(meeting_id, db):
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        try:
+            await state["release"].wait()
+        finally:
+            state["running"] -= 1
+        if meeting_id == "bad":
+            raise RuntimeError("boom")
+        return {"meeting_id": meeting_id, "total_elapsed_ms": 5}
+
+    @asynccontextmanager
+    async def fake_session():
+        yield object()
+
+    async def fake_mark(meeting_id, status):
+        state["marked"][meeting_id] = status
+
+    async def fake_broadcast(data):
+        pass
+
+    monkeypatch.setattr(mpq, "get_settings", lambda: _settings(2))
+    monkeypatch.setattr(pipeline, "process_meeting_recording", fake_process)
+    monkeypatch.setattr(pipeline, "broadcast_processing_progress", fake_broadcast)
+    monkeypatch.setattr(database, "get_session", fake_session)
+    monkeypatch.setattr(mpq.MeetingProcessingQueue, "_mark_meeting", staticmethod(fake_mark))
+    return state
+
+
+@pytest.mark.asyncio
+async def test_queue_bounds_concurrency_dedupes_and_cancels(fake_pipeline):
+    queue = mpq.MeetingProcessingQueue()
+    done = []
+
+    async def on_complete():
+        done.append(True)
+
+    for mid in ("a", "bad", "c"):
+        queue.submit(mid, on_complete=on_complete)
+    assert queue.submit("a")["status"] in ("queued", "running")
+    await asyncio.sleep(0.01)
+    assert fake_pipeline["running"] == 2
+    assert queue.status("c")["status"] == "queued"
+
+    assert queue.cancel("c")
+    fake_pipeline["release"].set()
+    await asyncio.gather(*(j.task for j in queue._jobs.values()), return_exceptions=True)
+
+    assert fake_pipeline["peak"] == 2
+    assert queue.status("a")["status"] == "completed"
+    assert queue.status("a")["total_elapsed_ms"] == 5
+    assert queue.status("bad")["status"] == "failed"
+    assert queue.status("c")["status"] == "cancelled"
+    assert fake_pipeline["marked"] == {"bad": "failed", "c": "cancelled"}
+    assert done == [True]
+    assert not queue.cancel("a")
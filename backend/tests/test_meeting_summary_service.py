@@ -0,0 +1,101 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import meeting_summary_service as mss
+from app.services.meeting_summary_service import MeetingSummaryService, SectionCache
+
+
+class FakeLLM:
+    def __init__(self, fail_reduce=False):
+        self.prompts: list[str] = []
+        self.in_flight = 0
+        self.peak = 0
+        self.fail_reduce = fail_reduce
+
+    async def chat(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.in_flight -= 1
+        if prompt.startswith("Combine"):
+            if self.fail_reduce:
+                raise RuntimeError("reduce timed out")
+            return json.dumps({"summary_text": "all", "key_topics": ["t"], "action_items": [], "decisions": []})
+        if prompt.startswith("Merge"):
+            return json.dumps({"section_summary": "merged", "key_topics": ["m"]})
+        return json.dumps({"section_summary": "s" * 300, "key_topics": ["k"]})
+
+
+def _transcript(sections):
+    return "\n\n".join(f"para {i} " + "x" * 11_000 for i in range(sections))
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    fake = FakeLLM()
+    monkeypatch.setattr(mss, "get_unified_llm_client", lambda: fake)
+    monkeypatch.setattr(mss, "get_settings", lambda: SimpleNamespace(meeting_summary_concurrency=3))
+    return fake
+
+
+@pytest.mark.asyncio
+async def test_map_stage_is_concurrent_and_streams_sections(llm, tmp_path):
+    svc = MeetingSummaryService(cache=SectionCache(tmp_path))
+    events = []
+
+    async def on_progress(event):
+        events.append(event)
+
+    result = await svc.summarize(_transcript(6), "Standup", on_progress=on_progress)
+
+    assert result["summary_text"] == "all"
+    assert llm.peak == 3
+    sections = [e for e in events if "completed" in e]
+    assert [e["completed"] for e in sections] == [1, 2, 3, 4, 5, 6]
+    assert sorted(e["section_index"] for e in sections) == [1, 2, 3, 4, 5, 6]
+    assert events[-1] == {"stage": "reduce", "level": 1, "groups": 1}
+
+
+@pytest.mark.asyncio
+async def test_failed_reduce_rerun_reuses_cached_sections(llm, tmp_path):
+    llm.fail_reduce = True
+    svc = MeetingSummaryService(cache=SectionCache(tmp_path))
+    with pytest.raises(RuntimeError):
+        await svc.summarize(_transcript(4), "Planning")
+    assert len(llm.prompts) == 5
+    assert len(list(tmp_path.glob("*.json"))) == 4
+
+    # A fresh service (e.g. after a restart) reads the sections from disk.
+    llm.fail_reduce = False
+    llm.prompts.clear()
+    events = []
+
+    async def on_progress(event):
+        events.append(event)
+
+    result = await MeetingSummaryService(cache=SectionCache(tmp_path)).summarize(
+        _transcript(4), "Planning", on_progress=on_progress,
+    )
+    assert result["summary_text"] == "all"
+    assert [p.split("\n", 1)[0] for p in llm.prompts] == ["Combine these section summaries into one cohesive meeting summary."]
+    assert all(e["cached"] for e in events if "completed" in e)
+
+
+@pytest.mark.asyncio
+async def test_long_meetings_reduce_hierarchically(llm, tmp_path, monkeypatch):
+    monkeypatch.setattr(mss, "_REDUCE_TOKEN_LIMIT", 250)
+    svc = MeetingSummaryService(cache=SectionCache(tmp_path))
+
+    result = await svc.summarize(_transcript(8), "Offsite")
+
+    merges = [p for p in llm.prompts if p.startswith("Merge")]
+    combine = [p for p in llm.prompts if p.startswith("Combine")]
+    assert result["summary_text"] == "all"
+    assert merges and len(combine) == 1
+    assert combine[0].count("--- Section") < 8
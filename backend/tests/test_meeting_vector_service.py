@@ -16,3 +16,97 @@ async def test_meeting_vector_embedding_uses_shared_client(monkeypatch):
     )
 
     assert await MeetingVectorService().embed_text("hello meeting") == [0.1, 0.2, 0.3]
+
+
+def test_chunk_segments_tracks_span_speakers_and_ids():
+    segments = [
+        {"id": 1, "text": "a" * 1200, "start_time": 0.0, "end_time": 5.0, "speaker": "Ann"},
+        {"id": 2, "text": "b" * 1200, "start_time": 5.0, "end_time": 9.0, "speaker": "Bob"},
+        {"id": 3, "text": "c" * 100, "start_time": 9.0, "end_time": 12.0, "speaker": "Ann"},
+    ]
+    chunks = MeetingVectorService()._chunk_segments(segments, max_tokens=500)
+    assert [c["segment_ids"] for c in chunks] == [[1], [2, 3]]
+    assert (chunks[1]["start"], chunks[1]["end"]) == (5.0, 12.0)
+    assert chunks[1]["speakers"] == ["Bob", "Ann"]
+
+
+@pytest.mark.asyncio
+async def test_embed_segments_batches_embeddings_and_bulk_inserts(monkeypatch):
+    from types import SimpleNamespace
+
+    from app.services import meeting_vector_service as mvs
+
+    batches: list[int] = []
+
+    class FakeClient:
+        async def embed_batch(self, texts):
+            batches.append(len(texts))
+            if any(t.startswith("fail") for t in texts):
+                raise RuntimeError("upstream down")
+            return [[0.1, 0.2, 0.3] for _ in texts]
+
+    class FakeDB:
+        def __init__(self):
+            self.statements = []
+            self.commits = 0
+
+        async def execute(self, stmt):
+            self.statements.append(stmt)
+
+        async def commit(self):
+            self.commits += 1
+
+    monkeypatch.setattr(mvs, "get_llm_client", lambda: FakeClient())
+    monkeypatch.setattr(mvs, "get_settings", lambda: SimpleNamespace(meeting_embed_batch_size=2))
+
+    segments = [
+        {"id": i, "text": ("fail " if i == 4 else "") + "x" * 2000, "start_time": float(i)}
+        for i in range(5)
+    ]
+    db = FakeDB()
+    stored = await MeetingVectorService().embed_segments("m1", segments, db)
+
+    assert sorted(batches) == [1, 2, 2]
+    assert stored == 4
+    # One delete of the old rows, one multi-row insert, one commit.
+    assert len(db.statements) == 2 and db.commits == 1
+    from sqlalchemy.dialects import postgresql
+
+    params = db.statements[1].compile(dialect=postgresql.dialect()).params
+    assert params["id_m0"] == "m1:0" and params["segment_ids_m3"] == [3]
+
+
+@pytest.mark.asyncio
+async def test_per_meeting_search_is_an_exact_scan(monkeypatch):
+    from types import SimpleNamespace
+
+    from app.services import meeting_vector_service as mvs
+
+    class FakeDB:
+        def __init__(self):
+            self.statements = []
+
+        async def execute(self, stmt, params=None):
+            self.statements.append((str(stmt), params))
+            return SimpleNamespace(fetchall=lambda: [])
+
+    service = MeetingVectorService()
+
+    async def embed_text(text):
+        return [0.1, 0.2]
+
+    monkeypatch.setattr(service, "embed_text", embed_text)
+    monkeypatch.setattr(mvs, "get_settings", lambda: SimpleNamespace(meeting_vector_ef_search=40))
+
+    scoped = FakeDB()
+    await service.search_similar("budget", scoped, meeting_id="m1", top_k=5)
+    everywhere = FakeDB()
+    await service.search_similar("budget", everywhere, top_k=5)
+
+    # The filtered query never goes through the HNSW index (or its ef_search).
+    ((sql, params),) = scoped.statements
+    assert "AS MATERIALIZED" in sql and "FROM scoped c" in sql
+    assert params["mid"] == "m1" and params["k"] == 5
+    (set_ef, _), (sql, params) = everywhere.statements
+    assert set_ef == "SET LOCAL hnsw.ef_search = 40"
+    assert "MATERIALIZED" not in sql and "mid" not in params
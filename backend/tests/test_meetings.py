@@ -216,6 +216,33 @@ class TestMeetingSearch:
         assert data["total"] == 0
         assert data["query"] == "nonexistent-query-xyz"
 
+    async def test_hybrid_search_finds_meeting_without_embedded_chunks(self, client):
+        from app.db.models import MeetingTranscriptSegmentModel
+        from app.infrastructure.database import get_session
+
+        create_resp = await client.post("/api/meetings/", json={
+            "title": "Unembedded",
+            "start_time": "2025-01-15T09:00:00Z",
+        })
+        meeting_id = create_resp.json()["id"]
+        async with get_session() as db:
+            db.add(MeetingTranscriptSegmentModel(
+                meeting_id=meeting_id, speaker="Ann", start_time=12.0, end_time=15.0,
+                text="The zebracorn rollout slips to May",
+            ))
+
+        with patch(
+            "app.services.meeting_vector_service.MeetingVectorService.embed_text",
+            new_callable=AsyncMock, return_value=[0.1] * 768,
+        ):
+            resp = await client.get("/api/meeting-search/?q=zebracorn")
+
+        assert resp.status_code == 200
+        hits = [r for r in resp.json()["results"] if r["meeting_id"] == meeting_id]
+        assert [(h["timestamp"], h["speaker"], h["meeting_title"]) for h in hits] == [
+            (12.0, "Ann", "Unembedded"),
+        ]
+
 
 # ============================================================
 # Meeting Speakers
@@ -235,3 +235,96 @@ class TestRouterSafety:
         assert captured["tool_name"] == "memory_vault.write_chunk"
         assert captured["tier"] == "write_local"
         assert captured["arguments"]["source"] == "gmail"
+
+
+class TestIndex:
+    def _svc(self, tmp_path):
+        from app.services.memory_tree.service import MemoryTreeService
+
+        return MemoryTreeService(data_dir=tmp_path)
+
+    def test_writes_append_to_delta_and_survive_reload(self, tmp_path):
+        from app.services.memory_tree.service import MemoryTreeService
+
+        svc = self._svc(tmp_path)
+
+        async def run():
+            await svc.write_chunk("gmail", "quarterly invoice from acme", title="Acme invoice")
+            await svc.write_topic("acme", "acme contract renewal terms", title="Renewal")
+            await svc.write_global_digest("nothing about billing today")
+            index_dir = svc.root / ".index"
+            assert (index_dir / "manifest.json").exists()
+            delta = next(index_dir.glob("delta-*.jsonl")).read_text(encoding="utf-8")
+            assert len(delta.splitlines()) == 3
+
+            fresh = MemoryTreeService(data_dir=tmp_path)
+            hits = await fresh.search("acme")
+            assert {h.title for h in hits} == {"Acme invoice", "Renewal"}
+            # Title match outranks a body-only match.
+            assert hits[0].title == "Acme invoice"
+            assert hits[0].level == 0 and hits[0].source == "gmail"
+            assert "acme" in hits[0].snippet
+
+        asyncio.run(run())
+
+    def test_filters_match_list_entries_semantics(self, tmp_path):
+        svc = self._svc(tmp_path)
+
+        async def run():
+            await svc.write_chunk("gmail", "tax invoice arrived", title="g")
+            await svc.write_chunk("slack", "tax chatter", title="s")
+            await svc.write_topic("acme", "acme tax terms")
+            await svc.write_global_digest("tax filings")
+            only_gmail = await svc.search("tax", scope="source", source="gmail")
+            assert [h.title for h in only_gmail] == ["g"]
+            # Outside an explicit scope, source only narrows the sources tree.
+            mixed = await svc.search("tax", source="gmail")
+            assert sorted(h.title for h in mixed) == ["Daily digest", "acme", "g"]
+            assert await svc.search("tax", scope="topic", entity="other") == []
+
+        asyncio.run(run())
+
+    def test_merge_rebuild_and_deleted_files(self, tmp_path, monkeypatch):
+        from app.services.memory_tree import index as index_mod
+
+        monkeypatch.setattr(index_mod, "MERGE_THRESHOLD", 3)
+        svc = self._svc(tmp_path)
+
+        async def run():
+            paths = []
+            for i in range(5):
+                paths += await svc.write_chunk("notes", f"entry {i} mentions widgets", title=f"n{i}")
+            stats = svc._index.stats()
+            assert stats["base_docs"] >= 3 and stats["generation"] >= 2
+            assert len(list((svc.root / ".index").glob("base-*.postings.npy"))) == 1
+            assert len(await svc.search("widgets", limit=10)) == 5
+
+            paths[0].unlink()
+            hits = await svc.search("widgets", limit=10)
+            assert len(hits) == 4 and paths[0] not in {h.path for h in hits}
+            assert svc._index.stats()["deleted"] == 1
+
+            # Files added behind the service's back are picked up by reindex.
+            from app.services.memory_tree.vault import write_chunk
+
+            write_chunk(svc.root, source="notes", level=0, title="manual", body="widgets by hand")
+            assert len(await svc.search("widgets", limit=10)) == 4
+            assert (await svc.reindex())["indexed"] == 5
+            assert len(await svc.search("widgets", limit=10)) == 5
+
+        asyncio.run(run())
+
+    def test_search_falls_back_to_scan_when_index_breaks(self, tmp_path, monkeypatch):
+        svc = self._svc(tmp_path)
+
+        async def run():
+            await svc.write_chunk("gmail", "invoice body", title="Invoice")
+
+            def broken(*args, **kwargs):
+                raise OSError("index unreadable")
+
+            monkeypatch.setattr(svc._index, "search", broken)
+            hits = await svc.search("invoice")
+            assert [h.title for h in hits] == ["Invoice"]
+
+        asyncio.run(run())
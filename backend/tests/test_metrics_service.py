@@ -0,0 +1,143 @@
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from app.infrastructure import database
+from app.services import metrics_service as ms
+from app.services.metrics_service import MetricsService
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = {"t": 1_800_000_000.0}
+    monkeypatch.setattr(ms.time, "time", lambda: now["t"])
+    return now
+
+
+def test_summary_quantiles_track_exact_percentiles(clock):
+    svc = MetricsService()
+    rng = np.random.default_rng(7)
+    values = rng.lognormal(mean=5.0, sigma=1.0, size=20_000)
+    for v in values:
+        svc.record("llm_response_time", float(v))
+
+    s = svc.get_summary(hours=1)["metrics"]["llm_response_time"]
+    assert s["count"] == 20_000
+    assert s["avg"] == pytest.approx(values.mean())
+    assert s["min"] == pytest.approx(values.min())
+    assert s["max"] == pytest.approx(values.max())
+    for q, key in ((50, "p50"), (95, "p95"), (99, "p99")):
+        assert s[key] == pytest.approx(np.percentile(values, q), rel=0.05)
+
+
+def test_summary_aggregates_tagsets_and_reports_each(clock):
+    svc = MetricsService()
+    for _ in range(3):
+        svc.record("llm_response_time", 100.0, {"provider": "vllm"})
+    svc.record("llm_response_time", 900.0, {"provider": "kimi"})
+
+    s = svc.get_summary()["metrics"]["llm_response_time"]
+    assert s["count"] == 4
+    assert s["max"] == 900.0
+    assert s["tags"]["provider=vllm"]["count"] == 3
+    assert s["tags"]["provider=kimi"]["p50"] == pytest.approx(900.0)
+
+
+def test_summary_window_drops_old_hours(clock):
+    svc = MetricsService()
+    svc.record("job_ms", 10.0)
+    clock["t"] += 5 * 3600
+    svc.record("job_ms", 20.0)
+
+    assert svc.get_summary(hours=1)["metrics"]["job_ms"]["count"] == 1
+    assert svc.get_summary(hours=24)["metrics"]["job_ms"]["count"] == 2
+
+    # A slot is reused once its hour falls out of the retained window.
+    clock["t"] += ms.HOURS_RETAINED * 3600
+    svc.record("job_ms", 30.0)
+    assert svc.get_summary(hours=24)["metrics"]["job_ms"]["count"] == 1
+
+
+def test_one_hour_summary_still_covers_the_last_60_minutes(clock):
+    svc = MetricsService()
+    clock["t"] -= 60  # HH:59
+    svc.record("job_ms", 10.0)
+    clock["t"] += 120  # HH+1:01
+
+    assert svc.get_summary(hours=1)["metrics"]["job_ms"]["count"] == 1
+    last_complete = int(clock["t"] // 3600) - 1
+    assert svc.get_summary(hours=1, last_hour=last_complete)["metrics"]["job_ms"]["count"] == 1
+    assert "job_ms" not in svc.get_summary(hours=1, last_hour=last_complete + 1)["metrics"]
+
+
+def test_timeseries_buckets_across_tagsets(clock):
+    svc = MetricsService()
+    start = clock["t"] - (clock["t"] % 300)
+    for i, v in enumerate([1.0, 3.0, 10.0]):
+        clock["t"] = start + i * 100  # first two in one 5-min bucket
+        svc.record("llm_queue_wait_ms", v, {"provider": "vllm" if i else "kimi"})
+    clock["t"] = start + 400
+    svc.record("llm_queue_wait_ms", 7.0, {"provider": "vllm"})
+
+    data = svc.get_timeseries("llm_queue_wait_ms", hours=1, resolution_minutes=5)
+    assert [(d["count"], d["avg"], d["max"]) for d in data] == [
+        (3, pytest.approx(14.0 / 3), 10.0),
+        (1, 7.0, 7.0),
+    ]
+    only_kimi = svc.get_timeseries("llm_queue_wait_ms", tags={"provider": "kimi"})
+    assert [d["count"] for d in only_kimi] == [1]
+    assert svc.get_timeseries("missing") == []
+
+
+def test_ring_buffer_keeps_latest_samples(clock):
+    svc = MetricsService(buffer_size=4)
+    for i in range(10):
+        clock["t"] += 1
+        svc.record("x", float(i))
+    data = svc.get_timeseries("x", hours=1, resolution_minutes=60)
+    assert sum(d["count"] for d in data) == 4
+    # Hourly sketches still cover every sample.
+    assert svc.get_summary(hours=1)["metrics"]["x"]["count"] == 10
+
+
+def test_increment_counts_totals_and_tagsets():
+    svc = MetricsService()
+    svc.increment("llm_requests", tags={"provider": "vllm", "success": "True"})
+    svc.increment("llm_requests", tags={"provider": "vllm", "success": "True"})
+    svc.increment("job_ok", 3)
+
+    summary = svc.get_summary()
+    assert summary["counters"] == {"llm_requests": 2, "job_ok": 3}
+    assert summary["counters_by_tags"]["llm_requests"] == {"provider=vllm,success=True": 2}
+
+
+@pytest.mark.asyncio
+async def test_hourly_snapshot_covers_the_hour_that_just_ended(clock, monkeypatch):
+    statements = []
+
+    class FakeSession:
+        async def execute(self, stmt, params=None):
+            statements.append((str(stmt), params))
+
+    @asynccontextmanager
+    async def get_session():
+        yield FakeSession()
+
+    monkeypatch.setattr(database, "get_session", get_session)
+    hour_start = clock["t"] - clock["t"] % 3600
+    svc = MetricsService()
+    clock["t"] = hour_start + 3540  # HH:59
+    for v in (10.0, 20.0, 30.0):
+        svc.record("job_ms", v)
+    clock["t"] = hour_start + 3600  # HH+1:00, when the cron fires
+    svc.record("job_ms", 99.0)
+
+    await svc.persist_snapshot()
+
+    insert = next(params for sql, params in statements if sql.startswith("INSERT"))
+    snapshot = json.loads(insert["data"])["metrics"]["job_ms"]
+    assert (snapshot["count"], snapshot["max"]) == (3, 30.0)
+    assert insert["ts"] == datetime.utcfromtimestamp(hour_start + 3600)
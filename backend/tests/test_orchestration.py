@@ -72,6 +72,30 @@ class TestClassifyRouteKeywords:
         _, score = classify_route_keywords("sprint task project backlog velocity")
         assert score >= KEYWORD_CONFIDENCE_THRESHOLD
 
+    def test_matches_substring_scan(self):
+        """The Aho-Corasick matcher scores exactly like a per-keyword scan."""
+        import random
+        from app.services.orchestration_graph import ROUTE_KEYWORDS
+
+        def scan(message):
+            msg = message.lower()
+            scores = {}
+            for route, keywords in ROUTE_KEYWORDS.items():
+                score = sum(1 for kw in keywords if kw in msg)
+                if score > 0:
+                    scores[route] = score
+            if not scores:
+                return "general", 0
+            best = max(scores, key=scores.get)
+            return best, scores[best]
+
+        rng = random.Random(3)
+        vocab = [kw for kws in ROUTE_KEYWORDS.values() for kw in kws] + ["the", "my", "x", "s"]
+        for _ in range(500):
+            words = [rng.choice(vocab) for _ in range(rng.randrange(0, 8))]
+            message = rng.choice([" ", "", "-"]).join(words).upper()
+            assert classify_route_keywords(message) == scan(message)
+
 
 class TestRouteByClassification:
     """Test the conditional edge router."""
@@ -2261,6 +2261,110 @@ class TestLocalRealtimeHandler:
         assert tool_end["tool_name"] == "camera"
         assert tool_end["status"] == "failed"
 
+    @staticmethod
+    def _speech_handler(deps, monkeypatch, voice="en-US-JennyNeural"):
+        from app.infrastructure.ttl_cache import TTLCache
+        from app.services import tts_service
+        from app.services.reachy_realtime import local_handler
+        from app.services.reachy_realtime.local_handler import LocalRealtimeHandler
+
+        log: list[str] = []
+
+        class FakeTTS:
+            def __init__(self):
+                self.voice_sets: list[str] = []
+                self.gate = None
+
+            async def set_piper_voice(self, voice):
+                self.voice_sets.append(voice)
+
+            async def synthesize_with_meta(self, text, voice_override=None):
+                log.append(f"synth:{text}")
+                if self.gate is not None:
+                    await self.gate.wait()
+                await asyncio.sleep(0)
+                return text.encode(), {}
+
+        tts = FakeTTS()
+        # 1 s of audio per sentence = 20 audio.delta frames.
+        monkeypatch.setattr(
+            local_handler, "_wav_bytes_to_pcm16",
+            lambda wav, rate: b"\x01\x00" * local_handler.OUTPUT_RATE,
+        )
+        monkeypatch.setattr(
+            local_handler, "_PCM_CACHE", TTLCache("test", max_entries=8, ttl_s=60),
+        )
+        monkeypatch.setattr(tts_service, "get_tts_service", lambda: tts)
+
+        handler = LocalRealtimeHandler(
+            model="Qwen3-32B-AWQ", voice=voice, profile_id="assistant", deps=deps,
+        )
+        handler.voice = voice
+
+        async def writer(event: dict) -> None:
+            if event.get("type") == "audio.delta":
+                log.append("audio")
+
+        handler._client_writer = writer
+        return handler, tts, log
+
+    @pytest.mark.asyncio
+    async def test_local_tts_synthesizes_next_sentence_during_playback(self, deps, monkeypatch):
+        handler, _tts, log = self._speech_handler(deps, monkeypatch)
+
+        await handler._speak_chunk("First sentence.")
+        await handler._speak_chunk("Second sentence.")
+        await handler._finish_speech()
+
+        second = log.index("synth:Second sentence.")
+        assert log.index("audio") < second
+        assert log[second + 1:].count("audio") > 20  # rest of sentence 1 + sentence 2
+        assert log.count("audio") == 40
+        assert handler._speech_task is None
+
+    @pytest.mark.asyncio
+    async def test_local_tts_caches_pcm_and_sets_piper_voice_once(self, deps, monkeypatch):
+        handler, tts, log = self._speech_handler(deps, monkeypatch, voice="en_US-lessac-medium")
+
+        for _ in range(2):
+            await handler._speak_chunk("Got it.")
+            await handler._speak_chunk("On it now.")
+            await handler._finish_speech()
+
+        assert [e for e in log if e.startswith("synth:")] == ["synth:Got it.", "synth:On it now."]
+        assert tts.voice_sets == ["en_US-lessac-medium"]
+        assert log.count("audio") == 80
+
+    @pytest.mark.asyncio
+    async def test_local_tts_barge_in_cancels_pending_synthesis(self, deps, monkeypatch):
+        handler, tts, log = self._speech_handler(deps, monkeypatch)
+        tts.gate = asyncio.Event()
+
+        await handler._speak_chunk("This will never be heard.")
+        await asyncio.sleep(0.01)
+        handler._cancel_response.set()
+        await asyncio.wait_for(handler._finish_speech(), timeout=1.0)
+
+        assert log == ["synth:This will never be heard."]
+        await handler._speak_chunk("Dropped while cancelled.")
+        assert handler._speech_task is None
+
+    def test_wav_decode_resamples_with_polyphase_filter(self):
+        import numpy as np
+        from app.services.reachy_realtime.local_handler import _resample_polyphase
+
+        tone = np.sin(2 * np.pi * 440.0 * np.arange(22050) / 22050.0).astype(np.float32)
+        out = _resample_polyphase(tone, 22050, 24000)
+        expected = np.sin(2 * np.pi * 440.0 * np.arange(24000) / 24000.0)
+        assert out.size == 24000
+        assert np.max(np.abs(out[200:-200] - expected[200:-200])) < 0.02
+
+        # Content above the target Nyquist is filtered out instead of aliasing.
+        hiss = np.sin(2 * np.pi * 18000.0 * np.arange(48000) / 48000.0).astype(np.float32)
+        folded = _resample_polyphase(hiss, 48000, 24000)
+        assert folded.size == 24000
+        assert np.sqrt(np.mean(folded[200:-200] ** 2)) < 0.05
+
 
 # ============================================================
 # router — GET /config, PUT /config, GET /profiles
@@ -0,0 +1,128 @@
+import random
+
+from app.services.speaker_alignment import UNKNOWN, align_segments, assign_speakers
+
+
+def _brute_force(starts, ends, turns):
+    """Reference: per-speaker overlap summed over every turn."""
+    out = []
+    for s, e in zip(starts, ends):
+        totals = {}
+        for t in turns:
+            ov = min(e, t["end"]) - max(s, t["start"])
+            if ov > 0:
+                totals[t["speaker"]] = totals.get(t["speaker"], 0.0) + ov
+        if not totals:
+            out.append(UNKNOWN)
+            continue
+        best = max(sorted(totals), key=lambda k: totals[k])
+        out.append(best if e - s <= 0 or totals[best] / (e - s) > 0.5 else UNKNOWN)
+    return out
+
+
+def test_assign_matches_brute_force_on_overlapping_turns():
+    rng = random.Random(7)
+    turns, t = [], 0.0
+    for _ in range(400):
+        start = t + rng.uniform(-1.0, 0.5)  # some overlapping speech
+        end = start + rng.uniform(0.2, 6.0)
+        turns.append({"start": start, "end": end, "speaker": f"SPEAKER_{rng.randrange(4):02d}"})
+        t = end
+    turns.append({"start": 100.0, "end": 900.0, "speaker": "SPEAKER_09"})  # one very long turn
+    rng.shuffle(turns)
+    starts = [rng.uniform(0, t) for _ in range(500)]
+    ends = [s + rng.uniform(0.0, 8.0) for s in starts]
+
+    assert assign_speakers(starts, ends, turns) == _brute_force(starts, ends, turns)
+
+
+def test_assign_sums_split_turns_of_one_speaker():
+    turns = [
+        {"start": 0.0, "end": 1.5, "speaker": "A"},
+        {"start": 1.5, "end": 2.5, "speaker": "B"},
+        {"start": 2.5, "end": 4.0, "speaker": "A"},
+    ]
+    # The single longest turn is only 1.5s, but A covers 3 of 4 seconds.
+    assert assign_speakers([0.0, 5.0], [4.0, 6.0], turns) == ["A", UNKNOWN]
+    assert assign_speakers([], [], turns) == []
+    assert assign_speakers([0.0], [1.0], []) == [UNKNOWN]
+
+
+def test_align_splits_segments_at_speaker_changes_using_words():
+    turns = [
+        {"start": 0.0, "end": 2.0, "speaker": "A"},
+        {"start": 2.0, "end": 5.0, "speaker": "B"},
+    ]
+    words = [
+        {"start": 0.0, "end": 0.5, "word": " Are"},
+        {"start": 0.5, "end": 1.0, "word": " we"},
+        {"start": 1.0, "end": 1.8, "word": " ready?"},
+        {"start": 2.1, "end": 2.6, "word": " Yes,"},
+        {"start": 2.6, "end": 3.0, "word": " ship"},
+        {"start": 3.0, "end": 3.4, "word": " it."},
+    ]
+    segments = [
+        {"start": 0.0, "end": 3.4, "text": "Are we ready? Yes, ship it.", "confidence": -0.2, "words": words},
+        {"start": 3.5, "end": 4.5, "text": "Now.", "confidence": -0.1},
+    ]
+
+    aligned = align_segments(turns, segments)
+
+    assert [(s["speaker"], s["text"], s["start"], s["end"]) for s in aligned] == [
+        ("A", "Are we ready?", 0.0, 1.8),
+        ("B", "Yes, ship it.", 2.1, 3.4),
+        ("B", "Now.", 3.5, 4.5),
+    ]
+    assert all("words" not in s for s in aligned)
+    assert aligned[0]["confidence"] == -0.2
+
+
+def test_align_folds_single_word_blips_into_neighbours():
+    turns = [
+        {"start": 0.0, "end": 1.0, "speaker": "A"},
+        {"start": 1.0, "end": 1.3, "speaker": "B"},
+        {"start": 1.3, "end": 3.0, "speaker": "A"},
+    ]
+    words = [
+        {"start": 0.0, "end": 0.5, "word": " one"},
+        {"start": 0.5, "end": 1.0, "word": " two"},
+        {"start": 1.0, "end": 1.3, "word": " three"},
+        {"start": 1.4, "end": 2.0, "word": " four"},
+    ]
+    seg = {"start": 0.0, "end": 2.0, "text": "one two three four", "confidence": None, "words": words}
+
+    aligned = align_segments(turns, [seg])
+
+    assert [(s["speaker"], s["text"]) for s in aligned] == [("A", "one two three four")]
+
+
+def test_words_do_not_bypass_the_coverage_rule():
+    turns = [{"start": 0.0, "end": 1.0, "speaker": "A"}]
+    words = [{"start": float(k), "end": k + 1.0, "word": f" w{k}"} for k in range(10)]
+    seg = {"start": 0.0, "end": 10.0, "text": "ten words", "confidence": None}
+
+    assert align_segments(turns, [seg])[0]["speaker"] == UNKNOWN
+    assert align_segments(turns, [{**seg, "words": words}])[0]["speaker"] == UNKNOWN
+
+
+def test_split_parts_are_checked_for_coverage_individually():
+    turns = [
+        {"start": 0.0, "end": 2.0, "speaker": "A"},
+        {"start": 2.0, "end": 2.6, "speaker": "B"},
+        {"start": 5.0, "end": 5.4, "speaker": "B"},
+    ]
+    words = [
+        {"start": 0.0, "end": 1.0, "word": " Ready"},
+        {"start": 1.0, "end": 2.0, "word": " now?"},
+        {"start": 2.0, "end": 2.5, "word": " Well,"},
+        {"start": 2.5, "end": 4.0, "word": " maybe"},
+        {"start": 4.0, "end": 6.0, "word": " later."},
+    ]
+    seg = {"start": 0.0, "end": 6.0, "text": "Ready now? Well, maybe later.", "confidence": None, "words": words}
+
+    aligned = align_segments(turns, [seg])
+
+    # B's turns cover 1.0s of the 4.0s part "Well, maybe later."
+    assert [(s["speaker"], s["text"]) for s in aligned] == [
+        ("A", "Ready now?"), (UNKNOWN, "Well, maybe later."),
+    ]
@@ -0,0 +1,133 @@
+import pytest
+
+from app.services import vault_indexer_service as vis
+from app.services.vault_indexer_service import VaultIndexerService
+
+
+def _write(root, rel, text):
+    fp = root / rel
+    fp.parent.mkdir(parents=True, exist_ok=True)
+    fp.write_text(text, encoding="utf-8")
+    return fp
+
+
+def test_prepare_file_skips_unchanged_and_chunks_changed(tmp_path):
+    fp = _write(tmp_path, "30_Efforts/plan.md", "---\ntags: [a]\n---\n# Goal\nShip it\n## Next\nTest it\n")
+    pf = vis._prepare_file(fp, "30_Efforts/plan.md", None, False)
+    assert pf is not None
+    assert pf.partition == "projects"
+    assert pf.tags == ["a"]
+    assert [c.heading_path for c in pf.chunks] == ["Goal", "Goal > Next"]
+    assert [c.idx for c in pf.chunks] == [0, 1]
+
+    stored = pf.file_hash[:16] + "0" * 16
+    assert vis._prepare_file(fp, "30_Efforts/plan.md", stored, False) is None
+    assert vis._prepare_file(fp, "30_Efforts/plan.md", stored, True) is not None
+
+
+def test_chunk_id_is_stable_per_path_and_index():
+    assert vis._chunk_id("a.md", 3) == vis._chunk_id("a.md", 3)
+    assert vis._chunk_id("a.md", 3) != vis._chunk_id("b.md", 3)
+    assert len(vis._chunk_id("a.md", 3)) <= 64
+
+
+@pytest.mark.asyncio
+async def test_reindex_embeds_in_batches_and_writes_once_per_window(tmp_path, monkeypatch):
+    for i in range(5):
+        _write(tmp_path, f"10_Atlas/note{i}.md", f"# Note {i}\nbody {i}\n")
+
+    batches: list[int] = []
+
+    class FakeClient:
+        async def embed_batch(self, texts, **kwargs):
+            batches.append(len(texts))
+            return [[0.5] * 8 for _ in texts]
+
+    monkeypatch.setattr(vis, "get_llm_client", lambda: FakeClient())
+
+    svc = VaultIndexerService()
+    svc._root = tmp_path
+    svc._embed_batch_size = 2
+    svc._embed_concurrency = 2
+
+    written: list[list] = []
+
+    async def fake_hashes():
+        return {"10_Atlas/gone.md": "x" * 32}
+
+    async def fake_write(files):
+        written.append(files)
+        return sum(len(pf.chunks) for pf in files)
+
+    swept: list[set] = []
+
+    async def fake_sweep(db_paths, live_paths, truncated):
+        swept.append(db_paths - live_paths)
+        return len(db_paths - live_paths)
+
+    monkeypatch.setattr(svc, "_load_file_hashes", fake_hashes)
+    monkeypatch.setattr(svc, "_write_files", fake_write)
+    monkeypatch.setattr(svc, "_sweep_orphans", fake_sweep)
+
+    result = await svc.reindex(force=True)
+
+    assert result["files_changed"] == 5
+    assert result["chunks_written"] == 5
+    assert result["chunks_deleted"] == 1
+    assert sum(batches) == 5
+    assert max(batches) <= 2
+    assert all(len(pf.embeddings[0]) == vis._EMBED_DIM for files in written for pf in files)
+    assert swept == [{"10_Atlas/gone.md"}]
+    assert svc.progress()["running"] is False
+    assert svc.progress()["chunks_embedded"] == 5
+
+
+@pytest.mark.asyncio
+async def test_index_paths_reuses_embeddings_of_unchanged_chunks(tmp_path, monkeypatch):
+    _write(tmp_path, "_Inbox/idea.md", "# Keep\nsame text\n# Edit\nnew text\n")
+
+    embedded: list[str] = []
+
+    class FakeClient:
+        async def embed_batch(self, texts, **kwargs):
+            embedded.extend(texts)
+            return [[0.1] * vis._EMBED_DIM for _ in texts]
+
+    monkeypatch.setattr(vis, "get_llm_client", lambda: FakeClient())
+
+    svc = VaultIndexerService()
+    svc._root = tmp_path
+    kept_hash = vis._sha256_bytes(b"same text")[:16]
+    stored = [0.9] * vis._EMBED_DIM
+
+    async def fake_hashes(paths=None):
+        return {"_Inbox/idea.md": "0" * 32}
+
+    async def fake_reuse(paths):
+        assert paths == ["_Inbox/idea.md"]
+        return {("_Inbox/idea.md", kept_hash): stored}
+
+    written: list = []
+
+    async def fake_write(files):
+        written.extend(files)
+        return sum(len(pf.chunks) for pf in files)
+
+    deleted: list = []
+
+    async def fake_delete(paths):
+        deleted.extend(paths)
+        return len(list(paths))
+
+    monkeypatch.setattr(svc, "_load_file_hashes", fake_hashes)
+    monkeypatch.setattr(svc, "_load_chunk_embeddings", fake_reuse)
+    monkeypatch.setattr(svc, "_write_files", fake_write)
+    monkeypatch.setattr(svc, "_delete_paths", fake_delete)
+
+    result = await svc.index_paths(["_Inbox/idea.md", "_Inbox/gone.md", ".obsidian/x.md", "a.png"])
+
+    assert embedded == ["new text"]
+    assert result["chunks_reused"] == 1
+    assert result["chunks_written"] == 2
+    assert written[0].embeddings[0] == stored
+    assert deleted == ["_Inbox/gone.md"]
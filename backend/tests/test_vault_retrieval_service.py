@@ -0,0 +1,82 @@
+import pytest
+
+from app.services import vault_retrieval_service as vrs
+from app.services.vault_retrieval_service import VaultRetrievalService
+
+
+@pytest.mark.asyncio
+async def test_query_embedding_cached_by_normalized_text(monkeypatch):
+    calls: list[str] = []
+
+    async def fake_embed(text):
+        calls.append(text)
+        return [0.1] * 1024
+
+    monkeypatch.setattr(vrs, "_embed_query", fake_embed)
+    svc = VaultRetrievalService()
+
+    first = await svc._cached_query_embedding("What did I do  Monday?")
+    second = await svc._cached_query_embedding("what did i do monday?")
+
+    assert first == second
+    assert calls == ["What did I do  Monday?"]
+    assert svc.cache_stats()["query_embeddings"]["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_search_results_cached_until_invalidated(monkeypatch):
+    svc = VaultRetrievalService()
+    runs: list[tuple] = []
+
+    async def fake_uncached(query, *, partitions, top_k, per_side_k):
+        runs.append((query, partitions, top_k))
+        return {"query": query, "hits": [{"id": "a"}], "dense_enabled": True}
+
+    monkeypatch.setattr(svc, "_search_uncached", fake_uncached)
+
+    r1 = await svc.search("Weekly plan", partitions=["journal", "projects"], top_k=5)
+    r1["hits"].append({"id": "mutated"})
+    r2 = await svc.search("weekly plan", partitions=["projects", "journal"], top_k=5)
+    assert len(runs) == 1
+    assert r2["hits"] == [{"id": "a"}]
+    assert r2["query"] == "weekly plan"
+
+    await svc.search("weekly plan", partitions=["projects", "journal"], top_k=3)
+    assert len(runs) == 2
+
+    svc.invalidate_results()
+    await svc.search("weekly plan", partitions=["journal", "projects"], top_k=5)
+    assert len(runs) == 3
+
+
+@pytest.mark.asyncio
+async def test_bm25_only_results_are_not_cached(monkeypatch):
+    svc = VaultRetrievalService()
+    runs: list[str] = []
+
+    async def fake_uncached(query, *, partitions, top_k, per_side_k):
+        runs.append(query)
+        return {"query": query, "hits": [], "dense_enabled": False}
+
+    monkeypatch.setattr(svc, "_search_uncached", fake_uncached)
+    await svc.search("x")
+    await svc.search("x")
+    assert runs == ["x", "x"]
+
+
+@pytest.mark.asyncio
+async def test_search_overlapping_an_index_write_is_not_cached(monkeypatch):
+    svc = VaultRetrievalService()
+    runs: list[str] = []
+
+    async def fake_uncached(query, *, partitions, top_k, per_side_k):
+        runs.append(query)
+        if len(runs) == 1:
+            svc.invalidate_results()  # the indexer writes mid-search
+        return {"query": query, "hits": [], "dense_enabled": True}
+
+    monkeypatch.setattr(svc, "_search_uncached", fake_uncached)
+    await svc.search("plan")
+    await svc.search("plan")
+    await svc.search("plan")
+    assert runs == ["plan", "plan"]
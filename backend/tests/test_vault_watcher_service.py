@@ -0,0 +1,79 @@
+import pytest
+
+from app.services import vault_watcher_service as vws
+from app.services.vault_watcher_service import VaultWatcherService
+
+
+def _watcher(tmp_path, **kwargs):
+    svc = VaultWatcherService(**kwargs)
+    svc._root = tmp_path
+    return svc
+
+
+def test_notify_collapses_events_per_markdown_path(tmp_path, monkeypatch):
+    svc = _watcher(tmp_path)
+    svc._notify(str(tmp_path / "10_Atlas" / "a.md"))
+    svc._notify(str(tmp_path / "10_Atlas" / "a.md"))
+    svc._notify(str(tmp_path / "10_Atlas" / "img.png"))
+    svc._notify("/somewhere/else/b.md")
+
+    assert svc._pending == {"10_Atlas/a.md"}
+    assert svc._events_seen == 2
+    assert 0 < svc._flush_delay() <= svc._debounce_s
+
+
+@pytest.mark.asyncio
+async def test_flush_hands_batch_to_indexer(tmp_path, monkeypatch):
+    svc = _watcher(tmp_path, debounce_s=0.0)
+    calls: list[set] = []
+
+    class FakeIndexer:
+        async def index_paths(self, paths):
+            calls.append(set(paths))
+            return {"status": "ok", "files_changed": len(paths)}
+
+    monkeypatch.setattr(
+        "app.services.vault_indexer_service.get_vault_indexer", lambda: FakeIndexer()
+    )
+    svc._notify(str(tmp_path / "a.md"))
+    svc._notify(str(tmp_path / "b.md"))
+
+    assert svc._flush_delay() == 0.0
+    result = await svc.flush()
+
+    assert calls == [{"a.md", "b.md"}]
+    assert result["files_changed"] == 2
+    assert svc._pending == set()
+    assert svc._flush_delay() is None
+
+
+def test_reconcile_always_due_without_watcher(tmp_path):
+    svc = _watcher(tmp_path)
+    svc.mark_reconciled()
+    assert svc.reconcile_due() is True
+
+
+@pytest.mark.asyncio
+async def test_running_watcher_reconciles_on_schedule_or_after_failed_flush(tmp_path, monkeypatch):
+    svc = _watcher(tmp_path)
+    now = [1000.0]
+    monkeypatch.setattr(vws.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(VaultWatcherService, "running", property(lambda self: True))
+
+    svc.mark_reconciled()
+    now[0] += svc._reconcile_s - 1
+    assert svc.reconcile_due() is False
+    now[0] += 1
+    assert svc.reconcile_due() is True
+
+    class DeadIndexer:
+        async def index_paths(self, paths):
+            raise ConnectionError("db down")
+
+    monkeypatch.setattr(
+        "app.services.vault_indexer_service.get_vault_indexer", lambda: DeadIndexer()
+    )
+    svc.mark_reconciled()
+    svc._notify(str(tmp_path / "a.md"))
+    assert await svc.flush() is None
+    assert svc.reconcile_due() is True
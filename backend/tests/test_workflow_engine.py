@@ -0,0 +1,232 @@
+import asyncio
+import json
+
+import pytest
+
+from app.services import workflow_engine
+from app.services.workflow_engine import (
+    DAGExecutor,
+    StateManager,
+    StepHandler,
+    WorkflowDefinition,
+    critical_path,
+)
+from app.services.workflow_history import execution_row
+
+
+class SleepHandler(StepHandler):
+    """Sleeps ``config.sleep`` seconds and records start/finish order."""
+
+    def __init__(self):
+        self.events = []
+        self.running = 0
+        self.peak = 0
+
+    async def execute(self, step, context):
+        self.events.append(("start", step["id"]))
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(step["config"]["sleep"])
+        finally:
+            self.running -= 1
+        self.events.append(("end", step["id"]))
+        return {"output": step["id"], "status": "completed"}
+
+
+def _workflow(*steps):
+    return WorkflowDefinition({
+        "name": "wf",
+        "steps": [
+            {"id": sid, "type": "sleep", "config": {"sleep": sleep}, "depends_on": deps}
+            for sid, sleep, deps in steps
+        ],
+    })
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    h = SleepHandler()
+    monkeypatch.setitem(workflow_engine.STEP_HANDLERS, "sleep", h)
+    return h
+
+
+@pytest.mark.asyncio
+async def test_step_starts_when_its_own_dependencies_finish(handler, tmp_path):
+    # Waves would be [slow, fast], [after_fast, after_slow]: after_fast would
+    # wait for slow. Eagerly it runs alongside slow.
+    wf = _workflow(
+        ("slow", 0.2, []),
+        ("fast", 0.01, []),
+        ("after_fast", 0.05, ["fast"]),
+        ("after_slow", 0.01, ["slow"]),
+    )
+    executor = DAGExecutor(StateManager(str(tmp_path)))
+
+    state = await executor.execute_workflow(wf)
+
+    assert state["status"] == "completed"
+    ev = handler.events
+    assert ev.index(("end", "after_fast")) < ev.index(("end", "slow"))
+    timing = state["timing"]
+    assert timing["critical_path"] == ["slow", "after_slow"]
+    assert timing["wall_ms"] < 200 + 50  # ~critical path, not 200 + 50 waves
+    assert timing["critical_path_ms"] <= timing["wall_ms"]
+
+
+@pytest.mark.asyncio
+async def test_per_type_concurrency_limit(handler, tmp_path):
+    wf = _workflow(*[(f"s{i}", 0.02, []) for i in range(6)])
+    executor = DAGExecutor(StateManager(str(tmp_path)), concurrency={"sleep": 2})
+
+    state = await executor.execute_workflow(wf)
+
+    assert state["status"] == "completed"
+    assert handler.peak == 2
+
+
+@pytest.mark.asyncio
+async def test_raising_step_stops_new_launches(monkeypatch, handler, tmp_path):
+    original = DAGExecutor._execute_step
+
+    async def execute_step(self, step_def, context, state):
+        if step_def["id"] == "bad":
+            raise RuntimeError("boom")
+        return await original(self, step_def, context, state)
+
+    monkeypatch.setattr(DAGExecutor, "_execute_step", execute_step)
+    wf = _workflow(("bad", 0.0, []), ("slow", 0.05, []), ("child", 0.0, ["slow"]))
+
+    state = await DAGExecutor(StateManager(str(tmp_path))).execute_workflow(wf)
+
+    assert state["status"] == "failed"
+    assert state["error"] == "Step 'bad' failed: boom"
+    assert ("end", "slow") in handler.events  # in-flight step finished
+    assert ("start", "child") not in handler.events
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_journal_replays_over_snapshot(tmp_path):
+    sm = StateManager(str(tmp_path))
+    sm.save_state("e1", {"workflow_id": "wf", "steps": {}, "status": "running"})
+    sm.append_checkpoint("e1", [
+        StateManager.encode_checkpoint("a", {"status": "failed"}),
+        StateManager.encode_checkpoint("a", {"status": "completed"}),
+    ])
+    with open(tmp_path / "executions" / "e1.jsonl", "a") as f:
+        f.write('{"step_id": "b", "res')  # torn write
+
+    state = sm.load_state("e1")
+
+    assert state["steps"] == {"a": {"status": "completed"}}
+    assert [s["workflow_id"] for s in await sm.get_active_executions()] == ["wf"]
+
+    sm.complete_execution("e1", state)
+    assert not list((tmp_path / "executions").iterdir())
+    with open(tmp_path / "history" / "e1.json") as f:
+        assert json.load(f)["steps"]["a"]["status"] == "completed"
+
+
+def test_critical_path_follows_longest_duration_chain():
+    steps = [
+        {"id": "a"},
+        {"id": "b", "depends_on": ["a"]},
+        {"id": "c"},
+        {"id": "d", "depends_on": ["b", "c"]},
+    ]
+    spans = {"a": (0.0, 1.0), "b": (1.0, 1.5), "c": (0.0, 2.0), "d": (2.0, 2.5)}
+
+    seconds, path = critical_path(steps, spans)
+
+    assert path == ["c", "d"]
+    assert seconds == pytest.approx(2.5)
+
+
+class FakeStore:
+    def __init__(self, fail=False):
+        self.rows = {}
+        self.fail = fail
+        self.imports = 0
+
+    async def upsert(self, state):
+        if self.fail:
+            raise ConnectionError("db down")
+        self.rows[state["execution_id"]] = json.loads(json.dumps(state, default=str))
+
+    async def get(self, execution_id):
+        if self.fail:
+            raise ConnectionError("db down")
+        return self.rows.get(execution_id)
+
+    async def history(self, limit, *, workflow_id=None, status=None):
+        if self.fail:
+            raise ConnectionError("db down")
+        rows = [r for r in self.rows.values() if r["status"] != "running"]
+        return sorted(rows, key=lambda r: r["started_at"], reverse=True)[:limit]
+
+    async def running(self, limit=100):
+        if self.fail:
+            raise ConnectionError("db down")
+        return [r for r in self.rows.values() if r["status"] == "running"]
+
+    async def import_json_dir(self, history_dir):
+        self.imports += 1
+        return 0
+
+
+@pytest.mark.asyncio
+async def test_finished_executions_go_to_the_store(handler, tmp_path):
+    store = FakeStore()
+    sm = StateManager(str(tmp_path), store=store)
+    executor = DAGExecutor(sm)
+
+    first = await executor.execute_workflow(_workflow(("a", 0.0, [])))
+    second = await executor.execute_workflow(_workflow(("a", 0.0, [])))
+
+    assert not list((tmp_path / "executions").iterdir())
+    assert not list((tmp_path / "history").glob("*.json"))
+    history = await sm.get_history(limit=5)
+    assert [h["execution_id"] for h in history] == [second["execution_id"], first["execution_id"]]
+    assert (await sm.get_execution(first["execution_id"]))["status"] == "completed"
+    assert await sm.get_active_executions() == []
+    assert store.imports == 1  # legacy files imported once
+
+
+@pytest.mark.asyncio
+async def test_store_outage_falls_back_to_history_file(handler, tmp_path):
+    sm = StateManager(str(tmp_path), store=FakeStore(fail=True))
+
+    state = await DAGExecutor(sm).execute_workflow(_workflow(("a", 0.0, [])))
+
+    assert state["status"] == "completed"
+    assert (tmp_path / "history" / f"{state['execution_id']}.json").exists()
+    assert [h["execution_id"] for h in await sm.get_history()] == [state["execution_id"]]
+
+
+@pytest.mark.asyncio
+async def test_store_outage_reads_active_executions_from_disk(tmp_path):
+    sm = StateManager(str(tmp_path), store=FakeStore(fail=True))
+    sm.save_state("e1", {"execution_id": "e1", "status": "running", "steps": {}})
+
+    assert [s["execution_id"] for s in await sm.get_active_executions()] == ["e1"]
+    assert (await sm.get_execution("e1"))["status"] == "running"
+    assert await sm.get_execution("missing") is None
+
+
+def test_execution_row_summarises_state():
+    row = execution_row({
+        "workflow_id": "wf",
+        "execution_id": "e1",
+        "status": "completed",
+        "trigger": {"type": "cron"},
+        "steps": {"a": {"status": "completed", "output": object()}},
+        "error": None,
+        "started_at": "2026-01-01T00:00:00",
+        "completed_at": "2026-01-01T00:00:02.5",
+    })
+
+    assert row["started_at"].tzinfo is not None
+    assert row["duration_ms"] == 2500.0
+    assert row["trigger_type"] == "cron"
+    assert row["step_status"] == {"a": "completed"}
+    assert isinstance(row["state"]["steps"]["a"]["output"], str)
@@ -1,43 +1,188 @@
-"""Thread-safe ring buffer for audio data. Mirrors Zero's backend version."""
+"""Single-producer / multi-consumer audio ring in shared memory.
+
+The samples live in a ``multiprocessing.shared_memory`` segment so other
+processes (speaker, STT workers) can ``RingBuffer.attach(name)`` and read
+the same audio without pickling it across a pipe.
+
+Layout of the segment::
+
+    int64[HEADER_SLOTS]   samples_written, capacity
+    float32[2 * capacity] samples, second half mirrors the first
+
+Each write lands at ``pos`` and again at ``pos + capacity`` (or ``pos -
+capacity``), so every window of up to ``capacity`` samples is one
+contiguous slice. Reads return read-only numpy views into the segment
+instead of copies; a view stays valid until the producer laps it, i.e.
+for ``capacity`` samples (30 s in AudioCapture).
+
+Only one thread/process may write. Readers never lock: the producer stores
+the samples first and publishes ``samples_written`` last, and each reader
+keeps its own cursor (``RingReader``) so consumers don't disturb each other.
+"""
+
+from __future__ import annotations
 
 import threading
+import weakref
+from multiprocessing import shared_memory
+from typing import Optional
+
 import numpy as np
 
+HEADER_SLOTS = 2
+_HEADER_BYTES = HEADER_SLOTS * 8
+
+
+def _release(shm: shared_memory.SharedMemory, owner: bool) -> None:
+    try:
+        shm.close()
+    except Exception:
+        pass
+    if owner:
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _attach_untracked(name: str) -> shared_memory.SharedMemory:
+    """Open an existing segment without handing it to this process's
+    resource tracker (which would unlink it when a consumer exits)."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+        except Exception:
+            pass
+        return shm
+
 
 class RingBuffer:
-    def __init__(self, capacity: int):
-        self.capacity = capacity
-        self.buffer = np.zeros(capacity, dtype=np.float32)
-        self.write_pos = 0
-        self.samples_written = 0
-        self._lock = threading.Lock()
+    def __init__(self, capacity: int, *, _shm: Optional[shared_memory.SharedMemory] = None):
+        owner = _shm is None
+        if owner:
+            _shm = shared_memory.SharedMemory(
+                create=True, size=_HEADER_BYTES + 2 * capacity * 4,
+            )
+        self._shm = _shm
+        self._header = np.ndarray((HEADER_SLOTS,), dtype=np.int64, buffer=_shm.buf)
+        if owner:
+            self._header[:] = (0, capacity)
+        self.capacity = int(self._header[1])
+        self.buffer = np.ndarray(
+            (2 * self.capacity,), dtype=np.float32, buffer=_shm.buf, offset=_HEADER_BYTES,
+        )
+        if owner:
+            self.buffer[:] = 0.0
+        self._write_lock = threading.Lock()
+        self._finalizer = weakref.finalize(self, _release, _shm, owner)
+
+    @classmethod
+    def attach(cls, name: str) -> "RingBuffer":
+        """Map a ring created by another process (read side)."""
+        return cls(0, _shm=_attach_untracked(name))
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def samples_written(self) -> int:
+        return int(self._header[0])
+
+    @property
+    def write_pos(self) -> int:
+        return self.samples_written % self.capacity
+
+    def close(self) -> None:
+        """Release this mapping (and the segment, if this process created it).
+
+        Views handed out earlier must not be used afterwards.
+        """
+        # Drop our own exports first; SharedMemory.close() refuses while
+        # arrays still point into the mapping.
+        del self._header, self.buffer
+        self._finalizer()
 
     def write(self, data: np.ndarray) -> None:
-        with self._lock:
-            n = len(data)
-            if n >= self.capacity:
-                self.buffer[:] = data[-self.capacity:]
-                self.write_pos = 0
-                self.samples_written += n
-                return
-            end_pos = self.write_pos + n
-            if end_pos <= self.capacity:
-                self.buffer[self.write_pos:end_pos] = data
+        data = np.asarray(data, dtype=np.float32).reshape(-1)
+        with self._write_lock:
+            written = int(self._header[0])
+            n = data.size
+            if n > self.capacity:
+                data = data[-self.capacity:]
+                written += n - self.capacity
+                n = self.capacity
+            cap = self.capacity
+            pos = written % cap
+            end = pos + n
+            # Primary copy at [pos, end) in the 2×capacity array, then the
+            # mirror so both halves agree for the written range.
+            self.buffer[pos:end] = data
+            if end <= cap:
+                self.buffer[pos + cap:end + cap] = data
             else:
-                split = self.capacity - self.write_pos
-                self.buffer[self.write_pos:] = data[:split]
+                split = cap - pos
+                self.buffer[pos + cap:] = data[:split]
                 self.buffer[: n - split] = data[split:]
-            self.write_pos = end_pos % self.capacity
-            self.samples_written += n
+            # Publish last so readers never see the count before the samples.
+            self._header[0] = written + n
+
+    def _view(self, first: int, n: int) -> np.ndarray:
+        start = first % self.capacity
+        view = self.buffer[start:start + n]
+        view.flags.writeable = False
+        return view
 
     def read_latest(self, n: int) -> np.ndarray:
-        with self._lock:
-            n = min(n, self.capacity, self.samples_written)
-            if n == 0:
-                return np.zeros(0, dtype=np.float32)
-            start = (self.write_pos - n) % self.capacity
-            if start + n <= self.capacity:
-                return self.buffer[start:start + n].copy()
-            first = self.buffer[start:].copy()
-            second = self.buffer[: n - len(first)].copy()
-            return np.concatenate([first, second])
+        """Most recent ``n`` samples as a read-only view."""
+        written = self.samples_written
+        n = min(n, self.capacity, written)
+        if n <= 0:
+            return np.zeros(0, dtype=np.float32)
+        return self._view(written - n, n)
+
+    def read_since(self, start: int) -> tuple[int, np.ndarray]:
+        """Samples from absolute index ``start`` up to the write head.
+
+        ``start`` is clamped to the oldest sample still held, so the returned
+        first index tells the caller if audio was overwritten before it read.
+        """
+        written = self.samples_written
+        oldest = written - min(self.capacity, written)
+        first = min(max(start, oldest), written)
+        if first == written:
+            return first, np.zeros(0, dtype=np.float32)
+        return first, self._view(first, written - first)
+
+    def reader(self, *, from_start: bool = False) -> "RingReader":
+        """New consumer cursor, at the write head (or the oldest held sample)."""
+        written = self.samples_written
+        return RingReader(self, written - min(self.capacity, written) if from_start else written)
+
+
+class RingReader:
+    """One consumer's cursor into a RingBuffer."""
+
+    def __init__(self, ring: RingBuffer, position: int) -> None:
+        self.ring = ring
+        self.position = position
+        self.dropped = 0  # samples overwritten before this reader got to them
+
+    @property
+    def available(self) -> int:
+        return min(self.ring.samples_written - self.position, self.ring.capacity)
+
+    def read(self, max_samples: Optional[int] = None) -> np.ndarray:
+        """Everything new since the last read (at most ``max_samples``), as a
+        read-only view. Advances the cursor."""
+        first, view = self.ring.read_since(self.position)
+        if first > self.position:
+            self.dropped += first - self.position
+        if max_samples is not None:
+            view = view[:max_samples]
+        self.position = first + view.size
+        return view
@@ -1,8 +1,8 @@
 """
 Live transcription for the host agent.
 
-Runs faster-whisper on a rolling window of the audio ring buffer while a
-recording is active and pushes new text segments to WebSocket subscribers.
+Streams faster-whisper over the audio ring buffer while a recording is
+active and pushes committed text segments to WebSocket subscribers.
 Post-recording Whisper (higher-quality pass) still happens in zero-api's
 meeting_processing_pipeline after the file is written.
 
@@ -10,19 +10,27 @@ Design choices:
 - Model: faster-whisper `base` on CPU with int8 — real-time-ish latency
   without hogging the GPU that the post-recording `small`+diarization
   pipeline needs.
-- Window: 8-second slice read every 2s from AudioCapture.ring_buffer.
-  Slight overlap lets Whisper anchor word boundaries across chunks.
-- Dedup: we keep a running transcript string and only emit text that
-  extends past what we've already shown. Whisper re-reads its own past
-  text on each window, so naive emit-everything would produce duplicates.
-- Broadcast: subscribers register an asyncio.Queue; the worker thread
-  schedules `queue.put_nowait` via run_coroutine_threadsafe so the loop
-  stays responsive.
+- VAD gate: each poll first runs Silero VAD (bundled with faster-whisper)
+  over only the audio that arrived since the last poll. Silence is never
+  decoded; the first silent poll after speech closes the utterance.
+- Commit policy: LocalAgreement-2. The uncommitted tail of the buffer is
+  re-decoded each poll and the words two consecutive decodes agree on are
+  committed. Committed audio is dropped from the decode window, so text
+  is never re-decoded; the last committed words go in as the prompt.
+- Timestamps: absolute positions come from the ring buffer's
+  `samples_written`, so segment start/end are real offsets into the
+  recording rather than "now minus window".
+- CPU budget: a token bucket caps decode time to a fraction of wall-clock
+  time. Over budget, audio stays buffered and is decoded in one larger
+  pass once tokens refill.
+- Broadcast: subscribers register a synchronous callback; the websocket
+  handler hops onto its loop with call_soon_threadsafe.
 """
 
 from __future__ import annotations
 
 import asyncio
+import re
 import threading
 import time
 from typing import Any, Callable, Optional
@@ -34,10 +42,118 @@ logger = structlog.get_logger(__name__)
 
 
 _DEFAULT_MODEL_SIZE = "base"
-_DEFAULT_WINDOW_S = 4.0
+# Longest stretch of uncommitted audio decoded at once. When two decodes
+# keep disagreeing for this long the pending hypothesis is committed as-is.
+_DEFAULT_WINDOW_S = 8.0
 _DEFAULT_POLL_INTERVAL_S = 1.2
 _DEFAULT_LANGUAGE = "en"
 _DEFAULT_SAMPLE_RATE = 16000
+# Share of wall-clock time live decoding may use on average (0 = unlimited).
+_DEFAULT_CPU_BUDGET = 0.35
+# Decode bursts allowed above the average, in seconds of decode time.
+_CPU_BURST_S = 2.0
+_MIN_DECODE_S = 1.0
+# Cheap energy floor checked before running Silero on a chunk.
+_VAD_MIN_RMS = 0.003
+_VAD_THRESHOLD = 0.5
+# Audio kept ahead of the next utterance when silence is dropped.
+_SILENCE_LEAD_IN_S = 0.3
+# Committed words re-checked against a new decode's leading words.
+_MAX_OVERLAP_WORDS = 5
+_PROMPT_WORDS = 24
+
+# (start_s, end_s, text) — seconds from the start of the recording.
+_Word = tuple[float, float, str]
+_NORM_RE = re.compile(r"[^\w']+")
+
+
+def _norm(text: str) -> str:
+    return _NORM_RE.sub("", text.lower())
+
+
+class _LocalAgreement:
+    """LocalAgreement-2 commit policy over successive decodes of one buffer.
+
+    A word is committed once two consecutive hypotheses agree on it (and on
+    everything before it). Committed words are never offered again.
+    """
+
+    def __init__(self) -> None:
+        self.committed_end = 0.0
+        self._committed: list[_Word] = []  # recent tail, for overlap + prompt
+        self._previous: list[_Word] = []
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._previous)
+
+    def update(self, words: list[_Word]) -> list[_Word]:
+        """Feed a new hypothesis; return the newly committed words."""
+        fresh = [w for w in words if w[0] > self.committed_end - 0.1]
+        # The decode window starts at the last committed word, so Whisper
+        # often re-hears it. Drop a leading n-gram repeating the committed tail.
+        if fresh and self._committed and fresh[0][0] - self.committed_end < 1.0:
+            limit = min(_MAX_OVERLAP_WORDS, len(fresh), len(self._committed))
+            for n in range(limit, 0, -1):
+                tail = [_norm(w[2]) for w in self._committed[-n:]]
+                if tail == [_norm(w[2]) for w in fresh[:n]]:
+                    fresh = fresh[n:]
+                    break
+        agreed = 0
+        for new, old in zip(fresh, self._previous):
+            if _norm(new[2]) != _norm(old[2]):
+                break
+            agreed += 1
+        commit = fresh[:agreed]
+        self._previous = fresh[agreed:]
+        self._accept(commit)
+        return commit
+
+    def flush(self) -> list[_Word]:
+        """Commit the whole pending hypothesis (end of utterance)."""
+        commit, self._previous = self._previous, []
+        self._accept(commit)
+        return commit
+
+    def prompt(self) -> str:
+        return " ".join(w[2] for w in self._committed[-_PROMPT_WORDS:])
+
+    def _accept(self, words: list[_Word]) -> None:
+        if words:
+            self.committed_end = words[-1][1]
+            self._committed = (self._committed + words)[-_PROMPT_WORDS:]
+
+
+class _CpuBudget:
+    """Token bucket over decode seconds: on average at most ``fraction`` of
+    each wall-clock second goes to decoding, bursting up to ``burst_s``."""
+
+    def __init__(
+        self,
+        fraction: float,
+        burst_s: float = _CPU_BURST_S,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.fraction = fraction
+        self._capacity = burst_s
+        self._tokens = burst_s
+        self._clock = clock
+        self._at = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self._capacity, self._tokens + (now - self._at) * self.fraction)
+        self._at = now
+
+    def allow(self) -> bool:
+        if self.fraction <= 0:
+            return True
+        self._refill()
+        return self._tokens > 0
+
+    def spend(self, seconds: float) -> None:
+        self._refill()
+        self._tokens -= seconds
 
 
 class LiveTranscriptionService:
@@ -54,11 +170,13 @@ class LiveTranscriptionService:
         window_s: float = _DEFAULT_WINDOW_S,
         poll_interval_s: float = _DEFAULT_POLL_INTERVAL_S,
         language: str = _DEFAULT_LANGUAGE,
+        cpu_budget: float = _DEFAULT_CPU_BUDGET,
     ) -> None:
         self.model_size = model_size
         self.window_s = window_s
         self.poll_interval_s = poll_interval_s
         self.language = language
+        self.cpu_budget = cpu_budget
 
         self._model = None
         self._model_lock = threading.Lock()
@@ -70,8 +188,13 @@ class LiveTranscriptionService:
         self._subscribers: list[Callable[[dict], None]] = []
         self._subscribers_lock = threading.Lock()
 
-        self._last_text: str = ""
         self._segment_counter: int = 0
+        # Stream state, in absolute ring-buffer sample indices.
+        self._origin: int = 0  # sample at recording t=0
+        self._buf_start: int = 0  # first uncommitted sample
+        self._vad_pos: int = 0  # end of audio already seen by VAD
+        self._agreement = _LocalAgreement()
+        self._budget = _CpuBudget(cpu_budget)
 
     # --- Model -------------------------------------------------------------
 
@@ -150,8 +273,7 @@ class LiveTranscriptionService:
             return
         self._capture = capture
         self._stop.clear()
-        self._last_text = ""
-        self._segment_counter = 0
+        self._reset_stream(capture)
         self._thread = threading.Thread(
             target=self._run, name="LiveTranscription", daemon=True,
         )
@@ -168,6 +290,17 @@ class LiveTranscriptionService:
 
     # --- Worker ------------------------------------------------------------
 
+    def _reset_stream(self, capture: Any) -> None:
+        sample_rate = _DEFAULT_SAMPLE_RATE
+        written = int(capture.ring_buffer.samples_written)
+        # The ring may predate this recording; anchor t=0 to the WAV start.
+        self._origin = written - int(round(capture.duration_seconds * sample_rate))
+        self._buf_start = written
+        self._vad_pos = written
+        self._segment_counter = 0
+        self._agreement = _LocalAgreement()
+        self._budget = _CpuBudget(self.cpu_budget)
+
     def _run(self) -> None:
         try:
             self.load_model()
@@ -175,100 +308,115 @@ class LiveTranscriptionService:
             logger.warning("live_transcription_model_load_failed", error=str(e))
             return
 
-        sample_rate = _DEFAULT_SAMPLE_RATE
-        window_samples = int(self.window_s * sample_rate)
-
-        while not self._stop.is_set():
-            # Wait up to poll_interval_s, but bail early if stop is signalled.
-            if self._stop.wait(self.poll_interval_s):
-                break
-
-            capture = self._capture
-            if capture is None or not capture.is_recording:
-                continue
-
+        # Wait up to poll_interval_s, but bail early if stop is signalled.
+        while not self._stop.wait(self.poll_interval_s):
             try:
-                audio = capture.ring_buffer.read_latest(window_samples)
+                self._tick()
             except Exception as e:
-                logger.debug("live_transcription_read_failed", error=str(e))
-                continue
+                logger.debug("live_transcription_tick_failed", error=str(e))
 
-            if audio is None or len(audio) < sample_rate:  # need at least 1s
-                continue
+    def _tick(self) -> None:
+        capture = self._capture
+        if capture is None or not capture.is_recording:
+            return
+        sample_rate = _DEFAULT_SAMPLE_RATE
+        ring = capture.ring_buffer
+        try:
+            first, view = ring.read_since(self._buf_start)
+            # read_since returns a view into the shared ring, which the
+            # capture thread keeps overwriting; decode from a private copy.
+            audio = np.array(view, dtype=np.float32).reshape(-1)
+            # Samples the writer lapped while we were copying are torn.
+            torn = ring.samples_written - ring.capacity - first
+        except Exception as e:
+            logger.debug("live_transcription_read_failed", error=str(e))
+            return
+        if torn > 0:
+            audio = audio[torn:]
+            first += torn
+        if first > self._buf_start:
+            # The ring overwrote audio we never decoded (budget starved for
+            # the whole ring length); carry on from the oldest sample held.
+            logger.debug("live_transcription_overrun", lost_samples=first - self._buf_start)
+            self._buf_start = first
+        head = first + audio.size
+        new = audio[max(0, self._vad_pos - first):]
+        self._vad_pos = head
+        if new.size == 0:
+            return
 
-            # faster-whisper wants float32 in [-1, 1]. Our ring buffer already
-            # stores float32, but be defensive about shape.
-            audio_np = np.asarray(audio, dtype=np.float32).reshape(-1)
+        if not self._has_speech(new):
+            # Utterance over: one last decode settles the pending words,
+            # then the silent audio is dropped without ever being decoded.
+            if self._agreement.pending and self._budget.allow():
+                words = self._decode(audio, first)
+                self._commit(self._agreement.update(words) + self._agreement.flush())
+            elif self._agreement.pending:
+                self._commit(self._agreement.flush())
+            self._buf_start = max(self._buf_start, head - int(_SILENCE_LEAD_IN_S * sample_rate))
+            return
 
-            try:
-                segments, _info = self._model.transcribe(
-                    audio_np,
-                    language=self.language,
-                    beam_size=1,
-                    vad_filter=False,
-                    without_timestamps=False,
-                    condition_on_previous_text=False,
-                )
-                text_parts: list[str] = []
-                spans: list[tuple[float, float, str]] = []
-                for seg in segments:
-                    seg_text = (seg.text or "").strip()
-                    if not seg_text:
-                        continue
-                    text_parts.append(seg_text)
-                    spans.append((seg.start, seg.end, seg_text))
-                full_text = " ".join(text_parts).strip()
-            except Exception as e:
-                logger.debug("live_transcription_transcribe_failed", error=str(e))
-                continue
-
-            # Diff against last window. Whisper re-hears the overlap, so emit
-            # only what extends beyond the prior output.
-            new_suffix = self._diff_suffix(self._last_text, full_text)
-            if new_suffix:
-                self._segment_counter += 1
-                duration = capture.duration_seconds
-                # We don't have an absolute start offset (the window is
-                # rolling), so we pin start to "now minus window" and end to
-                # "now", giving the UI a monotonically-advancing cursor.
-                start_t = max(0.0, duration - self.window_s)
-                end_t = duration
-                self._broadcast({
-                    "type": "segment",
-                    "id": f"live-{self._segment_counter}",
-                    "start": round(start_t, 2),
-                    "end": round(end_t, 2),
-                    "text": new_suffix,
-                })
-                self._last_text = full_text
-
-    @staticmethod
-    def _diff_suffix(previous: str, current: str) -> str:
-        """Return the fragment of `current` that wasn't present in `previous`.
-
-        Handles the common case where Whisper's new window repeats the tail
-        of the previous window plus new words. We find the largest suffix of
-        `previous` that is also a prefix of `current` and return the rest.
-        If there's no overlap (e.g. speaker paused and silence reset the
-        context), return the whole current text — better to show a duplicate
-        than to swallow new speech.
-        """
-        if not current:
-            return ""
-        if not previous:
-            return current.strip()
-        # Quick win: exact prefix match.
-        if current.startswith(previous):
-            return current[len(previous):].strip()
-        # Find longest suffix of `previous` that's a prefix of `current`.
-        max_overlap = min(len(previous), len(current))
-        overlap = 0
-        for n in range(max_overlap, 0, -1):
-            if previous.endswith(current[:n]):
-                overlap = n
-                break
-        tail = current[overlap:].strip()
-        return tail
+        if audio.size < _MIN_DECODE_S * sample_rate or not self._budget.allow():
+            # Over budget: keep buffering; the next allowed tick decodes it all.
+            return
+        self._commit(self._agreement.update(self._decode(audio, first)))
+        committed_sample = self._origin + int(self._agreement.committed_end * sample_rate)
+        self._buf_start = max(self._buf_start, min(committed_sample, head))
+        if head - self._buf_start > self.window_s * sample_rate:
+            self._commit(self._agreement.flush())
+            self._buf_start = head
+
+    def _has_speech(self, audio: np.ndarray) -> bool:
+        if float(np.sqrt(np.mean(np.square(audio)))) < _VAD_MIN_RMS:
+            return False
+        try:
+            from faster_whisper.vad import VadOptions, get_speech_timestamps  # type: ignore
+        except ImportError:
+            return True
+        try:
+            return bool(get_speech_timestamps(audio, VadOptions(threshold=_VAD_THRESHOLD)))
+        except Exception as e:
+            logger.debug("live_transcription_vad_failed", error=str(e))
+            return True
+
+    def _decode(self, audio: np.ndarray, first: int) -> list[_Word]:
+        """Word-level hypothesis for ``audio`` (starting at ring sample
+        ``first``), in seconds from the start of the recording."""
+        offset = (first - self._origin) / _DEFAULT_SAMPLE_RATE
+        words: list[_Word] = []
+        t0 = time.monotonic()
+        try:
+            segments, _info = self._model.transcribe(
+                audio,
+                language=self.language,
+                beam_size=1,
+                vad_filter=True,
+                word_timestamps=True,
+                condition_on_previous_text=False,
+                initial_prompt=self._agreement.prompt() or None,
+            )
+            for seg in segments:
+                for w in seg.words or []:
+                    text = (w.word or "").strip()
+                    if text:
+                        words.append((offset + w.start, offset + w.end, text))
+        except Exception as e:
+            logger.debug("live_transcription_transcribe_failed", error=str(e))
+        finally:
+            self._budget.spend(time.monotonic() - t0)
+        return words
+
+    def _commit(self, words: list[_Word]) -> None:
+        if not words:
+            return
+        self._segment_counter += 1
+        self._broadcast({
+            "type": "segment",
+            "id": f"live-{self._segment_counter}",
+            "start": round(max(0.0, words[0][0]), 2),
+            "end": round(words[-1][1], 2),
+            "text": " ".join(w[2] for w in words),
+        })
 
 
 _singleton: Optional[LiveTranscriptionService] = None
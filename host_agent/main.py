@@ -565,6 +565,7 @@ async def live_transcript_config_get():
         "model": live.model_size,
         "window_s": live.window_s,
         "poll_interval_s": live.poll_interval_s,
+        "cpu_budget": live.cpu_budget,
         "loaded": live.is_loaded,
     }
 